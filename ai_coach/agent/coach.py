@@ -14,6 +14,7 @@ from pydantic_ai.messages import ModelMessage, ModelRequest  # pyrefly: ignore[i
 from pydantic_ai.settings import ModelSettings  # pyrefly: ignore[import-error]
 
 from config.app_settings import settings
+from core.ai_coach.answer_stream import AnswerStreamPublisher
 from core.enums import WorkoutLocation
 from core.schemas import DayExercises, DietPlan, Program, QAResponse, Subscription
 from ai_coach.exceptions import AgentExecutionAborted
@@ -443,6 +444,7 @@ class CoachAgent(metaclass=CoachAgentMeta):
         deps: AgentDeps,
         profile_context: str | None = None,
         attachments: Sequence[dict[str, str]] | None = None,
+        stream_id: str | None = None,
     ) -> QAResponse:
         deps.mode = CoachMode.ask_ai
         agent = cls._get_agent()
@@ -466,6 +468,21 @@ class CoachAgent(metaclass=CoachAgentMeta):
             profile_context=resolved_profile_context,
         )
 
+        if stream_id and not attachments:
+            streamed: QAResponse | None = None
+            try:
+                streamed = await cls.llm_helper._stream_answer_question(
+                    prompt,
+                    deps,
+                    raw_history,
+                    publisher=AnswerStreamPublisher(stream_id),
+                    profile_context=resolved_profile_context,
+                )
+            except Exception as exc:  # noqa: BLE001 - the agent run below still answers; its result is final
+                logger.warning(f"agent.ask.stream_failed profile_id={deps.profile_id} error={exc}")
+            if streamed is not None:
+                return streamed
+
         multimodal_input = cls._build_user_message(user_prompt, attachments)
 
         async def _run_agent(user_input: Any) -> Any:
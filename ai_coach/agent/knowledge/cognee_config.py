@@ -8,6 +8,7 @@ from typing import Any, ClassVar
 from loguru import logger
 from sqlalchemy.engine.url import URL, make_url
 
+from ai_coach.agent.knowledge.utils.embedding_cache import EmbeddingCache
 from ai_coach.agent.knowledge.utils.storage_helpers import (
     collect_storage_info,
     patch_local_file_storage,
@@ -226,6 +227,7 @@ class CogneeConfig:
             from cognee.infrastructure.databases.vector.embeddings import LiteLLMEmbeddingEngine
 
             CogneeConfig._patch_litellm_embedding_engine(LiteLLMEmbeddingEngine)  # pyrefly: ignore[bad-argument-type]
+            CogneeConfig._patch_embedding_cache(LiteLLMEmbeddingEngine)  # pyrefly: ignore[bad-argument-type]
 
         except Exception as exc:  # noqa: BLE001
             logger.debug(f"Cognee patch failed: {exc}")
@@ -259,6 +261,28 @@ class CogneeConfig:
 
         engine_cls.embedding = staticmethod(patched_embedding)  # pyrefly: ignore[missing-attribute]
 
+    @staticmethod
+    def _patch_embedding_cache(engine_cls: type) -> None:
+        """Serve ``embed_text`` from the embedding cache, embedding only the misses in one call."""
+        original = getattr(engine_cls, "embed_text", None)
+        if original is None or getattr(original, "__embedding_cache__", False):
+            return
+
+        async def cached_embed_text(self: Any, text: list[str]) -> list[list[float]]:
+            cache = EmbeddingCache.shared()
+            if cache is None or not text:
+                return await original(self, text)
+            model = str(getattr(self, "model", None) or settings.EMBEDDING_MODEL)
+            dimensions = int(getattr(self, "dimensions", None) or 0)
+
+            async def _compute(batch: list[str]) -> list[list[float]]:
+                return await original(self, batch)
+
+            return await cache.embed(text, model=model, dimensions=dimensions, compute=_compute)
+
+        setattr(cached_embed_text, "__embedding_cache__", True)
+        engine_cls.embed_text = cached_embed_text  # pyrefly: ignore[missing-attribute]
+
     @staticmethod
     def _patch_cache_adapter() -> None:
         if CogneeConfig._CACHE_PATCHED:
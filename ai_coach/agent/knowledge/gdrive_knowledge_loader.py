@@ -4,9 +4,11 @@ import hashlib
 import io
 import ssl
 import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Final, Mapping, cast, Literal, TypedDict
+from typing import Any, Awaitable, Callable, Final, Mapping, Sequence, cast, Literal, TypedDict
 
 from google.oauth2.service_account import Credentials  # pyrefly: ignore[import-error]
 from googleapiclient.discovery import build  # pyrefly: ignore[import-error]
@@ -23,6 +25,7 @@ from .knowledge_base import KnowledgeBase
 from .utils.helpers import sanitize_text
 
 SCOPES: Final = ["https://www.googleapis.com/auth/drive.readonly"]
+_PROCESS_PARSED: Final = frozenset({".docx", ".pdf"})
 GDriveSummaryStatus = Literal["running", "skipped", "done", "partial", "error"]
 
 
@@ -34,6 +37,7 @@ class GDriveLoadSummary(TypedDict):
     files_total: int
     processed: int
     skipped: int
+    unchanged: int
     errors: int
     current: str | None
     started_at: str
@@ -80,21 +84,33 @@ class GDriveDocumentLoader(KnowledgeLoader):
     folder_id: str | None = settings.KNOWLEDGE_BASE_FOLDER_ID
     credentials_path: str | Path = settings.GOOGLE_APPLICATION_CREDENTIALS
     _files_service: Any | None = None
+    _thread_state = threading.local()
     _FOLDER_MIME_TYPE: Final[str] = "application/vnd.google-apps.folder"
 
     def __init__(self, knowledge_base: KnowledgeBase) -> None:
         self._kb = knowledge_base
         self._dataset_name = knowledge_base.GLOBAL_DATASET
 
+    def _build_files_service(self) -> Any:
+        creds = Credentials.from_service_account_file(
+            str(self.credentials_path),
+            scopes=SCOPES,
+        )
+        return build("drive", "v3", credentials=creds).files()
+
     def _get_drive_files_service(self) -> Any:
         if self._files_service is None:
-            creds = Credentials.from_service_account_file(
-                str(self.credentials_path),
-                scopes=SCOPES,
-            )
-            self._files_service = build("drive", "v3", credentials=creds).files()
+            self._files_service = self._build_files_service()
         return self._files_service
 
+    def _media_files_service(self) -> Any:
+        # httplib2 connections are not thread-safe, so each download thread builds its own service
+        service = getattr(self._thread_state, "files_service", None)
+        if service is None:
+            service = self._build_files_service()
+            self._thread_state.files_service = service
+        return service
+
     @staticmethod
     def _is_retryable_download_error(exc: Exception) -> bool:
         if isinstance(exc, (TimeoutError, BrokenPipeError, ssl.SSLError, ConnectionError, OSError)):
@@ -111,23 +127,23 @@ class GDriveDocumentLoader(KnowledgeLoader):
         delay = base * (factor ** max(attempt - 1, 0))
         return min(delay, settings.GDRIVE_DOWNLOAD_MAX_DELAY)
 
+    def _fetch_media(self, file_id: str) -> bytes:
+        request = self._media_files_service().get_media(fileId=file_id)
+        fh = io.BytesIO()
+        downloader = MediaIoBaseDownload(fh, request)
+        chunk_retries = max(0, settings.GDRIVE_DOWNLOAD_CHUNK_RETRIES)
+        done = False
+        while not done:
+            _, done = downloader.next_chunk(num_retries=chunk_retries)
+        return fh.getvalue()
+
     async def _download_file(self, file_id: str) -> bytes:
-        service = self._get_drive_files_service()
         max_attempts = max(1, settings.GDRIVE_DOWNLOAD_MAX_RETRIES)
-        chunk_retries = max(0, settings.GDRIVE_DOWNLOAD_CHUNK_RETRIES)
         last_exc: Exception | None = None
 
         for attempt in range(1, max_attempts + 1):
-            request = service.get_media(fileId=file_id)
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
             try:
-                while not done:
-                    status, done = downloader.next_chunk(num_retries=chunk_retries)
-                    if status:
-                        await asyncio.sleep(0)
-                return fh.getvalue()
+                return await asyncio.to_thread(self._fetch_media, file_id)
             except Exception as exc:
                 last_exc = exc
                 if not self._is_retryable_download_error(exc) or attempt >= max_attempts:
@@ -174,7 +190,7 @@ class GDriveDocumentLoader(KnowledgeLoader):
         while True:
             request = service.list(
                 q=q,
-                fields="nextPageToken, files(id, name, size, mimeType, modifiedTime)",
+                fields="nextPageToken, files(id, name, size, mimeType, modifiedTime, md5Checksum)",
                 pageToken=page_token,
                 pageSize=1000,
             )
@@ -227,6 +243,86 @@ class GDriveDocumentLoader(KnowledgeLoader):
         except Exception as exc:  # noqa: BLE001
             logger.debug(f"kb_gdrive.summary_store_failed detail={exc}")
 
+    def _file_versions_key(self) -> str:
+        return f"ai_coach:gdrive:folder:{self.folder_id}:files"
+
+    @staticmethod
+    def _file_version(item: Mapping[str, Any]) -> str:
+        return f"{item.get('modifiedTime') or ''}:{item.get('md5Checksum') or ''}"
+
+    async def _load_file_versions(self) -> dict[str, str]:
+        try:
+            client = get_redis_client()
+            return await cast(Awaitable[dict[str, str]], client.hgetall(self._file_versions_key()))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"kb_gdrive.file_versions_load_failed detail={exc}")
+            return {}
+
+    async def _store_file_versions(self, synced: Mapping[str, str], stale: Sequence[str]) -> None:
+        if not synced and not stale:
+            return
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            if synced:
+                pipe.hset(self._file_versions_key(), mapping=dict(synced))
+            if stale:
+                pipe.hdel(self._file_versions_key(), *stale)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"kb_gdrive.file_versions_store_failed detail={exc}")
+
+    def _skip_reason(self, item: Mapping[str, Any]) -> str | None:
+        name = str(item.get("name") or "").strip()
+        if Path(name).suffix.lower() not in self._PARSERS:
+            return "unsupported_extension"
+        if int(item.get("size") or 0) > settings.MAX_FILE_SIZE_MB * (1024 * 1024):
+            return "file_too_large"
+        if not item.get("id"):
+            return "missing_file_id"
+        return None
+
+    @staticmethod
+    def _parse_pool(items: Sequence[Mapping[str, Any]]) -> ProcessPoolExecutor | None:
+        workers = max(int(settings.GDRIVE_PARSE_PROCESSES), 0)
+        heavy = sum(1 for item in items if Path(str(item.get("name") or "")).suffix.lower() in _PROCESS_PARSED)
+        if not workers or not heavy:
+            return None
+        return ProcessPoolExecutor(max_workers=min(workers, heavy))
+
+    async def _fetch_document(
+        self, item: Mapping[str, Any], limiter: asyncio.Semaphore, pool: ProcessPoolExecutor | None
+    ) -> str:
+        """Download and parse one file; returns its normalized text."""
+        ext = Path(str(item.get("name") or "")).suffix.lower()
+        async with limiter:
+            data = await self._download_file(str(item["id"]))
+        parser = self._PARSERS[ext]
+        if ext not in _PROCESS_PARSED:
+            text = parser(data)
+        elif pool is not None:
+            text = await asyncio.get_running_loop().run_in_executor(pool, parser, data)
+        else:
+            text = await asyncio.to_thread(parser, data)
+        return self._kb.dataset_service._normalize_text(sanitize_text(text))
+
+    @staticmethod
+    def _document_metadata(item: Mapping[str, Any], dataset_alias: str) -> dict[str, Any]:
+        name = str(item.get("name") or "").strip()
+        metadata = {
+            "dataset": dataset_alias,
+            "source": "gdrive",
+            "file_id": item.get("id"),
+            "name": name,
+            "path": str(item.get("kb_path") or name),
+            "folder_path": item.get("kb_folder_path") or "",
+            "mime_type": item.get("mimeType"),
+            "size": int(item.get("size") or 0),
+        }
+        modified_ts = item.get("modifiedTime") or item.get("modified_time")
+        if modified_ts:
+            metadata["modified_ts"] = modified_ts
+        return metadata
+
     async def load(self, force_ingest: bool = False) -> None:
         if not self.folder_id:
             logger.info("No GDRIVE_FOLDER_ID set; skip load")
@@ -236,7 +332,16 @@ class GDriveDocumentLoader(KnowledgeLoader):
             if not got_lock:
                 logger.info("kb_gdrive.skip reason=lock_held")
                 return
+            await self._sync(self.folder_id, force_ingest=force_ingest)
+
+    async def _sync(self, folder_id: str, *, force_ingest: bool) -> None:
+        """Ingest new and changed files of the folder; unchanged files are skipped by their Drive version.
 
+        Each file's ``modifiedTime``/``md5Checksum`` is kept in Redis once it is ingested (or found to be a
+        duplicate or empty), so only files changed since then are downloaded. Downloads run concurrently up
+        to ``GDRIVE_SYNC_CONCURRENCY``, PDF and DOCX parsing goes to a process pool, and parsed documents are
+        ingested ``GDRIVE_SYNC_BATCH_SIZE`` at a time.
+        """
         dataset_alias = self._kb.dataset_service.alias_for_dataset(self._dataset_name)
         started_at = _utc_now()
         started_monotonic = asyncio.get_running_loop().time()
@@ -244,10 +349,11 @@ class GDriveDocumentLoader(KnowledgeLoader):
             "status": "running",
             "dataset": self._dataset_name,
             "dataset_alias": dataset_alias,
-            "folder_id": self.folder_id,
+            "folder_id": folder_id,
             "files_total": 0,
             "processed": 0,
             "skipped": 0,
+            "unchanged": 0,
             "errors": 0,
             "current": None,
             "started_at": started_at,
@@ -260,17 +366,15 @@ class GDriveDocumentLoader(KnowledgeLoader):
         await self._store_summary(summary)
         processed = 0
         skipped = 0
+        unchanged = 0
         errors = 0
         try:
-            files = self._scan_drive_tree(self.folder_id)
+            files = self._scan_drive_tree(folder_id)
             total_files = len(files)
-            progress_every = max(1, total_files // 20)
             summary["files_total"] = total_files
             summary["updated_at"] = _utc_now()
             await self._store_summary(summary)
-            logger.info(
-                f"kb_gdrive.scan start folder_id={self.folder_id} dataset={self._dataset_name} files={total_files}"
-            )
+            logger.info(f"kb_gdrive.scan start folder_id={folder_id} dataset={self._dataset_name} files={total_files}")
 
             user = getattr(self._kb, "_user", None)
             if user is None:
@@ -294,7 +398,7 @@ class GDriveDocumentLoader(KnowledgeLoader):
             summary["updated_at"] = _utc_now()
             await self._store_summary(summary)
             if not force_ingest:
-                cache_key = f"ai_coach:gdrive:folder:{self.folder_id}:fingerprint"
+                cache_key = f"ai_coach:gdrive:folder:{folder_id}:fingerprint"
                 try:
                     client = get_redis_client()
                     cached = await client.get(cache_key)
@@ -311,172 +415,121 @@ class GDriveDocumentLoader(KnowledgeLoader):
                 except Exception as exc:  # noqa: BLE001
                     logger.debug(f"kb_gdrive.fingerprint_check_failed detail={exc}")
 
-            for index, f in enumerate(files, start=1):
-                name = str(f.get("name") or "").strip()
-                file_id = f.get("id")
-                size = int(f.get("size") or 0)
-                ext = Path(name).suffix.lower()
-                kb_path = str(f.get("kb_path") or name)
-
-                should_log_progress = total_files > 0 and (
-                    index == 1 or index % progress_every == 0 or index == total_files
-                )
-                logger.debug(
-                    "kb_gdrive.file_start dataset={} index={}/{} file={} size={}",
-                    dataset_alias,
-                    index,
-                    total_files,
-                    kb_path,
-                    size,
-                )
-
-                try:
-                    if ext not in self._PARSERS:
-                        logger.debug(
-                            "kb_gdrive.file_decision dataset={} file={} decision=skip reason=unsupported_extension",
-                            dataset_alias,
-                            kb_path,
-                        )
-                        skipped += 1
-                        continue
-                    if (size or 0) > settings.MAX_FILE_SIZE_MB * (1024 * 1024):
-                        logger.debug(
-                            "kb_gdrive.file_decision dataset={} file={} decision=skip reason=file_too_large "
-                            "size_mb={:.1f}",
-                            dataset_alias,
-                            kb_path,
-                            size / 1_048_576,
-                        )
-                        skipped += 1
-                        continue
-                    if not file_id:
-                        logger.warning(
-                            "kb_gdrive.file_decision dataset={} file={} decision=skip reason=missing_file_id",
-                            dataset_alias,
-                            kb_path,
-                        )
-                        skipped += 1
-                        continue
-
-                    data = await self._download_file(file_id)
-                    parser = self._PARSERS[ext]
-                    text = await asyncio.to_thread(parser, data) if ext != ".txt" else parser(data)
-                    text = sanitize_text(text)
-
-                    normalized = self._kb.dataset_service._normalize_text(text)
-                    if not normalized.strip():
-                        self._kb.dataset_service.log_once(
-                            logging.INFO,
-                            "kb_gdrive.empty_document",
-                            dataset=dataset_alias,
-                            file_id=file_id,
-                            name=name,
-                            source="gdrive",
-                            min_interval=120.0,
-                        )
-                        skipped += 1
-                        continue
-
-                    metadata = {
-                        "dataset": dataset_alias,
-                        "source": "gdrive",
-                        "file_id": file_id,
-                        "name": name,
-                        "path": kb_path,
-                        "folder_path": f.get("kb_folder_path") or "",
-                        "mime_type": f.get("mimeType"),
-                        "size": size,
-                    }
-                    modified_ts = f.get("modifiedTime") or f.get("modified_time")
-                    if modified_ts:
-                        metadata["modified_ts"] = modified_ts
-
-                    payload_bytes = normalized.encode("utf-8")
-                    digest_sha = hashlib.sha256(payload_bytes).hexdigest()
-                    resolved_dataset, created = await self._kb.update_dataset(
-                        normalized,
-                        self._dataset_name,
-                        user,
-                        node_set=[f"gdrive:{file_id}"],
-                        metadata=metadata,
-                        force_ingest=force_ingest,
-                        trigger_projection=False,
+            versions = await self._load_file_versions()
+            changed: list[dict[str, Any]] = []
+            for item in files:
+                kb_path = str(item.get("kb_path") or item.get("name") or "")
+                reason = self._skip_reason(item)
+                if reason is not None:
+                    logger.debug(
+                        "kb_gdrive.file_decision dataset={} file={} decision=skip reason={}",
+                        dataset_alias,
+                        kb_path,
+                        reason,
                     )
-                    is_duplicate = not created
-                    if is_duplicate and not force_ingest:
-                        skipped += 1
-                        ident = self._kb.dataset_service.get_registered_identifier(dataset_alias)
-                        logger.debug(
-                            (
-                                "kb_gdrive.file_decision dataset={} file={} decision=skip "
-                                "reason=duplicate_digest digest={} ident={}"
-                            ),
-                            dataset_alias,
-                            kb_path,
-                            digest_sha[:12],
-                            ident,
-                        )
-                        continue
-
-                    processed += 1
-                    if is_duplicate:
-                        ident = self._kb.dataset_service.get_registered_identifier(dataset_alias) or ""
-                        logger.debug(
-                            (
-                                "kb_gdrive.file_decision dataset={} file={} decision=force_ingest "
-                                "reason=duplicate_digest digest={} ident={}"
-                            ),
-                            dataset_alias,
-                            kb_path,
-                            digest_sha[:12],
-                            ident,
-                        )
-                    else:
-                        logger.debug(
-                            "kb_gdrive.file_decision dataset={} file={} decision=process reason=new_content",
-                            dataset_alias,
-                            kb_path,
-                        )
+                    skipped += 1
+                    continue
+                if not force_ingest and versions.get(str(item["id"])) == self._file_version(item):
+                    unchanged += 1
+                    continue
+                changed.append(item)
+            logger.info(
+                f"kb_gdrive.plan dataset={dataset_alias} changed={len(changed)} unchanged={unchanged} skipped={skipped}"
+            )
 
-                    logger.debug(
-                        "kb_gdrive.ingested dataset_alias={} ident={} file_id={} bytes={} digest={}",
+            synced: dict[str, str] = {}
+            batch_size = max(1, int(settings.GDRIVE_SYNC_BATCH_SIZE))
+            limiter = asyncio.Semaphore(max(1, int(settings.GDRIVE_SYNC_CONCURRENCY)))
+            pool = self._parse_pool(changed)
+            try:
+                for offset in range(0, len(changed), batch_size):
+                    chunk = changed[offset : offset + batch_size]
+                    results = await asyncio.gather(
+                        *(self._fetch_document(item, limiter, pool) for item in chunk), return_exceptions=True
+                    )
+                    batch: list[tuple[str, Mapping[str, Any] | None]] = []
+                    batch_items: list[dict[str, Any]] = []
+                    for item, result in zip(chunk, results, strict=True):
+                        file_id = str(item["id"])
+                        kb_path = str(item.get("kb_path") or item.get("name") or "")
+                        if isinstance(result, BaseException):
+                            logger.opt(exception=result).error(f"Failed to process {kb_path} (id={file_id})")
+                            errors += 1
+                            continue
+                        if not result.strip():
+                            self._kb.dataset_service.log_once(
+                                logging.INFO,
+                                "kb_gdrive.empty_document",
+                                dataset=dataset_alias,
+                                file_id=file_id,
+                                name=item.get("name"),
+                                source="gdrive",
+                                min_interval=120.0,
+                            )
+                            skipped += 1
+                            synced[file_id] = self._file_version(item)
+                            continue
+                        batch.append((result, self._document_metadata(item, dataset_alias)))
+                        batch_items.append(item)
+                    if batch:
+                        try:
+                            resolved_dataset, created = await self._kb.update_dataset_batch(
+                                batch,
+                                self._dataset_name,
+                                user,
+                                node_set=[f"gdrive:{folder_id}"],
+                                force_ingest=force_ingest,
+                                trigger_projection=False,
+                            )
+                        except Exception:
+                            logger.exception(f"kb_gdrive.batch_failed dataset={dataset_alias} files={len(batch)}")
+                            errors += len(batch)
+                        else:
+                            for item, was_created in zip(batch_items, created, strict=True):
+                                kb_path = str(item.get("kb_path") or item.get("name") or "")
+                                if was_created:
+                                    processed += 1
+                                else:
+                                    skipped += 1
+                                logger.debug(
+                                    "kb_gdrive.file_decision dataset={} file={} decision={} ident={}",
+                                    dataset_alias,
+                                    kb_path,
+                                    "process" if was_created else "skip reason=duplicate_digest",
+                                    resolved_dataset,
+                                )
+                                synced[str(item["id"])] = self._file_version(item)
+                    done = offset + len(chunk)
+                    logger.info(
+                        "kb_gdrive.progress dataset={} index={}/{} processed={} skipped={} errors={} remaining={}",
                         dataset_alias,
-                        resolved_dataset,
-                        file_id,
-                        len(payload_bytes),
-                        digest_sha[:12],
+                        done,
+                        len(changed),
+                        processed,
+                        skipped,
+                        errors,
+                        len(changed) - done,
                     )
-                except Exception:
-                    logger.exception(f"Failed to process {kb_path} (id={file_id})")
-                    errors += 1
-                finally:
-                    if should_log_progress:
-                        remaining = total_files - index
-                        logger.info(
-                            "kb_gdrive.progress dataset={} index={}/{} processed={} skipped={} errors={} "
-                            "remaining={} current={}",
-                            dataset_alias,
-                            index,
-                            total_files,
-                            processed,
-                            skipped,
-                            errors,
-                            remaining,
-                            kb_path,
-                        )
-                        summary["processed"] = processed
-                        summary["skipped"] = skipped
-                        summary["errors"] = errors
-                        summary["current"] = kb_path
-                        summary["updated_at"] = _utc_now()
-                        await self._store_summary(summary)
+                    summary["processed"] = processed
+                    summary["skipped"] = skipped
+                    summary["unchanged"] = unchanged
+                    summary["errors"] = errors
+                    summary["current"] = str(chunk[-1].get("kb_path") or chunk[-1].get("name") or "")
+                    summary["updated_at"] = _utc_now()
+                    await self._store_summary(summary)
+            finally:
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+            present = {str(item.get("id")) for item in files}
+            await self._store_file_versions(synced, [file_id for file_id in versions if file_id not in present])
             logger.info(
                 f"kb_gdrive.summary dataset={self._dataset_name} files_total={total_files} "
-                f"processed={processed} skipped={skipped} errors={errors}"
+                f"processed={processed} skipped={skipped} unchanged={unchanged} errors={errors}"
             )
             finished_at = _utc_now()
             summary["processed"] = processed
             summary["skipped"] = skipped
+            summary["unchanged"] = unchanged
             summary["errors"] = errors
             summary["current"] = None
             summary["finished_at"] = finished_at
@@ -508,13 +561,13 @@ class GDriveDocumentLoader(KnowledgeLoader):
             self._kb.record_loader_result(
                 dataset_alias,
                 processed=processed,
-                skipped=skipped,
+                skipped=skipped + unchanged,
                 errors=errors,
                 projection_requested=projection_requested,
             )
             if errors == 0:
                 try:
-                    cache_key = f"ai_coach:gdrive:folder:{self.folder_id}:fingerprint"
+                    cache_key = f"ai_coach:gdrive:folder:{folder_id}:fingerprint"
                     client = get_redis_client()
                     await client.set(cache_key, fingerprint)
                 except Exception as exc:  # noqa: BLE001
@@ -534,6 +587,7 @@ class GDriveDocumentLoader(KnowledgeLoader):
             summary["duration_s"] = asyncio.get_running_loop().time() - started_monotonic
             summary["processed"] = processed
             summary["skipped"] = skipped
+            summary["unchanged"] = unchanged
             summary["errors"] = errors
             await self._store_summary(summary)
             logger.exception(f"kb_gdrive.failed dataset={dataset_alias} detail={exc}")
@@ -19,6 +19,8 @@ from ai_coach.agent.knowledge.cognee_config import CogneeConfig
 from ai_coach.agent.knowledge.utils.datasets import DatasetService
 from ai_coach.agent.knowledge.utils.projection import ProjectionService
 from ai_coach.agent.knowledge.utils.search import SearchService
+from ai_coach.agent.knowledge.utils.search_cache import SearchResultCache
+from ai_coach.agent.knowledge.utils.dataset_stats import DatasetStatsRegistry
 from ai_coach.agent.knowledge.utils.session_cache import SessionCacheService
 from ai_coach.agent.knowledge.utils.storage import StorageService
 from ai_coach.agent.knowledge.utils.lock_cache import LockCache
@@ -399,12 +401,12 @@ class KnowledgeBase:
         self._degraded_until = 0.0
         self._degraded_reason = None
 
-    def resume_projections(self, dataset: str | None = None) -> dict[str, Any]:
+    async def resume_projections(self, dataset: str | None = None) -> dict[str, Any]:
         if dataset:
             alias = self.dataset_service.resolve_dataset_alias(dataset)
         else:
             alias = self.dataset_service.alias_for_dataset(self.GLOBAL_DATASET)
-        self.projection_service.clear_stall(alias)
+        await self.projection_service.clear_stall(alias)
         self.clear_degraded()
         return {"status": "ok", "dataset": alias}
 
@@ -528,6 +530,7 @@ class KnowledgeBase:
         result = memify_fn(*positional, **kwargs)
         if inspect.isawaitable(result):
             await result
+        await SearchResultCache.bump(*datasets)
 
     async def search(
         self, query: str, profile_id: int, k: int | None = None, *, request_id: str | None = None
@@ -574,7 +577,7 @@ class KnowledgeBase:
             if row_count > 0:
                 # Ensure projection is ready before searching
                 await self.projection_service.ensure_dataset_projected(effective, user, timeout_s=2.0)
-                counts_map[effective] = await self.dataset_service.get_counts(effective, user)
+                counts_map[effective] = await self.dataset_service.get_cached_counts(effective, user)
                 counts_payload = counts_map[effective]
                 if (counts_payload.get("text_rows", 0) or 0) > 0 and (
                     (counts_payload.get("chunk_rows", 0) or 0) == 0 and (counts_payload.get("graph_nodes", 0) or 0) == 0
@@ -692,7 +695,7 @@ class KnowledgeBase:
                 if created:
                     alias = target_alias
                     if not project or self.dataset_service.is_chat_dataset(alias):
-                        pending = self.chat_queue_service.queue_chat_dataset(alias)
+                        pending = await self.chat_queue_service.queue_chat_dataset(alias)
                         logger.debug(f"kb_chat_ingest queued={pending} dataset={alias}")
                         self.chat_queue_service.ensure_chat_projection_task(alias)
                     else:
@@ -848,6 +851,9 @@ class KnowledgeBase:
             self.dataset_service.register_dataset_identifier(alias, identifier)
             resolved = identifier
         resolved_alias = self.dataset_service.alias_for_dataset(resolved)
+        await SearchResultCache.bump(alias, resolved_alias)
+        for stats_alias in {alias, resolved_alias}:
+            await DatasetStatsRegistry.bump(stats_alias)
         rows_after = await self.dataset_service.get_row_count(resolved_alias, user=actor)
         logger.debug(
             "kb.update rows raw={} alias={} resolved={} rows_before={} rows_after={} digest={} force={}".format(
@@ -886,6 +892,111 @@ class KnowledgeBase:
                 logger.debug(f"projection:post_ingest_diag_skipped dataset={resolved_alias} detail={exc}")
         return resolved, True
 
+    async def update_dataset_batch(
+        self,
+        items: Sequence[tuple[str, Mapping[str, Any] | None]],
+        dataset: str,
+        user: Any | None = None,
+        node_set: list[str] | None = None,
+        force_ingest: bool = False,
+        trigger_projection: bool = True,
+    ) -> tuple[str, list[bool]]:
+        """Ingest ``(text, metadata)`` pairs into one dataset with per-batch rather than per-item overhead.
+
+        The batch is deduplicated against ``HashStore`` in a single call, storage files share one
+        directory fsync, ``cognee.add`` runs once and at most one projection is requested. The
+        returned flags line up with ``items`` and mark the entries that were ingested.
+        """
+        from ai_coach.agent.knowledge.utils.hash_store import HashStore
+
+        alias = self.dataset_service.alias_for_dataset(dataset)
+        created = [False] * len(items)
+        pending: dict[str, tuple[list[int], str, dict[str, Any]]] = {}
+        for index, (text, metadata) in enumerate(items):
+            normalized_text = self.dataset_service._normalize_text(text)
+            if not normalized_text.strip():
+                continue
+            digest_sha = self.storage_service.compute_digests(normalized_text, dataset_alias=alias)
+            if digest_sha in pending:
+                pending[digest_sha][0].append(index)
+                continue
+            metadata_payload = self.dataset_service._infer_metadata_from_text(
+                normalized_text, dict(metadata) if metadata else None
+            )
+            metadata_payload.setdefault("dataset", alias)
+            pending[digest_sha] = ([index], normalized_text, metadata_payload)
+        if not pending:
+            return alias, created
+
+        actor = user if user is not None else self._user
+        user_ctx = self.dataset_service.to_user_ctx_or_default(actor)
+        if user_ctx is None:
+            user_ctx = self.dataset_service._bootstrap_user_ctx()
+        await self._ensure_vector_ready()
+        await self.dataset_service.ensure_dataset_exists(alias, user_ctx)
+
+        if not force_ingest:
+            known = await HashStore.contains_many(alias, pending.keys())
+            duplicates = {digest: pending.pop(digest)[2] for digest, seen in known.items() if seen}
+            if duplicates:
+                await HashStore.add_many(alias, duplicates)
+                logger.debug(f"kb_append_batch skipped dataset={alias} duplicates={len(duplicates)}")
+        if not pending:
+            return alias, created
+
+        written = self.storage_service.ensure_storage_files(
+            [(digest, normalized) for digest, (_, normalized, _) in pending.items()], dataset=alias
+        )
+        for digest, (path, _) in zip(list(pending), written, strict=False):
+            if path is None:
+                pending.pop(digest)
+        if not pending:
+            return alias, created
+
+        add_user = actor if actor is not None and not isinstance(actor, SimpleNamespace) else user_ctx
+        try:
+            import cognee
+
+            info = await cognee.add(
+                [normalized for _, normalized, _ in pending.values()],
+                dataset_name=alias,
+                user=add_user,
+                node_set=list(node_set or []),
+            )
+        except Exception as exc:
+            if self.dataset_service._is_duplicate_data_error(exc):
+                logger.info(f"kb_update_batch_duplicate_entry dataset={alias} items={len(pending)} detail={exc}")
+                await HashStore.add_many(alias, {digest: meta for digest, (_, _, meta) in pending.items()})
+                return alias, created
+            raise RuntimeError(f"Failed to add {len(pending)} dataset entries for {alias}") from exc
+
+        await HashStore.add_many(alias, {digest: meta for digest, (_, _, meta) in pending.items()})
+        for indexes, _, _ in pending.values():
+            for index in indexes:
+                created[index] = True
+        resolved = alias
+        identifier = self.dataset_service._extract_dataset_identifier(info)
+        if identifier:
+            self.dataset_service.register_dataset_identifier(alias, identifier)
+            resolved = identifier
+        resolved_alias = self.dataset_service.alias_for_dataset(resolved)
+        await SearchResultCache.bump(alias, resolved_alias)
+        for stats_alias in {alias, resolved_alias}:
+            await DatasetStatsRegistry.bump(stats_alias, amount=len(pending))
+        logger.debug(f"kb.update_batch dataset={resolved_alias} items={len(items)} ingested={len(pending)}")
+
+        if trigger_projection:
+            try:
+                self.dataset_service.log_once(
+                    logging.DEBUG, "projection:requested", dataset=resolved_alias, reason="ingest_batch"
+                )
+                await self.projection_service.project_dataset(resolved_alias, actor, allow_rebuild=False)
+                if not self.projection_service.is_batching_enabled():
+                    await self._wait_for_projection(resolved_alias, actor, timeout_s=15.0)
+            except Exception as exc:
+                logger.debug(f"projection:post_ingest_diag_skipped dataset={resolved_alias} detail={exc}")
+        return resolved, created
+
     async def _process_dataset(self, dataset: str, user: Any | None = None) -> None:
         lock = self._cognify_locks.get(dataset)
         async with lock:
@@ -1135,6 +1246,8 @@ class KnowledgeBase:
         from ai_coach.agent.knowledge.utils.hash_store import HashStore
 
         await HashStore.clear(alias)
+        await SearchResultCache.bump(alias)
+        await DatasetStatsRegistry.invalidate(alias)
         self.dataset_service._PROJECTED_DATASETS.discard(alias)
         try:
             entries = await self.dataset_service.list_dataset_entries(alias, user_ctx)
@@ -1321,6 +1434,8 @@ class KnowledgeBase:
             await HashStore.clear(alias)
         except Exception as exc:  # noqa: BLE001
             issues.append(f"hash_clear_failed:{exc}")
+        await SearchResultCache.bump(alias)
+        await DatasetStatsRegistry.invalidate(alias)
         try:
             stats["storage_deleted"] = await self.storage_service.drop_dataset_storage(
                 alias,
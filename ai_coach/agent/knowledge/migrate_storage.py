@@ -0,0 +1,124 @@
+"""Move knowledge texts between the per-file layout and packfiles.
+
+``python -m ai_coach.agent.knowledge.migrate_storage --to packfile [--prune]`` copies every verified
+``text_<sha>.txt`` into packfiles; ``--prune`` then removes the per-file copies, first turning md5 mirror
+symlinks into regular files so Cognee's ``raw_data_location`` paths keep resolving.
+``--to files`` writes packed texts back out as ``text_<sha>.txt``. Switch ``AI_COACH_STORAGE_BACKEND`` after
+migrating; both directions are idempotent.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from argparse import ArgumentParser
+from hashlib import md5, sha256
+from pathlib import Path
+
+from loguru import logger
+
+from ai_coach.agent.knowledge.utils.datasets import DatasetService
+from ai_coach.agent.knowledge.utils.packfile import PackfileStore
+from ai_coach.agent.knowledge.utils.storage import StorageService
+from ai_coach.agent.knowledge.utils.storage_manifest import StorageManifest
+from config.app_settings import settings
+
+BATCH_SIZE = 1000
+
+
+class _RootedStorage(StorageService):
+    def __init__(self, root: Path) -> None:
+        super().__init__(DatasetService())
+        self._root = root
+
+    def storage_root(self) -> Path:
+        return self._root
+
+    def packfile(self) -> PackfileStore | None:
+        return None
+
+
+def _materialize_md5_mirror(path: Path, text: str) -> None:
+    mirror = path.parent / f"text_{md5(text.encode('utf-8')).hexdigest()}.txt"
+    if mirror.is_symlink() and mirror.resolve() == path.resolve():
+        mirror.unlink()
+        mirror.write_text(text, encoding="utf-8")
+
+
+def to_packfile(root: Path, *, prune: bool) -> tuple[int, int]:
+    store = PackfileStore.for_root(root, segment_bytes=settings.AI_COACH_PACKFILE_SEGMENT_BYTES)
+    files = StorageService._scan_storage(root)
+    migrated = 0
+    skipped = 0
+    for offset in range(0, len(files), BATCH_SIZE):
+        batch: list[tuple[str, str]] = []
+        paths: list[Path] = []
+        for digest_sha, path, _, _ in files[offset : offset + BATCH_SIZE]:
+            try:
+                text = path.read_text(encoding="utf-8")
+            except OSError as exc:
+                logger.warning(f"kb_migrate.read_failed path={path} detail={exc}")
+                skipped += 1
+                continue
+            if sha256(text.encode("utf-8")).hexdigest() != digest_sha:
+                logger.warning(f"kb_migrate.digest_mismatch path={path}")
+                skipped += 1
+                continue
+            batch.append((digest_sha, text))
+            paths.append(path)
+        kinds = [str(DatasetService._infer_metadata_from_text(text).get("kind") or "document") for _, text in batch]
+        created = store.put_many(batch, kinds=kinds)
+        migrated += sum(1 for flag in created if flag)
+        if prune:
+            for (_, text), path in zip(batch, paths, strict=True):
+                _materialize_md5_mirror(path, text)
+                path.unlink(missing_ok=True)
+    if prune:
+        StorageManifest(root).path.unlink(missing_ok=True)
+    return migrated, skipped
+
+
+def to_files(root: Path) -> tuple[int, int]:
+    store = PackfileStore.for_root(root, segment_bytes=settings.AI_COACH_PACKFILE_SEGMENT_BYTES)
+    service = _RootedStorage(root)
+    digests = list(store.records())
+    migrated = 0
+    skipped = 0
+    for offset in range(0, len(digests), BATCH_SIZE):
+        batch: list[tuple[str, str]] = []
+        for digest_sha in digests[offset : offset + BATCH_SIZE]:
+            text = store.get(digest_sha)
+            if text is None:
+                skipped += 1
+                continue
+            batch.append((digest_sha, text))
+        results = service.ensure_storage_files(batch)
+        migrated += sum(1 for _, created in results if created)
+        skipped += sum(1 for path, _ in results if path is None)
+    return migrated, skipped
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Migrate knowledge texts between storage backends")
+    parser.add_argument("--to", choices=("packfile", "files"), required=True)
+    parser.add_argument("--root", type=Path, default=None, help="storage root (defaults to COGNEE_STORAGE_PATH)")
+    parser.add_argument("--prune", action="store_true", help="delete text_<sha>.txt files after packing them")
+    args = parser.parse_args()
+    root = (args.root or Path(settings.COGNEE_STORAGE_PATH)).expanduser().resolve()
+    if not root.exists():
+        logger.error(f"kb_migrate.root_missing path={root}")
+        return 1
+    started = time.perf_counter()
+    if args.to == "packfile":
+        migrated, skipped = to_packfile(root, prune=args.prune)
+    else:
+        migrated, skipped = to_files(root)
+    logger.info(
+        f"kb_migrate.done to={args.to} root={root} migrated={migrated} skipped={skipped} "
+        f"duration_ms={(time.perf_counter() - started) * 1000:.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,96 @@
+from time import monotonic
+from typing import Awaitable, ClassVar, Mapping, cast
+
+from loguru import logger
+
+from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client
+
+COUNT_FIELDS = ("text_rows", "chunk_rows", "graph_nodes", "graph_edges")
+
+# only bump snapshots that exist; a partial hash would under-report rows ingested before it was created
+_BUMP_LUA = """
+if redis.call("exists", KEYS[1]) == 1 then
+    return redis.call("hincrby", KEYS[1], ARGV[1], ARGV[2])
+end
+return nil
+"""
+
+
+class DatasetStatsRegistry:
+    """Per-dataset row and graph counts kept in Redis and memoized in-process.
+
+    Projection stores a full snapshot when it completes and ingestion bumps
+    ``text_rows``, so readers on the search path never run count queries
+    while a snapshot exists.
+    """
+
+    KEY_PREFIX = "ai_coach:dataset_stats:"
+    _local: ClassVar[dict[str, tuple[float, dict[str, int]]]] = {}
+
+    @classmethod
+    def _key(cls, alias: str) -> str:
+        return f"{cls.KEY_PREFIX}{alias}"
+
+    @staticmethod
+    def _normalize(counts: Mapping[str, object]) -> dict[str, int]:
+        normalized: dict[str, int] = {}
+        for field in COUNT_FIELDS:
+            try:
+                normalized[field] = int(counts.get(field) or 0)  # pyrefly: ignore[bad-argument-type]
+            except (TypeError, ValueError):
+                normalized[field] = 0
+        return normalized
+
+    @classmethod
+    def _remember(cls, alias: str, counts: dict[str, int]) -> None:
+        ttl = max(float(settings.AI_COACH_DATASET_STATS_TTL), 0.0)
+        if ttl:
+            cls._local[alias] = (monotonic() + ttl, counts)
+
+    @classmethod
+    async def get(cls, alias: str) -> dict[str, int] | None:
+        cached = cls._local.get(alias)
+        if cached is not None and cached[0] > monotonic():
+            return dict(cached[1])
+        try:
+            raw = await cast(Awaitable[dict[str, str]], get_redis_client().hgetall(cls._key(alias)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"dataset_stats.get_failed dataset={alias} detail={exc}")
+            return None
+        if not raw:
+            cls._local.pop(alias, None)
+            return None
+        counts = cls._normalize(raw)
+        cls._remember(alias, counts)
+        return dict(counts)
+
+    @classmethod
+    async def store(cls, alias: str, counts: Mapping[str, object]) -> None:
+        normalized = cls._normalize(counts)
+        try:
+            await cast(Awaitable[int], get_redis_client().hset(cls._key(alias), mapping=normalized))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"dataset_stats.store_failed dataset={alias} detail={exc}")
+            return
+        cls._remember(alias, normalized)
+
+    @classmethod
+    async def bump(cls, alias: str, field: str = "text_rows", amount: int = 1) -> None:
+        cls._local.pop(alias, None)
+        try:
+            await cast(Awaitable[int | None], get_redis_client().eval(_BUMP_LUA, 1, cls._key(alias), field, amount))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"dataset_stats.bump_failed dataset={alias} field={field} detail={exc}")
+
+    @classmethod
+    async def invalidate(cls, *aliases: str) -> None:
+        names = [alias for alias in aliases if alias]
+        for alias in names:
+            cls._local.pop(alias, None)
+        if not names:
+            return
+        try:
+            await cast(Awaitable[int], get_redis_client().delete(*(cls._key(alias) for alias in names)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"dataset_stats.invalidate_failed datasets={','.join(names)} detail={exc}")
@@ -13,12 +13,29 @@ from loguru import logger
 import cognee
 
 from ai_coach.agent.knowledge.schemas import DatasetRow
+from ai_coach.agent.knowledge.utils.dataset_stats import DatasetStatsRegistry
 from ai_coach.exceptions import ProjectionProbeError
 from ai_coach.schemas import CogneeUser
 from ai_coach.agent.knowledge.utils.helpers import needs_cognee_setup
 from config.app_settings import settings
 from ai_coach.logging_config import log_once as global_log_once
 
+# Cognee does not tag graph nodes with their dataset; a dataset's slice of the graph is reached from its document
+# nodes, which reuse the ids of the dataset's data items, through their chunks (``is_part_of``) and whatever the
+# chunks reference. Both queries start from an indexed ``__Node__.id`` lookup instead of scanning the whole graph.
+_SCOPED_NODE_COUNT = (
+    "MATCH (d:`__Node__`) WHERE d.id IN $document_ids "
+    "OPTIONAL MATCH (d)<-[:is_part_of]-(c:`__Node__`) "
+    "OPTIONAL MATCH (c)-->(e:`__Node__`) "
+    "WITH collect(DISTINCT d) + collect(DISTINCT c) + collect(DISTINCT e) AS nodes "
+    "UNWIND nodes AS n RETURN count(DISTINCT n) AS count"
+)
+_SCOPED_EDGE_COUNT = (
+    "MATCH (d:`__Node__`) WHERE d.id IN $document_ids "
+    "MATCH (d)<-[:is_part_of]-(c:`__Node__`)-[r]-() "
+    "RETURN count(DISTINCT r) AS count"
+)
+
 
 class DatasetService:
     """Resolve, cache, and manage Cognee dataset identifiers and metadata."""
@@ -1002,9 +1019,10 @@ class DatasetService:
             logger.warning(f"cognee_chunk_counts_failed dataset={dataset} detail={exc}")
             return 0
 
-    async def get_graph_counts(self, dataset: str, user: Any | None = None) -> tuple[int, int]:
+    async def get_graph_counts(self, dataset: str, user: Any | None = None, *, scoped: bool = False) -> tuple[int, int]:
+        """Count graph nodes and edges; ``scoped`` limits them to the dataset's documents, chunks and their links."""
         alias = self.alias_for_dataset(dataset)
-        logger.debug(f"cognee_graph_counts.start dataset={alias}")
+        logger.debug(f"cognee_graph_counts.start dataset={alias} scoped={scoped}")
         graph_engine = self._graph_engine
         if graph_engine is None:
             logger.warning(f"cognee_graph_counts_unavailable dataset={alias} reason=missing_graph_engine")
@@ -1016,6 +1034,16 @@ class DatasetService:
             return 0, 0
 
         try:
+            if scoped:
+                document_ids = await self._dataset_document_ids(alias, user)
+                if not document_ids:
+                    logger.debug(f"cognee_graph_counts_scoped dataset={alias} nodes=0 edges=0 reason=no_documents")
+                    return 0, 0
+                params = {"document_ids": document_ids}
+                nodes = await self._execute_graph_count(driver, _SCOPED_NODE_COUNT, params)
+                edges = await self._execute_graph_count(driver, _SCOPED_EDGE_COUNT, params)
+                logger.debug(f"cognee_graph_counts_scoped dataset={alias} nodes={nodes} edges={edges}")
+                return nodes, edges
             nodes = await self._execute_graph_count(driver, "MATCH (n) RETURN count(n) AS count")
             edges = await self._execute_graph_count(driver, "MATCH ()-[r]->() RETURN count(r) AS count")
         except Exception as exc:
@@ -1028,7 +1056,20 @@ class DatasetService:
             logger.debug(f"cognee_graph_counts_global dataset={alias} nodes_total={nodes} edges_total={edges}")
         return nodes, edges
 
-    async def _execute_graph_count(self, driver: Any, query: str) -> int:
+    async def _dataset_document_ids(self, dataset: str, user: Any | None) -> list[str]:
+        """Ids of the dataset's data items, which Cognee reuses as the ids of its document nodes."""
+        list_data = getattr(getattr(cognee, "datasets", None), "list_data", None)
+        if not callable(list_data):
+            return []
+        rows = await self._fetch_dataset_rows(cast(Callable[..., Awaitable[Iterable[Any]]], list_data), dataset, user)
+        document_ids: list[str] = []
+        for row in rows:
+            value = row.get("id") if isinstance(row, Mapping) else getattr(row, "id", None)
+            if value:
+                document_ids.append(str(value))
+        return document_ids
+
+    async def _execute_graph_count(self, driver: Any, query: str, params: Mapping[str, Any] | None = None) -> int:
         session_factory = getattr(driver, "session", None)
         if session_factory is None or not callable(session_factory):
             raise RuntimeError("graph_driver_session_unavailable")
@@ -1041,7 +1082,7 @@ class DatasetService:
         session = session_factory(**kwargs)
 
         async def _fetch_count(handle: Any) -> int:
-            result = handle.run(query)
+            result = handle.run(query, dict(params)) if params else handle.run(query)
             if hasattr(result, "__await__"):
                 result = await result
             record = result.single()
@@ -1065,7 +1106,7 @@ class DatasetService:
                 return await _fetch_count(handle)
         return await _fetch_count(session)
 
-    async def get_counts(self, dataset: str, user: Any | None = None) -> dict[str, int]:
+    async def get_counts(self, dataset: str, user: Any | None = None, *, scoped_graph: bool = False) -> dict[str, int]:
         raw_name = (dataset or "").strip()
         alias = self.alias_for_dataset(raw_name)
         identifier = await self.get_dataset_id(raw_name, user)
@@ -1081,7 +1122,7 @@ class DatasetService:
             text_rows = await self.get_row_count_text(name, user=user)
             if text_rows > 0:
                 chunk_rows = await self.get_row_count_chunks(name, user=user)
-                nodes, edges = await self.get_graph_counts(name, user=user)
+                nodes, edges = await self.get_graph_counts(name, user=user, scoped=scoped_graph)
                 break
 
         return {
@@ -1091,6 +1132,16 @@ class DatasetService:
             "graph_edges": int(edges or 0),
         }
 
+    async def get_cached_counts(self, dataset: str, user: Any | None = None) -> dict[str, int]:
+        """Serve counts from ``DatasetStatsRegistry``, computing a dataset-scoped snapshot on a miss."""
+        alias = self.alias_for_dataset(dataset)
+        cached = await DatasetStatsRegistry.get(alias)
+        if cached is not None:
+            return cached
+        counts = await self.get_counts(dataset, user, scoped_graph=True)
+        await DatasetStatsRegistry.store(alias, counts)
+        return counts
+
     async def _prepare_dataset_row(self, raw: Any, alias: str) -> DatasetRow:
         from ai_coach.agent.knowledge.utils.storage import StorageService
 
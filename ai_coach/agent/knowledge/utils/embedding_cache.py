@@ -0,0 +1,229 @@
+import asyncio
+import base64
+import sqlite3
+import threading
+from array import array
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Awaitable, Callable, ClassVar, Mapping, Sequence, cast
+
+from loguru import logger
+
+from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client
+
+Vector = list[float]
+Embedder = Callable[[list[str]], Awaitable[list[Vector]]]
+
+COUNTERS = ("requests", "texts", "local_hits", "redis_hits", "misses", "calls", "calls_saved")
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> Vector:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class SqliteEmbeddingStore:
+    """Local ``key -> float32 vector`` table shared by every thread of the process."""
+
+    _BATCH = 500
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, Vector]:
+        found: dict[str, Vector] = {}
+        with self._lock:
+            conn = self._connection()
+            for offset in range(0, len(keys), self._BATCH):
+                chunk = keys[offset : offset + self._BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk)
+                found.update((key, _unpack(blob)) for key, blob in rows)
+        return found
+
+    def put_many(self, items: Mapping[str, Sequence[float]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, _pack(vector)) for key, vector in items.items()],
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class EmbeddingCache:
+    """Embeddings keyed by model, dimensions and the sha256 of the text.
+
+    Lookups go to the local SQLite store first, then to Redis when
+    ``AI_COACH_EMBEDDING_CACHE_REDIS_TTL`` is set; the remaining misses of a
+    request are deduplicated and embedded in one upstream call. Vectors are
+    stored as float32, the precision the vector store keeps anyway.
+    """
+
+    REDIS_PREFIX = "ai_coach:embedding:"
+    FILENAME = ".embedding_cache.sqlite"
+    _shared: ClassVar["EmbeddingCache | None"] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, store: SqliteEmbeddingStore | None, *, redis_ttl: int = 0) -> None:
+        self.store = store
+        self.redis_ttl = max(redis_ttl, 0)
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(COUNTERS, 0)
+
+    @classmethod
+    def shared(cls) -> "EmbeddingCache | None":
+        if not settings.AI_COACH_EMBEDDING_CACHE_ENABLED:
+            return None
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    raw_path = settings.AI_COACH_EMBEDDING_CACHE_PATH
+                    path = Path(raw_path) if raw_path else Path(settings.COGNEE_STORAGE_PATH) / cls.FILENAME
+                    store = SqliteEmbeddingStore(path.expanduser())
+                    cls._shared = cls(store, redis_ttl=int(settings.AI_COACH_EMBEDDING_CACHE_REDIS_TTL))
+        return cls._shared
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._shared_lock:
+            if cls._shared is not None and cls._shared.store is not None:
+                cls._shared.store.close()
+            cls._shared = None
+
+    @staticmethod
+    def key(text: str, *, model: str, dimensions: int) -> str:
+        return f"{model}:{dimensions}:{sha256(text.encode('utf-8')).hexdigest()}"
+
+    async def embed(self, texts: Sequence[str], *, model: str, dimensions: int, compute: Embedder) -> list[Vector]:
+        keys = [self.key(text, model=model, dimensions=dimensions) for text in texts]
+        text_by_key = dict(zip(keys, texts))
+        unique = list(text_by_key)
+        found: dict[str, Vector] = {}
+        if self.store is not None:
+            found = await self._local_get(unique)
+        local_hits = len(found)
+        redis_hits = 0
+        if self.redis_ttl and len(found) < len(unique):
+            remote = await self._redis_get([key for key in unique if key not in found])
+            redis_hits = len(remote)
+            if remote:
+                found.update(remote)
+                await self._local_put(remote)
+        missing = [key for key in unique if key not in found]
+        if missing:
+            vectors = await compute([text_by_key[key] for key in missing])
+            computed = {key: list(vector) for key, vector in zip(missing, vectors, strict=True)}
+            found.update(computed)
+            await self._local_put(computed)
+            await self._redis_put(computed)
+        self._count(
+            requests=1,
+            texts=len(keys),
+            local_hits=local_hits,
+            redis_hits=redis_hits,
+            misses=len(missing),
+            calls=1 if missing else 0,
+            calls_saved=0 if missing else 1,
+        )
+        return [found[key] for key in keys]
+
+    async def _local_get(self, keys: Sequence[str]) -> dict[str, Vector]:
+        try:
+            return await asyncio.to_thread(cast(SqliteEmbeddingStore, self.store).get_many, keys)
+        except sqlite3.Error as exc:
+            logger.debug(f"embedding_cache.local_get_failed detail={exc}")
+            return {}
+
+    async def _local_put(self, items: Mapping[str, Vector]) -> None:
+        if self.store is None:
+            return
+        try:
+            await asyncio.to_thread(self.store.put_many, items)
+        except sqlite3.Error as exc:
+            logger.debug(f"embedding_cache.local_put_failed detail={exc}")
+
+    async def _redis_get(self, keys: Sequence[str]) -> dict[str, Vector]:
+        try:
+            raw = await cast(
+                Awaitable[list[str | None]], get_redis_client().mget([f"{self.REDIS_PREFIX}{key}" for key in keys])
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"embedding_cache.redis_get_failed detail={exc}")
+            return {}
+        return {key: _unpack(base64.b64decode(value)) for key, value in zip(keys, raw) if value}
+
+    async def _redis_put(self, items: Mapping[str, Vector]) -> None:
+        if not self.redis_ttl or not items:
+            return
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            for key, vector in items.items():
+                encoded = base64.b64encode(_pack(vector)).decode("ascii")
+                pipe.set(f"{self.REDIS_PREFIX}{key}", encoded, ex=self.redis_ttl)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"embedding_cache.redis_put_failed detail={exc}")
+
+    def _count(self, **amounts: int) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                self._counters[name] += amount
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    @staticmethod
+    def summarize(counters: Mapping[str, int]) -> dict[str, Any]:
+        """Hit rate and savings for a counter snapshot or the difference of two."""
+        hits = counters.get("local_hits", 0) + counters.get("redis_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        return {
+            **{name: counters.get(name, 0) for name in COUNTERS},
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "texts_saved": counters.get("texts", 0) - counters.get("misses", 0),
+        }
+
+    @staticmethod
+    def since(before: Mapping[str, int], after: Mapping[str, int]) -> dict[str, int]:
+        return {name: after.get(name, 0) - before.get(name, 0) for name in COUNTERS}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "path": str(self.store.path) if self.store is not None else None,
+            "redis_ttl": self.redis_ttl,
+            **self.summarize(self.counters()),
+        }
+
+    @classmethod
+    def shared_stats(cls) -> dict[str, Any]:
+        cache = cls.shared()
+        return cache.stats() if cache is not None else {"enabled": False}
@@ -1,23 +1,30 @@
 import json
 from hashlib import sha256
-from typing import Any, Awaitable, Iterable, Mapping, cast
+from typing import Any, Awaitable, ClassVar, Iterable, Mapping, Sequence, cast
 
 from redis.asyncio import Redis
 from loguru import logger
 
 from ai_coach.agent.knowledge.utils.helpers import normalize_text
 from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client_for_db
 
 
 class HashStore:
-    """Persist SHA256 hashes for deduplication."""
+    """Persist SHA256 hashes for deduplication.
 
-    redis: Redis = Redis.from_url(
-        url=settings.REDIS_URL,
-        db=2,
-        encoding="utf-8",
-        decode_responses=True,
-    )
+    Writes go through MULTI/EXEC pipelines so a hash and its metadata land
+    together. The Redis client is resolved per event loop on first use;
+    assigning ``HashStore.redis`` pins a specific client instead.
+    """
+
+    DB = 2
+    SCAN_COUNT = 500
+    redis: ClassVar[Redis | None] = None
+
+    @classmethod
+    def _client(cls) -> Redis:
+        return cls.redis if cls.redis is not None else get_redis_client_for_db(cls.DB)
 
     @staticmethod
     def _key(dataset: str) -> str:
@@ -27,15 +34,31 @@ class HashStore:
     def _meta_key(dataset: str) -> str:
         return f"cognee_hash_meta:{dataset}"
 
+    @staticmethod
+    def _ttl() -> int:
+        return settings.BACKUP_RETENTION_DAYS * 24 * 60 * 60
+
     @classmethod
     async def contains(cls, dataset: str, hash_value: str) -> bool:
         try:
-            return bool(await cast(Awaitable[int], cls.redis.sismember(cls._key(dataset), hash_value)))
+            return bool(await cast(Awaitable[int], cls._client().sismember(cls._key(dataset), hash_value)))
         except Exception as e:
             logger.error(f"HashStore.contains error {dataset}: {e}")
             return False
 
     @classmethod
+    async def contains_many(cls, dataset: str, hash_values: Iterable[str]) -> dict[str, bool]:
+        """Check several hashes with a single SMISMEMBER round trip."""
+        values = list(dict.fromkeys(hash_values))
+        if not values:
+            return {}
+        try:
+            flags = await cast(Awaitable[list[int]], cls._client().smismember(cls._key(dataset), values))
+        except Exception as e:
+            logger.error(f"HashStore.contains_many error {dataset}: {e}")
+            return {value: False for value in values}
+        return {value: bool(flag) for value, flag in zip(values, flags, strict=False)}
+
     @staticmethod
     def _normalize_metadata(hash_value: str, metadata: Mapping[str, Any] | None) -> dict[str, Any] | None:
         if metadata is None:
@@ -46,41 +69,75 @@ class HashStore:
 
     @classmethod
     async def add(cls, dataset: str, hash_value: str, metadata: Mapping[str, Any] | None = None) -> None:
+        normalized_meta = cls._normalize_metadata(hash_value, metadata)
+        json_meta = json.dumps(normalized_meta) if normalized_meta else None
+        meta_bytes = len(json_meta.encode("utf-8")) if json_meta else 0
         try:
-            key = cls._key(dataset)
-            await cast(Awaitable[int], cls.redis.sadd(key, hash_value))
-            await cast(
-                Awaitable[int],
-                cls.redis.expire(key, settings.BACKUP_RETENTION_DAYS * 24 * 60 * 60),
-            )
-            normalized_meta = cls._normalize_metadata(hash_value, metadata)
-            meta_bytes = 0
-            if normalized_meta:
-                meta_key = cls._meta_key(dataset)
-                json_meta = json.dumps(normalized_meta)
-                meta_bytes = len(json_meta.encode("utf-8"))
-                await cast(Awaitable[int], cls.redis.hset(meta_key, hash_value, json_meta))
-                await cast(
-                    Awaitable[int],
-                    cls.redis.expire(meta_key, settings.BACKUP_RETENTION_DAYS * 24 * 60 * 60),
-                )
+            await cls._write(dataset, [hash_value], {hash_value: json_meta} if json_meta else {})
             logger.debug(f"[hashstore_put] sha={hash_value[:12]} bytes={meta_bytes} dataset={dataset} ok")
         except Exception as e:
             logger.error(f"HashStore.add error {dataset}: {e}")
             logger.debug(f"[hashstore_put] sha={hash_value[:12]} bytes=0 dataset={dataset} err={e}")
 
+    @classmethod
+    async def add_many(cls, dataset: str, entries: Mapping[str, Mapping[str, Any] | None]) -> None:
+        """Add hashes and their metadata in one MULTI/EXEC round trip."""
+        if not entries:
+            return
+        metadata = {
+            hash_value: json.dumps(normalized)
+            for hash_value, meta in entries.items()
+            if (normalized := cls._normalize_metadata(hash_value, meta))
+        }
+        try:
+            await cls._write(dataset, list(entries), metadata)
+            logger.debug(f"[hashstore_put_many] dataset={dataset} count={len(entries)} meta={len(metadata)} ok")
+        except Exception as e:
+            logger.error(f"HashStore.add_many error {dataset}: {e}")
+
+    @classmethod
+    async def _write(cls, dataset: str, hash_values: Sequence[str], metadata: Mapping[str, str]) -> None:
+        key = cls._key(dataset)
+        meta_key = cls._meta_key(dataset)
+        ttl = cls._ttl()
+        pipe = cls._client().pipeline(transaction=True)
+        pipe.sadd(key, *hash_values)
+        pipe.expire(key, ttl)
+        if metadata:
+            pipe.hset(meta_key, mapping=dict(metadata))
+            pipe.expire(meta_key, ttl)
+        await pipe.execute()
+
+    @classmethod
+    async def remove(cls, dataset: str, hash_value: str) -> None:
+        await cls.remove_many(dataset, [hash_value])
+
+    @classmethod
+    async def remove_many(cls, dataset: str, hash_values: Iterable[str]) -> None:
+        """Drop hashes and their metadata in one MULTI/EXEC round trip."""
+        values = list(dict.fromkeys(hash_values))
+        if not values:
+            return
+        try:
+            pipe = cls._client().pipeline(transaction=True)
+            pipe.srem(cls._key(dataset), *values)
+            pipe.hdel(cls._meta_key(dataset), *values)
+            await pipe.execute()
+            logger.debug(f"[hashstore_remove] dataset={dataset} count={len(values)} ok")
+        except Exception as e:
+            logger.error(f"HashStore.remove_many error {dataset}: {e}")
+
     @classmethod
     async def clear(cls, dataset: str) -> None:
         try:
-            await cast(Awaitable[int], cls.redis.delete(cls._key(dataset)))
-            await cast(Awaitable[int], cls.redis.delete(cls._meta_key(dataset)))
+            await cast(Awaitable[int], cls._client().delete(cls._key(dataset), cls._meta_key(dataset)))
         except Exception as e:
             logger.error(f"HashStore.clear error {dataset}: {e}")
 
     @classmethod
     async def metadata(cls, dataset: str, hash_value: str) -> dict[str, Any] | None:
         try:
-            raw = await cast(Awaitable[str | None], cls.redis.hget(cls._meta_key(dataset), hash_value))
+            raw = await cast(Awaitable[str | None], cls._client().hget(cls._meta_key(dataset), hash_value))
         except Exception as e:
             logger.error(f"HashStore.metadata error {dataset}: {e}")
             return None
@@ -106,7 +163,7 @@ class HashStore:
     @classmethod
     async def list(cls, dataset: str) -> set[str]:
         try:
-            members = await cast(Awaitable[Iterable[str]], cls.redis.smembers(cls._key(dataset)))
+            members = await cast(Awaitable[Iterable[str]], cls._client().smembers(cls._key(dataset)))
         except Exception as e:
             logger.error(f"HashStore.list error {dataset}: {e}")
             return set()
@@ -115,7 +172,7 @@ class HashStore:
     @classmethod
     async def count(cls, dataset: str) -> int:
         try:
-            value = await cast(Awaitable[int], cls.redis.scard(cls._key(dataset)))
+            value = await cast(Awaitable[int], cls._client().scard(cls._key(dataset)))
         except Exception as e:
             logger.error(f"HashStore.count error {dataset}: {e}")
             return 0
@@ -124,8 +181,10 @@ class HashStore:
     @classmethod
     async def list_all_datasets(cls) -> set[str]:
         try:
-            keys = await cast(Awaitable[Iterable[str]], cls.redis.keys("cognee_hashes:*"))
-            return {key.removeprefix("cognee_hashes:") for key in keys}
+            return {
+                key.removeprefix("cognee_hashes:")
+                async for key in cls._client().scan_iter(match="cognee_hashes:*", count=cls.SCAN_COUNT)
+            }
         except Exception as e:
             logger.error(f"HashStore.list_all_datasets error: {e}")
             return set()
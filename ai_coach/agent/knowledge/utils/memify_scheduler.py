@@ -7,7 +7,6 @@ __all__ = [
     "schedule_profile_memify",
     "schedule_profile_memify_sync",
     "settings",
-    "try_lock_chat_summary",
 ]
 
 
@@ -31,8 +30,3 @@ def schedule_profile_memify_sync(
     core_memify_scheduler.settings = settings
     core_memify_scheduler.get_redis_client = get_redis_client
     return core_memify_scheduler.schedule_profile_memify_sync(profile_id, reason=reason, delay_s=delay_s)
-
-
-async def try_lock_chat_summary(profile_id: int, ttl_seconds: int) -> bool:
-    core_memify_scheduler.get_redis_client = get_redis_client
-    return await core_memify_scheduler.try_lock_chat_summary(profile_id, ttl_seconds)
@@ -0,0 +1,296 @@
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from hashlib import md5
+from pathlib import Path
+from typing import ClassVar, Iterable, Sequence
+
+from loguru import logger
+
+_SEGMENT_NAME = re.compile(r"^segment_(\d{6})\.pack$")
+
+
+@dataclass(frozen=True, slots=True)
+class PackRecord:
+    segment: int
+    offset: int
+    length: int
+    md5: str
+    dataset: str
+    kind: str
+
+
+class PackfileStore:
+    """Append-only, content-addressed text store: segment files plus a JSONL index.
+
+    Texts are appended to the active ``segment_NNNNNN.pack`` and located through
+    ``index.jsonl`` (sha → segment, offset, length, md5); deletions append a
+    tombstone. A batch costs one fsync for the segment and one for the index
+    regardless of its size, and the whole corpus lives in a handful of inodes.
+    ``compact`` copies live texts out of mostly-dead sealed segments and rewrites
+    the index. One store instance exists per directory and process.
+    """
+
+    DIRNAME = "packs"
+    INDEX_NAME = "index.jsonl"
+    _instances: ClassVar[dict[Path, "PackfileStore"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: Path, *, segment_bytes: int) -> None:
+        self.root = root / self.DIRNAME
+        self.segment_bytes = max(1, segment_bytes)
+        self.index_path = self.root / self.INDEX_NAME
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._records: dict[str, PackRecord] = {}
+        self._md5_to_sha: dict[str, str] = {}
+        self._total: dict[int, int] = {}
+        self._dead: dict[int, int] = {}
+        self._fds: dict[int, int] = {}
+        self._active = 1
+        self._compacting = False
+
+    @classmethod
+    def for_root(cls, root: Path, *, segment_bytes: int) -> "PackfileStore":
+        store = cls._instances.get(root)
+        if store is not None:
+            return store
+        with cls._instances_lock:
+            resolved = root.resolve()
+            store = cls._instances.get(resolved)
+            if store is None:
+                store = cls(resolved, segment_bytes=segment_bytes)
+                cls._instances[resolved] = store
+            cls._instances[root] = store
+            return store
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._instances_lock:
+            for store in set(cls._instances.values()):
+                store.close()
+            cls._instances.clear()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"segment_{segment:06d}.pack"
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        for path in self.root.iterdir():
+            match = _SEGMENT_NAME.match(path.name)
+            if match:
+                self._active = max(self._active, int(match.group(1)))
+        try:
+            with self.index_path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        raw = json.loads(line)
+                        sha = raw["sha"]
+                        if raw.get("del"):
+                            self._drop(sha)
+                            continue
+                        record = PackRecord(
+                            raw["seg"],
+                            raw["off"],
+                            raw["len"],
+                            raw["md5"],
+                            raw.get("ds", ""),
+                            raw.get("kind", "document"),
+                        )
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    self._apply(sha, record)
+        except FileNotFoundError:
+            pass
+        self._loaded = True
+
+    def _apply(self, sha: str, record: PackRecord) -> None:
+        self._drop(sha)
+        self._records[sha] = record
+        self._md5_to_sha[record.md5] = sha
+        self._total[record.segment] = self._total.get(record.segment, 0) + record.length
+
+    def _drop(self, sha: str) -> None:
+        previous = self._records.pop(sha, None)
+        if previous is None:
+            return
+        self._dead[previous.segment] = self._dead.get(previous.segment, 0) + previous.length
+        if self._md5_to_sha.get(previous.md5) == sha:
+            self._md5_to_sha.pop(previous.md5, None)
+
+    @staticmethod
+    def _index_line(sha: str, record: PackRecord) -> str:
+        payload = {
+            "sha": sha,
+            "seg": record.segment,
+            "off": record.offset,
+            "len": record.length,
+            "md5": record.md5,
+            "ds": record.dataset,
+            "kind": record.kind,
+        }
+        return json.dumps(payload, separators=(",", ":")) + "\n"
+
+    def _append_index(self, lines: Iterable[str]) -> None:
+        payload = "".join(lines).encode("utf-8")
+        if not payload:
+            return
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _append_blobs(self, blobs: Sequence[bytes]) -> list[tuple[int, int]]:
+        """Append blobs to the active segment, rolling it when full; returns (segment, offset) per blob."""
+        placements: list[tuple[int, int]] = []
+        handle = self._segment_path(self._active).open("ab")
+        try:
+            for blob in blobs:
+                offset = handle.tell()
+                if offset and offset + len(blob) > self.segment_bytes:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    handle.close()
+                    self._active += 1
+                    handle = self._segment_path(self._active).open("ab")
+                    offset = 0
+                handle.write(blob)
+                placements.append((self._active, offset))
+            handle.flush()
+            os.fsync(handle.fileno())
+        finally:
+            handle.close()
+        return placements
+
+    def put_many(
+        self, items: Sequence[tuple[str, str]], *, dataset: str | None = None, kinds: Sequence[str] | None = None
+    ) -> list[bool]:
+        """Store ``(sha, text)`` pairs; returns per item whether it was newly written."""
+        with self._lock:
+            self._load()
+            created = [False] * len(items)
+            pending: dict[str, tuple[int, bytes, str]] = {}
+            for position, (sha, text) in enumerate(items):
+                if sha in self._records or sha in pending:
+                    continue
+                kind = kinds[position] if kinds is not None else "document"
+                pending[sha] = (position, text.encode("utf-8"), kind)
+            if not pending:
+                return created
+            placements = self._append_blobs([blob for _, blob, _ in pending.values()])
+            lines: list[str] = []
+            records: list[tuple[str, PackRecord]] = []
+            for (sha, (position, blob, kind)), (segment, offset) in zip(pending.items(), placements, strict=True):
+                record = PackRecord(segment, offset, len(blob), md5(blob).hexdigest(), dataset or "", kind)
+                lines.append(self._index_line(sha, record))
+                records.append((sha, record))
+                created[position] = True
+            self._append_index(lines)
+            for sha, record in records:
+                self._apply(sha, record)
+            return created
+
+    def _fd(self, segment: int) -> int:
+        fd = self._fds.get(segment)
+        if fd is None:
+            fd = os.open(self._segment_path(segment), os.O_RDONLY)
+            self._fds[segment] = fd
+        return fd
+
+    def get(self, sha: str) -> str | None:
+        with self._lock:
+            self._load()
+            record = self._records.get(sha)
+            if record is None:
+                return None
+            data = os.pread(self._fd(record.segment), record.length, record.offset)
+        return data.decode("utf-8")
+
+    def contains(self, sha: str) -> bool:
+        with self._lock:
+            self._load()
+            return sha in self._records
+
+    def sha_for_md5(self, md5_hex: str) -> str | None:
+        with self._lock:
+            self._load()
+            return self._md5_to_sha.get(md5_hex)
+
+    def records(self) -> dict[str, PackRecord]:
+        with self._lock:
+            self._load()
+            return dict(self._records)
+
+    def delete_many(self, shas: Iterable[str]) -> int:
+        with self._lock:
+            self._load()
+            doomed = [sha for sha in dict.fromkeys(shas) if sha in self._records]
+            if not doomed:
+                return 0
+            self._append_index(json.dumps({"sha": sha, "del": True}, separators=(",", ":")) + "\n" for sha in doomed)
+            for sha in doomed:
+                self._drop(sha)
+            return len(doomed)
+
+    def garbage_ratio(self) -> float:
+        with self._lock:
+            total = sum(self._total.values())
+            return sum(self._dead.values()) / total if total else 0.0
+
+    def compact(self, min_dead_ratio: float = 0.5) -> int:
+        """Rewrite sealed segments whose dead share reaches ``min_dead_ratio``; returns bytes reclaimed."""
+        with self._lock:
+            self._load()
+            if self._compacting:
+                return 0
+            self._compacting = True
+            try:
+                return self._compact_locked(min_dead_ratio)
+            finally:
+                self._compacting = False
+
+    def _compact_locked(self, min_dead_ratio: float) -> int:
+        victims = [
+            segment
+            for segment, total in self._total.items()
+            if segment != self._active and total and self._dead.get(segment, 0) / total >= min_dead_ratio
+        ]
+        if not victims:
+            return 0
+        moved = [(sha, record) for sha, record in self._records.items() if record.segment in victims]
+        blobs = [os.pread(self._fd(record.segment), record.length, record.offset) for _, record in moved]
+        # seal the current active segment so survivors never share a file with a victim
+        self._active = max(self._active, *victims) + 1
+        placements = self._append_blobs(blobs) if blobs else []
+        for (sha, record), (segment, offset) in zip(moved, placements, strict=True):
+            self._records[sha] = PackRecord(segment, offset, record.length, record.md5, record.dataset, record.kind)
+            self._total[segment] = self._total.get(segment, 0) + record.length
+        reclaimed = 0
+        for segment in victims:
+            reclaimed += self._dead.pop(segment, 0)
+            self._total.pop(segment, None)
+        temp_path = self.index_path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            handle.writelines(self._index_line(sha, record) for sha, record in self._records.items())
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.index_path)
+        for segment in victims:
+            fd = self._fds.pop(segment, None)
+            if fd is not None:
+                os.close(fd)
+            self._segment_path(segment).unlink(missing_ok=True)
+        logger.info(f"kb_packfile.compacted segments={len(victims)} moved={len(moved)} reclaimed_bytes={reclaimed}")
+        return reclaimed
+
+    def close(self) -> None:
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
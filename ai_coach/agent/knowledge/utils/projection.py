@@ -9,10 +9,13 @@ from typing import Any, ClassVar, Optional, TYPE_CHECKING
 from loguru import logger
 
 from ai_coach.agent.knowledge.schemas import ProjectionStatus
+from ai_coach.agent.knowledge.utils.dataset_stats import DatasetStatsRegistry
 from ai_coach.agent.knowledge.utils.datasets import DatasetService
+from ai_coach.agent.knowledge.utils.embedding_cache import EmbeddingCache
+from ai_coach.agent.knowledge.utils.projection_coordinator import STALL_FIELDS, ProjectionCoordinator
+from ai_coach.agent.knowledge.utils.search_cache import SearchResultCache
 from ai_coach.agent.knowledge.utils.storage import StorageService
 from config.app_settings import settings
-from core.utils.redis_lock import redis_try_lock
 
 if TYPE_CHECKING:
     from ai_coach.agent.knowledge.knowledge_base import KnowledgeBase
@@ -21,12 +24,17 @@ Waiter = Callable[..., Awaitable[ProjectionStatus]]
 
 
 class ProjectionService:
-    """Coordinate dataset projection lifecycle and retry logic."""
+    """Coordinate dataset projection lifecycle and retry logic.
+
+    Pending flags, per-dataset leases, concurrency tokens, debounce windows and
+    stall state live in Redis (see ``ProjectionCoordinator``), so one worker
+    projects a dataset at a time. ``_SCHEDULED_TASKS`` only holds the local
+    timers that try to claim due datasets on behalf of this process.
+    """
 
     _MAX_REBUILD_ATTEMPTS: ClassVar[int] = 3
+    _CLAIM_POLL_S: ClassVar[float] = 2.0
     _COGNIFY_SEMAPHORE: ClassVar[asyncio.Semaphore | None] = None
-    _LAST_PROJECTION_START: ClassVar[dict[str, float]] = {}
-    _STALL_STATE: ClassVar[dict[str, dict[str, float | int | None]]] = {}
     _SCHEDULED_TASKS: ClassVar[dict[str, asyncio.Task[None]]] = {}
     _SCHEDULED_REQUESTS: ClassVar[dict[str, dict[str, Any]]] = {}
 
@@ -67,33 +75,10 @@ class ProjectionService:
         alias = self.dataset_service.alias_for_dataset(dataset)
         logger.debug(f"projection.wait dataset={alias} attempts={attempts} status={status.name.lower()}")
 
-    @classmethod
-    def _should_debounce(cls, alias: str) -> bool:
-        min_interval = float(settings.COGNEE_PROJECTION_DEBOUNCE_S)
-        if min_interval <= 0:
-            return False
-        now = monotonic()
-        last = cls._LAST_PROJECTION_START.get(alias)
-        if last is None:
-            cls._LAST_PROJECTION_START[alias] = now
-            return False
-        elapsed = now - last
-        if elapsed < min_interval:
-            return True
-        cls._LAST_PROJECTION_START[alias] = now
-        return False
-
-    async def _should_debounce_redis(self, alias: str) -> bool:
-        min_interval = float(settings.COGNEE_PROJECTION_DEBOUNCE_S)
-        if min_interval <= 0:
-            return False
-        ttl_ms = int(min_interval * 1000)
-        try:
-            async with redis_try_lock(f"locks:cognee_projection:{alias}", ttl_ms=ttl_ms, wait=False) as got_lock:
-                return not got_lock
-        except Exception as exc:  # noqa: BLE001 - best-effort debounce
-            logger.debug("projection:debounce_redis_failed dataset={} detail={}", alias, exc)
-            return False
+    @staticmethod
+    async def _debounce_remaining(alias: str) -> float:
+        min_interval = max(float(settings.COGNEE_PROJECTION_DEBOUNCE_S), 0.0)
+        return await ProjectionCoordinator.start_window(alias, min_interval)
 
     @classmethod
     def _get_cognify_semaphore(cls) -> asyncio.Semaphore:
@@ -102,71 +87,25 @@ class ProjectionService:
             cls._COGNIFY_SEMAPHORE = asyncio.Semaphore(limit)
         return cls._COGNIFY_SEMAPHORE
 
-    @classmethod
-    def _stall_state(cls, alias: str) -> dict[str, float | int | None]:
-        state = cls._STALL_STATE.get(alias)
-        if state is None:
-            state = {
-                "text_rows": None,
-                "chunk_rows": None,
-                "graph_nodes": None,
-                "graph_edges": None,
-                "no_progress": 0,
-                "blocked_until": 0.0,
-            }
-            cls._STALL_STATE[alias] = state
-        return state
-
-    @classmethod
-    def _is_blocked(cls, alias: str) -> bool:
-        state = cls._stall_state(alias)
-        blocked_until = float(state.get("blocked_until") or 0.0)
-        return blocked_until > monotonic()
+    @staticmethod
+    async def _is_blocked(alias: str) -> bool:
+        return await ProjectionCoordinator.blocked_for(alias) > 0
 
-    @classmethod
-    def _record_progress(cls, alias: str, counts: dict[str, int]) -> bool:
-        state = cls._stall_state(alias)
-        prev_text_raw = state.get("text_rows")
-        prev_chunk_raw = state.get("chunk_rows")
-        prev_nodes_raw = state.get("graph_nodes")
-        prev_edges_raw = state.get("graph_edges")
-
-        prev_text = int(prev_text_raw or 0)
-        prev_chunk = int(prev_chunk_raw or 0)
-        prev_nodes = int(prev_nodes_raw or 0)
-        prev_edges = int(prev_edges_raw or 0)
-
-        text_rows = int(counts.get("text_rows") or 0)
-        chunk_rows = int(counts.get("chunk_rows") or 0)
-        graph_nodes = int(counts.get("graph_nodes") or 0)
-        graph_edges = int(counts.get("graph_edges") or 0)
-
-        progressed = (
-            prev_text_raw is None
-            or prev_chunk_raw is None
-            or prev_nodes_raw is None
-            or prev_edges_raw is None
-            or text_rows != prev_text
-            or chunk_rows != prev_chunk
-            or graph_nodes != prev_nodes
-            or graph_edges != prev_edges
-        )
-        if progressed:
+    @staticmethod
+    async def _record_progress(alias: str, counts: dict[str, int]) -> bool:
+        previous = await ProjectionCoordinator.load_stall(alias)
+        state = {field: int(counts.get(field) or 0) for field in STALL_FIELDS if field != "no_progress"}
+        if previous is None or any(previous[field] != value for field, value in state.items()):
             state["no_progress"] = 0
         else:
-            state["no_progress"] = int(state.get("no_progress") or 0) + 1
-
-        state["text_rows"] = text_rows
-        state["chunk_rows"] = chunk_rows
-        state["graph_nodes"] = graph_nodes
-        state["graph_edges"] = graph_edges
+            state["no_progress"] = previous["no_progress"] + 1
+        await ProjectionCoordinator.store_stall(alias, state)
 
         stall_limit = max(int(settings.COGNEE_PROJECTION_STALL_LIMIT), 0)
         if stall_limit <= 0:
             return False
-        if int(state["no_progress"]) >= stall_limit:
-            cooldown_s = max(float(settings.COGNEE_PROJECTION_STALL_COOLDOWN_S), 0.0)
-            state["blocked_until"] = monotonic() + cooldown_s
+        if state["no_progress"] >= stall_limit:
+            await ProjectionCoordinator.block(alias, max(float(settings.COGNEE_PROJECTION_STALL_COOLDOWN_S), 0.0))
             return True
         return False
 
@@ -224,39 +163,71 @@ class ProjectionService:
         delay = base * (factor ** max(attempt - 1, 0))
         return min(delay, float(settings.COGNEE_PROJECTION_RETRY_MAX_DELAY))
 
-    async def _schedule_projection(self, dataset: str, user: Any | None, *, allow_rebuild: bool) -> None:
+    async def _schedule_projection(
+        self, dataset: str, user: Any | None, *, allow_rebuild: bool, delay_s: float | None = None
+    ) -> None:
         alias = self.dataset_service.alias_for_dataset(dataset)
-        delay_s = self._batch_window_s()
-        if delay_s <= 0:
-            return
-        request = {
+        if delay_s is None:
+            delay_s = self._batch_window_s()
+            if delay_s <= 0:
+                return
+        requests = await ProjectionCoordinator.mark_pending(alias, delay_s)
+        # recorded after the entry is queued so a finishing timer that sees it knows to look again
+        self._SCHEDULED_REQUESTS[alias] = {
             "dataset": dataset,
             "user": user,
             "allow_rebuild": allow_rebuild,
         }
-        self._SCHEDULED_REQUESTS[alias] = request
         existing = self._SCHEDULED_TASKS.get(alias)
         if existing and not existing.done():
-            existing.cancel()
+            logger.debug(f"projection.coalesced dataset={alias} requests={requests}")
+            return
+        self._SCHEDULED_TASKS[alias] = asyncio.create_task(self._run_scheduled(alias, delay_s))
+        logger.info(f"projection.scheduled dataset={alias} delay_s={delay_s:.0f} requests={requests}")
 
-        async def _run() -> None:
-            try:
-                await asyncio.sleep(delay_s)
-                payload = self._SCHEDULED_REQUESTS.get(alias, request)
-                await self._project_now(
-                    payload["dataset"],
-                    payload.get("user"),
-                    allow_rebuild=bool(payload.get("allow_rebuild")),
-                )
-            except asyncio.CancelledError:
-                return
-            except Exception as exc:  # noqa: BLE001
-                logger.debug(f"projection.scheduled_failed dataset={alias} detail={exc}")
-            finally:
-                self._SCHEDULED_TASKS.pop(alias, None)
+    async def _run_scheduled(self, alias: str, delay_s: float) -> None:
+        """Claim ``alias`` once it is due and project it until no request is pending.
 
-        self._SCHEDULED_TASKS[alias] = asyncio.create_task(_run())
-        logger.info(f"projection.scheduled dataset={alias} delay_s={delay_s:.0f}")
+        Timers on other workers race for the same entry; the loser finds it gone
+        and exits, so a burst across processes still projects once.
+        """
+        request: dict[str, Any] = {}
+        try:
+            await asyncio.sleep(delay_s)
+            while True:
+                request = self._SCHEDULED_REQUESTS.pop(alias, None) or request
+                owner = ProjectionCoordinator.new_owner()
+                requests = await ProjectionCoordinator.claim(alias, owner)
+                if requests is None:
+                    wait_s = await ProjectionCoordinator.due_in(alias)
+                    if wait_s is None and alias not in self._SCHEDULED_REQUESTS:
+                        return
+                    await asyncio.sleep(max(wait_s or 0.0, self._CLAIM_POLL_S))
+                    continue
+                try:
+                    await self._project_dataset(
+                        request["dataset"],
+                        request.get("user"),
+                        allow_rebuild=bool(request.get("allow_rebuild")),
+                        immediate=True,
+                        lease=(owner, requests),
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug(f"projection.scheduled_failed dataset={alias} detail={exc}")
+                if alias not in self._SCHEDULED_REQUESTS and not await ProjectionCoordinator.is_pending(alias):
+                    return
+        except asyncio.CancelledError:
+            return
+        finally:
+            self._SCHEDULED_TASKS.pop(alias, None)
+
+    async def _keep_lease(self, alias: str, owner: str) -> None:
+        interval_s = ProjectionCoordinator.lease_ms() / 3000
+        while True:
+            await asyncio.sleep(interval_s)
+            if not await ProjectionCoordinator.renew(alias, owner):
+                logger.warning(f"projection.lease_lost dataset={alias} owner={owner}")
+                return
 
     async def _project_now(self, dataset: str, user: Any | None, *, allow_rebuild: bool = True) -> None:
         await self._project_dataset(
@@ -266,15 +237,9 @@ class ProjectionService:
             immediate=True,
         )
 
-    @classmethod
-    def clear_stall(cls, alias: str) -> None:
-        state = cls._stall_state(alias)
-        state["text_rows"] = None
-        state["chunk_rows"] = None
-        state["graph_nodes"] = None
-        state["graph_edges"] = None
-        state["no_progress"] = 0
-        state["blocked_until"] = 0.0
+    @staticmethod
+    async def clear_stall(alias: str) -> None:
+        await ProjectionCoordinator.clear_stall(alias)
 
     async def ensure_dataset_projected(
         self, dataset: str, user: Any | None, *, timeout_s: float | None = None
@@ -471,17 +436,20 @@ class ProjectionService:
         *,
         allow_rebuild: bool = True,
         immediate: bool = False,
+        lease: tuple[str, int] | None = None,
     ) -> None:
-        import cognee
-
         alias = self.dataset_service.alias_for_dataset(dataset)
         user_ctx = self.dataset_service.to_user_ctx(user)
         if user_ctx is None:
             logger.warning(f"knowledge_project_skipped dataset={alias}: user context unavailable")
+            if lease is not None:
+                await ProjectionCoordinator.release(alias, lease[0])
             return
         if allow_rebuild:
-            self.clear_stall(alias)
-        if self._is_blocked(alias):
+            await self.clear_stall(alias)
+        if await self._is_blocked(alias):
+            if lease is not None:
+                await ProjectionCoordinator.release(alias, lease[0])
             logger.warning(
                 f"projection.skipped dataset={alias} reason=stalled "
                 f"cooldown_s={max(float(settings.COGNEE_PROJECTION_STALL_COOLDOWN_S), 0.0):.0f}"
@@ -490,15 +458,65 @@ class ProjectionService:
         if not immediate and self._batch_window_s() > 0:
             await self._schedule_projection(dataset, user, allow_rebuild=allow_rebuild)
             return
-        if await self._should_debounce_redis(alias) or self._should_debounce(alias):
-            self.dataset_service.log_once(
-                logging.DEBUG,
-                "projection:debounced",
-                dataset=alias,
-                min_interval=float(settings.COGNEE_PROJECTION_DEBOUNCE_S),
-                ttl=float(settings.COGNEE_PROJECTION_DEBOUNCE_S),
-            )
-            return
+        if lease is None:
+            owner = ProjectionCoordinator.new_owner()
+            requests = await ProjectionCoordinator.claim(alias, owner, force=True)
+            if requests is None:
+                holder = await ProjectionCoordinator.lease_holder(alias)
+                logger.info(f"projection.deferred dataset={alias} reason=lease_held holder={holder}")
+                await self._schedule_projection(
+                    dataset, user, allow_rebuild=allow_rebuild, delay_s=self._batch_window_s()
+                )
+                return
+        else:
+            owner, requests = lease
+        try:
+            remaining_s = await self._debounce_remaining(alias)
+            if remaining_s > 0:
+                self.dataset_service.log_once(
+                    logging.DEBUG,
+                    "projection:debounced",
+                    dataset=alias,
+                    min_interval=float(settings.COGNEE_PROJECTION_DEBOUNCE_S),
+                    ttl=float(settings.COGNEE_PROJECTION_DEBOUNCE_S),
+                )
+                await self._schedule_projection(dataset, user, allow_rebuild=allow_rebuild, delay_s=remaining_s)
+                return
+            heartbeat = asyncio.create_task(self._keep_lease(alias, owner))
+            embedding_cache = EmbeddingCache.shared()
+            embed_before = embedding_cache.counters() if embedding_cache is not None else None
+            started = monotonic()
+            status = "failed"
+            try:
+                status = await self._cognify_dataset(dataset, alias, user, user_ctx, owner, allow_rebuild=allow_rebuild)
+            finally:
+                heartbeat.cancel()
+                embedding = None
+                if embedding_cache is not None and embed_before is not None:
+                    # process-wide counters: runs for other datasets overlapping this one are included
+                    embedding = EmbeddingCache.summarize(EmbeddingCache.since(embed_before, embedding_cache.counters()))
+                    logger.info(
+                        f"projection.embedding dataset={alias} texts={embedding['texts']} "
+                        f"hit_rate={embedding['hit_rate']:.2f} calls={embedding['calls']} "
+                        f"calls_saved={embedding['calls_saved']} texts_saved={embedding['texts_saved']}"
+                    )
+                await ProjectionCoordinator.record_run(
+                    alias,
+                    owner,
+                    duration_s=monotonic() - started,
+                    requests=requests,
+                    status=status,
+                    embedding=embedding,
+                )
+        finally:
+            await ProjectionCoordinator.release(alias, owner)
+
+    async def _cognify_dataset(
+        self, dataset: str, alias: str, user: Any | None, user_ctx: Any, owner: str, *, allow_rebuild: bool
+    ) -> str:
+        """Run Cognee for ``alias`` under its lease; returns the status recorded for the run."""
+        import cognee
+
         dataset_id = await self.dataset_service.get_dataset_id(alias, user_ctx)
         target = alias
 
@@ -531,16 +549,15 @@ class ProjectionService:
         for attempt in range(1, attempts + 1):
             if max_duration_s and (monotonic() - start_ts) >= max_duration_s:
                 cooldown_s = max(float(settings.COGNEE_PROJECTION_STALL_COOLDOWN_S), 0.0)
-                state = self._stall_state(alias)
-                state["blocked_until"] = monotonic() + cooldown_s
+                await ProjectionCoordinator.block(alias, cooldown_s)
                 logger.error(
                     f"projection.stopped dataset={alias} reason=max_duration "
                     f"elapsed_s={monotonic() - start_ts:.1f} cooldown_s={cooldown_s:.0f}"
                 )
-                return
+                return "stopped"
             try:
                 logger.debug(f"projection.cognee_call dataset={alias} target={target} attempt={attempt}/{attempts}")
-                async with self._get_cognify_semaphore():
+                async with self._get_cognify_semaphore(), ProjectionCoordinator.token(owner):
                     result = await cognee.cognify(datasets=[target], user=user_ctx, incremental_loading=True)
                 self._register_dataset_uuids(alias, result)
                 duration = monotonic() - start_ts
@@ -560,7 +577,7 @@ class ProjectionService:
                         f"knowledge_dataset_storage_missing dataset={alias} missing={getattr(exc, 'filename', None)} "
                         "reason=aggressive_rebuild_disabled"
                     )
-                    return
+                    return "storage_missing"
                 missing_path = getattr(exc, "filename", None) or str(exc)
                 logger.debug(f"knowledge_dataset_storage_missing dataset={alias} missing={missing_path}")
                 missing, healed = await self.storage_service.heal_dataset_storage(
@@ -569,7 +586,7 @@ class ProjectionService:
                 self.dataset_service._PROJECTED_DATASETS.discard(alias)
                 if healed > 0:
                     await self.project_dataset_now(alias, user, allow_rebuild=True)
-                    return
+                    return "healed"
                 self.dataset_service.log_once(
                     logging.WARNING,
                     "storage_missing:heal_failed",
@@ -585,7 +602,7 @@ class ProjectionService:
                         await kb.rebuild_dataset(alias, user)
                         logger.debug(f"knowledge_dataset_rebuilt dataset={alias}")
                         await self.project_dataset_now(alias, user, allow_rebuild=True)
-                        return
+                        return "rebuilt"
                     else:
                         self.dataset_service.log_once(
                             logging.WARNING,
@@ -612,10 +629,14 @@ class ProjectionService:
                 logger.exception(f"knowledge_dataset_cognify_failed dataset={dataset}")
                 raise
         try:
-            counts = await self.dataset_service.get_counts(alias, user)
+            counts = await self.dataset_service.get_counts(alias, user, scoped_graph=True)
         except Exception as exc:  # noqa: BLE001 - logging-only diagnostics
             logger.debug(f"projection.counts_failed dataset={alias} detail={exc}")
             counts = {}
+        else:
+            await DatasetStatsRegistry.store(alias, counts)
+        # results cached between ingestion and the end of cognify were computed on the unprojected graph
+        await SearchResultCache.bump(alias)
         duration = monotonic() - start_ts
         logger.info(
             (
@@ -626,7 +647,7 @@ class ProjectionService:
                 f"graph_edges={counts.get('graph_edges', 0)}"
             )
         )
-        if self._record_progress(alias, counts):
+        if await self._record_progress(alias, counts):
             logger.error(
                 f"projection.stalled dataset={alias} reason=no_progress_runs "
                 f"limit={max(int(settings.COGNEE_PROJECTION_STALL_LIMIT), 0)} "
@@ -639,6 +660,7 @@ class ProjectionService:
             dataset_id=dataset_id,
             min_interval=5.0,
         )
+        return "done"
 
     def _register_dataset_uuids(self, alias: str, result: Any) -> None:
         if not isinstance(result, dict):
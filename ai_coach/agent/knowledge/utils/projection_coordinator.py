@@ -0,0 +1,394 @@
+import asyncio
+import os
+import socket
+from contextlib import asynccontextmanager
+from time import time
+from typing import Any, AsyncIterator, Awaitable, Mapping, cast
+from uuid import uuid4
+
+from loguru import logger
+
+from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client
+
+STALL_FIELDS = ("text_rows", "chunk_rows", "graph_nodes", "graph_edges", "no_progress")
+
+# KEYS: queue, requests, lease; ARGV: alias, owner, lease_ms, now_ms, force
+_CLAIM_LUA = """
+local due = redis.call("zscore", KEYS[1], ARGV[1])
+if ARGV[5] ~= "1" and (not due or tonumber(due) > tonumber(ARGV[4])) then
+    return nil
+end
+if not redis.call("set", KEYS[3], ARGV[2], "NX", "PX", ARGV[3]) then
+    return nil
+end
+redis.call("zrem", KEYS[1], ARGV[1])
+local requests = tonumber(redis.call("hget", KEYS[2], ARGV[1]) or "0")
+redis.call("hdel", KEYS[2], ARGV[1])
+return requests
+"""
+
+# KEYS: lease, tokens; ARGV: owner, lease_ms, token_expiry_ms
+_RENEW_LUA = """
+if redis.call("get", KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call("pexpire", KEYS[1], ARGV[2])
+redis.call("zadd", KEYS[2], "XX", ARGV[3], ARGV[1])
+return 1
+"""
+
+# KEYS: lease, tokens; ARGV: owner
+_RELEASE_LUA = """
+redis.call("zrem", KEYS[2], ARGV[1])
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# KEYS: tokens; ARGV: owner, now_ms, expiry_ms, limit
+_TOKEN_LUA = """
+redis.call("zremrangebyscore", KEYS[1], "-inf", ARGV[2])
+if redis.call("zscore", KEYS[1], ARGV[1]) or redis.call("zcard", KEYS[1]) < tonumber(ARGV[4]) then
+    redis.call("zadd", KEYS[1], ARGV[3], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+class ProjectionCoordinator:
+    """Projection scheduling state shared by every AI coach worker through Redis.
+
+    Pending requests sit in a sorted set scored by the time they become due;
+    ``ZADD NX`` keeps the first deadline, so a burst inside the batch window
+    collapses into one entry. Claiming an entry takes a per-dataset lease that
+    the owner renews while Cognee runs, and every ``cognify`` call also holds
+    one of ``COGNEE_PROJECTION_MAX_CONCURRENCY`` global tokens. All calls are
+    best-effort: when Redis is unreachable the caller behaves like a single
+    worker.
+    """
+
+    PREFIX = "ai_coach:projection:"
+    QUEUE_KEY = f"{PREFIX}queue"
+    REQUESTS_KEY = f"{PREFIX}requests"
+    TOKENS_KEY = f"{PREFIX}tokens"
+    DATASETS_KEY = f"{PREFIX}datasets"
+    CHAT_PENDING_KEY = f"{PREFIX}chat_pending"
+    TOKEN_POLL_S = 0.5
+
+    @classmethod
+    def _key(cls, kind: str, alias: str) -> str:
+        return f"{cls.PREFIX}{kind}:{alias}"
+
+    @staticmethod
+    def new_owner() -> str:
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    @staticmethod
+    def lease_ms() -> int:
+        return max(int(float(settings.COGNEE_PROJECTION_LEASE_S) * 1000), 1000)
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time() * 1000)
+
+    @classmethod
+    async def mark_pending(cls, alias: str, delay_s: float) -> int:
+        """Queue ``alias`` to become due after ``delay_s``; returns the requests collapsed into the entry."""
+        due_ms = cls._now_ms() + int(max(delay_s, 0.0) * 1000)
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            pipe.zadd(cls.QUEUE_KEY, {alias: due_ms}, nx=True)
+            pipe.hincrby(cls.REQUESTS_KEY, alias, 1)
+            pipe.sadd(cls.DATASETS_KEY, alias)
+            _, requests, _ = await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.mark_pending_failed dataset={alias} detail={exc}")
+            return 0
+        return int(requests)
+
+    @classmethod
+    async def is_pending(cls, alias: str) -> bool:
+        return await cls.due_in(alias) is not None
+
+    @classmethod
+    async def due_in(cls, alias: str) -> float | None:
+        """Seconds until the pending entry for ``alias`` is due (negative when overdue), ``None`` if none."""
+        try:
+            due = await cast(Awaitable[float | None], get_redis_client().zscore(cls.QUEUE_KEY, alias))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.due_in_failed dataset={alias} detail={exc}")
+            return None
+        if due is None:
+            return None
+        return (float(due) - cls._now_ms()) / 1000
+
+    @classmethod
+    async def claim(cls, alias: str, owner: str, *, force: bool = False) -> int | None:
+        """Take the lease for ``alias`` and its pending entry.
+
+        Without ``force`` the claim only succeeds for a due entry. Returns the
+        number of collapsed requests, or ``None`` when another worker holds the
+        lease or nothing is due.
+        """
+        args = (alias, owner, cls.lease_ms(), cls._now_ms(), "1" if force else "0")
+        keys = (cls.QUEUE_KEY, cls.REQUESTS_KEY, cls._key("lease", alias))
+        try:
+            result = await cast(Awaitable[int | None], get_redis_client().eval(_CLAIM_LUA, 3, *keys, *args))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.claim_failed dataset={alias} detail={exc}")
+            return 0
+        return None if result is None else int(result)
+
+    @classmethod
+    async def renew(cls, alias: str, owner: str) -> bool:
+        lease_ms = cls.lease_ms()
+        keys = (cls._key("lease", alias), cls.TOKENS_KEY)
+        try:
+            result = await cast(
+                Awaitable[int],
+                get_redis_client().eval(_RENEW_LUA, 2, *keys, owner, lease_ms, cls._now_ms() + lease_ms),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.renew_failed dataset={alias} detail={exc}")
+            return True
+        return bool(result)
+
+    @classmethod
+    async def release(cls, alias: str, owner: str) -> None:
+        try:
+            await cast(
+                Awaitable[int],
+                get_redis_client().eval(_RELEASE_LUA, 2, cls._key("lease", alias), cls.TOKENS_KEY, owner),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.release_failed dataset={alias} detail={exc}")
+
+    @classmethod
+    async def lease_holder(cls, alias: str) -> str | None:
+        try:
+            return await cast(Awaitable[str | None], get_redis_client().get(cls._key("lease", alias)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.lease_holder_failed dataset={alias} detail={exc}")
+            return None
+
+    @classmethod
+    async def acquire_token(cls, owner: str) -> bool:
+        now_ms = cls._now_ms()
+        limit = max(int(settings.COGNEE_PROJECTION_MAX_CONCURRENCY), 1)
+        try:
+            result = await cast(
+                Awaitable[int],
+                get_redis_client().eval(_TOKEN_LUA, 1, cls.TOKENS_KEY, owner, now_ms, now_ms + cls.lease_ms(), limit),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.token_failed owner={owner} detail={exc}")
+            return True
+        return bool(result)
+
+    @classmethod
+    async def release_token(cls, owner: str) -> None:
+        try:
+            await cast(Awaitable[int], get_redis_client().zrem(cls.TOKENS_KEY, owner))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.token_release_failed owner={owner} detail={exc}")
+
+    @classmethod
+    @asynccontextmanager
+    async def token(cls, owner: str) -> AsyncIterator[None]:
+        """Hold one global concurrency token for the duration of the block."""
+        while not await cls.acquire_token(owner):
+            await asyncio.sleep(cls.TOKEN_POLL_S)
+        try:
+            yield
+        finally:
+            await cls.release_token(owner)
+
+    @classmethod
+    async def start_window(cls, alias: str, interval_s: float) -> float:
+        """Open the debounce window for ``alias``; returns seconds left if one is already open."""
+        if interval_s <= 0:
+            return 0.0
+        key = cls._key("window", alias)
+        try:
+            client = get_redis_client()
+            if await cast(Awaitable[bool | None], client.set(key, "1", nx=True, px=int(interval_s * 1000))):
+                return 0.0
+            remaining_ms = await cast(Awaitable[int], client.pttl(key))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.window_failed dataset={alias} detail={exc}")
+            return 0.0
+        return max(int(remaining_ms), 0) / 1000
+
+    @classmethod
+    async def record_run(
+        cls,
+        alias: str,
+        owner: str,
+        *,
+        duration_s: float,
+        requests: int,
+        status: str,
+        embedding: Mapping[str, Any] | None = None,
+    ) -> None:
+        mapping = {
+            "last_owner": owner,
+            "last_status": status,
+            "last_duration_ms": int(duration_s * 1000),
+            "last_requests": requests,
+            "last_finished_at": int(time()),
+        }
+        if embedding:
+            mapping["last_embed_hit_rate"] = embedding["hit_rate"]
+            mapping["last_embed_calls_saved"] = embedding["calls_saved"]
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.hset(cls._key("stats", alias), mapping=mapping)
+            pipe.hincrby(cls._key("stats", alias), "runs", 1)
+            pipe.sadd(cls.DATASETS_KEY, alias)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.record_failed dataset={alias} detail={exc}")
+
+    @classmethod
+    async def load_stall(cls, alias: str) -> dict[str, int] | None:
+        try:
+            raw = await cast(Awaitable[dict[str, str]], get_redis_client().hgetall(cls._key("stall", alias)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.stall_load_failed dataset={alias} detail={exc}")
+            return None
+        if not raw:
+            return None
+        return {field: int(raw.get(field) or 0) for field in STALL_FIELDS}
+
+    @classmethod
+    async def store_stall(cls, alias: str, state: Mapping[str, int]) -> None:
+        try:
+            await cast(Awaitable[int], get_redis_client().hset(cls._key("stall", alias), mapping=dict(state)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.stall_store_failed dataset={alias} detail={exc}")
+
+    @classmethod
+    async def block(cls, alias: str, cooldown_s: float) -> None:
+        if cooldown_s <= 0:
+            return
+        try:
+            await cast(
+                Awaitable[bool], get_redis_client().set(cls._key("blocked", alias), "1", px=int(cooldown_s * 1000))
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.block_failed dataset={alias} detail={exc}")
+
+    @classmethod
+    async def blocked_for(cls, alias: str) -> float:
+        try:
+            remaining_ms = await cast(Awaitable[int], get_redis_client().pttl(cls._key("blocked", alias)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.blocked_failed dataset={alias} detail={exc}")
+            return 0.0
+        return max(int(remaining_ms), 0) / 1000
+
+    @classmethod
+    async def clear_stall(cls, alias: str) -> None:
+        try:
+            await cast(Awaitable[int], get_redis_client().delete(cls._key("stall", alias), cls._key("blocked", alias)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.clear_stall_failed dataset={alias} detail={exc}")
+
+    @classmethod
+    async def add_chat_pending(cls, alias: str, amount: int = 1) -> int:
+        try:
+            return int(await cast(Awaitable[int], get_redis_client().hincrby(cls.CHAT_PENDING_KEY, alias, amount)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.chat_pending_failed dataset={alias} detail={exc}")
+            return amount
+
+    @classmethod
+    async def chat_pending(cls, alias: str) -> int:
+        try:
+            raw = await cast(Awaitable[str | None], get_redis_client().hget(cls.CHAT_PENDING_KEY, alias))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.chat_pending_failed dataset={alias} detail={exc}")
+            return 0
+        return int(raw or 0)
+
+    @classmethod
+    async def take_chat_pending(cls, alias: str) -> int:
+        """Atomically read and reset the chat messages queued for ``alias``."""
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            pipe.hget(cls.CHAT_PENDING_KEY, alias)
+            pipe.hdel(cls.CHAT_PENDING_KEY, alias)
+            raw, _ = await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.chat_take_failed dataset={alias} detail={exc}")
+            return 1
+        return int(raw or 0)
+
+    @classmethod
+    async def chat_cooldown(cls, alias: str) -> float:
+        """Seconds left before chat dataset ``alias`` may project again."""
+        try:
+            remaining_ms = await cast(Awaitable[int], get_redis_client().pttl(cls._key("chat_window", alias)))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.chat_cooldown_failed dataset={alias} detail={exc}")
+            return 0.0
+        return max(int(remaining_ms), 0) / 1000
+
+    @classmethod
+    async def start_chat_cooldown(cls, alias: str, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        try:
+            await cast(
+                Awaitable[bool], get_redis_client().set(cls._key("chat_window", alias), "1", px=int(seconds * 1000))
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.chat_cooldown_failed dataset={alias} detail={exc}")
+
+    @classmethod
+    async def snapshot(cls) -> dict[str, Any]:
+        """Queue depth, token usage, lease holder and last run per known dataset."""
+        try:
+            client = get_redis_client()
+            pipe = client.pipeline(transaction=False)
+            pipe.zrange(cls.QUEUE_KEY, 0, -1, withscores=True)
+            pipe.hgetall(cls.REQUESTS_KEY)
+            pipe.zcount(cls.TOKENS_KEY, cls._now_ms(), "+inf")
+            pipe.smembers(cls.DATASETS_KEY)
+            queue, requests, tokens, known = await pipe.execute()
+            aliases = sorted(set(known) | {alias for alias, _ in queue})
+            pipe = client.pipeline(transaction=False)
+            for alias in aliases:
+                pipe.get(cls._key("lease", alias))
+                pipe.hgetall(cls._key("stats", alias))
+            rows = await pipe.execute() if aliases else []
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"projection_coordinator.snapshot_failed detail={exc}")
+            return {"available": False}
+        now_ms = cls._now_ms()
+        due = {alias: score for alias, score in queue}
+        datasets: dict[str, Any] = {}
+        for position, alias in enumerate(aliases):
+            stats = rows[position * 2 + 1] or {}
+            datasets[alias] = {
+                "pending": alias in due,
+                "pending_requests": int(requests.get(alias) or 0),
+                "due_in_s": round((float(due[alias]) - now_ms) / 1000, 1) if alias in due else None,
+                "lease_holder": rows[position * 2],
+                "last_duration_ms": int(stats["last_duration_ms"]) if "last_duration_ms" in stats else None,
+                "last_status": stats.get("last_status"),
+                "last_finished_at": int(stats["last_finished_at"]) if "last_finished_at" in stats else None,
+                "runs": int(stats.get("runs") or 0),
+                "last_embed_hit_rate": float(stats["last_embed_hit_rate"]) if "last_embed_hit_rate" in stats else None,
+                "last_embed_calls_saved": int(stats.get("last_embed_calls_saved") or 0),
+            }
+        return {
+            "available": True,
+            "queue_depth": len(queue),
+            "tokens_in_use": int(tokens),
+            "max_concurrency": max(int(settings.COGNEE_PROJECTION_MAX_CONCURRENCY), 1),
+            "datasets": datasets,
+        }
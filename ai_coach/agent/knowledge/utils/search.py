@@ -37,6 +37,7 @@ from ai_coach.agent.knowledge.utils.cognee_compat import (
 )
 from ai_coach.agent.knowledge.utils.datasets import DatasetService
 from ai_coach.agent.knowledge.utils.projection import ProjectionService
+from ai_coach.agent.knowledge.utils.search_cache import SearchResultCache
 from config.app_settings import settings
 from core.schemas import Profile
 from core.utils.redis_lock import get_redis_client
@@ -233,32 +234,50 @@ class SearchService:
     ) -> list[KnowledgeSnippet]:
         aggregated: list[KnowledgeSnippet] = []
         seen: set[str] = set()
-        for variant in queries:
-            snippets = await self._search_single_query(
-                variant,
-                resolved_datasets,
-                actor,
-                k,
-                profile_id,
-                query_type=self._search_type_default,
-                request_id=request_id,
-                session_id=session_id,
-            )
-            if not snippets:
-                continue
-            for snippet in snippets:
-                cleaned = snippet.text.strip()
-                if not cleaned:
-                    continue
-                key = cleaned.casefold()
-                if key in seen:
-                    continue
-                aggregated.append(snippet)
-                seen.add(key)
+        semaphore = asyncio.Semaphore(max(1, settings.AI_COACH_SEARCH_VARIANT_CONCURRENCY))
+
+        async def _run_variant(variant: str) -> list[KnowledgeSnippet]:
+            async with semaphore:
+                return await self._search_single_query(
+                    variant,
+                    resolved_datasets,
+                    actor,
+                    k,
+                    profile_id,
+                    query_type=self._search_type_default,
+                    request_id=request_id,
+                    session_id=session_id,
+                )
+
+        # variants run concurrently but are merged in variant order, so ranking never depends on latency;
+        # once the earlier variants fill ``k`` unique snippets the remaining ones are cancelled
+        tasks = [asyncio.create_task(_run_variant(variant)) for variant in queries]
+        try:
+            for task in tasks:
+                snippets = await task
+                for snippet in snippets:
+                    cleaned = snippet.text.strip()
+                    if not cleaned:
+                        continue
+                    key = cleaned.casefold()
+                    if key in seen:
+                        continue
+                    aggregated.append(snippet)
+                    seen.add(key)
+                    if k is not None and len(aggregated) >= k:
+                        break
                 if k is not None and len(aggregated) >= k:
                     break
-            if k is not None and len(aggregated) >= k:
-                break
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if pending:
+                logger.debug(
+                    f"knowledge_search_variants_cancelled profile_id={profile_id} rid={request_id or 'na'} "
+                    f"cancelled={len(pending)} variants={len(tasks)}"
+                )
         return aggregated
 
     async def search(
@@ -306,6 +325,13 @@ class SearchService:
             return []
 
         resolved_datasets = await self._resolve_datasets(candidate_aliases, user_ctx, profile_id)
+        cache_key = await SearchResultCache.key_for(normalized, resolved_datasets, k)
+        if cache_key is not None:
+            cached = await SearchResultCache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"knowledge_search_cache_hit profile_id={profile_id} rid={rid_value} hits={len(cached)}")
+                self._log_search_completion(profile_id, rid_value, ",".join(resolved_datasets), len(cached), started_at)
+                return cached
 
         try:
             base_hash = sha256(normalized.encode()).hexdigest()[:12]
@@ -345,6 +371,8 @@ class SearchService:
                     min_interval=60.0,
                 )
                 logger.debug(f"knowledge_search_empty profile_id={profile_id} rid={rid_value} datasets={datasets_hint}")
+            elif cache_key is not None:
+                await SearchResultCache.set(cache_key, aggregated)
             self._log_search_completion(profile_id, rid_value, datasets_hint, len(aggregated), started_at)
             return aggregated
         except asyncio.CancelledError:
@@ -390,7 +418,7 @@ class SearchService:
             target = (dataset or "").strip() or dataset
             alias = self.dataset_service.alias_for_dataset(dataset)
             try:
-                counts = await self.dataset_service.get_counts(alias, user)
+                counts = await self.dataset_service.get_cached_counts(alias, user)
             except Exception as exc:
                 logger.debug(f"projection:count_unavailable dataset={alias} detail={exc}")
                 fallback_rows = await self.dataset_service.get_row_count(alias, user)
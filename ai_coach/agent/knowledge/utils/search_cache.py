@@ -0,0 +1,85 @@
+import json
+from dataclasses import asdict
+from hashlib import sha256
+from typing import Awaitable, Iterable, Sequence, cast
+
+from loguru import logger
+
+from ai_coach.agent.knowledge.schemas import KnowledgeSnippet
+from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client
+
+
+class SearchResultCache:
+    """Cache search snippets keyed by normalized query, datasets and dataset versions.
+
+    Every dataset alias carries a version counter in ``ai_coach:dataset_versions``;
+    bumping it on ingestion, when projection completes and after memify makes all
+    cached results that touched the dataset unreachable, and the TTL reclaims them.
+    """
+
+    RESULT_PREFIX = "ai_coach:search_cache:"
+    VERSION_KEY = "ai_coach:dataset_versions"
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.casefold().split())
+
+    @classmethod
+    async def _versions(cls, datasets: Sequence[str]) -> list[str]:
+        values = await cast(Awaitable[list[str | None]], get_redis_client().hmget(cls.VERSION_KEY, list(datasets)))
+        return [value or "0" for value in values]
+
+    @classmethod
+    async def key_for(cls, query: str, datasets: Sequence[str], k: int | None) -> str | None:
+        """Build the cache key, or ``None`` when caching is disabled or Redis is down."""
+        if settings.AI_COACH_SEARCH_CACHE_TTL <= 0 or not datasets:
+            return None
+        ordered = sorted(set(datasets))
+        try:
+            versions = await cls._versions(ordered)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"search_cache.versions_failed datasets={','.join(ordered)} detail={exc}")
+            return None
+        scope = ",".join(f"{dataset}@{version}" for dataset, version in zip(ordered, versions, strict=False))
+        raw = f"{cls.normalize_query(query)}|{scope}|{k if k is not None else '-'}"
+        return f"{cls.RESULT_PREFIX}{sha256(raw.encode()).hexdigest()}"
+
+    @classmethod
+    async def get(cls, key: str) -> list[KnowledgeSnippet] | None:
+        try:
+            raw = await cast(Awaitable[str | None], get_redis_client().get(key))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"search_cache.get_failed key={key[-12:]} detail={exc}")
+            return None
+        if not raw:
+            return None
+        try:
+            return [KnowledgeSnippet(**item) for item in json.loads(raw)]
+        except (TypeError, ValueError) as exc:
+            logger.debug(f"search_cache.decode_failed key={key[-12:]} detail={exc}")
+            return None
+
+    @classmethod
+    async def set(cls, key: str, snippets: Iterable[KnowledgeSnippet]) -> None:
+        payload = json.dumps([asdict(snippet) for snippet in snippets])
+        try:
+            await get_redis_client().set(key, payload, ex=settings.AI_COACH_SEARCH_CACHE_TTL)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"search_cache.set_failed key={key[-12:]} detail={exc}")
+
+    @classmethod
+    async def bump(cls, *datasets: str) -> None:
+        """Invalidate cached results for the given dataset aliases."""
+        aliases = {dataset for dataset in datasets if dataset}
+        if not aliases:
+            return
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            for alias in aliases:
+                pipe.hincrby(cls.VERSION_KEY, alias, 1)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"search_cache.bump_failed datasets={','.join(sorted(aliases))} detail={exc}")
+            return
+        logger.debug(f"search_cache.invalidated datasets={','.join(sorted(aliases))}")
@@ -4,7 +4,6 @@ import cognee
 from loguru import logger
 
 from ai_coach.agent.knowledge.utils.cognee_compat import resolve_get_cache_engine
-from ai_coach.agent.knowledge.utils.memify_scheduler import try_lock_chat_summary
 from ai_coach.types import MessageRole
 from config.app_settings import settings
 from core.utils.redis_lock import get_redis_client_for_db, redis_try_lock
@@ -104,9 +103,6 @@ class SessionCacheService:
         pair_limit = int(settings.AI_COACH_CHAT_SUMMARY_PAIR_LIMIT)
         if pair_limit <= 0:
             return {"status": "skipped", "reason": "disabled"}
-        dedupe_ttl = max(pair_limit * 5, 60)
-        if not await try_lock_chat_summary(profile_id, dedupe_ttl):
-            return {"status": "skipped", "reason": "dedupe_lock"}
         lock_key = f"locks:chat_summary:{profile_id}"
         async with redis_try_lock(lock_key, ttl_ms=180_000, wait=False) as got_lock:
             if not got_lock:
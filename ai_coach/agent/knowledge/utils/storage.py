@@ -5,6 +5,8 @@ import hashlib
 import logging
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Awaitable, Iterable, Mapping, Sequence, TYPE_CHECKING, Optional
 from uuid import uuid4
@@ -14,18 +16,27 @@ from loguru import logger
 from ai_coach.agent.knowledge.cognee_config import CogneeConfig
 from ai_coach.agent.knowledge.schemas import DatasetRow, RebuildResult
 from ai_coach.agent.knowledge.utils.hash_store import HashStore
+from ai_coach.agent.knowledge.utils.packfile import PackfileStore
+from ai_coach.agent.knowledge.utils.datasets import DatasetService
+from ai_coach.agent.knowledge.utils.storage_manifest import ManifestEntry, StorageManifest
 from ai_coach.agent.knowledge.utils.storage_resolver import StorageResolver
+from ai_coach.agent.knowledge.utils.text_cache import TextLRUCache
 from ai_coach.agent.knowledge.utils.helpers import normalize_text
 from config.app_settings import settings
 
 if TYPE_CHECKING:
     from ai_coach.agent.knowledge.knowledge_base import KnowledgeBase
 
+_SHA_FILENAME = re.compile(r"^text_([0-9a-f]{64})\.txt$")
+_REBUILD_CHUNK = 256
+_REBUILD_HASHSTORE_BATCH = 1000
+
 
 class StorageService:
     """Read and cache Cognee storage artifacts for datasets."""
 
-    _STORAGE_CACHE: dict[str, str] = {}
+    _STORAGE_CACHE: TextLRUCache = TextLRUCache(settings.AI_COACH_STORAGE_CACHE_MAX_BYTES)
+    _COMPACTION_TASK: asyncio.Task[int] | None = None
 
     def __init__(self, dataset_service) -> None:
         self.dataset_service = dataset_service
@@ -34,6 +45,9 @@ class StorageService:
     def attach_knowledge_base(self, knowledge_base: "KnowledgeBase") -> None:
         self._knowledge_base = knowledge_base
 
+    def cache_stats(self) -> dict[str, Any]:
+        return self._STORAGE_CACHE.stats()
+
     def storage_root(self) -> Path:
         root = CogneeConfig.storage_root()
         if root is not None:
@@ -50,20 +64,48 @@ class StorageService:
             self.dataset_service.log_once(logging.WARNING, "storage_path_invalid_digest", sha=digest_sha)
             return None
 
+    def packfile(self) -> PackfileStore | None:
+        """Packfile store for the storage root, or ``None`` when the per-file layout is selected."""
+        if settings.AI_COACH_STORAGE_BACKEND != "packfile":
+            return None
+        return PackfileStore.for_root(self.storage_root(), segment_bytes=settings.AI_COACH_PACKFILE_SEGMENT_BYTES)
+
+    def has_storage_text(self, digest_sha: str) -> bool:
+        store = self.packfile()
+        if store is not None:
+            return store.contains(digest_sha)
+        path = self.storage_path_for_sha(digest_sha)
+        return path is not None and path.exists()
+
+    def manifest(self) -> StorageManifest:
+        return StorageManifest(self.storage_root())
+
+    @staticmethod
+    def _manifest_entry(path: Path, digest_sha: str, text: str, dataset: str | None) -> ManifestEntry:
+        kind = str(DatasetService._infer_metadata_from_text(text).get("kind") or "document")
+        return StorageManifest.entry_for(path, digest_sha, text, dataset=dataset, kind=kind)
+
     async def read_storage_text(self, *, digest_sha: str) -> str | None:
-        if digest_sha in self._STORAGE_CACHE:
-            return self._STORAGE_CACHE[digest_sha]
+        cached = self._STORAGE_CACHE.get(digest_sha)
+        if cached is not None:
+            return cached
 
+        store = self.packfile()
         path = self.storage_path_for_sha(digest_sha)
         if path is None:
             return None
 
-        if not path.exists():
+        if store is None and not path.exists():
             return None
 
         try:
-            text = await asyncio.to_thread(path.read_text, encoding="utf-8")
-            self._STORAGE_CACHE[digest_sha] = text
+            if store is not None:
+                text = await asyncio.to_thread(store.get, digest_sha)
+            else:
+                text = await asyncio.to_thread(path.read_text, encoding="utf-8")
+            if text is None:
+                return None
+            self._STORAGE_CACHE.put(digest_sha, text)
             return text
         except Exception as exc:
             self.dataset_service.log_once(
@@ -75,31 +117,35 @@ class StorageService:
             )
             return None
 
+    @staticmethod
+    def _ensure_md5_mirror(path: Path, text: str) -> None:
+        try:
+            from hashlib import md5 as _md5
+
+            md5_hex = _md5(text.encode("utf-8")).hexdigest()
+            md5_path = path.parent / f"text_{md5_hex}.txt"
+            if not md5_path.exists():
+                try:
+                    md5_path.symlink_to(path.name)
+                    logger.debug(f"md5_mirror_link_created md5={md5_hex[:12]} -> {path.name[:16]}")
+                except Exception:
+                    if not md5_path.exists():
+                        md5_path.write_text(text, encoding="utf-8")
+                        logger.debug(f"md5_mirror_file_created md5={md5_hex[:12]} bytes={len(text.encode('utf-8'))}")
+        except Exception as md5_exc:
+            logger.debug(f"md5_mirror_skip reason={md5_exc}")
+
     def ensure_storage_file(
         self, *, digest_sha: str, text: str, dataset: str | None = None
     ) -> tuple[Path | None, bool]:
+        if self.packfile() is not None:
+            return self.ensure_storage_files([(digest_sha, text)], dataset=dataset)[0]
         path = self.storage_path_for_sha(digest_sha)
         if path is None:
             return None, False
 
         if path.exists():
-            try:
-                from hashlib import md5 as _md5
-
-                md5_hex = _md5(text.encode("utf-8")).hexdigest()
-                md5_path = path.parent / f"text_{md5_hex}.txt"
-                if not md5_path.exists():
-                    try:
-                        md5_path.symlink_to(path.name)
-                        logger.debug(f"md5_mirror_link_created md5={md5_hex[:12]} -> {path.name[:16]}")
-                    except Exception:
-                        if not md5_path.exists():
-                            md5_path.write_text(text, encoding="utf-8")
-                            logger.debug(
-                                f"md5_mirror_file_created md5={md5_hex[:12]} bytes={len(text.encode('utf-8'))}"
-                            )
-            except Exception as md5_exc:
-                logger.debug(f"md5_mirror_skip reason={md5_exc}")
+            self._ensure_md5_mirror(path, text)
             return path, False
 
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -110,24 +156,8 @@ class StorageService:
                 handle.flush()
                 os.fsync(handle.fileno())
             temp_path.replace(path)
-
-            try:
-                from hashlib import md5 as _md5
-
-                md5_hex = _md5(text.encode("utf-8")).hexdigest()
-                md5_path = path.parent / f"text_{md5_hex}.txt"
-                if not md5_path.exists():
-                    try:
-                        md5_path.symlink_to(path.name)
-                        logger.debug(f"md5_mirror_link_created md5={md5_hex[:12]} -> {path.name[:16]}")
-                    except Exception:
-                        if not md5_path.exists():
-                            md5_path.write_text(text, encoding="utf-8")
-                            logger.debug(
-                                f"md5_mirror_file_created md5={md5_hex[:12]} bytes={len(text.encode('utf-8'))}"
-                            )
-            except Exception as md5_exc:
-                logger.debug(f"md5_mirror_skip reason={md5_exc}")
+            self._ensure_md5_mirror(path, text)
+            StorageManifest(path.parent).record([self._manifest_entry(path, digest_sha, text, dataset)])
 
             logger.debug(f"kb_storage ensure sha={digest_sha[:12]} created=True")
             return path, True
@@ -143,6 +173,87 @@ class StorageService:
                 pass
             return None, False
 
+    def ensure_storage_files(
+        self, items: Sequence[tuple[str, str]], *, dataset: str | None = None
+    ) -> list[tuple[Path | None, bool]]:
+        """Batch variant of ``ensure_storage_file`` for ``(digest_sha, text)`` pairs.
+
+        Files are written and renamed without per-file fsync; the storage
+        directory is fsync'd once after the batch so the renames are durable.
+        With the packfile backend the batch is one segment append instead.
+        """
+        store = self.packfile()
+        if store is not None:
+            return self._ensure_packed(store, items, dataset=dataset)
+        results: list[tuple[Path | None, bool]] = []
+        entries: list[ManifestEntry] = []
+        written = 0
+        root: Path | None = None
+        for digest_sha, text in items:
+            path = self.storage_path_for_sha(digest_sha)
+            if path is None:
+                results.append((None, False))
+                continue
+            if path.exists():
+                self._ensure_md5_mirror(path, text)
+                results.append((path, False))
+                continue
+            root = path.parent
+            root.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(path.suffix + ".tmp")
+            try:
+                temp_path.write_text(text, encoding="utf-8")
+                temp_path.replace(path)
+            except Exception as exc:
+                logger.warning(
+                    f"knowledge_storage_write_failed digest_sha={digest_sha[:12]} "
+                    f"dataset={dataset or 'unknown'} path={path} detail={exc}"
+                )
+                temp_path.unlink(missing_ok=True)
+                results.append((None, False))
+                continue
+            self._ensure_md5_mirror(path, text)
+            entries.append(self._manifest_entry(path, digest_sha, text, dataset))
+            results.append((path, True))
+            written += 1
+        if written and root is not None:
+            StorageManifest(root).record(entries)
+            try:
+                dir_fd = os.open(root, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError as exc:
+                logger.debug(f"kb_storage dir_fsync_failed path={root} detail={exc}")
+        logger.debug(f"kb_storage ensure_batch dataset={dataset or 'unknown'} items={len(items)} created={written}")
+        return results
+
+    def _ensure_packed(
+        self, store: PackfileStore, items: Sequence[tuple[str, str]], *, dataset: str | None
+    ) -> list[tuple[Path | None, bool]]:
+        valid = [(digest_sha, text) for digest_sha, text in items if self.storage_path_for_sha(digest_sha) is not None]
+        kinds = [str(DatasetService._infer_metadata_from_text(text).get("kind") or "document") for _, text in valid]
+        try:
+            created = iter(store.put_many(valid, dataset=dataset, kinds=kinds))
+        except OSError as exc:
+            logger.warning(
+                f"knowledge_storage_write_failed backend=packfile dataset={dataset or 'unknown'} detail={exc}"
+            )
+            return [(None, False) for _ in items]
+        results: list[tuple[Path | None, bool]] = []
+        for digest_sha, _ in items:
+            if self.storage_path_for_sha(digest_sha) is None:
+                results.append((None, False))
+            else:
+                results.append((store.root, next(created)))
+        written = sum(1 for _, flag in results if flag)
+        logger.debug(
+            f"kb_storage ensure_batch backend=packfile dataset={dataset or 'unknown'} "
+            f"items={len(items)} created={written}"
+        )
+        return results
+
     async def heal_dataset_storage(
         self, dataset: str, user_ctx: Any | None, *, entries: Sequence[DatasetRow] | None = None, reason: str
     ) -> tuple[int, int]:
@@ -174,7 +285,7 @@ class StorageService:
             storage_path = self.storage_path_for_sha(digest_sha)
             if storage_path is None:
                 continue
-            sha_exists = storage_path.exists()
+            sha_exists = self.has_storage_text(digest_sha)
             if not sha_exists:
                 missing += 1
             _, created = self.ensure_storage_file(
@@ -195,77 +306,178 @@ class StorageService:
             self.log_storage_state(alias, missing_count=missing, healed_count=healed)
         return missing, healed
 
-    async def rebuild_from_disk(self, alias: str) -> tuple[int, int]:
-        storage_root = self.storage_root()
-        if not storage_root.exists():
-            return 0, 0
-        created = 0
-        linked = 0
-        mismatch_count = 0
-        unreadable_count = 0
-        empty_count = 0
-        for path in storage_root.glob("text_*.txt"):
-            digest_match = re.match(r"^text_([0-9a-f]{64})\.txt$", path.name)
-            if not digest_match:
-                if re.match(r"^text_([0-9a-f]{32})\.txt$", path.name):
-                    self.dataset_service.log_once(logging.INFO, "rebuild_disk_md5_ignored", path=path.name)
-                continue
-            digest_sha_from_name = digest_match.group(1)
+    @staticmethod
+    def _scan_storage(root: Path) -> list[tuple[str, Path, int, int]]:
+        files: list[tuple[str, Path, int, int]] = []
+        with os.scandir(root) as entries:
+            for entry in entries:
+                digest_match = _SHA_FILENAME.match(entry.name)
+                if not digest_match:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((digest_match.group(1), Path(entry.path), stat.st_size, stat.st_mtime_ns))
+        return files
+
+    def _read_for_rebuild(
+        self, alias: str, files: Sequence[tuple[str, Path, int, int]]
+    ) -> list[tuple[str, str, dict[str, Any] | None, ManifestEntry | None]]:
+        """Read, normalize and verify files; runs on a rebuild worker thread."""
+        results: list[tuple[str, str, dict[str, Any] | None, ManifestEntry | None]] = []
+        for digest_sha, path, _, _ in files:
             try:
-                contents = await asyncio.to_thread(path.read_text, encoding="utf-8")
+                contents = path.read_text(encoding="utf-8")
             except Exception as exc:
-                logger.debug(
-                    f"knowledge_rebuild_read_failed dataset={alias} sha={digest_sha_from_name[:12]} detail={exc}"
-                )
-                unreadable_count += 1
+                logger.debug(f"knowledge_rebuild_read_failed dataset={alias} sha={digest_sha[:12]} detail={exc}")
+                results.append(("unreadable", digest_sha, None, None))
                 continue
-            # logger.debug(f"rebuild_read_ok path={path} bytes={len(contents)}")
             normalized = normalize_text(contents)
             if not normalized:
-                empty_count += 1
                 logger.debug(f"rebuild_empty_content path={path}")
+                results.append(("empty", digest_sha, None, None))
                 continue
             digest_sha_from_content = self.compute_digests(normalized, dataset_alias=alias)
-            if digest_sha_from_content != digest_sha_from_name:
+            if digest_sha_from_content != digest_sha:
                 logger.warning(
                     f"knowledge_rebuild_digest_mismatch dataset={alias} "
-                    f"path_sha={digest_sha_from_name[:12]} content_sha={digest_sha_from_content[:12]}"
+                    f"path_sha={digest_sha[:12]} content_sha={digest_sha_from_content[:12]}"
                 )
-                mismatch_count += 1
+                results.append(("mismatch", digest_sha, None, None))
                 continue
-            inferred_metadata = self.dataset_service._infer_metadata_from_text(
-                normalized,
-                {"dataset": alias},
-            )
-            metadata = self.augment_metadata(
-                inferred_metadata,
-                alias,
-                digest_sha=digest_sha_from_content,
-            )
+            inferred = self.dataset_service._infer_metadata_from_text(normalized, {"dataset": alias})
             try:
-                already = await HashStore.contains(alias, digest_sha_from_content)
-                await HashStore.add(alias, digest_sha_from_content, metadata=metadata)
-            except Exception as exc:
-                logger.debug(
-                    "knowledge_rebuild_hashstore_failed "
-                    f"dataset={alias} sha={digest_sha_from_content[:12]} detail={exc}"
+                entry = StorageManifest.entry_for(
+                    path, digest_sha, normalized, dataset=alias, kind=str(inferred.get("kind") or "document")
                 )
+            except OSError:
+                entry = None
+            results.append(("ok", digest_sha, inferred, entry))
+        return results
+
+    async def rebuild_from_disk(self, alias: str) -> tuple[int, int]:
+        """Link every ``text_<sha>.txt`` in storage into ``alias`` in HashStore.
+
+        Files whose size and mtime match the manifest are trusted without being
+        read; the rest are read on a bounded thread pool and re-recorded. The
+        packfile backend serves everything from its index.
+        """
+        storage_root = self.storage_root()
+        if not storage_root.exists():
+            return 0, 0
+        started = time.perf_counter()
+        store = self.packfile()
+        if store is not None:
+            records = await asyncio.to_thread(store.records)
+            packed = {
+                digest: {"dataset": alias, "bytes": record.length, "kind": record.kind}
+                for digest, record in records.items()
+            }
+            created, linked = await self._link_rebuilt(alias, packed)
+            self._log_rebuild(alias, started, files=len(packed), reread=0, created=created, linked=linked)
+            return created, linked
+        manifest = StorageManifest(storage_root)
+        files = await asyncio.to_thread(self._scan_storage, storage_root)
+        known, manifest_lines = await asyncio.to_thread(manifest.load)
+
+        metadata_by_digest: dict[str, dict[str, Any]] = {}
+        live: dict[str, ManifestEntry] = {}
+        stale: list[tuple[str, Path, int, int]] = []
+        for digest_sha, path, size, mtime_ns in files:
+            entry = known.get(digest_sha)
+            if entry is None or not entry.matches(size, mtime_ns):
+                stale.append((digest_sha, path, size, mtime_ns))
                 continue
-            linked += 1
-            if not already:
-                created += 1
-        if created > 0 or linked > 0 or mismatch_count > 0 or unreadable_count > 0 or empty_count > 0:
-            logger.debug(
-                "rebuild:summary dataset={} created={} linked={} mismatches={} unreadable={} empty={}",
-                alias,
-                created,
-                linked,
-                mismatch_count,
-                unreadable_count,
-                empty_count,
-            )
+            live[digest_sha] = entry
+            metadata_by_digest[digest_sha] = {"dataset": alias, "bytes": entry.size, "kind": entry.kind}
+
+        counts = {"unreadable": 0, "empty": 0, "mismatch": 0}
+        refreshed: list[ManifestEntry] = []
+        if stale:
+            workers = max(1, settings.AI_COACH_STORAGE_REBUILD_WORKERS)
+            chunk = max(1, min(_REBUILD_CHUNK, -(-len(stale) // workers)))
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kb-rebuild") as pool:
+                batches = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(pool, self._read_for_rebuild, alias, stale[offset : offset + chunk])
+                        for offset in range(0, len(stale), chunk)
+                    )
+                )
+            for status, digest_sha, inferred, entry in (item for batch in batches for item in batch):
+                if status != "ok" or inferred is None:
+                    counts[status] += 1
+                    continue
+                metadata_by_digest[digest_sha] = inferred
+                if entry is not None:
+                    live[digest_sha] = entry
+                    refreshed.append(entry)
+
+        if len(known) != len(live) or manifest_lines > 2 * max(len(live), 1):
+            await asyncio.to_thread(manifest.compact, live.values())
+        elif refreshed:
+            await asyncio.to_thread(manifest.record, refreshed)
+
+        created, linked = await self._link_rebuilt(alias, metadata_by_digest)
+        self._log_rebuild(alias, started, files=len(files), reread=len(stale), created=created, linked=linked, **counts)
         return created, linked
 
+    async def _link_rebuilt(self, alias: str, metadata_by_digest: Mapping[str, Mapping[str, Any]]) -> tuple[int, int]:
+        created = 0
+        linked = 0
+        digests = list(metadata_by_digest)
+        for offset in range(0, len(digests), _REBUILD_HASHSTORE_BATCH):
+            batch = digests[offset : offset + _REBUILD_HASHSTORE_BATCH]
+            try:
+                already = await HashStore.contains_many(alias, batch)
+                await HashStore.add_many(
+                    alias,
+                    {
+                        digest: self.augment_metadata(metadata_by_digest[digest], alias, digest_sha=digest)
+                        for digest in batch
+                    },
+                )
+            except Exception as exc:
+                logger.debug(f"knowledge_rebuild_hashstore_failed dataset={alias} items={len(batch)} detail={exc}")
+                continue
+            linked += len(batch)
+            created += sum(1 for digest in batch if not already.get(digest))
+        return created, linked
+
+    @staticmethod
+    def _log_rebuild(
+        alias: str,
+        started: float,
+        *,
+        files: int,
+        reread: int,
+        created: int,
+        linked: int,
+        mismatch: int = 0,
+        unreadable: int = 0,
+        empty: int = 0,
+    ) -> None:
+        elapsed = time.perf_counter() - started
+        if not (files or created or linked):
+            return
+        logger.info(
+            "rebuild:summary dataset={} backend={} files={} reread={} manifest_hits={} created={} linked={} "
+            "mismatches={} unreadable={} empty={} duration_ms={:.1f} files_per_sec={:.0f}",
+            alias,
+            settings.AI_COACH_STORAGE_BACKEND,
+            files,
+            reread,
+            files - reread,
+            created,
+            linked,
+            mismatch,
+            unreadable,
+            empty,
+            elapsed * 1000,
+            files / elapsed if elapsed > 0 else 0.0,
+        )
+
     async def reingest_from_hashstore(
         self,
         alias: str,
@@ -301,6 +513,7 @@ class StorageService:
             logger.debug(f"knowledge_reingest_failed dataset={alias} reason=missing_user")
             return result
 
+        pending: list[tuple[str, Mapping[str, Any] | None]] = []
         for digest_sha, metadata in digests:
             path = self.storage_path_for_sha(digest_sha)
             if path is None:
@@ -310,7 +523,7 @@ class StorageService:
             # logger.debug(f"[reingest_probe] sha={digest_sha} path_attempt={path}")
 
             normalized = None
-            if path.exists():
+            if self.has_storage_text(digest_sha):
                 try:
                     raw_text = await self.read_storage_text(digest_sha=digest_sha)
                     if raw_text:
@@ -318,7 +531,7 @@ class StorageService:
                         normalized = normalize_text(raw_text)
                 except Exception as exc:
                     logger.debug(f"knowledge_reingest_read_failed dataset={alias} sha={digest_sha[:12]} detail={exc}")
-            else:
+            elif self.packfile() is None:
                 md5_path = StorageResolver.map_sha_to_md5_path(digest_sha, self.storage_root())
                 if md5_path and md5_path.exists():
                     try:
@@ -364,29 +577,31 @@ class StorageService:
             if kind == "message":
                 continue
             meta_payload = dict(metadata) if isinstance(metadata, Mapping) else None
+            logger.debug(f"reingest.update_call dataset={alias} digest={digest_sha[:12]}")
+            pending.append((normalized, meta_payload))
+
+        if pending:
             reingest_user = raw_user if raw_user is not None else actor
             try:
-                # CRITICAL: We pass force_ingest=True to bypass HashStore check inside update_dataset.
-                # Since we are re-ingesting from HashStore, the hash is inherently already there.
-                logger.debug(f"reingest.update_call dataset={alias} digest={digest_sha[:12]}")
-                dataset_name, created = await kb.update_dataset(
-                    normalized,
+                # CRITICAL: We pass force_ingest=True to bypass the HashStore check inside the batch.
+                # Since we are re-ingesting from HashStore, the hashes are inherently already there.
+                dataset_name, created = await kb.update_dataset_batch(
+                    pending,
                     alias,
                     user=reingest_user,
                     node_set=None,
-                    metadata=meta_payload,
                     force_ingest=True,
                     trigger_projection=False,
                 )
             except Exception as exc:
                 result.healed = False
                 result.reason = getattr(exc, "args", ("update_dataset_failed",))[0]
-                logger.debug(f"knowledge_reingest_failed dataset={alias} digest_sha={digest_sha[:12]} detail={exc}")
-                break
-            if created:
-                result.reinserted += 1
-                self.dataset_service.register_dataset_identifier(alias, dataset_name)
-                result.last_dataset = dataset_name
+                logger.debug(f"knowledge_reingest_failed dataset={alias} items={len(pending)} detail={exc}")
+            else:
+                result.reinserted = sum(1 for flag in created if flag)
+                if result.reinserted:
+                    self.dataset_service.register_dataset_identifier(alias, dataset_name)
+                    result.last_dataset = dataset_name
 
         if result.reinserted:
             result.rehydrated = result.reinserted
@@ -478,6 +693,20 @@ class StorageService:
             normalized = self.dataset_service.alias_for_dataset(name)
             if normalized and normalized != alias:
                 other_aliases.append(normalized)
+        store = self.packfile()
+        if store is not None:
+            doomed = [
+                digest_sha
+                for digest_sha in digests
+                if not await self._digest_in_use_elsewhere(digest_sha, other_aliases)
+            ]
+            removed = await asyncio.to_thread(store.delete_many, doomed)
+            if removed:
+                logger.debug(
+                    f"storage_cleanup backend=packfile dataset={alias} removed={removed} digests={len(digests)}"
+                )
+                self._schedule_compaction(store)
+            return removed
         removed = 0
         for digest_sha in digests:
             if await self._digest_in_use_elsewhere(digest_sha, other_aliases):
@@ -501,6 +730,25 @@ class StorageService:
             logger.debug(f"storage_cleanup dataset={alias} removed={removed} digests={len(digests)}")
         return removed
 
+    @classmethod
+    def _schedule_compaction(cls, store: PackfileStore) -> None:
+        ratio = settings.AI_COACH_PACKFILE_COMPACT_RATIO
+        if ratio <= 0 or store.garbage_ratio() < ratio:
+            return
+        if cls._COMPACTION_TASK is not None and not cls._COMPACTION_TASK.done():
+            return
+        task = asyncio.create_task(asyncio.to_thread(store.compact, ratio))
+        cls._COMPACTION_TASK = task
+        task.add_done_callback(cls._log_compaction_result)
+
+    @staticmethod
+    def _log_compaction_result(task: asyncio.Task[int]) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.warning(f"kb_packfile.compaction_failed detail={exc}")
+
     async def _digest_in_use_elsewhere(self, digest_sha: str, dataset_names: Sequence[str]) -> bool:
         from ai_coach.agent.knowledge.utils.hash_store import HashStore
 
@@ -520,27 +768,29 @@ class StorageService:
         md5_removed_count = 0
         sha_final_count = 0
 
-        all_aliases = await HashStore.list_all_datasets() if hasattr(HashStore, "list_all_datasets") else []
+        all_aliases = await HashStore.list_all_datasets()
         for alias in all_aliases:
             digests_to_process = await HashStore.list(alias)
+            stale: list[str] = []
+            converted: dict[str, Mapping[str, Any]] = {}
             for digest in digests_to_process:
                 if len(digest) == 32:
                     md5_found_count += 1
+                    stale.append(digest)
                     metadata = await HashStore.metadata(alias, digest)
                     if metadata and metadata.get("text"):
                         content = str(metadata["text"])
                         sha256_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
-                        if await HashStore.contains(alias, sha256_hash):
-                            await HashStore.remove(alias, digest)
+                        if sha256_hash in digests_to_process or sha256_hash in converted:
                             md5_removed_count += 1
                         else:
-                            await HashStore.remove(alias, digest)
-                            await HashStore.add(alias, sha256_hash, metadata)
+                            converted[sha256_hash] = metadata
                             md5_converted_count += 1
                     else:
-                        await HashStore.remove(alias, digest)
                         md5_removed_count += 1
-            sha_final_count += len(await HashStore.list(alias))
+            await HashStore.remove_many(alias, stale)
+            await HashStore.add_many(alias, converted)
+            sha_final_count += await HashStore.count(alias)
 
         if md5_found_count > 0:
             logger.info(
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from hashlib import md5
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestEntry:
+    digest: str
+    dataset: str
+    size: int
+    mtime_ns: int
+    md5: str
+    kind: str = "document"
+
+    def matches(self, size: int, mtime_ns: int) -> bool:
+        return self.size == size and self.mtime_ns == mtime_ns
+
+
+class StorageManifest:
+    """Append-only record of storage files with their size, mtime and checksums.
+
+    Every write appends its lines with a single ``O_APPEND`` write so concurrent
+    writers never interleave partial records; the last line for a digest wins.
+    ``compact`` rewrites the live entries through a temp file and ``os.replace``.
+    A lost or stale record only costs a re-read during rebuild.
+    """
+
+    FILENAME = ".kb_manifest.jsonl"
+    _lock = threading.Lock()
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.path = root / self.FILENAME
+
+    @staticmethod
+    def entry_for(path: Path, digest: str, text: str, *, dataset: str | None, kind: str = "document") -> ManifestEntry:
+        stat = path.stat()
+        return ManifestEntry(
+            digest=digest,
+            dataset=dataset or "",
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            md5=md5(text.encode("utf-8")).hexdigest(),
+            kind=kind,
+        )
+
+    def record(self, entries: Iterable[ManifestEntry]) -> None:
+        payload = "".join(json.dumps(asdict(entry), separators=(",", ":")) + "\n" for entry in entries)
+        if not payload:
+            return
+        try:
+            with self._lock:
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, payload.encode("utf-8"))
+                finally:
+                    os.close(fd)
+        except OSError as exc:
+            logger.debug(f"kb_manifest.record_failed path={self.path} detail={exc}")
+
+    def load(self) -> tuple[dict[str, ManifestEntry], int]:
+        """Return live entries by digest and the number of lines read."""
+        entries: dict[str, ManifestEntry] = {}
+        lines = 0
+        try:
+            with self.path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    lines += 1
+                    try:
+                        entry = ManifestEntry(**json.loads(line))
+                    except (TypeError, ValueError):
+                        continue
+                    entries[entry.digest] = entry
+        except FileNotFoundError:
+            return {}, 0
+        except OSError as exc:
+            logger.debug(f"kb_manifest.load_failed path={self.path} detail={exc}")
+        return entries, lines
+
+    def compact(self, entries: Iterable[ManifestEntry]) -> None:
+        temp_path = self.path.with_suffix(".tmp")
+        payload = "".join(json.dumps(asdict(entry), separators=(",", ":")) + "\n" for entry in entries)
+        try:
+            with self._lock:
+                temp_path.write_text(payload, encoding="utf-8")
+                os.replace(temp_path, self.path)
+        except OSError as exc:
+            temp_path.unlink(missing_ok=True)
+            logger.debug(f"kb_manifest.compact_failed path={self.path} detail={exc}")
@@ -1,6 +1,7 @@
 import json
 import os
 import re
+from collections.abc import AsyncIterator
 from functools import wraps
 from time import perf_counter
 from typing import Any, Awaitable, Callable, ClassVar, Mapping, Optional, Sequence, TypeVar, cast, Protocol
@@ -16,7 +17,7 @@ from pydantic_ai.settings import ModelSettings  # pyrefly: ignore[import-error]
 from config.app_settings import settings
 from ai_coach.agent.base import AgentDeps
 from ai_coach.agent.knowledge.schemas import KnowledgeSnippet
-from ai_coach.agent.prompts import COACH_SYSTEM_PROMPT, ASK_AI_USER_PROMPT, agent_instructions
+from ai_coach.agent.prompts import COACH_SYSTEM_PROMPT, ASK_AI_STREAM_PROMPT, ASK_AI_USER_PROMPT, agent_instructions
 from ai_coach.agent.tools import toolset
 from ai_coach.agent.utils import get_knowledge_base, resolve_language_name
 from ai_coach.agent.knowledge.utils.helpers import (
@@ -28,6 +29,7 @@ from ai_coach.agent.knowledge.utils.helpers import (
 )
 from ai_coach.exceptions import AgentExecutionAborted
 from ai_coach.types import MessageRole
+from core.ai_coach.answer_stream import AnswerStreamPublisher
 from core.schemas import QAResponse, QAResponseBlock
 
 
@@ -70,6 +72,17 @@ class LLMHelperProto(Protocol):
         prefetched_knowledge: Sequence[KnowledgeSnippet] | None = None,
     ) -> QAResponse | None: ...
 
+    @classmethod
+    async def _stream_answer_question(
+        cls,
+        prompt: str,
+        deps: AgentDeps,
+        raw_history: Sequence[str],
+        *,
+        publisher: AnswerStreamPublisher,
+        profile_context: str | None = None,
+    ) -> QAResponse | None: ...
+
     @staticmethod
     def _normalize_text(text: str | None) -> str: ...
 
@@ -137,6 +150,32 @@ class LLMHelper:
         }
         return await client.chat.completions.create(**kwargs)  # pyrefly: ignore[no-untyped-call]
 
+    @staticmethod
+    async def call_llm_stream(
+        client: AsyncOpenAI,
+        messages: Sequence[dict[str, str]],
+        *,
+        model: str,
+        max_tokens: int,
+    ) -> AsyncIterator[str]:
+        """Yield the completion text deltas as the model produces them."""
+        kwargs: dict[str, Any] = {
+            "model": model,
+            "messages": list(messages),
+            "temperature": settings.COACH_AGENT_TEMPERATURE,
+            "max_tokens": max_tokens,
+            "tool_choice": "none",
+            "stream": True,
+        }
+        stream = await client.chat.completions.create(**kwargs)  # pyrefly: ignore[no-untyped-call]
+        async for chunk in stream:
+            choices = getattr(chunk, "choices", None) or []
+            if not choices:
+                continue
+            content = getattr(getattr(choices[0], "delta", None), "content", None)
+            if isinstance(content, str) and content:
+                yield content
+
     @classmethod
     def _language_context(cls, deps: AgentDeps) -> tuple[str, str]:
         default_lang: str = getattr(settings, "DEFAULT_LANG", "en") or "en"
@@ -441,6 +480,86 @@ class LLMHelper:
         logger.warning(f"agent.ask fallback missing_answer profile_id={deps.profile_id} kb_empty=True")
         return None
 
+    @staticmethod
+    def _history_chat_messages(raw: Sequence[str]) -> list[dict[str, str]]:
+        messages: list[dict[str, str]] = []
+        for item in raw:
+            if item.startswith(f"{MessageRole.CLIENT.value}:"):
+                role = "user"
+            elif item.startswith(f"{MessageRole.AI_COACH.value}:"):
+                role = "assistant"
+            else:
+                continue
+            text = item.split(":", 1)[1].strip()
+            if text:
+                messages.append({"role": role, "content": text})
+        return messages
+
+    @classmethod
+    async def _stream_answer_question(
+        cls,
+        prompt: str,
+        deps: AgentDeps,
+        raw_history: Sequence[str],
+        *,
+        publisher: AnswerStreamPublisher,
+        profile_context: str | None = None,
+    ) -> QAResponse | None:
+        """Answer with one streamed completion over prefetched knowledge, publishing text as it arrives."""
+        client, model_name = cls.get_completion_client()
+        cls._ensure_llm_logging(client, model_name)
+        knowledge: Sequence[KnowledgeSnippet] = []
+        kb = get_knowledge_base()
+        if settings.AI_COACH_KB_ENABLED:
+            try:
+                knowledge = await kb.search(prompt, deps.profile_id, 6, request_id=deps.request_rid)
+            except Exception as exc:  # noqa: BLE001 - log and continue with empty knowledge
+                logger.warning(f"agent.ask.stream knowledge_failed profile_id={deps.profile_id} error={exc}")
+        entries = filter_entries_for_prompt(prompt, build_knowledge_entries(knowledge))
+        entry_datasets = [
+            kb.dataset_service.alias_for_dataset(entry.dataset) if entry.dataset else "" for entry in entries
+        ]
+        deps.knowledge_base_empty = len(entries) == 0
+        deps.kb_used = not deps.knowledge_base_empty
+        _, language_label = cls._language_context(deps)
+        user_prompt = ASK_AI_STREAM_PROMPT.format(
+            language=language_label,
+            question=prompt,
+            profile_context=profile_context or "Profile data: not provided.",
+        )
+        knowledge_section = format_knowledge_entries(entries)
+        if knowledge_section:
+            user_prompt = f"{user_prompt}\n\nKnowledge entries:\n{knowledge_section}"
+        messages = [
+            {"role": "system", "content": COACH_SYSTEM_PROMPT},
+            *cls._history_chat_messages(raw_history),
+            {"role": "user", "content": user_prompt},
+        ]
+        started = perf_counter()
+        first_segment_ms: float | None = None
+        parts: list[str] = []
+        async for delta in cls.call_llm_stream(
+            client,
+            messages,
+            model=model_name,
+            max_tokens=settings.AI_COACH_FIRST_PASS_MAX_TOKENS,
+        ):
+            parts.append(delta)
+            await publisher.push(delta)
+            if first_segment_ms is None and publisher.segments:
+                first_segment_ms = (perf_counter() - started) * 1000.0
+        await publisher.flush()
+        answer = cls._strip_markup("".join(parts)).strip()
+        logger.info(
+            f"agent.ask.stream profile_id={deps.profile_id} answer_len={len(answer)} segments={publisher.segments} "
+            f"first_segment_ms={first_segment_ms or 0:.0f} total_ms={(perf_counter() - started) * 1000.0:.0f} "
+            f"kb_used={deps.kb_used}"
+        )
+        if not answer:
+            return None
+        sources = unique_sources(entry_datasets) or (["knowledge_base"] if deps.kb_used else ["general_knowledge"])
+        return QAResponse(answer=answer, sources=sources)
+
     @classmethod
     def get_completion_client(cls) -> tuple[AsyncOpenAI, str]:
         if cls._completion_client is not None and cls._completion_model_name is not None:
@@ -4,6 +4,7 @@ from .prompts import (
     GENERATE_WORKOUT,
     UPDATE_WORKOUT,
     ASK_AI_USER_PROMPT,
+    ASK_AI_STREAM_PROMPT,
     CHAT_SUMMARY_PROMPT,
     REPLACE_EXERCISE_PROMPT,
     DIET_PLAN,
@@ -16,6 +17,7 @@ __all__ = [
     "GENERATE_WORKOUT",
     "UPDATE_WORKOUT",
     "ASK_AI_USER_PROMPT",
+    "ASK_AI_STREAM_PROMPT",
     "CHAT_SUMMARY_PROMPT",
     "REPLACE_EXERCISE_PROMPT",
     "DIET_PLAN",
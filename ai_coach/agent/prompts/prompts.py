@@ -12,6 +12,7 @@ COACH_INSTRUCTIONS: str = _load_template("coach_instructions.txt")
 GENERATE_WORKOUT: str = _load_template("generate_workout.txt")
 UPDATE_WORKOUT: str = _load_template("update_workout.txt")
 ASK_AI_USER_PROMPT: str = _load_template("ask_ai_user_prompt.txt")
+ASK_AI_STREAM_PROMPT: str = _load_template("ask_ai_stream_prompt.txt")
 CHAT_SUMMARY_PROMPT: str = _load_template("chat_summary.txt")
 REPLACE_EXERCISE_PROMPT: str = _load_template("replace_exercise.txt")
 
@@ -62,6 +63,7 @@ __all__ = [
     "GENERATE_WORKOUT",
     "UPDATE_WORKOUT",
     "ASK_AI_USER_PROMPT",
+    "ASK_AI_STREAM_PROMPT",
     "CHAT_SUMMARY_PROMPT",
     "REPLACE_EXERCISE_PROMPT",
     "DIET_PLAN",
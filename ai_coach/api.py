@@ -12,11 +12,14 @@ from ai_coach import application as coach_application
 from ai_coach.application import app, security
 from ai_coach import ask_handler as _ask_handler
 from ai_coach.agent import CoachAgent  # noqa: F401 - re-exported for tests
+from ai_coach.agent.knowledge.utils.embedding_cache import EmbeddingCache
+from ai_coach.agent.knowledge.utils.projection_coordinator import ProjectionCoordinator
 from ai_coach.agent.utils import get_knowledge_base
 from ai_coach.coach_actions import DISPATCH  # noqa: F401 - re-exported for compatibility
 from ai_coach.schemas import AICoachRequest
 from ai_coach.types import CoachMode
 from config.app_settings import settings
+from core.ai_coach.chat_summary import ChatSummaryQueue, run_chat_summary_job
 from core.exceptions import UserServiceError
 from core.utils.redis_lock import get_redis_client
 from core.schemas import DietPlan, Program, QAResponse, Subscription
@@ -57,6 +60,10 @@ async def health_kb() -> dict[str, Any]:
     last_rebuild_info = kb.get_last_rebuild_result()
     gdrive_summary: dict[str, Any] | None = None
     degraded_info = kb.degraded_info()
+    storage_cache = kb.storage_service.cache_stats()
+    projection_queue = await ProjectionCoordinator.snapshot()
+    embedding_cache = EmbeddingCache.shared_stats()
+    chat_summary_queue = await ChatSummaryQueue.snapshot()
     folder_id = settings.KNOWLEDGE_BASE_FOLDER_ID
     if folder_id:
         try:
@@ -77,6 +84,10 @@ async def health_kb() -> dict[str, Any]:
         "last_rebuild_info": last_rebuild_info,
         "gdrive_summary": gdrive_summary,
         "degraded": degraded_info,
+        "storage_cache": storage_cache,
+        "projection_queue": projection_queue,
+        "embedding_cache": embedding_cache,
+        "chat_summary_queue": chat_summary_queue,
     }
 
 
@@ -260,13 +271,13 @@ async def prune_knowledge_base(_: None = Depends(_require_hmac)):
 @app.post("/knowledge/resume/")
 async def resume_knowledge_base(_: None = Depends(_require_hmac)) -> dict[str, Any]:
     kb = get_knowledge_base()
-    return kb.resume_projections()
+    return await kb.resume_projections()
 
 
 @app.post("/internal/knowledge/resume/")
 async def resume_knowledge_base_internal(_: None = Depends(_require_hmac)) -> dict[str, Any]:
     kb = get_knowledge_base()
-    return kb.resume_projections()
+    return await kb.resume_projections()
 
 
 class ProfileSyncRequest(BaseModel):
@@ -369,3 +380,17 @@ async def memify_profile_datasets_public(
     credentials: HTTPBasicCredentials = Depends(_validate_refresh_credentials),
 ) -> dict[str, Any]:
     return await _memify_profile(profile_id, payload)
+
+
+@app.post("/internal/knowledge/profiles/{profile_id}/summarize/")
+async def summarize_chat_session_internal(
+    profile_id: int,
+    _: None = Depends(_require_hmac),
+) -> dict[str, Any]:
+    kb = get_knowledge_base()
+
+    async def _summarize(language: str | None) -> dict[str, Any]:
+        return await kb.maybe_summarize_session(profile_id, language=language)
+
+    result = await run_chat_summary_job(profile_id, _summarize)
+    return {"profile_id": profile_id, "result": result}
@@ -3,7 +3,6 @@ from binascii import Error as BinasciiError
 from hashlib import sha1
 import asyncio
 import os
-from datetime import datetime
 from time import monotonic
 from typing import Any, cast, Iterable
 from uuid import uuid4
@@ -32,7 +31,9 @@ from ai_coach.coach_actions import DISPATCH, CoachAction
 from config.app_settings import settings
 from core.cache import Cache
 from core.enums import SubscriptionPeriod
-from core.schemas import DayExercises, DietPlan, Exercise, Program, Profile, QAResponse, Subscription
+from core.ai_coach.chat_summary import ChatSummaryQueue
+from core.ai_coach.profile_context import ProfileContext, ProfileContextStore, plan_lines, profile_lines
+from core.schemas import DietPlan, Program, Profile, QAResponse, Subscription
 from core.services import APIService
 
 DEFAULT_SPLIT_NUMBER = 3
@@ -43,13 +44,6 @@ _LOG_PAYLOADS = os.getenv("AI_COACH_LOG_PAYLOADS", "").strip() == "1"
 _inflight_requests: dict[str, asyncio.Future] = {}
 _inflight_lock = asyncio.Lock()
 
-WORKOUT_EXPERIENCE_DESCRIPTIONS: dict[str, str] = {
-    "beginner": "a newcomer with little to no structured training or only very sporadic activity, not yet training consistently",  # noqa: E501
-    "amateur": "someone with a few months of experience, training irregularly and comfortable with basic movements",
-    "advanced": "a regular trainee for at least a year, familiar with technique and structured progression patterns",
-    "pro": "long-term, consistent athlete with years of disciplined practice, close to competitive conditioning",
-}
-
 
 def _to_language_code(raw: object, default: str) -> str:
     """Normalize raw language values to a lowercase language code."""
@@ -164,162 +158,40 @@ def _build_context(
         "diet_products": data.diet_products or [],
         "profile_context": profile_context,
         "instructions": data.instructions,
+        "stream_id": data.request_id if data.stream and data.mode == CoachMode.ask_ai else None,
         "deps": deps,
     }
 
 
-def _format_exercise_entry(exercise: Exercise) -> str:
-    details: list[str] = []
-    sets = getattr(exercise, "sets", None)
-    reps = getattr(exercise, "reps", None)
-    if sets and reps:
-        details.append(f"{sets}x{reps}")
-    elif sets:
-        details.append(f"{sets} sets")
-    elif reps:
-        details.append(f"{reps} reps")
-    weight = getattr(exercise, "weight", None)
-    if weight:
-        details.append(f"weight {weight}")
-    if details:
-        return f"{exercise.name} ({', '.join(details)})"
-    return exercise.name
-
-
-def _format_plan_days(days: list[DayExercises], *, max_exercises: int = 8) -> list[str]:
-    lines: list[str] = []
-    for day in days:
-        exercises = day.exercises or []
-        if not exercises:
-            lines.append(f"{day.day}: no exercises")
-            continue
-        entries = [_format_exercise_entry(ex) for ex in exercises[:max_exercises]]
-        if len(exercises) > max_exercises:
-            entries.append("…")
-        lines.append(f"{day.day}: {', '.join(entries)}")
-    return lines
-
-
-def _format_program_label(program: Program, *, ordinal: int | None = None) -> str:
-    created_at = getattr(program, "created_at", None)
-    label = f"Program {ordinal}" if ordinal is not None else "Program"
-    if created_at is not None:
-        return f"{label} (created_at: {created_at})"
-    return label
-
-
-def _format_subscription_label(subscription: Subscription, *, ordinal: int | None = None) -> str:
-    label = f"Subscription {ordinal}" if ordinal is not None else "Subscription"
-    payment_date = getattr(subscription, "payment_date", None)
-    period = getattr(subscription, "period", None)
-    parts = [f"period: {period}" if period else None, f"payment_date: {payment_date}" if payment_date else None]
-    summary = ", ".join(part for part in parts if part)
-    if summary:
-        return f"{label} ({summary})"
-    return label
-
-
 async def _build_profile_context(profile: Profile | None, *, include_plans: bool) -> str | None:
     if profile is None:
         return None
-    lines: list[str] = []
-    workout_goals = getattr(profile, "workout_goals", None)
-    if workout_goals:
-        lines.append(f"Workout goals: {workout_goals}")
-    weight = getattr(profile, "weight", None)
-    if weight:
-        lines.append(f"Weight (kg): {weight}")
-    height = getattr(profile, "height", None)
-    if height:
-        lines.append(f"Height (cm): {height}")
-    workout_experience = getattr(profile, "workout_experience", None)
-    if workout_experience:
-        experience_value = str(workout_experience).lower()
-        experience_description = WORKOUT_EXPERIENCE_DESCRIPTIONS.get(experience_value)
-        if experience_description:
-            lines.append(f"Workout experience: {experience_value} ({experience_description})")
-        else:
-            lines.append(f"Workout experience: {experience_value}")
-    health_notes = getattr(profile, "health_notes", None)
-    if health_notes:
-        lines.append(f"Health notes: {health_notes}")
-    diet_allergies = getattr(profile, "diet_allergies", None)
-    if diet_allergies is not None:
-        allergies = str(diet_allergies).strip()
-        if allergies:
-            lines.append(f"Diet allergies: {allergies}")
-        else:
-            lines.append("Diet allergies: none")
-    diet_products = getattr(profile, "diet_products", None)
-    if diet_products:
-        lines.append(f"Diet products: {', '.join(diet_products)}")
-    gender = getattr(profile, "gender", None)
-    if gender:
-        lines.append(f"Gender: {gender.value}")
-    born_in = getattr(profile, "born_in", None)
-    if born_in:
-        lines.append(f"Birth year: {born_in}")
+    lines = profile_lines(profile)
     if include_plans:
         try:
             programs = await Cache.workout.get_all_programs(profile.id)
         except Exception:  # noqa: BLE001
             programs = []
-        if programs:
-            sorted_programs = sorted(
-                programs,
-                key=lambda program: float(getattr(program, "created_at", 0.0) or 0.0),
-                reverse=True,
-            )
-            programs_added = False
-            for index, program in enumerate(sorted_programs[:3], start=1):
-                try:
-                    program_days = [
-                        day if isinstance(day, DayExercises) else DayExercises.model_validate(day)
-                        for day in program.exercises_by_day
-                    ]
-                except Exception:  # noqa: BLE001
-                    program_days = []
-                if program_days:
-                    if not programs_added:
-                        lines.append("Recent programs:")
-                        programs_added = True
-                    lines.append(_format_program_label(program, ordinal=index))
-                    lines.extend(_format_plan_days(program_days))
         try:
             subscriptions = await Cache.workout.get_all_subscriptions(profile.id)
         except Exception:  # noqa: BLE001
             subscriptions = []
-        if subscriptions:
-
-            def _subscription_sort_key(subscription: Subscription) -> tuple[float, int]:
-                payment_date = getattr(subscription, "payment_date", None)
-                timestamp = 0.0
-                if payment_date:
-                    try:
-                        timestamp = datetime.fromisoformat(str(payment_date)).timestamp()
-                    except ValueError:
-                        timestamp = 0.0
-                return (timestamp, int(getattr(subscription, "id", 0) or 0))
-
-            sorted_subscriptions = sorted(subscriptions, key=_subscription_sort_key, reverse=True)
-            subscriptions_added = False
-            for index, subscription in enumerate(sorted_subscriptions[:3], start=1):
-                try:
-                    sub_days = [
-                        day if isinstance(day, DayExercises) else DayExercises.model_validate(day)
-                        for day in subscription.exercises
-                    ]
-                except Exception:  # noqa: BLE001
-                    sub_days = []
-                if sub_days:
-                    if not subscriptions_added:
-                        lines.append("Recent subscriptions:")
-                        subscriptions_added = True
-                    lines.append(_format_subscription_label(subscription, ordinal=index))
-                    lines.extend(_format_plan_days(sub_days))
+        lines.extend(plan_lines(programs, subscriptions))
     return "\n".join(lines) if lines else None
 
 
+async def _load_profile(profile_id: int) -> tuple[Profile | None, ProfileContext | None]:
+    """Profile and its materialized context with one Redis GET, or the profile from the API on a miss."""
+    if settings.AI_COACH_PROFILE_CONTEXT_ENABLED:
+        materialized = await ProfileContextStore.load(profile_id)
+        if materialized is not None:
+            return materialized.profile, materialized
+    profile = await _fetch_profile(profile_id)
+    if profile is not None and settings.AI_COACH_PROFILE_CONTEXT_ENABLED:
+        await ProfileContextStore.schedule_refresh(profile_id, reason="ask_miss")
+    return profile, None
+
+
 def _normalize_attachments(raw: Any) -> tuple[list[dict[str, str]], int]:
     attachments: list[dict[str, str]] = []
     total_bytes = 0
@@ -625,7 +497,8 @@ async def handle_coach_request(
         )
 
         profile_started = monotonic()
-        profile = await _fetch_profile(data.profile_id)
+        profile, materialized = await _load_profile(data.profile_id)
+        context_source = "materialized" if materialized is not None else "api"
         _log_stage_duration(
             "profile_fetch",
             profile_started,
@@ -633,6 +506,7 @@ async def handle_coach_request(
             profile_id=data.profile_id,
             mode=mode,
             found=str(profile is not None).lower(),
+            source=context_source,
         )
         language = _resolve_language(data.language, profile)
         split_number = data.split_number or DEFAULT_SPLIT_NUMBER
@@ -671,7 +545,20 @@ async def handle_coach_request(
         if not settings.AI_COACH_KB_ENABLED:
             deps.disabled_tools.add("tool_search_knowledge")
         include_plans = mode in {CoachMode.program, CoachMode.subscription, CoachMode.update}
-        profile_context = await _build_profile_context(profile, include_plans=include_plans)
+        context_started = monotonic()
+        if materialized is not None:
+            profile_context = materialized.render(include_plans=include_plans)
+        else:
+            profile_context = await _build_profile_context(profile, include_plans=include_plans)
+        _log_stage_duration(
+            "profile_context",
+            context_started,
+            request_id=data.request_id,
+            profile_id=data.profile_id,
+            mode=mode,
+            source=context_source,
+            include_plans=str(include_plans).lower(),
+        )
         ctx: AskCtx = _build_context(
             data,
             language,
@@ -738,8 +625,7 @@ async def handle_coach_request(
                         sources.extend(str(item).strip() for item in raw_sources if str(item).strip())
                 _log_sources(rid, data.request_id, data.profile_id, deps, cast(QAResponse, result), sources)
                 if isinstance(answer, str):
-                    kb = kb_for_chat or get_knowledge_base()
-                    await kb.maybe_summarize_session(data.profile_id, language=language)
+                    await ChatSummaryQueue.enqueue(data.profile_id, language=language)
                 if settings.AI_COACH_KB_ENABLED and not deps.kb_used:
                     logger.error(
                         "knowledge_base_unavailable request_id={} profile_id={} mode={}",
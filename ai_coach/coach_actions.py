@@ -64,7 +64,8 @@ DISPATCH: dict[CoachMode, CoachAction] = {
         ctx["prompt"] or "",
         deps=ctx["deps"],
         profile_context=ctx.get("profile_context"),
-        **({"attachments": ctx["attachments"]} if ctx.get("attachments") else {}),
+        attachments=ctx.get("attachments"),
+        stream_id=ctx.get("stream_id"),
     ),
     CoachMode.diet: lambda ctx: CoachAgent.generate_diet_plan(
         ctx.get("prompt"),
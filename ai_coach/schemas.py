@@ -31,6 +31,7 @@ class AICoachRequest(BaseModel):
     attachments: list[dict[str, str]] | None = None
     diet_allergies: str | None = None
     diet_products: list[str] | None = None
+    stream: bool = False  # Publish partial ask_ai answers to the request's answer stream
 
     def __init__(self, **data: Any) -> None:
         mode = data.get("mode")
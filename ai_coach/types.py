@@ -43,4 +43,5 @@ class AskCtx(TypedDict):
     diet_products: NotRequired[list[str]]
     profile_context: NotRequired[str | None]
     instructions: NotRequired[str | None]
+    stream_id: NotRequired[str | None]
     deps: NotRequired["AgentDeps"]
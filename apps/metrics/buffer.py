@@ -0,0 +1,131 @@
+"""Write-behind buffer for metrics events.
+
+The request path appends events to the ``metrics:events`` Redis stream instead of writing them to Postgres; the
+periodic ``flush_metrics_events`` task drains the stream with ``bulk_create(..., ignore_conflicts=True)``, so
+repeated events collapse on the ``metrics_event_unique_source`` constraint. Entries are deleted only after their
+batch is committed, which makes a flush safe to repeat. ``created_at`` is taken from the entry ID Redis assigned on
+append, so an event keeps the time it happened even when it is flushed in a later reporting window. When buffering is
+disabled or Redis is unavailable, events are written synchronously as before.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings as django_settings
+from django.utils import timezone
+from loguru import logger
+from redis.exceptions import RedisError
+
+from apps.metrics.models import MetricsEvent
+from config.app_settings import settings
+from core.metrics.constants import METRICS_EVENT_TYPES, METRICS_SOURCES
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+STREAM_KEY = "metrics:events"
+STATS_KEY = "metrics:events:stats"
+
+_client: "Redis | None" = None
+_client_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FlushReport:
+    flushed: int
+    batches: int
+    duration_ms: float
+    depth: int
+
+
+def _get_client() -> "Redis":
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from redis import Redis
+
+                _client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+def buffer_event(event_type: str, source: str, source_id: str) -> bool:
+    """Append a validated event to the stream; False when it was not buffered and must be written directly."""
+    if not settings.METRICS_BUFFER_ENABLED:
+        return False
+    try:
+        _get_client().xadd(STREAM_KEY, {"event_type": event_type, "source": source, "source_id": source_id})
+        return True
+    except RedisError as exc:
+        logger.warning(f"metrics_buffer_append_failed type={event_type} error={exc}")
+        return False
+
+
+def _entry_time(entry_id: str) -> datetime:
+    """Append time of a stream entry: the millisecond part of its ``<ms>-<seq>`` ID."""
+    created_at = datetime.fromtimestamp(int(entry_id.split("-", 1)[0]) / 1000, tz=dt_timezone.utc)
+    return created_at if django_settings.USE_TZ else timezone.make_naive(created_at)
+
+
+def _to_event(entry_id: str, fields: dict[str, Any]) -> MetricsEvent | None:
+    event_type = str(fields.get("event_type") or "")
+    source = str(fields.get("source") or "")
+    source_id = str(fields.get("source_id") or "")
+    if event_type not in METRICS_EVENT_TYPES or source not in METRICS_SOURCES or not source_id:
+        logger.warning(f"metrics_buffer_entry_invalid fields={fields}")
+        return None
+    return MetricsEvent(event_type=event_type, source=source, source_id=source_id, created_at=_entry_time(entry_id))
+
+
+def flush_events(batch_size: int, *, max_batches: int = 100) -> FlushReport:
+    """Move buffered events to the database, ``batch_size`` stream entries per ``bulk_create``."""
+    client = _get_client()
+    started = time.perf_counter()
+    flushed = 0
+    batches = 0
+    while batches < max_batches:
+        entries = client.xrange(STREAM_KEY, "-", "+", count=batch_size)
+        if not entries:
+            break
+        events = [event for entry_id, fields in entries if (event := _to_event(entry_id, fields)) is not None]
+        MetricsEvent.objects.bulk_create(events, ignore_conflicts=True)
+        client.xdel(STREAM_KEY, *[entry_id for entry_id, _ in entries])
+        flushed += len(entries)
+        batches += 1
+        if len(entries) < batch_size:
+            break
+    duration_ms = (time.perf_counter() - started) * 1000
+    depth = int(client.xlen(STREAM_KEY))
+    pipe = client.pipeline(transaction=False)
+    pipe.hset(
+        STATS_KEY,
+        mapping={
+            "last_flush_size": flushed,
+            "last_flush_ms": f"{duration_ms:.1f}",
+            "last_flush_at": int(time.time()),
+        },
+    )
+    pipe.hincrby(STATS_KEY, "flushed_total", flushed)
+    pipe.execute()
+    return FlushReport(flushed=flushed, batches=batches, duration_ms=duration_ms, depth=depth)
+
+
+def buffer_stats() -> dict[str, Any]:
+    """Current stream depth and the outcome of the last flush."""
+    client = _get_client()
+    pipe = client.pipeline(transaction=False)
+    pipe.xlen(STREAM_KEY)
+    pipe.hgetall(STATS_KEY)
+    depth, stats = pipe.execute()
+    return {
+        "depth": int(depth),
+        "last_flush_size": int(stats.get("last_flush_size", 0)),
+        "last_flush_ms": float(stats.get("last_flush_ms", 0.0)),
+        "last_flush_at": int(stats.get("last_flush_at", 0)),
+        "flushed_total": int(stats.get("flushed_total", 0)),
+    }
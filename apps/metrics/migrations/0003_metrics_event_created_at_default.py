@@ -0,0 +1,16 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("metrics", "0002_metrics_event_source"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="metricsevent",
+            name="created_at",
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 
 from django.db.models import Q
+from django.utils import timezone
 
 from core.metrics.constants import (
     METRICS_EVENT_ASK_AI_ANSWER,
@@ -32,7 +33,7 @@ class MetricsEvent(models.Model):
     event_type = models.CharField(max_length=50, choices=MetricsEventType.choices)
     source = models.CharField(max_length=40, choices=MetricsEventSource.choices)
     source_id = models.CharField(max_length=128)
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     class Meta:
         verbose_name = "Metrics event"
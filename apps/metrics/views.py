@@ -5,10 +5,11 @@ from typing import Any
 
 from django.http import HttpRequest, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from loguru import logger
 
 from config.app_settings import settings
+from apps.metrics.buffer import buffer_event, buffer_stats
 from apps.metrics.utils import record_event
 from core.metrics.constants import METRICS_EVENT_TYPES, METRICS_SOURCES
 
@@ -68,5 +69,20 @@ def record_metrics_event(request: HttpRequest) -> JsonResponse:
     if not source_id:
         return JsonResponse({"detail": "Missing source_id"}, status=400)
 
+    if buffer_event(event_type, source, source_id):
+        return JsonResponse({"status": "ok", "buffered": True})
     created = record_event(event_type, source, source_id)
     return JsonResponse({"status": "ok", "created": bool(created)})
+
+
+@csrf_exempt  # type: ignore[bad-specialization]
+@require_GET  # type: ignore[misc]
+def metrics_buffer_stats(request: HttpRequest) -> JsonResponse:
+    ok, error_response = _validate_hmac(request, request.body or b"")
+    if not ok:
+        return error_response or JsonResponse({"detail": "Unauthorized"}, status=403)
+    try:
+        return JsonResponse(buffer_stats())
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"metrics_buffer_stats_failed error={exc}")
+        return JsonResponse({"detail": "Metrics buffer unavailable"}, status=503)
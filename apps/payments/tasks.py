@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Awaitable, Callable, Coroutine, cast
 
 import httpx
@@ -8,6 +7,8 @@ from loguru import logger
 from config.app_settings import settings
 from core.celery_app import app
 from core.internal_http import build_internal_hmac_auth_headers, internal_request_timeout
+from core.services.internal.http_pool import HTTPClientRegistry
+from core.utils.async_runtime import run_async
 
 
 def _internal_headers(body: bytes) -> dict[str, str]:
@@ -29,9 +30,9 @@ async def _post_internal_json(path: str, payload: dict[str, Any]) -> None:
     body = orjson.dumps(payload)
     headers = _internal_headers(body=body)
     timeout = internal_request_timeout(settings)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(url, content=body, headers=headers)
-        response.raise_for_status()
+    client = HTTPClientRegistry.get_client(settings.BOT_INTERNAL_URL.rstrip("/"), settings)
+    response = await client.post(url, content=body, headers=headers, timeout=timeout)
+    response.raise_for_status()
 
 
 def _retryable_call(
@@ -41,7 +42,7 @@ def _retryable_call(
 ) -> None:
     try:
         coroutine = coro_factory()
-        asyncio.run(cast(Coroutine[Any, Any, None], coroutine))
+        run_async(cast(Coroutine[Any, Any, None], coroutine))
     except httpx.HTTPStatusError as exc:
         status = exc.response.status_code if exc.response is not None else None
         logger.warning(f"bot_call_failed status={status} description={description} error={exc}")
@@ -2,6 +2,7 @@ from django.contrib import admin
 from unfold.admin import ModelAdmin
 
 from .models import Profile
+from .repos import ProfileRepository
 
 
 @admin.register(Profile)
@@ -9,3 +10,9 @@ class ProfileAdmin(ModelAdmin):
     list_display = ("id", "tg_id", "language", "status", "credits")  # pyrefly: ignore[bad-override]
     search_fields = ("tg_id",)  # pyrefly: ignore[bad-override]
     list_filter = ("language", "status")  # pyrefly: ignore[bad-override]
+
+    def save_model(self, request, obj, form, change) -> None:
+        super().save_model(request, obj, form, change)
+        ProfileRepository.invalidate_cache(profile_id=obj.pk, tg_id=obj.tg_id)
+        if change and "credits" in form.changed_data:
+            ProfileRepository.invalidate_app_cache(obj.pk, obj.tg_id)
@@ -1,10 +1,31 @@
-from typing import cast
+import threading
+from typing import TYPE_CHECKING, cast
 from django.core.cache import cache
+from loguru import logger
+from redis.exceptions import RedisError
 from rest_framework.exceptions import NotFound
 
 from apps.profiles.models import Profile
 from apps.profiles.serializers import ProfileSerializer
 from config.app_settings import settings
+from core.cache.keys import APP_CACHE_DB, PROFILE_DATA_KEY, PROFILE_TG_INDEX_KEY, app_cache_key
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+_app_cache_client: "Redis | None" = None
+_app_cache_lock = threading.Lock()
+
+
+def _get_app_cache_client() -> "Redis":
+    global _app_cache_client
+    if _app_cache_client is None:
+        with _app_cache_lock:
+            if _app_cache_client is None:
+                from redis import Redis
+
+                _app_cache_client = Redis.from_url(settings.REDIS_URL, db=APP_CACHE_DB, decode_responses=True)
+    return _app_cache_client
 
 
 class ProfileRepository:
@@ -77,3 +98,18 @@ class ProfileRepository:
         cache.delete(f"profile:{profile_id}")
         if tg_id is not None:
             cache.delete(f"profile:tg:{tg_id}")
+
+    @staticmethod
+    def invalidate_app_cache(profile_id: int, tg_id: int | None) -> None:
+        """Drop the bot-side ``app:profiles`` record and its tg_id index entry.
+
+        Used when credits change here, so the bot re-reads the balance instead of serving the cached one.
+        """
+        try:
+            pipe = _get_app_cache_client().pipeline(transaction=False)
+            pipe.hdel(app_cache_key(PROFILE_DATA_KEY), str(profile_id))
+            if tg_id is not None:
+                pipe.hdel(app_cache_key(PROFILE_TG_INDEX_KEY), str(tg_id))
+            pipe.execute()
+        except RedisError as exc:
+            logger.warning(f"Failed to invalidate app profile cache profile_id={profile_id}: {exc}")
@@ -10,7 +10,9 @@ from apps.profiles.models import Profile
 from apps.profiles.choices import ProfileStatus
 from apps.profiles.serializers import ProfileSerializer
 from apps.profiles.repos import ProfileRepository
+from apps.metrics.buffer import buffer_event
 from apps.metrics.utils import record_event
+from core.ai_coach.profile_context import affects_profile_context, enqueue_profile_context_refresh
 from core.metrics.constants import METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE
 
 
@@ -41,7 +43,11 @@ class ProfileAPIUpdate(APIView):
                 profile_id=saved_profile.id,
                 tg_id=getattr(saved_profile, "tg_id", None),
             )
+            if "credits" in request.data:
+                ProfileRepository.invalidate_app_cache(saved_profile.id, getattr(saved_profile, "tg_id", None))
             logger.info(f"Profile id={profile_id} updated")
+            if affects_profile_context(request.data.keys()):
+                enqueue_profile_context_refresh(saved_profile.id, reason="profile_updated")
             try:
                 from core.tasks.ai_coach.maintenance import sync_profile_knowledge
 
@@ -92,6 +98,7 @@ class ProfileAPIDestroy(generics.RetrieveDestroyAPIView):
             ]
         )
         ProfileRepository.invalidate_cache(profile_id=profile_id or 0, tg_id=tg_id)
+        enqueue_profile_context_refresh(profile_id, reason="profile_deleted")
         if profile_id is not None:
             try:
                 from core.tasks.ai_coach.maintenance import cleanup_profile_knowledge
@@ -132,7 +139,8 @@ class ProfileAPIList(generics.ListCreateAPIView):
             return Response(response_data, status=status.HTTP_201_CREATED)
         profile = serializer.save()
         ProfileRepository.invalidate_cache(profile_id=profile.id, tg_id=getattr(profile, "tg_id", None))
-        record_event(METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, str(profile.id))
+        if not buffer_event(METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, str(profile.id)):
+            record_event(METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, str(profile.id))
         self._enqueue_profile_init(profile.id, reason="profile_created")
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
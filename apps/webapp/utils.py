@@ -26,6 +26,7 @@ from apps.profiles.repos import ProfileRepository
 from core.ai_coach.exercise_catalog import search_exercises
 from core.ai_coach.exercise_catalog import load_exercise_catalog
 from core.ai_coach.exercise_catalog.technique_loader import get_exercise_technique, resolve_gif_key_from_canonical_name
+from core.services.gif_cache import ExerciseGIFCache
 from core.services.gstorage_service import ExerciseGIFStorage
 
 T = TypeVar("T")
@@ -353,6 +354,39 @@ def _get_gif_storage() -> ExerciseGIFStorage:
     return ExerciseGIFStorage(settings.EXERCISE_GIF_BUCKET)
 
 
+@lru_cache(maxsize=1)
+def _get_gif_cache() -> ExerciseGIFCache:
+    return ExerciseGIFCache(
+        settings.EXERCISE_GIF_CACHE_DIR,
+        max_bytes=int(settings.EXERCISE_GIF_CACHE_MAX_MB) * 1024 * 1024,
+        ttl_s=int(settings.EXERCISE_GIF_CACHE_TTL_SEC),
+    )
+
+
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Resolve a single ``bytes=`` range against ``size``; ``None`` when it cannot be satisfied.
+
+    Multiple ranges are not supported and are answered with the first one.
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or size <= 0:
+        return None
+    start_raw, _, end_raw = ranges.split(",")[0].strip().partition("-")
+    try:
+        if not start_raw:
+            suffix = int(end_raw)
+            if suffix <= 0:
+                return None
+            return max(size - suffix, 0), size - 1
+        start = int(start_raw)
+        end = int(end_raw) if end_raw else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
 def transform_days(exercises_by_day: list, *, language: str | None = None) -> list[dict]:
     def _normalize_language_code(value: str | None) -> str:
         return str(value or "").strip().lower()
@@ -1,13 +1,16 @@
 import json
 from decimal import Decimal, ROUND_HALF_UP
-from typing import cast
+from typing import BinaryIO, Iterator, cast
 from uuid import uuid4
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import FileResponse, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
 from google.api_core.exceptions import NotFound as GCSNotFound
 from django.shortcuts import render
 from django.views.decorators.http import require_GET, require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from loguru import logger
 from pydantic import ValidationError
 from rest_framework.exceptions import NotFound
@@ -43,9 +46,9 @@ from core.cache import Cache
 from core.enums import WorkoutLocation, PaymentStatus, WorkoutPlanType
 from core.schemas import Program as ProgramSchema, Subscription
 from django.core.cache import cache
-from core.ai_coach.exercise_catalog import load_exercise_catalog
+from core.ai_coach.exercise_catalog import load_exercise_index
 from core.ai_coach.exercise_catalog.technique_loader import get_exercise_technique
-from core.services.gstorage_service import ExerciseGIFStorage
+from core.services.gif_cache import CachedGIF, GIFBucket
 from core.tasks.ai_coach.replace_exercise import (
     enqueue_exercise_replace_task,
     enqueue_subscription_exercise_replace_task,
@@ -63,9 +66,12 @@ from apps.webapp.exercise_replace import (
 )
 from .utils import STATIC_VERSION, transform_days
 from .utils import (
+    _get_gif_cache,
+    _get_gif_storage,
     build_payment_gateway,
     call_repo,
     ensure_container_ready,
+    parse_byte_range,
     parse_program_id,
     parse_subscription_id,
     resolve_credit_package,
@@ -173,35 +179,88 @@ async def program_data(request: HttpRequest) -> JsonResponse:
     return JsonResponse(data)
 
 
+def _gif_headers(response: HttpResponseBase, entry: CachedGIF) -> HttpResponseBase:
+    response["ETag"] = entry.etag
+    response["Last-Modified"] = http_date(entry.last_modified)
+    response["Cache-Control"] = f"public, max-age={int(settings.EXERCISE_GIF_MAX_AGE_SEC)}"
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def _iter_file_range(handle: BinaryIO, start: int, end: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    try:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
 @require_GET  # type: ignore[misc]
-def exercise_gif(request: HttpRequest, gif_key: str) -> HttpResponse:
+def exercise_gif(request: HttpRequest, gif_key: str) -> HttpResponseBase:
     safe_key = str(gif_key or "").strip().lstrip("/")
     if not safe_key:
         return HttpResponse(status=404)
 
-    entries = load_exercise_catalog()
-    if entries and safe_key not in {entry.gif_key for entry in entries}:
+    gif_keys = load_exercise_index().gif_keys
+    if gif_keys and safe_key not in gif_keys:
         logger.warning(f"exercise_gif_rejected gif_key={safe_key}")
         return HttpResponse(status=404)
 
-    storage = ExerciseGIFStorage(settings.EXERCISE_GIF_BUCKET)
+    storage = _get_gif_storage()
     if storage.bucket is None:
         logger.warning("exercise_gif_storage_unavailable")
         return HttpResponse(status=404)
 
-    blob = storage.bucket.blob(safe_key)
+    # ``Blob`` exposes its metadata through custom descriptors, which a Protocol cannot describe.
+    bucket = cast(GIFBucket, storage.bucket)
+    gif_cache = _get_gif_cache()
+    not_modified = None
+    opened = None
     try:
-        content = blob.download_as_bytes()
+        entry = gif_cache.get(bucket, safe_key)
+        if entry is not None:
+            not_modified = get_conditional_response(request, etag=entry.etag, last_modified=entry.last_modified)
+        if entry is not None and not_modified is None:
+            opened = gif_cache.open(bucket, safe_key)
     except GCSNotFound:
-        logger.warning(f"exercise_gif_missing gif_key={safe_key}")
-        return HttpResponse(status=404)
+        entry = opened = None
     except Exception as exc:  # noqa: BLE001
         logger.warning(f"exercise_gif_failed gif_key={safe_key} detail={exc}")
         return HttpResponse(status=502)
+    if entry is not None and not_modified is not None:
+        return _gif_headers(not_modified, entry)
+    if entry is None or opened is None:
+        logger.warning(f"exercise_gif_missing gif_key={safe_key}")
+        return HttpResponse(status=404)
+    entry, handle = opened
+
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (not if_range or if_range == entry.etag):
+        byte_range = parse_byte_range(range_header, entry.size)
+        if byte_range is None:
+            handle.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{entry.size}"
+            return _gif_headers(response, entry)
+        start, end = byte_range
+        partial = StreamingHttpResponse(
+            _iter_file_range(handle, start, end), status=206, content_type=entry.content_type
+        )
+        partial["Content-Range"] = f"bytes {start}-{end}/{entry.size}"
+        partial["Content-Length"] = str(end - start + 1)
+        return _gif_headers(partial, entry)
 
-    response = HttpResponse(content, content_type=blob.content_type or "image/gif")
-    response["Cache-Control"] = "public, max-age=3600"
-    return response
+    response = FileResponse(handle, content_type=entry.content_type)
+    # Only used when the server has no ``wsgi.file_wrapper``; Django's 4 KiB default costs a Python loop per block.
+    response.block_size = 64 * 1024
+    return _gif_headers(response, entry)
 
 
 @require_GET  # type: ignore[misc]
@@ -210,8 +269,8 @@ def exercise_technique(request: HttpRequest, gif_key: str) -> JsonResponse:
     if not safe_key:
         return JsonResponse({"error": "not_found"}, status=404)
 
-    entries = load_exercise_catalog()
-    if entries and safe_key not in {entry.gif_key for entry in entries}:
+    gif_keys = load_exercise_index().gif_keys
+    if gif_keys and safe_key not in gif_keys:
         logger.warning(f"exercise_technique_rejected gif_key={safe_key}")
         return JsonResponse({"error": "not_found"}, status=404)
 
@@ -6,13 +6,16 @@ import datetime
 # pyrefly: ignore-file
 # ruff: noqa
 
+from django.db import connection, transaction
 from django.db.models import QuerySet
+from django.utils import timezone
 from django.core.cache import cache
 from rest_framework.exceptions import NotFound
 
 from apps.workout_plans.models import Program, Subscription, SubscriptionProgressSnapshot
 from apps.workout_plans.progress_types import ProgressSnapshotPayload
 from config.app_settings import settings
+from core.ai_coach.profile_context import enqueue_profile_context_refresh
 
 
 class ProgramRepository:
@@ -76,6 +79,7 @@ class ProgramRepository:
                 ProgramRepository._list_key(profile_id),
             ]
         )
+        enqueue_profile_context_refresh(profile_id, reason="program_saved")
         return program
 
     @staticmethod
@@ -119,10 +123,35 @@ class SubscriptionRepository:
     def get_all(profile_id: int) -> list[Subscription]:
         return list(SubscriptionRepository.base_qs().filter(profile_id=profile_id).order_by("-updated_at"))
 
+    @staticmethod
+    def get_expired_page(expired_before: str, *, after_id: int, limit: int) -> list[dict[str, int]]:
+        rows = (
+            Subscription.objects.filter(enabled=True, payment_date__lte=expired_before, id__gt=after_id)
+            .order_by("id")
+            .values_list("id", "profile_id")[:limit]
+        )
+        return [{"id": subscription_id, "profile": profile_id} for subscription_id, profile_id in rows]
+
+    @staticmethod
+    def deactivate_many(subscription_ids: List[int]) -> list[dict[str, int]]:
+        """Disable the still enabled subscriptions among ``subscription_ids`` in one UPDATE ... RETURNING."""
+        if not subscription_ids:
+            return []
+        table = connection.ops.quote_name(Subscription._meta.db_table)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET enabled = FALSE, updated_at = %s "
+                "WHERE id = ANY(%s) AND enabled RETURNING id, profile_id",
+                [timezone.now(), list(subscription_ids)],
+            )
+            rows = cursor.fetchall()
+        return [{"id": subscription_id, "profile": profile_id} for subscription_id, profile_id in rows]
+
     @staticmethod
     def update_exercises(profile_id: int, exercises: Any, instance: Subscription) -> Subscription:
         Subscription.objects.filter(id=instance.id, profile_id=profile_id).update(exercises=exercises)
         instance.exercises = exercises  # type: ignore[attr-defined]
+        enqueue_profile_context_refresh(profile_id, reason="subscription_updated")
         return cast(Subscription, instance)
 
 
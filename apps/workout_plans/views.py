@@ -1,7 +1,9 @@
+from datetime import date
 from typing import Any, Optional
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, serializers
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_api_key.permissions import HasAPIKey
@@ -9,6 +11,10 @@ from rest_framework_api_key.permissions import HasAPIKey
 from apps.workout_plans.serializers import ProgramSerializer, SubscriptionSerializer
 from apps.workout_plans.repos import ProgramRepository, SubscriptionRepository
 from apps.workout_plans.models import Subscription
+from core.ai_coach.profile_context import enqueue_profile_context_refresh
+
+
+EXPIRED_PAGE_MAX = 1000
 
 
 def _parse_profile_id(profile_id_str: Optional[str]) -> Optional[int]:
@@ -74,10 +80,39 @@ class SubscriptionViewSet(ModelViewSet):
         return SubscriptionRepository.filter_by_profile(qs, profile_id)
 
     def perform_create(self, serializer: serializers.BaseSerializer) -> None:  # pyrefly: ignore[bad-override]
-        serializer.save()
+        subscription = serializer.save()
+        enqueue_profile_context_refresh(getattr(subscription, "profile_id", None), reason="subscription_saved")
 
     def perform_update(self, serializer: serializers.BaseSerializer) -> None:  # pyrefly: ignore[bad-override]
-        serializer.save()
+        subscription = serializer.save()
+        enqueue_profile_context_refresh(getattr(subscription, "profile_id", None), reason="subscription_updated")
 
     def perform_destroy(self, instance: Subscription) -> None:  # pyrefly: ignore[bad-override]
+        profile_id = getattr(instance, "profile_id", None)
         super().perform_destroy(instance)
+        enqueue_profile_context_refresh(profile_id, reason="subscription_deleted")
+
+    @action(detail=False, methods=["get"], url_path="expired")
+    def expired(self, request: Any) -> Response:
+        """Keyset page of enabled subscriptions with ``payment_date`` up to ``expired_before``."""
+        expired_before = request.query_params.get("expired_before")
+        try:
+            date.fromisoformat(str(expired_before))
+            after_id = int(request.query_params.get("after", 0))
+            limit = min(EXPIRED_PAGE_MAX, max(1, int(request.query_params.get("limit", EXPIRED_PAGE_MAX))))
+        except (TypeError, ValueError):
+            return Response({"error": "invalid expired_before, after or limit"}, status=status.HTTP_400_BAD_REQUEST)
+        results = SubscriptionRepository.get_expired_page(expired_before, after_id=after_id, limit=limit)
+        return Response({"results": results})
+
+    @action(detail=False, methods=["post"], url_path="bulk_deactivate")
+    def bulk_deactivate(self, request: Any) -> Response:
+        raw_ids = request.data.get("ids")
+        if not isinstance(raw_ids, list) or len(raw_ids) > EXPIRED_PAGE_MAX:
+            return Response({"error": "ids must be a list of subscription ids"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            subscription_ids = [int(item) for item in raw_ids]
+        except (TypeError, ValueError):
+            return Response({"error": "ids must be a list of subscription ids"}, status=status.HTTP_400_BAD_REQUEST)
+        deactivated = SubscriptionRepository.deactivate_many(subscription_ids)
+        return Response({"deactivated": deactivated})
@@ -0,0 +1,198 @@
+"""Measure time-to-first-visible-text of an Ask AI answer: full completion vs streamed segments.
+
+A local fake OpenAI-compatible server answers ``/v1/chat/completions`` after ``--ttft-ms`` and then produces
+``--tokens`` tokens ``--token-ms`` apart, either as one JSON body or as server-sent events. The previous flow shows
+text once the whole completion is back (the notify hop from the task to the bot is not counted, so it is a lower
+bound). The streaming flow runs ``LLMHelper.call_llm_stream`` through ``AnswerStreamPublisher`` into an in-memory
+Redis stream while the bot's ``deliver_streamed_answer`` tails it; first visible text is the reply's first
+``send_message``.
+
+Usage: ``python -m benchmarks.answer_stream --requests 5 --tokens 300 --token-ms 20``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from argparse import ArgumentParser
+from types import SimpleNamespace
+from typing import Any
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiohttp import web
+from openai import AsyncOpenAI
+
+import bot.utils.ai_coach.answer_stream as bot_stream
+import core.ai_coach.answer_stream as answer_stream_module
+from ai_coach.agent.llm_helper import LLMHelper
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.utils import run, summarize
+from core.ai_coach.answer_stream import AnswerStream, AnswerStreamPublisher
+from core.enums import Language
+from core.schemas import Profile
+
+MODEL = "fake-llm"
+MESSAGES = [{"role": "system", "content": "You are a coach."}, {"role": "user", "content": "How do I recover?"}]
+
+
+class _Bot:
+    def __init__(self) -> None:
+        self.id = 1
+        self.first_sent: float | None = None
+        self.last_change: float = 0.0
+        self.calls = 0
+
+    def _record(self) -> None:
+        now = time.perf_counter()
+        if self.first_sent is None:
+            self.first_sent = now
+        self.last_change = now
+        self.calls += 1
+
+    async def send_message(self, **kwargs: Any) -> SimpleNamespace:
+        self._record()
+        return SimpleNamespace(message_id=self.calls)
+
+    async def edit_message_text(self, **kwargs: Any) -> None:
+        self._record()
+
+    async def delete_message(self, chat_id: int, message_id: int) -> None:
+        self._record()
+
+
+def _fake_llm(tokens: int, ttft_s: float, token_s: float) -> web.Application:
+    words = [f" word{index}" for index in range(tokens)]
+
+    async def completions(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        await asyncio.sleep(ttft_s)
+        if not body.get("stream"):
+            await asyncio.sleep(token_s * len(words))
+            choice = {"index": 0, "message": {"role": "assistant", "content": "".join(words)}, "finish_reason": "stop"}
+            usage = {"prompt_tokens": 10, "completion_tokens": len(words), "total_tokens": 10 + len(words)}
+            return web.json_response(
+                {
+                    "id": "cmpl",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": MODEL,
+                    "choices": [choice],
+                    "usage": usage,
+                }
+            )
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for word in words:
+            chunk = {
+                "id": "cmpl",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": MODEL,
+                "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(token_s)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+async def _previous(client: AsyncOpenAI, max_tokens: int) -> tuple[float, float]:
+    started = time.perf_counter()
+    response = await LLMHelper.call_llm(
+        client, MESSAGES[0]["content"], MESSAGES[1]["content"], model=MODEL, max_tokens=max_tokens
+    )
+    assert response.choices[0].message.content
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, elapsed
+
+
+async def _streaming(client: AsyncOpenAI, max_tokens: int, request_id: str) -> tuple[float, float, int]:
+    profile = Profile(id=1, tg_id=1, language=Language.eng)
+    fsm = FSMContext(storage=MemoryStorage(), key=StorageKey(bot_id=1, chat_id=1, user_id=1))
+    bot = _Bot()
+    started = time.perf_counter()
+    consumer = asyncio.create_task(
+        bot_stream.deliver_streamed_answer(
+            bot=bot, profile=profile, request_id=request_id, fsm=fsm
+        )  # pyrefly: ignore[bad-argument-type]
+    )
+    publisher = AnswerStreamPublisher(request_id)
+    parts: list[str] = []
+    async for delta in LLMHelper.call_llm_stream(client, MESSAGES, model=MODEL, max_tokens=max_tokens):
+        parts.append(delta)
+        await publisher.push(delta)
+    await publisher.flush()
+    await AnswerStream.finish(request_id, {"status": "success", "answer": "".join(parts).strip()})
+    assert await consumer
+    assert bot.first_sent is not None
+    return (bot.first_sent - started) * 1000, (bot.last_change - started) * 1000, bot.calls
+
+
+async def _main(requests: int, tokens: int, ttft_ms: float, token_ms: float, redis_ms: float) -> int:
+    redis = InMemoryRedis(latency=redis_ms / 1000)
+    answer_stream_module.get_redis_client = lambda: redis  # pyrefly: ignore[bad-assignment]
+
+    async def _delivered(request_id: str) -> None:
+        return None
+
+    async def _menu(*args: Any) -> None:
+        return None
+
+    bot_stream.AiQuestionState = SimpleNamespace(  # pyrefly: ignore[bad-assignment]
+        create=lambda: SimpleNamespace(mark_delivered=_delivered)
+    )
+    bot_stream.send_main_menu_to_chat = _menu  # pyrefly: ignore[bad-assignment]
+
+    runner = web.AppRunner(_fake_llm(tokens, ttft_ms / 1000, token_ms / 1000))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    client = AsyncOpenAI(api_key="bench", base_url=f"http://127.0.0.1:{port}/v1")
+    max_tokens = tokens * 2
+    print(f"requests={requests} tokens={tokens} ttft_ms={ttft_ms} token_ms={token_ms} redis_ms={redis_ms}")
+    try:
+        samples: dict[str, list[float]] = {"previous": [], "streaming": [], "previous_total": [], "streaming_total": []}
+        calls: list[int] = []
+        for index in range(requests):
+            first, total = await _previous(client, max_tokens)
+            samples["previous"].append(first)
+            samples["previous_total"].append(total)
+            first, total, bot_calls = await _streaming(client, max_tokens, f"bench-{index}")
+            samples["streaming"].append(first)
+            samples["streaming_total"].append(total)
+            calls.append(bot_calls)
+        print(summarize("previous  first_visible", samples["previous"]))
+        print(
+            f"{summarize('streaming first_visible', samples['streaming'])} telegram_calls={sum(calls) / len(calls):.1f}"
+        )
+        print(summarize("previous  complete     ", samples["previous_total"]))
+        print(summarize("streaming complete     ", samples["streaming_total"]))
+    finally:
+        await client.close()
+        await runner.cleanup()
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Ask AI time-to-first-visible-text: full completion vs streamed segments")
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--ttft-ms", type=float, default=400.0)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--redis-ms", type=float, default=0.3)
+    args = parser.parse_args()
+    return run(_main(args.requests, args.tokens, args.ttft_ms, args.token_ms, args.redis_ms))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,156 @@
+"""Nightly subscription expiry against a seeded Postgres: per-row updates vs keyset chunks of bulk ``UPDATE``.
+
+Creates the Django test database (``DB_*`` settings, database ``test_db``) and seeds ``--subscriptions`` enabled
+subscriptions, ``--expired-ratio`` of them with a ``payment_date`` in the past. Both modes run the database work the
+API does for ``deactivate_expired_subscriptions``; HTTP and cache round trips are counted, not timed:
+
+* ``previous``: load every expired subscription, then one ``PATCH`` per row (``get_object`` and a model save);
+* ``bulk``: ``SubscriptionRepository.get_expired_page`` and ``deactivate_many`` per ``--chunk-size`` chunk.
+
+Expired rows are re-enabled between modes. Reported per mode: wall time, rows/sec, SQL statements and the API and
+Redis round trips the task would make.
+
+Usage: ``python -m benchmarks.billing_expiry --subscriptions 100000 --expired-ratio 0.2 --chunk-size 500``
+(needs a local Postgres)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from benchmarks.utils import run
+
+TODAY = date(2025, 1, 5)
+
+
+def _seed(subscriptions: int, expired_ratio: float) -> None:
+    from apps.profiles.models import Profile
+    from apps.workout_plans.models import Subscription
+
+    expired_every = max(1, round(1 / expired_ratio)) if expired_ratio > 0 else 0
+    batch = 5000
+    for start in range(0, subscriptions, batch):
+        created = Profile.objects.bulk_create(
+            [Profile(tg_id=20_000_000 + index) for index in range(start, min(start + batch, subscriptions))]
+        )
+        Subscription.objects.bulk_create(
+            [
+                Subscription(
+                    profile=profile,
+                    enabled=True,
+                    price=Decimal("10.00"),
+                    payment_date=(
+                        TODAY - timedelta(days=1)
+                        if expired_every and (start + offset) % expired_every == 0
+                        else TODAY + timedelta(days=20)
+                    ).isoformat(),
+                )
+                for offset, profile in enumerate(created)
+            ]
+        )
+
+
+def _previous(chunk_size: int) -> tuple[int, int, int]:
+    from apps.workout_plans.models import Subscription
+    from apps.workout_plans.repos import SubscriptionRepository
+
+    expired = list(
+        SubscriptionRepository.base_qs().filter(enabled=True, payment_date__lte=TODAY.isoformat()).order_by("id")
+    )
+    for item in expired:
+        subscription = SubscriptionRepository.base_qs().get(pk=item.pk)
+        subscription.enabled = False
+        subscription.save()
+    assert not Subscription.objects.filter(enabled=True, payment_date__lte=TODAY.isoformat()).exists()
+    # one listing call, then per row: PATCH, cache update (HGET + HSET) and payment status reset (HDEL)
+    return len(expired), 1 + len(expired), 3 * len(expired)
+
+
+def _bulk(chunk_size: int) -> tuple[int, int, int]:
+    from apps.workout_plans.repos import SubscriptionRepository
+
+    after_id = 0
+    deactivated = 0
+    api_calls = 0
+    redis_calls = 0
+    while True:
+        page = SubscriptionRepository.get_expired_page(TODAY.isoformat(), after_id=after_id, limit=chunk_size)
+        api_calls += 1
+        if not page:
+            break
+        after_id = page[-1]["id"]
+        rows = SubscriptionRepository.deactivate_many([item["id"] for item in page])
+        api_calls += 1
+        redis_calls += 3  # pipelined HMGET, HSET and HDEL batches
+        deactivated += len(rows)
+        if len(page) < chunk_size:
+            break
+    return deactivated, api_calls, redis_calls
+
+
+def _measure(label: str, func: Callable[[int], tuple[int, int, int]], chunk_size: int) -> None:
+    from django.db import connection, reset_queries
+
+    reset_queries()
+    started = time.perf_counter()
+    rows, api_calls, redis_calls = func(chunk_size)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<9} rows={rows} time={elapsed:7.2f}s rows/s={rows / elapsed if elapsed else 0:9.1f} "
+        f"sql={len(connection.queries)} api_calls={api_calls} redis_round_trips={redis_calls}"
+    )
+
+
+def _reenable() -> None:
+    from apps.workout_plans.models import Subscription
+
+    Subscription.objects.filter(payment_date__lte=TODAY.isoformat()).update(enabled=True)
+
+
+async def _main(subscriptions: int, expired_ratio: float, chunk_size: int, keep: bool) -> int:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings as django_settings
+    from django.db import connection
+
+    from apps.workout_plans.models import Subscription
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=keep)
+    try:
+        existing = Subscription.objects.count()
+        if existing < subscriptions:
+            started = time.perf_counter()
+            _seed(subscriptions - existing, expired_ratio)
+            print(f"seeded={subscriptions - existing} seconds={time.perf_counter() - started:.1f}")
+        expired = Subscription.objects.filter(payment_date__lte=TODAY.isoformat()).count()
+        print(f"subscriptions={Subscription.objects.count()} expired={expired} chunk_size={chunk_size}")
+        django_settings.DEBUG = True  # count executed statements
+        for label, func in (("previous", _previous), ("bulk", _bulk)):
+            _reenable()
+            _measure(label, func, chunk_size)
+    finally:
+        if not keep:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Subscription expiry: per-row updates vs bulk keyset chunks (local Postgres)")
+    parser.add_argument("--subscriptions", type=int, default=100_000)
+    parser.add_argument("--expired-ratio", type=float, default=0.2)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded test database for the next run")
+    args = parser.parse_args()
+    return run(_main(args.subscriptions, args.expired_ratio, args.chunk_size, args.keep))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
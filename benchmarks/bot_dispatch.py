@@ -0,0 +1,129 @@
+"""Scheduled notification dispatch against a seeded Postgres: one payload with every recipient vs keyset chunks.
+
+Creates the Django test database (``DB_*`` settings, database ``test_db``) and seeds ``--profiles`` profiles, each with
+one enabled subscription. ``previous`` builds the former single payload, every weekly survey recipient in one list,
+serialized as one request body. ``chunked`` walks the same recipients with ``_profile_id_pages`` and builds the
+payload of every ``send_notification_chunk`` in turn, as the subtasks would. Celery and the bot are not involved: the
+numbers cover the database reads and payload building that grew with the audience. Reported per mode: wall time,
+Python peak memory (``tracemalloc``), the largest request body, and the number of requests.
+
+Usage: ``python -m benchmarks.bot_dispatch --profiles 100000 --chunk-size 500`` (needs a local Postgres)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from decimal import Decimal
+from typing import Callable
+
+from benchmarks.utils import run
+
+
+def _seed(profiles: int) -> None:
+    from apps.profiles.models import Profile
+    from apps.workout_plans.models import Subscription
+
+    batch = 5000
+    for start in range(0, profiles, batch):
+        created = Profile.objects.bulk_create(
+            [
+                Profile(tg_id=10_000_000 + index, language="eng" if index % 2 else "ua")
+                for index in range(start, min(start + batch, profiles))
+            ]
+        )
+        Subscription.objects.bulk_create(
+            [Subscription(profile=profile, enabled=True, price=Decimal("10.00")) for profile in created]
+        )
+
+
+def _previous() -> tuple[int, int]:
+    import orjson
+
+    from core.tasks.bot_calls import _active_subscriptions_queryset
+
+    recipients = [
+        {
+            "profile_id": int(row["profile_id"]),
+            "tg_id": int(row["profile__tg_id"]),
+            "language": row.get("profile__language"),
+            "subscription_id": int(row["id"]),
+        }
+        for row in _active_subscriptions_queryset().values("id", "profile_id", "profile__tg_id", "profile__language")
+    ]
+    body = orjson.dumps({"recipients": recipients})
+    return len(body), 1
+
+
+def _chunked(chunk_size: int) -> tuple[int, int]:
+    import orjson
+
+    from core.tasks.bot_calls import _fetch_chunk_recipients, _profile_id_pages
+
+    largest = 0
+    requests = 0
+    for index, (after, last) in enumerate(_profile_id_pages("weekly_survey", "2025-01-05", chunk_size)):
+        recipients = _fetch_chunk_recipients("weekly_survey", "2025-01-05", after, last)
+        body = orjson.dumps({"broadcast_id": f"weekly_survey:2025-01-05:{index}", "recipients": recipients})
+        largest = max(largest, len(body))
+        requests += 1
+    return largest, requests
+
+
+def _measure(label: str, func: Callable[[], tuple[int, int]]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    largest, requests = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<9} time={elapsed:6.2f}s peak_mem={peak / 1024 / 1024:7.1f}MB "
+        f"largest_body={largest / 1024:8.1f}KB requests={requests}"
+    )
+
+
+async def _main(profiles: int, chunk_size: int, keep: bool) -> int:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings as django_settings
+    from django.db import connection
+
+    from apps.workout_plans.models import Subscription
+
+    django_settings.DEBUG = False  # keep executed queries out of memory
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=keep)
+    try:
+        existing = Subscription.objects.count()
+        if existing < profiles:
+            started = time.perf_counter()
+            _seed(profiles - existing)
+            print(f"seeded={profiles - existing} seconds={time.perf_counter() - started:.1f}")
+        from config.app_settings import settings
+
+        settings.BOT_NOTIFY_CHUNK_SIZE = chunk_size
+        print(f"profiles={Subscription.objects.count()} chunk_size={chunk_size}")
+        _measure("previous", _previous)
+        _measure("chunked", lambda: _chunked(chunk_size))
+    finally:
+        if not keep:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Notification dispatch: single payload vs keyset chunks (local Postgres)")
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded test database for the next run")
+    args = parser.parse_args()
+    return run(_main(args.profiles, args.chunk_size, args.keep))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,174 @@
+"""Throughput of a bot broadcast against a local fake Bot API server with Telegram-style flood control.
+
+The fake server answers ``sendMessage`` after ``--api-ms`` and replies ``429 retry after 1`` once more than
+``--server-limit`` messages arrived within the last second. Each mode sends one message to ``--recipients`` chats
+through a real aiogram ``Bot`` pointed at the server:
+
+* ``sequential``: the previous handlers, one ``send_message`` after another, errors logged and dropped;
+* ``unlimited``: ``--concurrency`` concurrent sends without a limiter, to show what flood control does to them;
+* ``engine``: ``Broadcast`` with its token bucket and ``RetryAfter`` backoff, progress in an in-memory Redis.
+
+Usage: ``python -m benchmarks.broadcast --recipients 300 --api-ms 80 --server-limit 30``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from argparse import ArgumentParser
+from collections import deque
+from dataclasses import dataclass
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+
+import bot.utils.broadcast as broadcast_module
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.utils import run
+from bot.utils.broadcast import Broadcast, BroadcastMessage
+
+TOKEN = "123456:bench-token"
+
+
+@dataclass(frozen=True)
+class _Recipient:
+    profile_id: int
+    tg_id: int
+
+
+def _fake_bot_api(api_s: float, server_limit: int) -> tuple[web.Application, dict[str, int]]:
+    recent: deque[float] = deque()
+    counters = {"accepted": 0, "rejected": 0}
+
+    async def send_message(request: web.Request) -> web.Response:
+        form = await request.post()
+        await asyncio.sleep(api_s)
+        now = time.monotonic()
+        while recent and now - recent[0] > 1:
+            recent.popleft()
+        if len(recent) >= server_limit:
+            counters["rejected"] += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after 1",
+                    "parameters": {"retry_after": 1},
+                }
+            )
+        recent.append(now)
+        counters["accepted"] += 1
+        chat_id = int(str(form["chat_id"]))
+        return web.json_response(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": counters["accepted"],
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "text": str(form.get("text", "")),
+                },
+            }
+        )
+
+    app = web.Application()
+    app.router.add_post(f"/bot{TOKEN}/sendMessage", send_message)
+    return app, counters
+
+
+async def _sequential(bot: Bot, recipients: list[_Recipient]) -> dict[str, int]:
+    counts = {"sent": 0, "failed": 0}
+    for recipient in recipients:
+        try:
+            await bot.send_message(chat_id=recipient.tg_id, text="renew", disable_notification=True)
+            counts["sent"] += 1
+        except Exception:  # noqa: BLE001
+            counts["failed"] += 1
+    return counts
+
+
+async def _unlimited(bot: Bot, recipients: list[_Recipient], concurrency: int) -> dict[str, int]:
+    counts = {"sent": 0, "failed": 0}
+    gate = asyncio.Semaphore(concurrency)
+
+    async def _one(recipient: _Recipient) -> None:
+        async with gate:
+            try:
+                await bot.send_message(chat_id=recipient.tg_id, text="renew", disable_notification=True)
+                counts["sent"] += 1
+            except Exception:  # noqa: BLE001
+                counts["failed"] += 1
+
+    await asyncio.gather(*(_one(recipient) for recipient in recipients))
+    return counts
+
+
+async def _engine(bot: Bot, recipients: list[_Recipient], concurrency: int, rate: float) -> dict[str, int]:
+    redis = InMemoryRedis()
+    broadcast_module.get_redis_client = lambda: redis  # pyrefly: ignore[bad-assignment]
+    report = await Broadcast(
+        bot,
+        broadcast_id=f"bench-{time.time_ns()}",
+        kind="bench",
+        recipients=recipients,
+        build=lambda recipient: BroadcastMessage(text="renew"),
+        rate_per_s=rate,
+        concurrency=concurrency,
+    ).run()
+    assert report is not None
+    return {"sent": report.sent, "failed": report.failed, "throttled": report.throttled}
+
+
+async def _main(recipients: int, api_ms: float, server_limit: int, concurrency: int, rate: float) -> int:
+    app, counters = _fake_bot_api(api_ms / 1000, server_limit)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{port}"))
+    bot = Bot(TOKEN, session=session)
+    targets = [_Recipient(profile_id=index, tg_id=1_000_000 + index) for index in range(recipients)]
+    print(
+        f"recipients={recipients} api_ms={api_ms} server_limit={server_limit}/s "
+        f"concurrency={concurrency} engine_rate={rate}/s"
+    )
+    try:
+        for mode in ("sequential", "unlimited", "engine"):
+            counters.update(accepted=0, rejected=0)
+            await asyncio.sleep(1.1)  # let the server's flood window drain between modes
+            started = time.perf_counter()
+            if mode == "sequential":
+                counts = await _sequential(bot, targets)
+            elif mode == "unlimited":
+                counts = await _unlimited(bot, targets, concurrency)
+            else:
+                counts = await _engine(bot, targets, concurrency, rate)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{mode:<10} duration={elapsed:6.1f}s delivered/s={counts['sent'] / elapsed:5.1f} "
+                f"sent={counts['sent']} failed={counts['failed']} throttled={counts.get('throttled', 0)} "
+                f"server_429={counters['rejected']}"
+            )
+    finally:
+        await bot.session.close()
+        await runner.cleanup()
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Bot broadcast throughput against a fake Bot API with flood control")
+    parser.add_argument("--recipients", type=int, default=300)
+    parser.add_argument("--api-ms", type=float, default=80.0)
+    parser.add_argument("--server-limit", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=25.0)
+    args = parser.parse_args()
+    return run(_main(args.recipients, args.api_ms, args.server_limit, args.concurrency, args.rate))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,51 @@
+"""Compare sequential HGET lookups with one pipelined HMGET batch.
+
+Usage: ``REDIS_URL=redis://127.0.0.1:6379 python -m benchmarks.cache_batch --fields 200``
+"""
+
+from __future__ import annotations
+
+import sys
+from argparse import ArgumentParser
+
+from benchmarks.utils import measure, run, summarize
+from core.cache.base import BaseCacheManager
+
+BENCH_KEY = "bench:cache_batch"
+
+
+async def _main(fields: int, rounds: int) -> int:
+    names = [str(index) for index in range(fields)]
+    await BaseCacheManager.mset_json(BENCH_KEY, {name: {"id": int(name), "payload": "x" * 64} for name in names})
+
+    async def sequential() -> None:
+        for name in names:
+            await BaseCacheManager.get_json(BENCH_KEY, name)
+
+    async def batched() -> None:
+        await BaseCacheManager.mget_json(BENCH_KEY, names)
+
+    try:
+        sequential_samples = await measure(sequential, rounds=rounds)
+        batched_samples = await measure(batched, rounds=rounds)
+    finally:
+        await BaseCacheManager.mdelete(BENCH_KEY, names)
+        await BaseCacheManager.close_pool()
+
+    print(summarize(f"sequential_hget fields={fields}", sequential_samples))
+    print(summarize(f"pipelined_hmget fields={fields}", batched_samples))
+    speedup = sum(sequential_samples) / max(sum(batched_samples), 1e-9)
+    print(f"speedup={speedup:.1f}x")
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Redis hash batch read benchmark")
+    parser.add_argument("--fields", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    return run(_main(args.fields, args.rounds))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
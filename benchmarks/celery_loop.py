@@ -0,0 +1,116 @@
+"""Throughput and latency of a no-op HTTP notify task under the Celery threads pool: ``asyncio.run`` vs worker loops.
+
+A local aiohttp server stands in for the bot's ``/internal/payments/send_message/`` and answers 200 right away.
+``--threads`` worker threads execute ``--tasks`` task bodies between them, the way the threads pool does:
+
+* ``previous``: the former ``send_payment_message`` body, ``asyncio.run`` around a fresh ``httpx.AsyncClient``, so
+  every task opens a loop and a TCP connection;
+* ``worker_loop``: the current body, ``_retryable_call`` with ``_post_internal_json``, which runs on the thread's
+  long-lived loop and posts through the pooled ``HTTPClientRegistry`` client.
+
+Reported per mode: tasks/sec, p50/p95 task latency and the connections the server accepted.
+
+Usage: ``python -m benchmarks.celery_loop --tasks 2000 --threads 4``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import httpx
+import orjson
+from aiohttp import web
+
+from apps.payments.tasks import _internal_headers, _internal_url, _post_internal_json, _retryable_call
+from benchmarks.utils import percentile, run
+from config.app_settings import settings
+from core.internal_http import internal_request_timeout
+from core.utils.async_runtime import close_worker_loops
+
+PATH = "/internal/payments/send_message/"
+
+
+class _Task:
+    def retry(self, exc: Exception) -> Exception:
+        return exc
+
+
+def _previous(payload: dict[str, Any]) -> None:
+    async def _post() -> None:
+        body = orjson.dumps(payload)
+        async with httpx.AsyncClient(timeout=internal_request_timeout(settings)) as client:
+            response = await client.post(_internal_url(PATH), content=body, headers=_internal_headers(body=body))
+            response.raise_for_status()
+
+    asyncio.run(_post())
+
+
+def _worker_loop(payload: dict[str, Any]) -> None:
+    _retryable_call(_Task(), "bench", lambda: _post_internal_json(PATH, payload))
+
+
+def _timed(body: Callable[[dict[str, Any]], None], index: int) -> float:
+    started = time.perf_counter()
+    body({"profile_id": index, "text": "ok"})
+    return (time.perf_counter() - started) * 1000
+
+
+async def _main(tasks: int, threads: int) -> int:
+    connections = {"count": 0}
+
+    async def send_message(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response({"ok": True})
+
+    @web.middleware
+    async def count_connections(request: web.Request, handler: Any) -> web.StreamResponse:
+        transport = request.transport
+        if transport is not None and not getattr(transport, "_bench_seen", False):
+            setattr(transport, "_bench_seen", True)
+            connections["count"] += 1
+        return await handler(request)
+
+    app = web.Application(middlewares=[count_connections])
+    app.router.add_post(PATH, send_message)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    settings.BOT_INTERNAL_URL = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    loop = asyncio.get_running_loop()
+    print(f"tasks={tasks} threads={threads}")
+    try:
+        for label, body in (("previous", _previous), ("worker_loop", _worker_loop)):
+            connections["count"] = 0
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                started = time.perf_counter()
+                samples = await asyncio.gather(
+                    *(loop.run_in_executor(pool, _timed, body, index) for index in range(tasks))
+                )
+                elapsed = time.perf_counter() - started
+                if label == "worker_loop":
+                    await loop.run_in_executor(None, close_worker_loops)
+            print(
+                f"{label:<12} tasks/s={tasks / elapsed:7.1f} p50={percentile(samples, 50):6.2f}ms "
+                f"p95={percentile(samples, 95):6.2f}ms connections={connections['count']}"
+            )
+    finally:
+        await runner.cleanup()
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="No-op notify task: asyncio.run per task vs long-lived worker loops")
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    return run(_main(args.tasks, args.threads))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
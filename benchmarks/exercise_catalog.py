@@ -0,0 +1,103 @@
+"""Compare exercise catalog lookups: linear scan vs the inverted indexes of ``ExerciseCatalogIndex``.
+
+Runs a fixed set of representative queries (the facet filters ``tool_search_exercises`` sends, name lookups used to
+resolve GIF keys, and replacement suggestions) against the bundled catalog. The linear numbers go through
+``filter_exercise_entries`` with a copy of the catalog, which takes the scan path the functions used before; the
+indexed numbers go through ``ExerciseCatalogIndex``. Results of both paths are checked to be identical.
+
+Usage: ``python -m benchmarks.exercise_catalog --rounds 2000``
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Any, Callable
+
+from benchmarks.utils import run, summarize
+from core.ai_coach.exercise_catalog import (
+    ExerciseCatalogEntry,
+    filter_exercise_entries,
+    load_exercise_catalog,
+    load_exercise_index,
+    suggest_replacement_exercises,
+)
+
+QUERIES: list[tuple[str, dict[str, Any]]] = [
+    ("category", {"category": "strength", "limit": 20}),
+    ("category+primary", {"category": "strength", "primary_muscles": ["chest"], "limit": 20}),
+    ("category+primary+equip", {"category": "strength", "primary_muscles": ["lats"], "equipment": ["cable"]}),
+    ("name_exact", {"name_query": "barbell bench press", "limit": 1}),
+    ("name_partial", {"name_query": "curl"}),
+    ("name_short", {"name_query": "ab"}),
+    ("name_missing", {"name_query": "underwater basket weaving", "limit": 1}),
+]
+REPLACEMENTS = ["Barbell Bench Press", "Crunch", "Jump Rope", "Pull-up"]
+
+
+def _linear_suggest(entries: list[ExerciseCatalogEntry], query: str) -> list[ExerciseCatalogEntry]:
+    base_candidates = filter_exercise_entries(entries, name_query=query, limit=1)
+    if not base_candidates:
+        return []
+    base = base_candidates[0]
+    if base.category in {"conditioning", "health"}:
+        return [entry for entry in entries if entry.category == base.category and entry.canonical != base.canonical]
+    base_primary = {item.lower() for item in base.primary_muscles}
+    return [
+        entry
+        for entry in entries
+        if entry.category == base.category
+        and entry.canonical != base.canonical
+        and base_primary.intersection({item.lower() for item in entry.primary_muscles})
+    ]
+
+
+def _time(func: Callable[[], Any], rounds: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return samples
+
+
+def _report(label: str, linear: list[float], indexed: list[float]) -> None:
+    ratio = sum(linear) / max(sum(indexed), 1e-9)
+    print(f"{label:<24} {summarize('linear', linear).replace('ms', 'us')}")
+    print(f"{'':<24} {summarize('indexed', indexed).replace('ms', 'us')} speedup={ratio:.1f}x")
+
+
+async def _main(rounds: int) -> int:
+    started = time.perf_counter()
+    index = load_exercise_index()
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"entries={len(index.entries)} ngrams={len(index.by_ngram)} build_ms={build_ms:.1f} rounds={rounds}")
+    entries = list(load_exercise_catalog())
+    for label, query in QUERIES:
+        expected = filter_exercise_entries(entries, **query)
+        assert index.search(**query) == expected, label
+        _report(
+            label,
+            _time(lambda: filter_exercise_entries(entries, **query), rounds),
+            _time(lambda: index.search(**query), rounds),
+        )
+    for name in REPLACEMENTS:
+        assert suggest_replacement_exercises(name_query=name) == _linear_suggest(entries, name), name
+        _report(
+            f"replace:{name}",
+            _time(lambda: _linear_suggest(entries, name), rounds),
+            _time(lambda: suggest_replacement_exercises(name_query=name), rounds),
+        )
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Exercise catalog lookups: linear scan vs inverted indexes")
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    return run(_main(args.rounds))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
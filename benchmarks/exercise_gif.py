@@ -0,0 +1,134 @@
+"""Load test of the ``/api/gif/<gif_key>/`` view: per-request GCS download vs the on-disk GIF cache.
+
+Synthetic GIFs for ``--gifs`` catalog keys are written to a temporary directory served by ``LocalBucket``, a
+filesystem stand-in for the GCS bucket that sleeps ``--gcs-ms`` per download. ``--threads`` threads (one gthread
+worker) then issue ``--requests`` requests for random keys and drain the responses. ``previous`` replays the former
+view: rebuild the catalog key set, download the blob into memory and return it. ``cached`` runs ``exercise_gif``
+with the on-disk cache; ``--revalidate`` is the share of requests that send the ETag of an earlier response, as
+browsers do once ``max-age`` has passed. Each mode runs in a fresh interpreter so ``ru_maxrss`` is per worker.
+
+Usage: ``python -m benchmarks.exercise_gif --gifs 200 --gif-kb 400 --requests 4000 --threads 8``
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from benchmarks.fakes import LocalBucket
+from benchmarks.utils import run
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _drain(response: Any) -> int:
+    if getattr(response, "streaming", False):
+        size = sum(len(chunk) for chunk in response.streaming_content)
+        response.close()
+        return size
+    return len(response.content)
+
+
+async def _child(
+    mode: str, gifs: int, gif_kb: int, requests: int, threads: int, gcs_ms: float, revalidate: float
+) -> int:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
+    import django
+
+    django.setup()
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    import apps.webapp.views as views
+    from core.ai_coach.exercise_catalog import load_exercise_catalog
+    from core.services.gif_cache import ExerciseGIFCache
+
+    keys = [entry.gif_key for entry in load_exercise_catalog()][:gifs]
+    factory = RequestFactory()
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "bucket"
+        root.mkdir()
+        for index, key in enumerate(keys):
+            (root / key).write_bytes(index.to_bytes(4, "big") * (gif_kb * 256))
+        bucket = LocalBucket(root, latency=gcs_ms / 1000)
+        gif_cache = ExerciseGIFCache(Path(tmp) / "cache", max_bytes=1024 * 1024 * 1024, ttl_s=3600)
+        etags: dict[str, str] = {}
+
+        def previous(key: str) -> Any:
+            if key not in {entry.gif_key for entry in load_exercise_catalog()}:
+                return HttpResponse(status=404)
+            blob = SimpleNamespace(bucket=bucket).bucket.blob(key)
+            response = HttpResponse(blob.download_as_bytes(), content_type=blob.content_type or "image/gif")
+            response["Cache-Control"] = "public, max-age=3600"
+            return response
+
+        def cached(key: str) -> Any:
+            headers = {"If-None-Match": etags[key]} if key in etags and rng.random() < revalidate else {}
+            response = views.exercise_gif(factory.get(f"/api/gif/{key}/", headers=headers), key)
+            if response.has_header("ETag"):
+                etags[key] = response["ETag"]
+            return response
+
+        views._get_gif_storage = lambda: SimpleNamespace(bucket=bucket)  # pyrefly: ignore[bad-assignment]
+        views._get_gif_cache = lambda: gif_cache  # pyrefly: ignore[bad-assignment]
+        handler = cached if mode == "cached" else previous
+        plan = [rng.choice(keys) for _ in range(requests)]
+        rss_before = _peak_rss_mb()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            sizes = list(pool.map(lambda key: _drain(handler(key)), plan))
+        elapsed = time.perf_counter() - started
+    not_modified = sizes.count(0)
+    print(
+        f"{mode:<9} requests/s={requests / elapsed:8.0f} "
+        f"rss_before={rss_before:7.1f}MB peak_rss={_peak_rss_mb():7.1f}MB "
+        f"gcs_downloads={bucket.downloads} not_modified={not_modified} mb_sent={sum(sizes) / 1024 / 1024:.0f}"
+    )
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Exercise GIF view: per-request download vs on-disk cache")
+    parser.add_argument("--gifs", type=int, default=200)
+    parser.add_argument("--gif-kb", type=int, default=400)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--gcs-ms", type=float, default=40.0)
+    parser.add_argument("--revalidate", type=float, default=0.3)
+    parser.add_argument("--child", choices=("previous", "cached"))
+    args = parser.parse_args()
+    if args.child:
+        return run(
+            _child(args.child, args.gifs, args.gif_kb, args.requests, args.threads, args.gcs_ms, args.revalidate)
+        )
+
+    print(
+        f"gifs={args.gifs} gif_kb={args.gif_kb} requests={args.requests} threads={args.threads} "
+        f"gcs_ms={args.gcs_ms} revalidate={args.revalidate}"
+    )
+    for mode in ("previous", "cached"):
+        command = [sys.executable, "-m", "benchmarks.exercise_gif", "--child", mode]
+        command += ["--gifs", str(args.gifs), "--gif-kb", str(args.gif_kb), "--requests", str(args.requests)]
+        command += ["--threads", str(args.threads), "--gcs-ms", str(args.gcs_ms), "--revalidate", str(args.revalidate)]
+        completed = subprocess.run(command, check=False)
+        if completed.returncode:
+            return completed.returncode
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
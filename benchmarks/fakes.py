@@ -0,0 +1,322 @@
+"""In-memory stand-ins used by benchmarks that should run without external services."""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import hashlib
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+
+class InMemoryRedis:
+    """Subset of ``redis.asyncio.Redis`` covering the hash, set, string and stream commands used by the caches.
+
+    ``latency`` adds an artificial per-round-trip delay so pipelined and sequential access can be compared.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.round_trips = 0
+        self._hashes: dict[str, dict[str, str]] = {}
+        self._strings: dict[str, str] = {}
+        self._sets: dict[str, set[str]] = {}
+        self._streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self._stream_added = asyncio.Event()
+
+    async def _trip(self) -> None:
+        self.round_trips += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _hget(self, key: str, field: str) -> str | None:
+        return self._hashes.get(key, {}).get(field)
+
+    def _hset(self, key: str, field: str | None = None, value: str | None = None, mapping: dict | None = None) -> int:
+        bucket = self._hashes.setdefault(key, {})
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        added = sum(1 for name in items if name not in bucket)
+        bucket.update({name: str(val) for name, val in items.items()})
+        return added
+
+    def _hsetnx(self, key: str, field: str, value: str) -> int:
+        bucket = self._hashes.setdefault(key, {})
+        if field in bucket:
+            return 0
+        bucket[field] = str(value)
+        return 1
+
+    def _hmget(self, key: str, fields: list[str]) -> list[str | None]:
+        bucket = self._hashes.get(key, {})
+        return [bucket.get(field) for field in fields]
+
+    def _hdel(self, key: str, *fields: str) -> int:
+        bucket = self._hashes.get(key, {})
+        return sum(1 for field in fields if bucket.pop(field, None) is not None)
+
+    def _hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        bucket = self._hashes.setdefault(key, {})
+        value = int(bucket.get(field, 0)) + amount
+        bucket[field] = str(value)
+        return value
+
+    def _hgetall(self, key: str) -> dict[str, str]:
+        return dict(self._hashes.get(key, {}))
+
+    def _hlen(self, key: str) -> int:
+        return len(self._hashes.get(key, {}))
+
+    def _sadd(self, key: str, *members: str) -> int:
+        bucket = self._sets.setdefault(key, set())
+        added = sum(1 for member in members if member not in bucket)
+        bucket.update(members)
+        return added
+
+    def _srem(self, key: str, *members: str) -> int:
+        bucket = self._sets.get(key, set())
+        removed = sum(1 for member in members if member in bucket)
+        bucket.difference_update(members)
+        return removed
+
+    def _sismember(self, key: str, member: str) -> int:
+        return int(member in self._sets.get(key, set()))
+
+    def _smismember(self, key: str, members: list[str]) -> list[int]:
+        bucket = self._sets.get(key, set())
+        return [int(member in bucket) for member in members]
+
+    def _smembers(self, key: str) -> set[str]:
+        return set(self._sets.get(key, set()))
+
+    def _scard(self, key: str) -> int:
+        return len(self._sets.get(key, set()))
+
+    def _expire(self, key: str, seconds: int) -> bool:
+        return key in self._hashes or key in self._sets or key in self._strings or key in self._streams
+
+    def _xadd(self, key: str, fields: dict[str, Any], maxlen: int | None = None, approximate: bool = True) -> str:
+        entries = self._streams.setdefault(key, [])
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append((entry_id, {name: str(value) for name, value in fields.items()}))
+        if maxlen is not None:
+            del entries[:-maxlen]
+        self._stream_added.set()
+        self._stream_added = asyncio.Event()
+        return entry_id
+
+    def _xrange_after(self, key: str, last_id: str, count: int | None) -> list[tuple[str, dict[str, str]]]:
+        after = int(last_id.split("-", 1)[0])
+        newer = [entry for entry in self._streams.get(key, []) if int(entry[0].split("-", 1)[0]) > after]
+        return newer[:count] if count else newer
+
+    def _get(self, key: str) -> str | None:
+        return self._strings.get(key)
+
+    def _set(self, key: str, value: Any, ex: int | None = None, px: int | None = None, nx: bool = False) -> bool:
+        if nx and key in self._strings:
+            return False
+        self._strings[key] = str(value)
+        return True
+
+    def _delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            removed += int(self._strings.pop(key, None) is not None)
+            removed += int(self._hashes.pop(key, None) is not None)
+            removed += int(self._sets.pop(key, None) is not None)
+            removed += int(self._streams.pop(key, None) is not None)
+        return removed
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        impl = getattr(type(self), f"_{name}", None)
+        if impl is None:
+            raise AttributeError(name)
+
+        async def _command(*args: Any, **kwargs: Any) -> Any:
+            await self._trip()
+            return impl(self, *args, **kwargs)
+
+        return _command
+
+    async def xread(
+        self, streams: dict[str, str], count: int | None = None, block: int | None = None
+    ) -> list[tuple[str, list[tuple[str, dict[str, str]]]]]:
+        await self._trip()
+        deadline = time.monotonic() + (block or 0) / 1000
+        while True:
+            found = [(key, self._xrange_after(key, last_id, count)) for key, last_id in streams.items()]
+            found = [(key, entries) for key, entries in found if entries]
+            remaining = deadline - time.monotonic()
+            if found or block is None or remaining <= 0:
+                return found
+            try:
+                await asyncio.wait_for(self._stream_added.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return []
+
+    async def ping(self) -> bool:
+        await self._trip()
+        return True
+
+    async def close(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
+
+    async def scan_iter(
+        self, match: str = "*", count: int | None = None, _type: str | None = None
+    ) -> AsyncIterator[str]:
+        await self._trip()
+        for key in [*self._hashes, *self._sets, *self._strings]:
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def hscan_iter(self, key: str, count: int | None = None) -> AsyncIterator[tuple[str, str]]:
+        await self._trip()
+        for item in list(self._hashes.get(key, {}).items()):
+            yield item
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    def __init__(self, client: InMemoryRedis) -> None:
+        self._client = client
+        self._queued: list[tuple[Callable[..., Any], tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., "InMemoryPipeline"]:
+        impl = getattr(InMemoryRedis, f"_{name}", None)
+        if impl is None:
+            raise AttributeError(name)
+
+        def _queue(*args: Any, **kwargs: Any) -> "InMemoryPipeline":
+            self._queued.append((impl, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list[Any]:
+        await self._client._trip()
+        queued, self._queued = self._queued, []
+        return [impl(self._client, *args, **kwargs) for impl, args, kwargs in queued]
+
+
+@dataclass(frozen=True)
+class _DriveRequest:
+    payload: dict[str, Any]
+
+    def execute(self) -> dict[str, Any]:
+        return self.payload
+
+
+class LocalDriveFolder:
+    """Google Drive ``files()`` service backed by a local directory.
+
+    File ids are paths relative to ``root`` (``"root"`` is the directory itself); listings carry the ``size``,
+    ``modifiedTime`` and ``md5Checksum`` Drive reports. ``read`` blocks for ``latency`` seconds per file, like a
+    download round trip, and counts the files fetched.
+    """
+
+    FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+    ROOT_ID = "root"
+
+    def __init__(self, root: Path, latency: float = 0.0) -> None:
+        self.root = root
+        self.latency = latency
+        self.downloads = 0
+        self._lock = threading.Lock()
+
+    def _path(self, file_id: str) -> Path:
+        return self.root if file_id == self.ROOT_ID else self.root / file_id
+
+    def _describe(self, path: Path) -> dict[str, Any]:
+        file_id = path.relative_to(self.root).as_posix()
+        if path.is_dir():
+            return {"id": file_id, "name": path.name, "mimeType": self.FOLDER_MIME_TYPE}
+        stat = path.stat()
+        return {
+            "id": file_id,
+            "name": path.name,
+            "mimeType": "application/octet-stream",
+            "size": str(stat.st_size),
+            "modifiedTime": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
+            "md5Checksum": hashlib.md5(path.read_bytes()).hexdigest(),  # noqa: S324 - Drive reports md5
+        }
+
+    def list(  # noqa: A003 - keep parity with googleapiclient
+        self,
+        *,
+        q: str,
+        fields: str | None = None,
+        pageToken: str | None = None,  # noqa: N803 - keep parity with googleapiclient
+        pageSize: int | None = None,  # noqa: N803 - keep parity with googleapiclient
+    ) -> _DriveRequest:
+        folder_id = q.split("'", 2)[1]
+        files = [self._describe(path) for path in sorted(self._path(folder_id).iterdir())]
+        return _DriveRequest({"files": files, "nextPageToken": None})
+
+    def read(self, file_id: str) -> bytes:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.downloads += 1
+        return self._path(file_id).read_bytes()
+
+
+class LocalBlob:
+    """``google.cloud.storage.Blob`` subset read by the exercise GIF view, backed by a local file."""
+
+    def __init__(self, bucket: "LocalBucket", path: Path) -> None:
+        stat = path.stat()
+        self._bucket = bucket
+        self.path = path
+        self.name = path.name
+        self.size = stat.st_size
+        self.generation = stat.st_mtime_ns
+        self.updated = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        self.content_type = "image/gif"
+
+    def _fetch(self) -> None:
+        if self._bucket.latency:
+            time.sleep(self._bucket.latency)
+        with self._bucket._lock:
+            self._bucket.downloads += 1
+
+    def download_as_bytes(self) -> bytes:
+        self._fetch()
+        return self.path.read_bytes()
+
+    def download_to_filename(self, filename: str) -> None:
+        # Streamed in chunks like the GCS client, so the download itself does not hold the blob in memory.
+        self._fetch()
+        shutil.copyfile(self.path, filename)
+
+
+class LocalBucket:
+    """``google.cloud.storage.Bucket`` stand-in serving blobs from a local directory.
+
+    Blob generations follow the file mtime. Every download sleeps ``latency`` seconds, like a GCS round trip, and is
+    counted in ``downloads``.
+    """
+
+    def __init__(self, root: Path, latency: float = 0.0) -> None:
+        self.root = root
+        self.latency = latency
+        self.downloads = 0
+        self._lock = threading.Lock()
+
+    def blob(self, blob_name: str) -> LocalBlob:
+        return LocalBlob(self, self.root / blob_name)
+
+    def get_blob(self, blob_name: str) -> LocalBlob | None:
+        path = self.root / blob_name
+        return LocalBlob(self, path) if path.is_file() else None
@@ -0,0 +1,163 @@
+"""Measure ``GDriveDocumentLoader`` sync time over a local folder standing in for Google Drive.
+
+The folder is served by ``LocalDriveFolder`` with ``--download-ms`` per download, ingestion is a stub costing
+``--ingest-ms`` per batch call and Redis is an in-memory stand-in. Three syncs are compared: a first sync with one
+download, parse and ingest call at a time, the same sync with concurrent downloads, process-pool parsing and batched
+ingestion, and a resync of the unchanged folder.
+
+Usage: ``python -m benchmarks.gdrive_sync --files 120 --concurrency 8``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Mapping, Sequence
+
+import fitz  # PyMuPDF  # pyrefly: ignore[import-error]
+from docx import Document  # pyrefly: ignore[import-error]
+
+import ai_coach.agent.knowledge.gdrive_knowledge_loader as loader_module
+from benchmarks.fakes import InMemoryRedis, LocalDriveFolder
+from benchmarks.utils import run
+
+
+class _DatasetService:
+    def alias_for_dataset(self, dataset: str) -> str:
+        return dataset
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        return text.strip()
+
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def get_counts(self, alias: str, user: Any, *, scoped_graph: bool = False) -> dict[str, int]:
+        return {}
+
+
+class _Projection:
+    async def project_dataset_now(self, alias: str, user: Any, *, allow_rebuild: bool = False) -> None:
+        return None
+
+
+class _KnowledgeBase:
+    GLOBAL_DATASET = "kb_global"
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.documents = 0
+        self._user = SimpleNamespace(id="bench")
+        self.dataset_service = _DatasetService()
+        self.projection_service = _Projection()
+
+    async def update_dataset_batch(
+        self, items: Sequence[tuple[str, Mapping[str, Any] | None]], dataset: str, user: Any = None, **kwargs: Any
+    ) -> tuple[str, list[bool]]:
+        self.calls += 1
+        self.documents += len(items)
+        await asyncio.sleep(self.latency)
+        return dataset, [True] * len(items)
+
+    async def _wait_for_projection(self, alias: str, user: Any, timeout_s: float) -> None:
+        return None
+
+    def record_loader_result(self, alias: str, **kwargs: Any) -> None:
+        return None
+
+
+def _docx_bytes(text: str) -> bytes:
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_bytes(text: str) -> bytes:
+    with fitz.open() as document:
+        for _ in range(4):
+            document.new_page().insert_text((72, 72), text)
+        return document.tobytes()
+
+
+def _populate(root: Path, files: int) -> None:
+    for index in range(files):
+        folder = root / f"program_{index % 6}"
+        folder.mkdir(exist_ok=True)
+        text = "\n".join(f"Week {week}: squat 5x5, bench 3x8, rest 90s ({index})." for week in range(12))
+        match index % 4:
+            case 0:
+                (folder / f"note_{index}.txt").write_text(text)
+            case 1:
+                (folder / f"note_{index}.md").write_text(f"# Plan {index}\n\n{text}")
+            case 2:
+                (folder / f"plan_{index}.docx").write_bytes(_docx_bytes(text))
+            case _:
+                (folder / f"plan_{index}.pdf").write_bytes(_pdf_bytes(text))
+
+
+async def _main(files: int, concurrency: int, processes: int, batch: int, download_ms: float, ingest_ms: float) -> int:
+    settings = loader_module.settings
+    redis = InMemoryRedis()
+    loader_module.get_redis_client = lambda: redis  # pyrefly: ignore[bad-assignment]
+    print(
+        f"files={files} concurrency={concurrency} processes={processes} batch={batch} "
+        f"download_ms={download_ms} ingest_ms={ingest_ms}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _populate(root, files)
+        runs = (
+            ("serial", 1, 0, 1),
+            ("concurrent", concurrency, processes, batch),
+            ("resync", concurrency, processes, batch),
+        )
+        for label, workers, parse_processes, batch_size in runs:
+            settings.GDRIVE_SYNC_CONCURRENCY = workers
+            settings.GDRIVE_PARSE_PROCESSES = parse_processes
+            settings.GDRIVE_SYNC_BATCH_SIZE = batch_size
+            if label != "resync":
+                redis._hashes.clear()
+                redis._strings.clear()
+            else:
+                redis._strings.clear()  # drop the folder fingerprint so the per-file versions decide
+            drive = LocalDriveFolder(root, latency=download_ms / 1000)
+            kb = _KnowledgeBase(ingest_ms / 1000)
+            loader = loader_module.GDriveDocumentLoader(kb)  # pyrefly: ignore[bad-argument-type]
+            loader.folder_id = LocalDriveFolder.ROOT_ID
+            loader._get_drive_files_service = lambda drive=drive: drive  # pyrefly: ignore[bad-assignment]
+            loader._fetch_media = drive.read  # pyrefly: ignore[bad-assignment]
+            started = time.perf_counter()
+            await loader._sync(LocalDriveFolder.ROOT_ID, force_ingest=False)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:<10} files/s={files / elapsed:8.1f} total_ms={elapsed * 1000:8.1f} "
+                f"downloads={drive.downloads} ingested={kb.documents} ingest_calls={kb.calls}"
+            )
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="GDriveDocumentLoader sync time over a local Drive stand-in")
+    parser.add_argument("--files", type=int, default=120)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--download-ms", type=float, default=20.0)
+    parser.add_argument("--ingest-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    return run(_main(args.files, args.concurrency, args.processes, args.batch, args.download_ms, args.ingest_ms))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,130 @@
+"""Measure ingestion throughput of ``KnowledgeBase.update_dataset`` vs ``update_dataset_batch``.
+
+Cognee is replaced by an in-memory stand-in whose ``add`` costs ``--add-ms`` per call plus ``--doc-ms`` per document,
+projection costs ``--projection-ms`` per request, Redis is an in-memory stand-in with ``--redis-ms`` per round trip and
+storage files go to a temporary directory (so fsync costs are real).
+
+Usage: ``python -m benchmarks.kb_ingest --docs 200 --batch 50``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import cognee
+
+import ai_coach.agent.knowledge.utils.dataset_stats as dataset_stats_module
+import ai_coach.agent.knowledge.utils.search_cache as search_cache_module
+from ai_coach.agent.knowledge.knowledge_base import KnowledgeBase
+from ai_coach.agent.knowledge.utils.hash_store import HashStore
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.utils import run
+
+
+class _Cognee:
+    def __init__(self, add_latency: float, doc_latency: float) -> None:
+        self.add_latency = add_latency
+        self.doc_latency = doc_latency
+        self.calls = 0
+        self.rows: dict[str, int] = {}
+
+    async def add(self, data: str | list[str], *, dataset_name: str, **kwargs: Any) -> None:
+        docs = data if isinstance(data, list) else [data]
+        self.calls += 1
+        self.rows[dataset_name] = self.rows.get(dataset_name, 0) + len(docs)
+        await asyncio.sleep(self.add_latency + self.doc_latency * len(docs))
+
+
+class _Projection:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    async def project_dataset(self, alias: str, user: Any, *, allow_rebuild: bool = True) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+    @staticmethod
+    def is_batching_enabled() -> bool:
+        return True
+
+
+def _build(root: Path, backend: _Cognee, projection: _Projection) -> KnowledgeBase:
+    kb = KnowledgeBase()
+    kb._vector_check_done = True
+    kb._vector_unavailable_reason = None
+    kb.storage_service.storage_root = lambda: root  # pyrefly: ignore[bad-assignment]
+    kb.projection_service = projection  # pyrefly: ignore[bad-assignment]
+
+    async def _exists(alias: str, user_ctx: Any) -> None:
+        return None
+
+    async def _rows(alias: str, user: Any | None = None) -> int:
+        return backend.rows.get(alias, 0)
+
+    kb.dataset_service.ensure_dataset_exists = _exists  # pyrefly: ignore[bad-assignment]
+    kb.dataset_service.get_row_count = _rows  # pyrefly: ignore[bad-assignment]
+    return kb
+
+
+def _docs(label: str, count: int) -> list[str]:
+    return [f"{label} workout note {index}: squat 5x5, bench 3x8, rest 90s." for index in range(count)]
+
+
+async def _main(docs: int, batch: int, add_ms: float, doc_ms: float, projection_ms: float, redis_ms: float) -> int:
+    redis = InMemoryRedis(latency=redis_ms / 1000)
+    HashStore.redis = redis  # pyrefly: ignore[bad-assignment]
+    search_cache_module.get_redis_client = lambda: redis  # pyrefly: ignore[bad-assignment]
+    dataset_stats_module.get_redis_client = lambda: redis  # pyrefly: ignore[bad-assignment]
+    user = SimpleNamespace(id="bench")
+
+    print(
+        f"docs={docs} batch={batch} add_ms={add_ms} doc_ms={doc_ms} projection_ms={projection_ms} redis_ms={redis_ms}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ("per_item", "batched"):
+            backend = _Cognee(add_ms / 1000, doc_ms / 1000)
+            projection = _Projection(projection_ms / 1000)
+            cognee.add = backend.add  # pyrefly: ignore[bad-assignment]
+            root = Path(tmp) / label
+            root.mkdir()
+            kb = _build(root, backend, projection)
+            texts = _docs(label, docs)
+            redis.round_trips = 0
+            started = time.perf_counter()
+            if label == "per_item":
+                for text in texts:
+                    await kb.update_dataset(text, "kb_bench", user=user)
+            else:
+                for offset in range(0, len(texts), batch):
+                    chunk = [(text, None) for text in texts[offset : offset + batch]]
+                    await kb.update_dataset_batch(chunk, "kb_bench", user=user)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:<9} docs/s={docs / elapsed:8.1f} total_ms={elapsed * 1000:8.1f} "
+                f"cognee_add={backend.calls} projections={projection.calls} redis_round_trips={redis.round_trips}"
+            )
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="KnowledgeBase ingestion throughput with an in-memory Cognee stand-in")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--add-ms", type=float, default=8.0)
+    parser.add_argument("--doc-ms", type=float, default=0.2)
+    parser.add_argument("--projection-ms", type=float, default=5.0)
+    parser.add_argument("--redis-ms", type=float, default=0.2)
+    args = parser.parse_args()
+    return run(_main(args.docs, args.batch, args.add_ms, args.doc_ms, args.projection_ms, args.redis_ms))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
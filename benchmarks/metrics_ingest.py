@@ -0,0 +1,105 @@
+"""Metrics event ingestion against local Postgres and Redis: ``get_or_create`` per event vs the write-behind buffer.
+
+Creates the Django test database (``DB_*`` settings, database ``test_db``) and records ``--events`` events from
+``--threads`` threads, the way concurrent API workers would; ``--duplicates`` of them repeat an earlier
+``source_id``. ``direct`` calls ``record_event`` (the previous request path). ``buffered`` calls ``buffer_event``
+(the stream append the request path now does) and then drains the stream with ``flush_events``, as the periodic
+task would. Reported per mode: request-path events/sec and p50/p95 latency, flush time and size, and the rows that
+ended up in ``MetricsEvent`` (both modes must agree).
+
+Usage: ``python -m benchmarks.metrics_ingest --events 20000 --threads 8`` (needs local Postgres and Redis)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from benchmarks.utils import percentile, run
+
+
+def _source_ids(events: int, duplicates: float) -> list[str]:
+    repeat_every = max(1, round(1 / duplicates)) if duplicates > 0 else 0
+    return [str(index // 2 if repeat_every and index % repeat_every == 0 else index) for index in range(events)]
+
+
+def _ingest(record: Callable[[str, str, str], bool], source_ids: list[str], threads: int) -> tuple[float, list[float]]:
+    from core.metrics.constants import METRICS_EVENT_ASK_AI_ANSWER, METRICS_SOURCE_ASK_AI
+
+    def _one(source_id: str) -> float:
+        started = time.perf_counter()
+        record(METRICS_EVENT_ASK_AI_ANSWER, METRICS_SOURCE_ASK_AI, source_id)
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = list(pool.map(_one, source_ids))
+    return time.perf_counter() - started, samples
+
+
+def _report(label: str, events: int, elapsed: float, samples: list[float], extra: str) -> None:
+    from apps.metrics.models import MetricsEvent
+
+    print(
+        f"{label:<9} events/s={events / elapsed:8.1f} p50={percentile(samples, 50):6.2f}ms "
+        f"p95={percentile(samples, 95):6.2f}ms rows={MetricsEvent.objects.count()} {extra}"
+    )
+
+
+async def _main(events: int, threads: int, duplicates: float, batch_size: int, keep: bool) -> int:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.db import connection
+
+    from apps.metrics import buffer
+    from apps.metrics.models import MetricsEvent
+    from apps.metrics.utils import record_event
+    from config.app_settings import settings
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=keep)
+    settings.METRICS_BUFFER_ENABLED = True
+    source_ids = _source_ids(events, duplicates)
+    print(f"events={events} unique={len(set(source_ids))} threads={threads} batch_size={batch_size}")
+    try:
+        MetricsEvent.objects.all().delete()
+        elapsed, samples = _ingest(record_event, source_ids, threads)
+        _report("direct", events, elapsed, samples, "flush=none")
+
+        MetricsEvent.objects.all().delete()
+        buffer._get_client().delete(buffer.STREAM_KEY, buffer.STATS_KEY)
+        elapsed, samples = _ingest(buffer.buffer_event, source_ids, threads)
+        flushed = buffer.flush_events(batch_size, max_batches=events // batch_size + 1)
+        _report(
+            "buffered",
+            events,
+            elapsed,
+            samples,
+            f"flush_ms={flushed.duration_ms:.0f} flushed={flushed.flushed} batches={flushed.batches} "
+            f"depth={flushed.depth}",
+        )
+    finally:
+        buffer._get_client().delete(buffer.STREAM_KEY, buffer.STATS_KEY)
+        if not keep:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Metrics ingestion: get_or_create per event vs Redis stream + bulk flush")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="share of events repeating an earlier one")
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--keep", action="store_true", help="keep the test database for the next run")
+    args = parser.parse_args()
+    return run(_main(args.events, args.threads, args.duplicates, args.batch_size, args.keep))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,142 @@
+"""Measure the pre-dispatch ``profile_fetch`` and ``profile_context`` stages of the ask path.
+
+The previous path fetches the profile over the API (``--api-ms`` per call) and, for plan modes, reads the program and
+subscription history through ``Cache.workout`` (warm cache, so no API fallback). The materialized path reads the
+``ProfileContext`` document with one GET. Redis is an in-memory stand-in with ``--redis-ms`` per round trip.
+
+Usage: ``python -m benchmarks.profile_context --requests 300 --api-ms 25``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+import core.ai_coach.profile_context as profile_context_module
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.utils import measure, run, summarize
+from core.ai_coach.profile_context import ProfileContext, ProfileContextStore, plan_lines, profile_lines
+from core.cache import Cache
+from core.cache.base import BaseCacheManager
+from core.enums import Language
+from core.schemas import Profile, Program, Subscription
+
+PROFILE_ID = 42
+
+
+class _ProfileAPI:
+    def __init__(self, profile: Profile, latency: float) -> None:
+        self.profile = profile
+        self.latency = latency
+
+    async def get_profile(self, profile_id: int) -> Profile:
+        await asyncio.sleep(self.latency)
+        return self.profile
+
+
+def _plans() -> tuple[list[Program], list[Subscription]]:
+    days = [
+        {"day": f"Day {day}", "exercises": [{"name": f"Exercise {n}", "sets": "4", "reps": "8"} for n in range(6)]}
+        for day in range(1, 5)
+    ]
+    programs = [
+        Program(id=index, profile=PROFILE_ID, exercises_by_day=days, created_at=float(index)) for index in range(1, 6)
+    ]
+    subscriptions = [
+        Subscription.model_validate(
+            {
+                "id": index,
+                "profile": PROFILE_ID,
+                "enabled": True,
+                "price": 0,
+                "workout_location": "gym",
+                "wishes": "",
+                "period": "1m",
+                "split_number": 4,
+                "exercises": days,
+                "payment_date": f"2026-0{index}-01",
+            }
+        )
+        for index in range(1, 4)
+    ]
+    return programs, subscriptions
+
+
+async def _previous(api: _ProfileAPI, *, include_plans: bool) -> str | None:
+    profile = await api.get_profile(PROFILE_ID)
+    lines = profile_lines(profile)
+    if include_plans:
+        programs = await Cache.workout.get_all_programs(PROFILE_ID)
+        subscriptions = await Cache.workout.get_all_subscriptions(PROFILE_ID)
+        lines.extend(plan_lines(programs, subscriptions))
+    return "\n".join(lines) or None
+
+
+async def _materialized(*, include_plans: bool) -> str | None:
+    context = await ProfileContextStore.load(PROFILE_ID)
+    assert context is not None
+    return context.render(include_plans=include_plans)
+
+
+async def _main(requests: int, api_ms: float, redis_ms: float) -> int:
+    redis = InMemoryRedis(latency=redis_ms / 1000)
+    BaseCacheManager._client = classmethod(lambda cls: redis)  # pyrefly: ignore[bad-assignment]
+    profile_context_module.get_redis_client = lambda: redis  # pyrefly: ignore[bad-assignment]
+    profile = Profile(
+        id=PROFILE_ID,
+        tg_id=4242,
+        language=Language.eng,
+        workout_goals="build strength",
+        weight=82,
+        height=180,
+        workout_experience="advanced",
+        diet_allergies="",
+    )
+    api = _ProfileAPI(profile, api_ms / 1000)
+    programs, subscriptions = _plans()
+    await Cache.workout.set(
+        "workout_plans:programs_history", str(PROFILE_ID), json.dumps([p.model_dump() for p in programs])
+    )
+    await Cache.workout.set(
+        "workout_plans:subscriptions_history", str(PROFILE_ID), json.dumps([s.model_dump() for s in subscriptions])
+    )
+    context = ProfileContext(
+        profile=profile,
+        summary="\n".join(profile_lines(profile)),
+        plans="\n".join(plan_lines(programs, subscriptions)),
+        generation=0,
+        built_at=time.time(),
+    )
+    await redis.set(ProfileContextStore._key(PROFILE_ID), context.to_json())
+
+    print(f"requests={requests} api_ms={api_ms} redis_ms={redis_ms}")
+    for include_plans in (False, True):
+        mode = "program" if include_plans else "ask_ai"
+        assert await _previous(api, include_plans=include_plans) == await _materialized(include_plans=include_plans)
+        samples: dict[str, Any] = {}
+        for label, func in (("previous", _previous), ("materialized", _materialized)):
+            kwargs: dict[str, Any] = {"include_plans": include_plans}
+            if func is _previous:
+                kwargs["api"] = api
+            redis.round_trips = 0
+            samples[label] = await measure(lambda func=func, kwargs=kwargs: func(**kwargs), rounds=requests)
+            trips = redis.round_trips / requests
+            print(f"{summarize(f'{mode:<7} {label:<12}', samples[label])} redis_round_trips={trips:.1f}")
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="Ask path profile stages: API fetch + plan history vs materialized document")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--api-ms", type=float, default=25.0)
+    parser.add_argument("--redis-ms", type=float, default=0.3)
+    args = parser.parse_args()
+    return run(_main(args.requests, args.api_ms, args.redis_ms))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,97 @@
+"""Replay a burst of synthetic Telegram updates through ``ProfileMiddleware``.
+
+Reports internal API calls per update with a cold ``tg_id → profile_id`` index (the previous behaviour, where every
+lookup went to the API) and with the index populated. Redis is replaced by an in-memory stand-in.
+
+Usage: ``python -m benchmarks.profile_middleware --users 200 --updates 5000``
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from types import SimpleNamespace
+from typing import Any
+
+import core.cache.profile as profile_cache
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.utils import run
+from bot.middlewares import ProfileMiddleware
+from core.cache.base import BaseCacheManager
+from core.cache.profile import ProfileCacheManager
+from core.enums import Language, ProfileStatus
+from core.schemas import Profile
+
+
+class _CountingProfileAPI:
+    def __init__(self, latency: float) -> None:
+        self.calls = 0
+        self.latency = latency
+
+    async def _profile(self, profile_id: int, tg_id: int) -> Profile:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return Profile(id=profile_id, tg_id=tg_id, language=Language.eng, status=ProfileStatus.completed)
+
+    async def get_profile_by_tg_id(self, tg_id: int) -> Profile:
+        return await self._profile(tg_id + 1_000_000, tg_id)
+
+    async def get_profile(self, profile_id: int) -> Profile:
+        return await self._profile(profile_id, profile_id - 1_000_000)
+
+
+class _State:
+    async def update_data(self, **kwargs: Any) -> dict[str, Any]:
+        return kwargs
+
+
+async def _replay(tg_ids: list[int], *, cold_index: bool, api: _CountingProfileAPI) -> tuple[float, float]:
+    middleware = ProfileMiddleware()
+    data = {"state": _State()}
+    redis = BaseCacheManager._client()
+
+    async def handler(event: Any, payload: dict[str, Any]) -> None:
+        return None
+
+    api.calls = 0
+    started = time.perf_counter()
+    for tg_id in tg_ids:
+        if cold_index and isinstance(redis, InMemoryRedis):
+            redis._hashes.pop(ProfileCacheManager._add_prefix(ProfileCacheManager.TG_INDEX_KEY), None)
+        event = SimpleNamespace(from_user=SimpleNamespace(id=tg_id))
+        await middleware(handler, event, data)
+    elapsed = time.perf_counter() - started
+    return api.calls / max(len(tg_ids), 1), len(tg_ids) / max(elapsed, 1e-9)
+
+
+async def _main(users: int, updates: int, api_latency: float) -> int:
+    api = _CountingProfileAPI(api_latency)
+    profile_cache.APIService = SimpleNamespace(profile=api)  # pyrefly: ignore[bad-assignment]
+    redis = InMemoryRedis()
+    BaseCacheManager._client = classmethod(lambda cls: redis)  # pyrefly: ignore[bad-assignment]
+    rng = random.Random(7)
+    tg_ids = [rng.randint(1, users) for _ in range(updates)]
+
+    before_calls, before_rate = await _replay(tg_ids, cold_index=True, api=api)
+    after_calls, after_rate = await _replay(tg_ids, cold_index=False, api=api)
+
+    print(f"updates={updates} users={users} api_latency_ms={api_latency * 1000:.1f}")
+    print(f"before api_calls_per_update={before_calls:.3f} updates_per_s={before_rate:.0f}")
+    print(f"after  api_calls_per_update={after_calls:.3f} updates_per_s={after_rate:.0f}")
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="ProfileMiddleware API-call load test")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--api-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    return run(_main(args.users, args.updates, args.api_latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
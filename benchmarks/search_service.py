@@ -0,0 +1,162 @@
+"""Measure ``SearchService.search`` latency against a stubbed Cognee backend.
+
+Compares sequential variant execution (the previous behaviour), concurrent variants, and concurrent variants with the
+Redis result cache warm. The backend sleeps ``--backend-ms`` (± jitter) per query; Redis is an in-memory stand-in.
+
+Usage: ``python -m benchmarks.search_service --variants 3 --rounds 200``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+from argparse import ArgumentParser
+from types import SimpleNamespace
+from typing import Any, Iterable, Sequence
+
+import ai_coach.agent.knowledge.utils.search as search_module
+import ai_coach.agent.knowledge.utils.search_cache as search_cache_module
+from ai_coach.agent.knowledge.schemas import KnowledgeSnippet, ProjectionStatus
+from ai_coach.agent.knowledge.utils.search import SearchService
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.utils import measure, run, summarize
+from config.app_settings import settings
+
+
+class _Backend:
+    def __init__(self, latency: float, jitter: float, hits: int, rng: random.Random) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.hits = hits
+        self.rng = rng
+        self.calls = 0
+
+    async def search(self, query: str, **params: Any) -> list[dict[str, Any]]:
+        self.calls += 1
+        await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+        return [{"text": f"{query} fact {index}"} for index in range(self.hits)]
+
+
+class _DatasetService:
+    _PROJECTED_DATASETS: set[str] = {"kb_profile_1", "kb_chat_1", "kb_global"}
+    GLOBAL_DATASET = "kb_global"
+
+    def alias_for_dataset(self, dataset: str) -> str:
+        return dataset
+
+    def alias_for(self, dataset: str) -> str:
+        return dataset
+
+    def dataset_name(self, profile_id: int) -> str:
+        return f"kb_profile_{profile_id}"
+
+    def chat_dataset_name(self, profile_id: int) -> str:
+        return f"kb_chat_{profile_id}"
+
+    def session_id_for_profile(self, profile_id: int) -> str:
+        return f"session:{profile_id}"
+
+    async def get_cognee_user(self) -> Any:
+        return SimpleNamespace(id="bench")
+
+    def to_user_ctx(self, user: Any) -> Any:
+        return user
+
+    async def get_cached_counts(self, alias: str, user: Any) -> dict[str, int]:
+        return {"text_rows": 1, "chunk_rows": 1, "graph_nodes": 0, "graph_edges": 0}
+
+    async def get_row_count(self, alias: str, user: Any) -> int:
+        return 1
+
+    async def ensure_dataset_exists(self, alias: str, user_ctx: Any) -> None:
+        return None
+
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+class _ProjectionService:
+    async def ensure_dataset_projected(self, alias: str, user: Any, timeout_s: float = 2.0) -> ProjectionStatus:
+        return ProjectionStatus.READY
+
+
+class _BenchSearchService(SearchService):
+    variants = 3
+
+    def _expanded_queries(self, query: str) -> list[str]:
+        return [query] + [f"{query} (variant {index})" for index in range(1, self.variants)]
+
+    def _session_cache_supported(self, profile_id: int) -> bool:
+        return False
+
+    async def _schedule_profile_sync(self, profile_id: int) -> None:
+        return None
+
+    async def _build_snippets(
+        self, items: Iterable[Any], datasets: Sequence[str], user: Any | None
+    ) -> list[KnowledgeSnippet]:
+        return [KnowledgeSnippet(text=item["text"], dataset=datasets[0] if datasets else None) for item in items]
+
+
+async def _scenario(
+    label: str,
+    service: SearchService,
+    questions: list[str],
+    *,
+    concurrency: int,
+    cache_ttl: int,
+    k: int,
+    rounds: int,
+    rng: random.Random,
+) -> None:
+    settings.AI_COACH_SEARCH_VARIANT_CONCURRENCY = concurrency
+    settings.AI_COACH_SEARCH_CACHE_TTL = cache_ttl
+
+    async def _once() -> None:
+        await service.search(rng.choice(questions), profile_id=1, k=k)
+
+    samples = await measure(_once, rounds=rounds)
+    print(summarize(label, samples))
+
+
+async def _main(variants: int, rounds: int, questions: int, backend_ms: float, jitter_ms: float, k: int) -> int:
+    rng = random.Random(11)
+    backend = _Backend(backend_ms / 1000, jitter_ms / 1000, k, rng)
+    redis = InMemoryRedis()
+    search_module.cognee = SimpleNamespace(search=backend.search)  # pyrefly: ignore[bad-assignment]
+    search_cache_module.get_redis_client = lambda: redis  # pyrefly: ignore[bad-assignment]
+    _BenchSearchService.variants = variants
+    service = _BenchSearchService(_DatasetService(), _ProjectionService())  # pyrefly: ignore[bad-argument-type]
+    pool = [f"how should I train question {index}" for index in range(questions)]
+    # each variant yields ``k`` snippets; asking for ``k * variants`` keeps early termination from hiding the fan-out
+    want = k * variants
+
+    print(f"variants={variants} rounds={rounds} questions={questions} backend_ms={backend_ms} jitter_ms={jitter_ms}")
+    await _scenario("sequential", service, pool, concurrency=1, cache_ttl=0, k=want, rounds=rounds, rng=rng)
+    await _scenario("parallel", service, pool, concurrency=variants, cache_ttl=0, k=want, rounds=rounds, rng=rng)
+    settings.AI_COACH_SEARCH_CACHE_TTL = 600
+    for question in pool:
+        await service.search(question, profile_id=1, k=want)
+    backend.calls = 0
+    await _scenario(
+        "parallel+cache", service, pool, concurrency=variants, cache_ttl=600, k=want, rounds=rounds, rng=rng
+    )
+    print(f"backend_calls_with_warm_cache={backend.calls}")
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="SearchService latency with a stubbed backend")
+    parser.add_argument("--variants", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--backend-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+    return run(_main(args.variants, args.rounds, args.questions, args.backend_ms, args.jitter_ms, args.k))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,99 @@
+"""Compare the per-file and packfile storage backends of ``StorageService``.
+
+Writes ``--docs`` synthetic texts to a temporary storage root (single writes, as ``update_dataset`` does, then batches
+of ``--batch`` as ``update_dataset_batch`` does), reads ``--reads`` random digests with the text cache disabled, and
+reports throughput plus the number of inodes each layout leaves behind.
+
+Usage: ``python -m benchmarks.storage_backends --docs 5000 --batch 200 --reads 20000``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from ai_coach.agent.knowledge.utils.packfile import PackfileStore
+from ai_coach.agent.knowledge.utils.storage import StorageService
+from ai_coach.agent.knowledge.utils.text_cache import TextLRUCache
+from benchmarks.utils import run
+from config.app_settings import settings
+
+
+class _DatasetService:
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+def _inodes(root: Path) -> int:
+    return sum(len(dirs) + len(files) for _, dirs, files in os.walk(root))
+
+
+def _corpus(label: str, docs: int, doc_bytes: int) -> list[tuple[str, str]]:
+    filler = "y" * doc_bytes
+    items = []
+    for index in range(docs):
+        text = f"{label} doc {index} {filler}"
+        items.append((hashlib.sha256(text.encode("utf-8")).hexdigest(), text))
+    return items
+
+
+async def _backend(backend: str, root: Path, docs: int, doc_bytes: int, batch: int, reads: int) -> None:
+    settings.AI_COACH_STORAGE_BACKEND = backend  # pyrefly: ignore[bad-assignment]
+    StorageService._STORAGE_CACHE = TextLRUCache(0)
+    service = StorageService(_DatasetService())
+    service.storage_root = lambda: root  # pyrefly: ignore[bad-assignment]
+
+    singles = _corpus("single", docs, doc_bytes)
+    started = time.perf_counter()
+    for digest, text in singles:
+        service.ensure_storage_file(digest_sha=digest, text=text, dataset="kb_global")
+    single_rate = docs / (time.perf_counter() - started)
+
+    batched = _corpus("batched", docs, doc_bytes)
+    started = time.perf_counter()
+    for offset in range(0, docs, batch):
+        service.ensure_storage_files(batched[offset : offset + batch], dataset="kb_global")
+    batch_rate = docs / (time.perf_counter() - started)
+
+    rng = random.Random(5)
+    digests = [digest for digest, _ in singles + batched]
+    started = time.perf_counter()
+    for _ in range(reads):
+        await service.read_storage_text(digest_sha=rng.choice(digests))
+    read_rate = reads / (time.perf_counter() - started)
+    print(
+        f"{backend:<9} write_single/s={single_rate:8.0f} write_batch/s={batch_rate:8.0f} "
+        f"read/s={read_rate:8.0f} inodes={_inodes(root)}"
+    )
+
+
+async def _main(docs: int, doc_bytes: int, batch: int, reads: int) -> int:
+    print(f"docs={docs}x2 doc_bytes={doc_bytes} batch={batch} reads={reads}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("files", "packfile"):
+            root = Path(tmp) / backend
+            root.mkdir()
+            await _backend(backend, root, docs, doc_bytes, batch, reads)
+    PackfileStore.reset()
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="StorageService per-file vs packfile backend")
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--doc-bytes", type=int, default=2048)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=20000)
+    args = parser.parse_args()
+    return run(_main(args.docs, args.doc_bytes, args.batch, args.reads))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,99 @@
+"""Measure peak RSS while ``StorageService`` reads a synthetic corpus through its text cache.
+
+Each mode runs in a fresh interpreter so ``ru_maxrss`` is not shared: ``unbounded`` keeps every text in a plain dict
+(the previous behaviour), ``lru`` uses the byte-budgeted cache with ``--budget-mb``. Documents are written to a
+temporary storage directory and read ``--passes`` times.
+
+Usage: ``python -m benchmarks.storage_cache --docs 4000 --doc-kb 32 --budget-mb 16``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from benchmarks.utils import run
+
+
+class _UnboundedCache(dict[str, str]):
+    def put(self, key: str, text: str) -> None:
+        self[key] = text
+
+    def stats(self) -> dict[str, Any]:
+        return {"entries": len(self), "evictions": 0}
+
+
+class _DatasetService:
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _child(mode: str, docs: int, doc_kb: int, budget_mb: int, passes: int) -> int:
+    from ai_coach.agent.knowledge.utils.storage import StorageService
+    from ai_coach.agent.knowledge.utils.text_cache import TextLRUCache
+
+    if mode == "lru":
+        StorageService._STORAGE_CACHE = TextLRUCache(budget_mb * 1024 * 1024)
+    else:
+        StorageService._STORAGE_CACHE = _UnboundedCache()  # pyrefly: ignore[bad-assignment]
+    service = StorageService(_DatasetService())
+    filler = "x" * (doc_kb * 1024)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        service.storage_root = lambda: root  # pyrefly: ignore[bad-assignment]
+        digests: list[str] = []
+        for index in range(docs):
+            text = f"doc {index} {filler}"
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            (root / f"text_{digest}.txt").write_text(text, encoding="utf-8")
+            digests.append(digest)
+        rss_before = _peak_rss_mb()
+        started = time.perf_counter()
+        for _ in range(passes):
+            for digest in digests:
+                await service.read_storage_text(digest_sha=digest)
+        elapsed = time.perf_counter() - started
+        stats = service.cache_stats()
+    print(
+        f"{mode:<9} rss_before={rss_before:7.1f}MB peak_rss={_peak_rss_mb():7.1f}MB "
+        f"reads/s={docs * passes / elapsed:9.0f} entries={stats['entries']} evictions={stats['evictions']}"
+    )
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="StorageService text cache memory footprint")
+    parser.add_argument("--docs", type=int, default=4000)
+    parser.add_argument("--doc-kb", type=int, default=32)
+    parser.add_argument("--budget-mb", type=int, default=16)
+    parser.add_argument("--passes", type=int, default=2)
+    parser.add_argument("--child", choices=("unbounded", "lru"))
+    args = parser.parse_args()
+    if args.child:
+        return run(_child(args.child, args.docs, args.doc_kb, args.budget_mb, args.passes))
+
+    print(f"docs={args.docs} doc_kb={args.doc_kb} budget_mb={args.budget_mb} passes={args.passes}")
+    for mode in ("unbounded", "lru"):
+        command = [sys.executable, "-m", "benchmarks.storage_cache", "--child", mode]
+        command += ["--docs", str(args.docs), "--doc-kb", str(args.doc_kb)]
+        command += ["--budget-mb", str(args.budget_mb), "--passes", str(args.passes)]
+        completed = subprocess.run(command, check=False)
+        if completed.returncode:
+            return completed.returncode
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,80 @@
+"""Measure ``StorageService.rebuild_from_disk`` over a synthetic storage directory.
+
+Writes ``--files`` documents to a temporary storage root, then rebuilds HashStore three ways: without a manifest on a
+single worker (closest to the previous serial glob-and-read loop), without a manifest on ``--workers`` threads, and with
+a warm manifest so unchanged files are not read at all. Redis is an in-memory stand-in.
+
+Usage: ``python -m benchmarks.storage_rebuild --files 50000 --workers 8``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from ai_coach.agent.knowledge.utils.datasets import DatasetService
+from ai_coach.agent.knowledge.utils.hash_store import HashStore
+from ai_coach.agent.knowledge.utils.storage import StorageService
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.utils import run
+from config.app_settings import settings
+
+
+class _DatasetService:
+    _infer_metadata_from_text = staticmethod(DatasetService._infer_metadata_from_text)
+
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+async def _rebuild(label: str, service: StorageService, files: int, workers: int, drop_manifest: bool) -> None:
+    HashStore.redis = InMemoryRedis()  # pyrefly: ignore[bad-assignment]
+    settings.AI_COACH_STORAGE_REBUILD_WORKERS = workers
+    if drop_manifest:
+        service.manifest().path.unlink(missing_ok=True)
+    started = time.perf_counter()
+    created, linked = await service.rebuild_from_disk("kb_global")
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<18} total_ms={elapsed * 1000:9.1f} files/s={files / elapsed:9.0f} created={created} linked={linked}"
+    )
+
+
+async def _main(files: int, doc_bytes: int, workers: int) -> int:
+    service = StorageService(_DatasetService())
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        service.storage_root = lambda: root  # pyrefly: ignore[bad-assignment]
+        filler = "x" * doc_bytes
+        batch: list[tuple[str, str]] = []
+        for index in range(files):
+            text = f"doc {index} {filler}"
+            batch.append((hashlib.sha256(text.encode("utf-8")).hexdigest(), text))
+            if len(batch) == 1000:
+                service.ensure_storage_files(batch, dataset="kb_global")
+                batch.clear()
+        service.ensure_storage_files(batch, dataset="kb_global")
+
+        print(f"files={files} doc_bytes={doc_bytes} workers={workers}")
+        await _rebuild("serial_no_manifest", service, files, 1, drop_manifest=True)
+        await _rebuild("pool_no_manifest", service, files, workers, drop_manifest=True)
+        await _rebuild("pool_manifest", service, files, workers, drop_manifest=False)
+    return 0
+
+
+def _entry() -> int:
+    parser = ArgumentParser(description="StorageService.rebuild_from_disk throughput")
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--doc-bytes", type=int, default=2048)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    return run(_main(args.files, args.doc_bytes, args.workers))
+
+
+if __name__ == "__main__":
+    sys.exit(_entry())
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable, Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def measure(func: Callable[[], Awaitable[Any]], *, rounds: int) -> list[float]:
+    """Run ``func`` ``rounds`` times and return wall-clock durations in milliseconds."""
+    samples: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(label: str, samples: Sequence[float]) -> str:
+    if not samples:
+        return f"{label}: no samples"
+    mean = sum(samples) / len(samples)
+    return (
+        f"{label}: n={len(samples)} mean={mean:.2f}ms p50={percentile(samples, 50):.2f}ms "
+        f"p95={percentile(samples, 95):.2f}ms max={max(samples):.2f}ms"
+    )
+
+
+def run(coro: Awaitable[Any]) -> Any:
+    return asyncio.run(coro)  # pyrefly: ignore[bad-argument-type]
@@ -10,6 +10,7 @@ from loguru import logger
 from bot.states import States
 from bot.texts import translate, MessageText
 from bot.utils.ai_coach.ask_ai import start_ask_ai_prompt, prepare_ask_ai_request, enqueue_ai_question
+from bot.utils.ai_coach.answer_stream import start_streamed_answer
 from bot.utils.text import build_coach_error_message
 from config.app_settings import settings
 from core.exceptions import AskAiPreparationError
@@ -145,6 +146,14 @@ async def process_ask_ai_question(message: Message, state: FSMContext, bot: Bot)
         await state.clear()
         await state.update_data(profile=profile.model_dump(mode="json"))
         await state.update_data(**state_payload)
+        if settings.AI_COACH_STREAM_ENABLED and not image_base64:
+            start_streamed_answer(
+                bot=bot,
+                profile=user_profile,
+                request_id=request_id,
+                fsm=state,
+                reply_to_message_id=message.message_id,
+            )
     except Exception:
         logger.exception(f"event=ask_ai_process_failed profile_id={profile.id}")
         await answer_msg(message, build_coach_error_message(lang))
@@ -16,8 +16,9 @@ from bot.utils.text import (
     build_coach_error_message,
 )
 from bot.utils.menus import send_main_menu_to_chat
-from bot.utils.ai_coach.ask_ai import send_chunk_with_reply_fallback
+from bot.utils.ai_coach.ask_ai import release_ask_ai_state, send_chunk_with_reply_fallback
 from config.app_settings import settings
+from core.ai_coach.answer_stream import OWNER_STREAM, OWNER_WEBHOOK, AnswerStream
 from core.ai_coach.state.ask_ai import AiQuestionState
 from core.exceptions import ProfileNotFoundError
 
@@ -64,6 +65,12 @@ async def _internal_ai_answer_ready_impl(request: web.Request) -> web.Response:
         )
         return web.json_response({"result": "ignored"}, status=202)
 
+    if payload.status == "success" and settings.AI_COACH_STREAM_ENABLED:
+        owner = await AnswerStream.claim(request_id, OWNER_WEBHOOK)
+        if owner == OWNER_STREAM:
+            logger.info(f"event=ask_ai_answer_streamed request_id={request_id} profile_id={payload.profile_id}")
+            return web.json_response({"result": "streaming"}, status=202)
+
     try:
         profile = await _resolve_profile(payload.profile_id, None)
     except ProfileNotFoundError:
@@ -80,17 +87,7 @@ async def _internal_ai_answer_ready_impl(request: web.Request) -> web.Response:
         storage = dispatcher.storage
         state_key = StorageKey(bot_id=bot.id, chat_id=profile.tg_id, user_id=profile.tg_id)
         fsm = FSMContext(storage=storage, key=state_key)
-        state_data = await fsm.get_data()
-        reply_to_message_id = state_data.get("ask_ai_question_message_id")
-        state_data.update(
-            {
-                "profile": profile.model_dump(mode="json"),
-                "last_request_id": payload.request_id,
-            }
-        )
-        for temporary_key in ("ask_ai_prompt_id", "ask_ai_prompt_chat_id", "ask_ai_cost", "ask_ai_question_message_id"):
-            state_data.pop(temporary_key, None)
-        await fsm.set_data(state_data)
+        reply_to_message_id = await release_ask_ai_state(fsm, profile, payload.request_id)
 
     language = profile.language
     request_id = payload.request_id
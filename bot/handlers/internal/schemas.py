@@ -44,6 +44,7 @@ class WeeklySurveyRecipient(BaseModel):
 
 
 class WeeklySurveyNotify(BaseModel):
+    broadcast_id: str | None = None
     recipients: list[WeeklySurveyRecipient] = Field(default_factory=list)
 
 
@@ -55,4 +56,5 @@ class SubscriptionRenewalRecipient(BaseModel):
 
 
 class SubscriptionRenewalNotify(BaseModel):
+    broadcast_id: str | None = None
     recipients: list[SubscriptionRenewalRecipient] = Field(default_factory=list)
@@ -1,5 +1,7 @@
 import asyncio
-from typing import Any
+import hashlib
+from datetime import date
+from typing import Any, Callable
 
 from aiohttp import web
 from aiogram import Bot
@@ -12,7 +14,13 @@ from bot.keyboards import program_view_kb as _program_view_kb, weekly_survey_kb
 from bot.texts import MessageText, translate
 from bot.utils.urls import get_webapp_url
 from bot.utils.text import build_coach_error_message
-from bot.handlers.internal.schemas import WeeklySurveyNotify, SubscriptionRenewalNotify
+from bot.utils.broadcast import Broadcast, BroadcastMessage, BroadcastProgress, spawn
+from bot.handlers.internal.schemas import (
+    SubscriptionRenewalNotify,
+    SubscriptionRenewalRecipient,
+    WeeklySurveyNotify,
+    WeeklySurveyRecipient,
+)
 from bot.handlers.internal.workout_plans import FINALIZERS, PlanFinalizeContext
 from config.app_settings import settings
 from core.exceptions import ProfileNotFoundError
@@ -214,81 +222,99 @@ async def _process_ai_plan_ready(
         )
 
 
-@require_internal_auth
-async def internal_send_weekly_survey(request: web.Request) -> web.Response:
-    bot: Bot = request.app["bot"]
-    try:
-        raw_payload = await request.json()
-    except Exception:
-        logger.error("weekly_survey_invalid_json")
-        return web.json_response({"detail": "Invalid JSON"}, status=400)
+def _weekly_survey_message(recipient: WeeklySurveyRecipient) -> BroadcastMessage | None:
+    lang = recipient.language or settings.DEFAULT_LANG
+    webapp_url = get_webapp_url(
+        "weekly_survey",
+        lang,
+        extra_params={"subscription_id": str(recipient.subscription_id)},
+    )
+    if not webapp_url:
+        logger.warning(f"weekly_survey_skipped reason=missing_webapp_url profile_id={recipient.profile_id}")
+        return None
+    return BroadcastMessage(
+        text=translate(MessageText.weekly_survey_prompt, lang).format(bot_name=settings.BOT_NAME),
+        reply_markup=weekly_survey_kb(lang, webapp_url),
+    )
 
-    try:
-        payload = WeeklySurveyNotify.model_validate(raw_payload)
-    except ValidationError as exc:
-        logger.error(f"weekly_survey_invalid_payload error={exc}")
-        return web.json_response({"detail": "Invalid payload"}, status=400)
 
-    if not payload.recipients:
-        logger.info("weekly_survey_skipped reason=no_recipients")
-        return web.json_response({"result": "no_recipients"})
+def _subscription_renewal_message(recipient: SubscriptionRenewalRecipient) -> BroadcastMessage:
+    lang = recipient.language or settings.DEFAULT_LANG
+    return BroadcastMessage(text=translate(MessageText.subscription_renewal_prompt, lang))
 
-    for recipient in payload.recipients:
-        lang = recipient.language or settings.DEFAULT_LANG
-        webapp_url = get_webapp_url(
-            "weekly_survey",
-            lang,
-            extra_params={"subscription_id": str(recipient.subscription_id)},
-        )
-        if not webapp_url:
-            logger.warning(f"weekly_survey_skipped reason=missing_webapp_url profile_id={recipient.profile_id}")
-            continue
-        try:
-            await bot.send_message(
-                chat_id=recipient.tg_id,
-                text=translate(MessageText.weekly_survey_prompt, lang).format(bot_name=settings.BOT_NAME),
-                reply_markup=weekly_survey_kb(lang, webapp_url),
-                disable_notification=True,
-            )
-            logger.info(f"weekly_survey_sent profile_id={recipient.profile_id}")
-        except Exception as exc:
-            logger.error(f"weekly_survey_failed profile_id={recipient.profile_id} error={exc!s}")
 
-    return web.json_response({"result": "ok", "sent": len(payload.recipients)})
+BroadcastNotify = WeeklySurveyNotify | SubscriptionRenewalNotify
 
+BROADCASTS: dict[str, tuple[type[BroadcastNotify], Callable[[Any], BroadcastMessage | None]]] = {
+    "weekly_survey": (WeeklySurveyNotify, _weekly_survey_message),
+    "subscription_renewal": (SubscriptionRenewalNotify, _subscription_renewal_message),
+}
 
-@require_internal_auth
-async def internal_send_subscription_renewal(request: web.Request) -> web.Response:
+
+def _broadcast_id(kind: str, payload: BroadcastNotify) -> str:
+    if payload.broadcast_id:
+        return payload.broadcast_id
+    # A retried trigger carries the same recipients, so it maps to the same broadcast and resumes it.
+    digest = hashlib.sha1(",".join(str(item.subscription_id) for item in payload.recipients).encode()).hexdigest()
+    return f"{kind}:{date.today().isoformat()}:{digest[:12]}"
+
+
+def _build_broadcast(bot: Bot, kind: str, broadcast_id: str, raw_payload: dict[str, Any]) -> Broadcast[Any]:
+    notify_cls, build = BROADCASTS[kind]
+    payload = notify_cls.model_validate(raw_payload)
+    return Broadcast(bot, broadcast_id=broadcast_id, kind=kind, recipients=payload.recipients, build=build)
+
+
+async def _accept_broadcast(request: web.Request, kind: str) -> web.Response:
     bot: Bot = request.app["bot"]
     try:
         raw_payload = await request.json()
     except Exception:
-        logger.error("subscription_renewal_invalid_json")
+        logger.error(f"{kind}_invalid_json")
         return web.json_response({"detail": "Invalid JSON"}, status=400)
 
+    notify_cls, _ = BROADCASTS[kind]
     try:
-        payload = SubscriptionRenewalNotify.model_validate(raw_payload)
+        payload = notify_cls.model_validate(raw_payload)
     except ValidationError as exc:
-        logger.error(f"subscription_renewal_invalid_payload error={exc}")
+        logger.error(f"{kind}_invalid_payload error={exc}")
         return web.json_response({"detail": "Invalid payload"}, status=400)
 
     if not payload.recipients:
-        logger.info("subscription_renewal_skipped reason=no_recipients")
+        logger.info(f"{kind}_skipped reason=no_recipients")
         return web.json_response({"result": "no_recipients"})
 
-    for recipient in payload.recipients:
-        lang = recipient.language or settings.DEFAULT_LANG
-        try:
-            await bot.send_message(
-                chat_id=recipient.tg_id,
-                text=translate(MessageText.subscription_renewal_prompt, lang),
-                disable_notification=True,
-            )
-            logger.info(f"subscription_renewal_sent profile_id={recipient.profile_id}")
-        except Exception as exc:
-            logger.error(f"subscription_renewal_failed profile_id={recipient.profile_id} error={exc!s}")
+    broadcast_id = _broadcast_id(kind, payload)
+    stats = await BroadcastProgress.stats(broadcast_id)
+    if stats.get("status") == "done":
+        logger.info(f"{kind}_skipped reason=already_sent broadcast_id={broadcast_id}")
+        return web.json_response({"result": "done", "broadcast_id": broadcast_id, "stats": stats})
+
+    await BroadcastProgress.start(broadcast_id, kind, payload.model_dump(mode="json"))
+    spawn(_build_broadcast(bot, kind, broadcast_id, payload.model_dump(mode="json")))
+    return web.json_response(
+        {"result": "accepted", "broadcast_id": broadcast_id, "recipients": len(payload.recipients)}, status=202
+    )
+
 
-    return web.json_response({"result": "ok", "sent": len(payload.recipients)})
+async def resume_broadcasts(bot: Bot) -> None:
+    """Restart broadcasts interrupted by a bot restart; chats reached before it are skipped."""
+    for broadcast_id, kind, raw_payload in await BroadcastProgress.pending():
+        if kind not in BROADCASTS:
+            logger.warning(f"broadcast_resume_skipped broadcast_id={broadcast_id} reason=unknown_kind kind={kind}")
+            continue
+        logger.info(f"broadcast_resumed kind={kind} broadcast_id={broadcast_id}")
+        spawn(_build_broadcast(bot, kind, broadcast_id, raw_payload), takeover=True)
+
+
+@require_internal_auth
+async def internal_send_weekly_survey(request: web.Request) -> web.Response:
+    return await _accept_broadcast(request, "weekly_survey")
+
+
+@require_internal_auth
+async def internal_send_subscription_renewal(request: web.Request) -> web.Response:
+    return await _accept_broadcast(request, "subscription_renewal")
 
 
 @require_internal_auth
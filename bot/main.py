@@ -11,6 +11,7 @@ from core.utils.idempotency import close_redis as close_idempotency
 from config.app_settings import settings
 from bot.middlewares import ProfileMiddleware
 from bot.handlers import configure_routers
+from bot.handlers.internal.tasks import resume_broadcasts
 from core.cache.base import BaseCacheManager
 from bot.utils.bot import set_bot_commands, check_webhook_alive
 from dependency_injector import providers
@@ -18,11 +19,13 @@ from dependency_injector import providers
 from core.containers import create_container, set_container, get_container
 from core.infra.payment import TaskPaymentNotifier
 from core.services.internal import APIService
+from core.services.internal.http_pool import HTTPClientRegistry
 
 
 async def on_shutdown(bot: Bot) -> None:
     await bot.session.close()
     await close_idempotency()
+    await HTTPClientRegistry.aclose_all()
 
 
 async def main() -> None:
@@ -67,7 +70,11 @@ async def main() -> None:
         stats = notifier.get_stats()  # pyrefly: ignore[missing-attribute]
         return web.json_response(stats)
 
+    async def health_http(request: web.Request) -> web.Response:
+        return web.json_response(HTTPClientRegistry.stats())
+
     app.router.add_get("/health/ask_ai", health_ask_ai)
+    app.router.add_get("/health/http", health_http)
 
     await setup_app(app, bot, dp)
 
@@ -108,6 +115,7 @@ async def main() -> None:
         if attempt > 0:
             logger.info(f"Webhook healthcheck passed after {attempt + 1} attempts.")
         logger.success("Bot started")
+        await resume_broadcasts(bot)
         stop_event = asyncio.Event()
         loop = asyncio.get_running_loop()
         for s in (signal.SIGINT, signal.SIGTERM):
@@ -0,0 +1,222 @@
+import asyncio
+import json
+from contextlib import suppress
+from time import monotonic
+from typing import Any
+
+from aiogram import Bot
+from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import Message
+from loguru import logger
+
+from bot.texts import MessageText, translate
+from bot.utils.ai_coach.ask_ai import extract_error_text, release_ask_ai_state
+from bot.utils.menus import send_main_menu_to_chat
+from bot.utils.text import chunk_formatted_message, format_answer_blocks, format_plain_answer
+from config.app_settings import settings
+from core.ai_coach.answer_stream import (
+    OWNER_STREAM,
+    STREAM_KIND_DELTA,
+    STREAM_KIND_ERROR,
+    STREAM_KIND_FINAL,
+    STREAM_KIND_START,
+    AnswerStream,
+)
+from core.ai_coach.state.ask_ai import AiQuestionState
+from core.schemas import Profile, QAResponseBlock
+
+_STREAM_TASKS: set[asyncio.Task[Any]] = set()
+
+
+class StreamedReply:
+    """Telegram messages showing one answer while it grows; overflow goes to follow-up messages."""
+
+    def __init__(self, bot: Bot, chat_id: int, *, template: str, reply_to_message_id: int | None) -> None:
+        self.bot = bot
+        self.chat_id = chat_id
+        self.template = template
+        self.reply_to_message_id = reply_to_message_id
+        self.messages: list[tuple[int, str]] = []
+
+    async def _send(self, text: str) -> Message:
+        reply_to = self.reply_to_message_id if not self.messages else None
+        try:
+            return await self.bot.send_message(
+                chat_id=self.chat_id,
+                text=text,
+                parse_mode=ParseMode.HTML,
+                disable_web_page_preview=True,
+                reply_to_message_id=reply_to,
+            )
+        except TelegramBadRequest as exc:
+            if reply_to is None:
+                raise
+            logger.warning(f"event=ask_ai_stream_reply_failed chat_id={self.chat_id} detail={extract_error_text(exc)}")
+            return await self.bot.send_message(
+                chat_id=self.chat_id,
+                text=text,
+                parse_mode=ParseMode.HTML,
+                disable_web_page_preview=True,
+            )
+
+    async def render(self, body: str, *, final: bool = False) -> None:
+        chunks = chunk_formatted_message(body, template=self.template, sender_name=settings.BOT_NAME)
+        for index, chunk in enumerate(chunks):
+            text = self.template.format(name=settings.BOT_NAME, message=chunk)
+            if index >= len(self.messages):
+                message = await self._send(text)
+                self.messages.append((message.message_id, text))
+                continue
+            message_id, shown = self.messages[index]
+            if shown == text:
+                continue
+            try:
+                await self.bot.edit_message_text(
+                    text=text,
+                    chat_id=self.chat_id,
+                    message_id=message_id,
+                    parse_mode=ParseMode.HTML,
+                    disable_web_page_preview=True,
+                )
+            except TelegramBadRequest as exc:
+                if "message is not modified" not in extract_error_text(exc).lower():
+                    raise
+            self.messages[index] = (message_id, text)
+        if final:
+            for message_id, _ in self.messages[len(chunks) :]:
+                with suppress(TelegramBadRequest):
+                    await self.bot.delete_message(self.chat_id, message_id)
+            del self.messages[len(chunks) :]
+
+    async def discard(self) -> None:
+        for message_id, _ in self.messages:
+            with suppress(TelegramBadRequest):
+                await self.bot.delete_message(self.chat_id, message_id)
+        self.messages.clear()
+
+
+def _final_body(payload: dict[str, Any]) -> str:
+    blocks = [QAResponseBlock.model_validate(block) for block in payload.get("blocks") or [] if block]
+    if blocks:
+        return format_answer_blocks(blocks)
+    return format_plain_answer(str(payload.get("answer") or "").strip())
+
+
+async def deliver_streamed_answer(
+    *,
+    bot: Bot,
+    profile: Profile,
+    request_id: str,
+    fsm: FSMContext,
+    reply_to_message_id: int | None = None,
+) -> bool:
+    """Tail the answer stream of ``request_id`` and edit the reply as segments arrive.
+
+    Returns ``True`` when the answer was delivered from the stream. Delivery is claimed before the first message is
+    sent; until then, and whenever this gives up, the ``ai_answer_ready`` webhook delivers the answer instead.
+    """
+    reply = StreamedReply(
+        bot,
+        profile.tg_id,
+        template=translate(MessageText.ask_ai_response_template, profile.language),
+        reply_to_message_id=reply_to_message_id,
+    )
+    interval = max(float(settings.AI_COACH_STREAM_EDIT_INTERVAL_S), 0.1)
+    deadline = monotonic() + float(settings.AI_COACH_TIMEOUT) + 60
+    last_id = "0-0"
+    text = ""
+    shown = ""
+    claimed = False
+    last_render = 0.0
+    started = monotonic()
+
+    async def _claim() -> bool:
+        nonlocal claimed
+        if not claimed:
+            claimed = await AnswerStream.claim(request_id, OWNER_STREAM) == OWNER_STREAM
+        return claimed
+
+    try:
+        while monotonic() < deadline:
+            final: dict[str, Any] | None = None
+            for entry_id, fields in await AnswerStream.read(request_id, last_id, block_ms=int(interval * 1000)):
+                last_id = entry_id
+                kind = fields.get("kind")
+                if kind == STREAM_KIND_START:
+                    text = ""
+                elif kind == STREAM_KIND_DELTA:
+                    text += fields.get("text", "")
+                elif kind == STREAM_KIND_FINAL:
+                    final = json.loads(fields.get("payload") or "{}")
+                elif kind == STREAM_KIND_ERROR:
+                    logger.info(f"event=ask_ai_stream_failed request_id={request_id} reason={fields.get('reason')}")
+                    await reply.discard()
+                    await AnswerStream.release(request_id, OWNER_STREAM)
+                    return False
+            if final is not None:
+                if final.get("status") != "success" or not str(final.get("answer") or "").strip():
+                    await reply.discard()
+                    await AnswerStream.release(request_id, OWNER_STREAM)
+                    return False
+                if not await _claim():
+                    return False
+                await reply.render(_final_body(final), final=True)
+                break
+            if not text.strip() or text == shown or monotonic() - last_render < interval:
+                continue
+            if not await _claim():
+                return False
+            if not shown:
+                logger.info(
+                    f"event=ask_ai_stream_first_text request_id={request_id} profile_id={profile.id} "
+                    f"elapsed_ms={(monotonic() - started) * 1000:.0f}"
+                )
+            await reply.render(format_plain_answer(text))
+            shown = text
+            last_render = monotonic()
+        else:
+            logger.warning(f"event=ask_ai_stream_timeout request_id={request_id} profile_id={profile.id}")
+            if claimed:
+                await reply.discard()
+                await AnswerStream.release(request_id, OWNER_STREAM)
+            return False
+    except Exception:
+        if claimed:
+            await AnswerStream.release(request_id, OWNER_STREAM)
+        raise
+
+    await AiQuestionState.create().mark_delivered(request_id)
+    logger.info(
+        f"event=ask_ai_answer_delivered request_id={request_id} profile_id={profile.id} source=stream "
+        f"messages={len(reply.messages)} elapsed_ms={(monotonic() - started) * 1000:.0f}"
+    )
+    await release_ask_ai_state(fsm, profile, request_id)
+    await send_main_menu_to_chat(bot, profile.tg_id, profile, fsm)
+    return True
+
+
+def start_streamed_answer(
+    *,
+    bot: Bot,
+    profile: Profile,
+    request_id: str,
+    fsm: FSMContext,
+    reply_to_message_id: int | None = None,
+) -> None:
+    async def _runner() -> None:
+        try:
+            await deliver_streamed_answer(
+                bot=bot,
+                profile=profile,
+                request_id=request_id,
+                fsm=fsm,
+                reply_to_message_id=reply_to_message_id,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.exception(f"event=ask_ai_stream_runner_failed request_id={request_id} error={exc!s}")
+
+    task = asyncio.create_task(_runner(), name=f"ask-ai-stream-{request_id}")
+    _STREAM_TASKS.add(task)
+    task.add_done_callback(_STREAM_TASKS.discard)
@@ -248,6 +248,22 @@ async def send_chunk_with_reply_fallback(
         raise
 
 
+async def release_ask_ai_state(fsm: FSMContext, profile: Profile, request_id: str) -> int | None:
+    """Record the answered request in the chat state and return the id of the question message."""
+    state_data = await fsm.get_data()
+    reply_to_message_id = state_data.get("ask_ai_question_message_id")
+    state_data.update(
+        {
+            "profile": profile.model_dump(mode="json"),
+            "last_request_id": request_id,
+        }
+    )
+    for temporary_key in ("ask_ai_prompt_id", "ask_ai_prompt_chat_id", "ask_ai_cost", "ask_ai_question_message_id"):
+        state_data.pop(temporary_key, None)
+    await fsm.set_data(state_data)
+    return reply_to_message_id
+
+
 def _build_ai_question_payload(
     *,
     profile_id: int,
@@ -0,0 +1,390 @@
+"""Rate-limited delivery of one notification to many Telegram chats.
+
+Broadcasts send at most ``BOT_BROADCAST_RATE_PER_S`` messages per second overall (shared by every broadcast of the
+process) and one message per ``BOT_BROADCAST_PER_CHAT_INTERVAL_S`` to any chat, each from
+``BOT_BROADCAST_CONCURRENCY`` workers. A flood-control
+``RetryAfter`` pauses every worker for the requested time before the message is tried again. Progress lives in Redis
+under ``bot:broadcast:<broadcast_id>``: the payload, the chats already handled and the counters. Running the same
+broadcast again, after a crash or a retried trigger, skips the chats it already reached.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from time import monotonic, time
+from typing import Any, Callable, Generic, Mapping, Protocol, Sequence, TypeVar
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from loguru import logger
+
+from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client
+
+
+class _Recipient(Protocol):
+    tg_id: int
+    profile_id: int
+
+
+RecipientT = TypeVar("RecipientT", bound=_Recipient)
+
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+_BROADCAST_TASKS: set[asyncio.Task[Any]] = set()
+
+
+@dataclass(frozen=True)
+class BroadcastMessage:
+    text: str
+    reply_markup: Any = None
+
+
+@dataclass(frozen=True)
+class BroadcastReport:
+    broadcast_id: str
+    kind: str
+    total: int
+    sent: int
+    failed: int
+    skipped: int
+    throttled: int
+    resumed: int
+    duration_s: float
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``capacity``; ``pause`` blocks every caller until a deadline."""
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        # Telegram counts messages per second, so a burst of ``rate`` on top of the steady rate would hit 429s.
+        self.rate = max(float(rate), 0.001)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, monotonic() + max(seconds, 0.0))
+        self._tokens = 0.0
+
+    async def acquire(self) -> None:
+        while True:
+            now = monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ChatRateLimiter:
+    """Spaces messages to the same chat at least ``interval_s`` apart."""
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = max(float(interval_s), 0.0)
+        self._next_at: dict[int, float] = {}
+
+    async def acquire(self, chat_id: int) -> None:
+        now = monotonic()
+        slot = max(now, self._next_at.get(chat_id, 0.0))
+        self._next_at[chat_id] = slot + self.interval_s
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+@lru_cache(maxsize=1)
+def _shared_limiters() -> tuple[TokenBucket, ChatRateLimiter]:
+    # Telegram limits the bot, not a broadcast: broadcasts running side by side (chunks of one scheduled
+    # notification, or two notifications) draw from the same budget.
+    return (
+        TokenBucket(settings.BOT_BROADCAST_RATE_PER_S),
+        ChatRateLimiter(settings.BOT_BROADCAST_PER_CHAT_INTERVAL_S),
+    )
+
+
+class BroadcastProgress:
+    """Redis record of one broadcast: payload, chats already handled and counters."""
+
+    PREFIX = "bot:broadcast:"
+    ACTIVE_KEY = "bot:broadcast:active"
+    TTL_S = 3 * 24 * 3600
+    LOCK_TTL_S = 120
+
+    @classmethod
+    def _key(cls, broadcast_id: str, kind: str) -> str:
+        return f"{cls.PREFIX}{broadcast_id}:{kind}"
+
+    @classmethod
+    async def start(cls, broadcast_id: str, kind: str, payload: dict[str, Any]) -> None:
+        """Store the payload so the broadcast can be resumed, and mark it active."""
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.set(cls._key(broadcast_id, "payload"), json.dumps({"kind": kind, "payload": payload}), ex=cls.TTL_S)
+            pipe.hsetnx(cls._key(broadcast_id, "stats"), "started_at", str(int(time())))
+            pipe.hset(cls._key(broadcast_id, "stats"), "status", "running")
+            pipe.expire(cls._key(broadcast_id, "stats"), cls.TTL_S)
+            pipe.sadd(cls.ACTIVE_KEY, broadcast_id)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"broadcast.start_failed broadcast_id={broadcast_id} detail={exc}")
+
+    @classmethod
+    async def claim(cls, broadcast_id: str, *, takeover: bool = False) -> bool:
+        """Take the run lock; ``False`` while another runner holds it. Fails open when Redis is unavailable.
+
+        ``takeover`` overwrites a held lock: one bot process serves the webhook, so a lock found at startup was left
+        by a run that died.
+        """
+        try:
+            lock_key = cls._key(broadcast_id, "lock")
+            return bool(await get_redis_client().set(lock_key, "1", nx=not takeover, ex=cls.LOCK_TTL_S))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"broadcast.claim_failed broadcast_id={broadcast_id} detail={exc}")
+            return True
+
+    @classmethod
+    async def extend(cls, broadcast_id: str) -> None:
+        try:
+            await get_redis_client().expire(cls._key(broadcast_id, "lock"), cls.LOCK_TTL_S)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"broadcast.extend_failed broadcast_id={broadcast_id} detail={exc}")
+
+    @classmethod
+    async def handled(cls, broadcast_id: str) -> set[int]:
+        try:
+            members = await get_redis_client().smembers(cls._key(broadcast_id, "done"))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"broadcast.handled_failed broadcast_id={broadcast_id} detail={exc}")
+            return set()
+        return {int(member) for member in members}
+
+    @classmethod
+    async def mark(cls, broadcast_id: str, chat_id: int, *, status: str, throttled: int) -> None:
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.sadd(cls._key(broadcast_id, "done"), str(chat_id))
+            pipe.expire(cls._key(broadcast_id, "done"), cls.TTL_S)
+            pipe.hincrby(cls._key(broadcast_id, "stats"), status, 1)
+            if throttled:
+                pipe.hincrby(cls._key(broadcast_id, "stats"), "throttled", throttled)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"broadcast.mark_failed broadcast_id={broadcast_id} chat_id={chat_id} detail={exc}")
+
+    @classmethod
+    async def finish(cls, report: BroadcastReport) -> None:
+        # The per-status counters were incremented by ``mark`` across every run of the broadcast.
+        mapping: Mapping[str | bytes, str] = {
+            "status": "done",
+            "total": str(report.total),
+            "duration_s": str(report.duration_s),
+            "finished_at": str(int(time())),
+        }
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.hset(cls._key(report.broadcast_id, "stats"), mapping=mapping)
+            pipe.delete(cls._key(report.broadcast_id, "payload"), cls._key(report.broadcast_id, "lock"))
+            pipe.srem(cls.ACTIVE_KEY, report.broadcast_id)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"broadcast.finish_failed broadcast_id={report.broadcast_id} detail={exc}")
+
+    @classmethod
+    async def release(cls, broadcast_id: str) -> None:
+        try:
+            await get_redis_client().delete(cls._key(broadcast_id, "lock"))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"broadcast.release_failed broadcast_id={broadcast_id} detail={exc}")
+
+    @classmethod
+    async def stats(cls, broadcast_id: str) -> dict[str, str]:
+        try:
+            return await get_redis_client().hgetall(cls._key(broadcast_id, "stats"))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"broadcast.stats_failed broadcast_id={broadcast_id} detail={exc}")
+            return {}
+
+    @classmethod
+    async def pending(cls) -> list[tuple[str, str, dict[str, Any]]]:
+        """``(broadcast_id, kind, payload)`` of every broadcast that was started but never finished."""
+        try:
+            client = get_redis_client()
+            broadcast_ids = sorted(await client.smembers(cls.ACTIVE_KEY))
+            raw_items = [await client.get(cls._key(broadcast_id, "payload")) for broadcast_id in broadcast_ids]
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"broadcast.pending_failed detail={exc}")
+            return []
+        pending: list[tuple[str, str, dict[str, Any]]] = []
+        expired: list[str] = []
+        for broadcast_id, raw in zip(broadcast_ids, raw_items):
+            if not raw:
+                expired.append(broadcast_id)
+                continue
+            stored = json.loads(raw)
+            pending.append((broadcast_id, str(stored["kind"]), dict(stored["payload"])))
+        if expired:
+            try:
+                await client.srem(cls.ACTIVE_KEY, *expired)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug(f"broadcast.pending_cleanup_failed detail={exc}")
+        return pending
+
+
+class Broadcast(Generic[RecipientT]):
+    """One notification sent to ``recipients``; ``build`` renders the message or returns ``None`` to skip one."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        *,
+        broadcast_id: str,
+        kind: str,
+        recipients: Sequence[RecipientT],
+        build: Callable[[RecipientT], BroadcastMessage | None],
+        rate_per_s: float | None = None,
+        per_chat_interval_s: float | None = None,
+        concurrency: int | None = None,
+        max_attempts: int | None = None,
+    ) -> None:
+        self.bot = bot
+        self.broadcast_id = broadcast_id
+        self.kind = kind
+        self.recipients = recipients
+        self.build = build
+        self.concurrency = max(1, int(concurrency or settings.BOT_BROADCAST_CONCURRENCY))
+        self.max_attempts = max(1, int(max_attempts or settings.BOT_BROADCAST_MAX_ATTEMPTS))
+        shared_bucket, shared_per_chat = _shared_limiters()
+        self.bucket = TokenBucket(rate_per_s) if rate_per_s else shared_bucket
+        self.per_chat = ChatRateLimiter(per_chat_interval_s) if per_chat_interval_s is not None else shared_per_chat
+        self.counts = {STATUS_SENT: 0, STATUS_FAILED: 0, STATUS_SKIPPED: 0}
+        self.throttled = 0
+
+    async def _send(self, recipient: RecipientT, message: BroadcastMessage) -> tuple[str, int]:
+        throttled = 0
+        for attempt in range(1, self.max_attempts + 1):
+            await self.per_chat.acquire(recipient.tg_id)
+            await self.bucket.acquire()
+            try:
+                await self.bot.send_message(
+                    chat_id=recipient.tg_id,
+                    text=message.text,
+                    reply_markup=message.reply_markup,
+                    disable_notification=True,
+                )
+                return STATUS_SENT, throttled
+            except TelegramRetryAfter as exc:
+                throttled += 1
+                self.bucket.pause(float(exc.retry_after))
+                logger.warning(
+                    f"broadcast_throttled kind={self.kind} broadcast_id={self.broadcast_id} "
+                    f"retry_after={exc.retry_after} attempt={attempt}"
+                )
+            except (TelegramNetworkError, TelegramServerError) as exc:
+                logger.warning(
+                    f"broadcast_transient_error kind={self.kind} profile_id={recipient.profile_id} "
+                    f"attempt={attempt} error={exc!s}"
+                )
+                await asyncio.sleep(min(2**attempt, 30))
+            except Exception as exc:  # noqa: BLE001
+                logger.error(f"{self.kind}_failed profile_id={recipient.profile_id} error={exc!s}")
+                return STATUS_FAILED, throttled
+        logger.error(f"{self.kind}_failed profile_id={recipient.profile_id} error=attempts_exhausted")
+        return STATUS_FAILED, throttled
+
+    async def _deliver(self, recipient: RecipientT) -> None:
+        try:
+            message = self.build(recipient)
+        except Exception as exc:  # noqa: BLE001
+            logger.error(f"{self.kind}_failed profile_id={recipient.profile_id} error={exc!s}")
+            status, throttled = STATUS_FAILED, 0
+        else:
+            status, throttled = (STATUS_SKIPPED, 0) if message is None else await self._send(recipient, message)
+        if status == STATUS_SENT:
+            logger.info(f"{self.kind}_sent profile_id={recipient.profile_id}")
+        self.counts[status] += 1
+        self.throttled += throttled
+        await BroadcastProgress.mark(self.broadcast_id, recipient.tg_id, status=status, throttled=throttled)
+
+    async def _worker(self, queue: "asyncio.Queue[RecipientT]") -> None:
+        while True:
+            try:
+                recipient = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._deliver(recipient)
+
+    async def _keep_claim(self) -> None:
+        while True:
+            await asyncio.sleep(BroadcastProgress.LOCK_TTL_S / 3)
+            await BroadcastProgress.extend(self.broadcast_id)
+
+    async def run(self, *, takeover: bool = False) -> BroadcastReport | None:
+        """Deliver to every recipient not handled by an earlier run; ``None`` if another runner owns the broadcast."""
+        if not await BroadcastProgress.claim(self.broadcast_id, takeover=takeover):
+            logger.info(f"broadcast_in_progress kind={self.kind} broadcast_id={self.broadcast_id}")
+            return None
+        started = monotonic()
+        keeper = asyncio.create_task(self._keep_claim())
+        try:
+            handled = await BroadcastProgress.handled(self.broadcast_id)
+            queue: asyncio.Queue[RecipientT] = asyncio.Queue()
+            seen: set[int] = set()
+            for recipient in self.recipients:
+                if recipient.tg_id not in handled and recipient.tg_id not in seen:
+                    seen.add(recipient.tg_id)
+                    queue.put_nowait(recipient)
+            await asyncio.gather(*(self._worker(queue) for _ in range(min(self.concurrency, queue.qsize() or 1))))
+        finally:
+            keeper.cancel()
+        report = BroadcastReport(
+            broadcast_id=self.broadcast_id,
+            kind=self.kind,
+            total=len(self.recipients),
+            sent=self.counts[STATUS_SENT],
+            failed=self.counts[STATUS_FAILED],
+            skipped=self.counts[STATUS_SKIPPED],
+            throttled=self.throttled,
+            resumed=len(handled),
+            duration_s=round(monotonic() - started, 3),
+        )
+        await BroadcastProgress.finish(report)
+        logger.info(
+            f"broadcast_finished kind={self.kind} broadcast_id={self.broadcast_id} total={report.total} "
+            f"sent={report.sent} failed={report.failed} skipped={report.skipped} throttled={report.throttled} "
+            f"resumed={report.resumed} duration_s={report.duration_s}"
+        )
+        return report
+
+
+def spawn(broadcast: Broadcast[Any], *, takeover: bool = False) -> None:
+    """Run ``broadcast`` in the background, keeping a reference until it completes."""
+
+    async def _runner() -> None:
+        try:
+            await broadcast.run(takeover=takeover)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception(f"broadcast_runner_failed broadcast_id={broadcast.broadcast_id} err={exc!s}")
+            await BroadcastProgress.release(broadcast.broadcast_id)
+
+    task = asyncio.create_task(_runner(), name=f"broadcast-{broadcast.broadcast_id}")
+    _BROADCAST_TASKS.add(task)
+    task.add_done_callback(_BROADCAST_TASKS.discard)
+
+
+__all__ = [
+    "Broadcast",
+    "BroadcastMessage",
+    "BroadcastProgress",
+    "BroadcastReport",
+    "ChatRateLimiter",
+    "TokenBucket",
+    "spawn",
+]
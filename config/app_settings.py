@@ -4,7 +4,7 @@ import logging
 import os
 from decimal import Decimal
 from pathlib import Path
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 from urllib.parse import quote, quote_plus, urlsplit, urlunsplit
 from uuid import NAMESPACE_DNS, uuid5
 
@@ -84,6 +84,12 @@ class Settings(BaseSettings):
     REDIS_PORT: Annotated[int, Field(default=6379, description="Port of the Redis server.")]
     HOST_REDIS_PORT: Annotated[str, Field(default="6379", description="Port for Redis exposed to the host machine (non-Docker).")]
     CACHE_TTL: int = Field(default=60 * 5, description="Default Time-To-Live for cached items in seconds.")
+    CACHE_FIELD_SOFT_TTL: Annotated[int, Field(default=3_600, description="Seconds after which cached hash fields are served stale while refreshed in the background.")]
+    CACHE_FIELD_HARD_TTL: Annotated[int, Field(default=30 * 86_400, description="Seconds after which cached hash fields are treated as missing and evicted by the sweeper.")]
+    CACHE_SWEEP_INTERVAL: Annotated[int, Field(default=3_600, description="Interval in seconds between sweeps that evict expired cache hash fields.")]
+    CACHE_FETCH_LEASE_ENABLED: Annotated[bool, Field(default=False, description="Coordinate cache refills across processes with a short Redis lease so only one worker hits the backing API per key.")]
+    CACHE_FETCH_LEASE_TTL_MS: Annotated[int, Field(default=5_000, description="TTL in milliseconds for the cross-process cache refill lease.")]
+    CACHE_FETCH_LEASE_WAIT_S: Annotated[float, Field(default=1.0, description="Seconds a worker waits for a peer holding the refill lease before fetching itself.")]
 
     # --- Message Broker (RabbitMQ) ---
     RABBITMQ_URL: Annotated[str | None, Field(default=None, description="Full connection URL for RabbitMQ. Auto-derived if not set.")]
@@ -102,6 +108,15 @@ class Settings(BaseSettings):
     BOT_INTERNAL_PORT: Annotated[int, Field(default=8088, description="Internal port for the bot service (in Docker).")]
     BOT_INTERNAL_URL: Annotated[str, Field(default="http://bot:8088/", description="Internal URL for the API to communicate with the bot.")]
     DOCKER_BOT_START: Annotated[bool, Field(default=False, description="Flag indicating if the bot is running in a Docker container.")]
+    BOT_BROADCAST_RATE_PER_S: Annotated[float, Field(default=25.0, description="Messages per second a broadcast sends across all chats (Telegram allows about 30).")]
+    BOT_BROADCAST_PER_CHAT_INTERVAL_S: Annotated[float, Field(default=1.0, description="Minimum seconds between two broadcast messages to the same chat.")]
+    BOT_BROADCAST_CONCURRENCY: Annotated[int, Field(default=8, description="Concurrent send_message calls of one broadcast.")]
+    BOT_BROADCAST_MAX_ATTEMPTS: Annotated[int, Field(default=5, description="Attempts per broadcast message on flood control and transient errors.")]
+    METRICS_BUFFER_ENABLED: Annotated[bool, Field(default=True, description="Buffer metrics events in a Redis stream and write them to the database in batches.")]
+    METRICS_FLUSH_INTERVAL: Annotated[int, Field(default=10, description="Interval in seconds between flushes of buffered metrics events.")]
+    METRICS_FLUSH_BATCH_SIZE: Annotated[int, Field(default=1_000, description="Buffered metrics events written per bulk insert.")]
+    BILLING_EXPIRY_CHUNK_SIZE: Annotated[int, Field(default=500, description="Expired subscriptions deactivated per bulk API call by deactivate_expired_subscriptions.")]
+    BOT_NOTIFY_CHUNK_SIZE: Annotated[int, Field(default=500, description="Recipients per Celery subtask (and bot broadcast) of the weekly survey and renewal reminders.")]
 
     # --- AI Coach Service ---
     AI_COACH_URL: Annotated[str, Field(default="http://ai_coach:9000/", description="URL of the AI Coach service.")]
@@ -124,8 +139,15 @@ class Settings(BaseSettings):
     AI_COACH_MEMIFY_DELAY_SECONDS: Annotated[float, Field(default=3600.0, description="Delay in seconds before scheduling Cognee memify for profile datasets.")]
     AI_COACH_CHAT_SUMMARY_PAIR_LIMIT: Annotated[int, Field(default=10, description="Number of client/coach message pairs required before summarizing chat history.")]
     AI_COACH_CHAT_SUMMARY_MAX_TOKENS: Annotated[int, Field(default=400, description="Max tokens for the chat summary LLM request.")]
+    AI_COACH_CHAT_SUMMARY_DELAY_S: Annotated[float, Field(default=30.0, description="Seconds a queued chat summarization job waits; answers given meanwhile collapse into it.")]
+    AI_COACH_CHAT_SUMMARY_STALE_S: Annotated[float, Field(default=900.0, description="Seconds past the delay after which a pending chat summarization job that never started is considered lost.")]
     AI_COACH_REDIS_CHAT_DB: Annotated[int, Field(default=2, description="Redis database index used for cached chat history summaries.")]
     AI_COACH_REDIS_STATE_DB: Annotated[int, Field(default=3, description="Redis database index used for AI coach idempotency and delivery state.")]
+    AI_COACH_PROFILE_CONTEXT_ENABLED: Annotated[bool, Field(default=True, description="Serve the ask prompt profile context from the materialized per-profile document in Redis.")]
+    AI_COACH_PROFILE_CONTEXT_TTL: Annotated[int, Field(default=24 * 3600, description="TTL in seconds for materialized profile context documents.")]
+    AI_COACH_STREAM_ENABLED: Annotated[bool, Field(default=False, description="Stream Ask AI answers to Telegram while they are generated.")]
+    AI_COACH_STREAM_SEGMENT_CHARS: Annotated[int, Field(default=64, description="Characters buffered before a partial Ask AI answer segment is published.")]
+    AI_COACH_STREAM_EDIT_INTERVAL_S: Annotated[float, Field(default=1.0, description="Minimum seconds between Telegram edits of a streamed Ask AI answer.")]
     AI_COACH_COGNEE_SESSION_TTL: Annotated[int, Field(default=0, description="TTL in seconds for Cognee session cache; 0 disables expiry.")]
     AI_COACH_KB_ENABLED: Annotated[bool, Field(default=True, description="Enable Cognee knowledge base usage for AI coach flows.")]
     AI_COACH_LOG_PAYLOADS: Annotated[bool, Field(default=False, description="Log AI coach payloads and sources in debug logs when enabled.")]
@@ -187,6 +209,7 @@ class Settings(BaseSettings):
     COGNEE_PROJECTION_RETRY_BACKOFF_FACTOR: Annotated[float, Field(default=2.0, description="Backoff multiplier for Cognee projection retries.")]
     COGNEE_PROJECTION_RETRY_MAX_DELAY: Annotated[float, Field(default=15.0, description="Maximum delay in seconds between Cognee projection retries.")]
     COGNEE_PROJECTION_DEBOUNCE_S: Annotated[float, Field(default=30.0, description="Minimum seconds between projection starts for the same dataset alias.")]
+    COGNEE_PROJECTION_LEASE_S: Annotated[float, Field(default=120.0, description="Lease in seconds a worker holds on a dataset while projecting it; renewed every third of the lease.")]
     COGNEE_PROJECTION_BATCH_WINDOW_S: Annotated[float, Field(default=60.0, description="Batch window in seconds before running a scheduled projection; 0 disables batching.")]
     COGNEE_PROJECTION_MAX_DURATION_S: Annotated[float, Field(default=900.0, description="Maximum duration in seconds for a projection run before pausing further projections.")]
     COGNEE_PROJECTION_STALL_LIMIT: Annotated[int, Field(default=2, description="Number of consecutive projections without progress before stalling further projections; 0 disables.")]
@@ -199,13 +222,31 @@ class Settings(BaseSettings):
     GDRIVE_DOWNLOAD_INITIAL_DELAY: Annotated[float, Field(default=1.0, description="Initial delay in seconds before retrying a Google Drive download.")]
     GDRIVE_DOWNLOAD_BACKOFF_FACTOR: Annotated[float, Field(default=2.0, description="Backoff multiplier for Google Drive download retries.")]
     GDRIVE_DOWNLOAD_MAX_DELAY: Annotated[float, Field(default=10.0, description="Maximum delay in seconds between Google Drive download retries.")]
+    GDRIVE_SYNC_CONCURRENCY: Annotated[int, Field(default=8, description="Concurrent Google Drive downloads during a knowledge base sync.")]
+    GDRIVE_PARSE_PROCESSES: Annotated[int, Field(default=2, description="Worker processes parsing PDF/DOCX files during a Google Drive sync; 0 parses in threads.")]
+    GDRIVE_SYNC_BATCH_SIZE: Annotated[int, Field(default=50, description="Documents ingested per batch during a Google Drive sync.")]
     KNOWLEDGE_REFRESH_INTERVAL: int = Field(default=60 * 60, description="Interval in seconds to refresh the knowledge base from the source.")
     KNOWLEDGE_REFRESH_START_DELAY: int = Field(default=180, description="Delay in seconds before starting the first knowledge base refresh.")
     COGNEE_SEARCH_MODE: Annotated[str, Field(default="GRAPH_COMPLETION_CONTEXT_EXTENSION", description="Search type for Cognee queries (e.g., 'GRAPH_COMPLETION_CONTEXT_EXTENSION').")]
+    AI_COACH_SEARCH_VARIANT_CONCURRENCY: Annotated[int, Field(default=3, description="Maximum number of query variants searched concurrently.")]
+    AI_COACH_SEARCH_CACHE_TTL: Annotated[int, Field(default=600, description="TTL in seconds for cached knowledge search results; 0 disables the cache.")]
+    AI_COACH_DATASET_STATS_TTL: Annotated[float, Field(default=30.0, description="Seconds dataset counts are memoized in-process before re-reading the Redis snapshot.")]
+    AI_COACH_STORAGE_CACHE_MAX_BYTES: Annotated[int, Field(default=64 * 1024 * 1024, description="Memory budget in bytes for document texts cached by the knowledge storage service; 0 disables the cache.")]
+    AI_COACH_STORAGE_REBUILD_WORKERS: Annotated[int, Field(default=8, description="Threads used to read storage files when rebuilding HashStore from disk.")]
+    AI_COACH_STORAGE_BACKEND: Annotated[Literal["files", "packfile"], Field(default="files", description="Knowledge text storage layout: one file per digest, or append-only packfiles.")]
+    AI_COACH_PACKFILE_SEGMENT_BYTES: Annotated[int, Field(default=64 * 1024 * 1024, description="Size in bytes at which the active packfile segment is sealed and a new one started.")]
+    AI_COACH_EMBEDDING_CACHE_ENABLED: Annotated[bool, Field(default=True, description="Serve repeated Cognee embeddings from the content-hash keyed embedding cache.")]
+    AI_COACH_EMBEDDING_CACHE_PATH: Annotated[str, Field(default="", description="SQLite file for cached embeddings; empty places it in the Cognee storage directory.")]
+    AI_COACH_EMBEDDING_CACHE_REDIS_TTL: Annotated[int, Field(default=0, description="TTL in seconds for embeddings shared through Redis; 0 keeps the cache local to each host.")]
+    AI_COACH_PACKFILE_COMPACT_RATIO: Annotated[float, Field(default=0.5, description="Share of deleted bytes that triggers background packfile compaction; 0 disables it.")]
 
     EXERCISE_GIF_BUCKET: Annotated[str, Field(default="exercises_catalog", description="Google Cloud Storage bucket name used for exercise GIF assets.")]
     EXERCISE_GIF_BASE_URL: Annotated[str, Field(default="https://storage.googleapis.com", description="Base URL for the exercise GIF storage.")]
     EXERCISE_GIF_URL_TTL_SEC: Annotated[int, Field(default=10_800, description="TTL in seconds for signed exercise GIF URLs.")]
+    EXERCISE_GIF_CACHE_DIR: Annotated[str, Field(default="exercise_gif_cache", description="Directory of the on-disk cache of exercise GIFs served by the webapp.")]
+    EXERCISE_GIF_CACHE_MAX_MB: Annotated[int, Field(default=256, description="Size budget in megabytes of the on-disk exercise GIF cache.")]
+    EXERCISE_GIF_CACHE_TTL_SEC: Annotated[int, Field(default=86_400, description="Seconds before a cached exercise GIF is revalidated against the bucket generation.")]
+    EXERCISE_GIF_MAX_AGE_SEC: Annotated[int, Field(default=86_400, description="Cache-Control max-age in seconds for exercise GIF responses.")]
 
     # --- AI-Generated Workout Plans ---
     AI_PLAN_DEDUP_TTL: Annotated[int, Field(default=3600, description="TTL in seconds for workout plan request deduplication.")]
@@ -233,6 +274,13 @@ class Settings(BaseSettings):
     API_TIMEOUT: int = Field(default=10, description="Default timeout in seconds for outbound API calls.")
     API_MAX_CONNECTIONS: int = Field(default=100, description="Maximum number of connections for the HTTP client pool.")
     API_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20, description="Maximum number of keep-alive connections for the HTTP client.")
+    API_KEEPALIVE_EXPIRY: float = Field(default=30.0, description="Seconds an idle pooled connection is kept alive before being closed.")
+    API_CIRCUIT_BREAKER_ENABLED: bool = Field(default=True, description="Fail fast on hosts whose recent error rate tripped the circuit breaker.")
+    API_CIRCUIT_BREAKER_WINDOW: float = Field(default=30.0, description="Rolling window in seconds used to compute a host's error rate.")
+    API_CIRCUIT_BREAKER_FAILURE_RATE: float = Field(default=0.5, description="Error rate within the window that opens the circuit breaker.")
+    API_CIRCUIT_BREAKER_MIN_REQUESTS: int = Field(default=10, description="Minimum outcomes within the window before the breaker may open.")
+    API_CIRCUIT_BREAKER_OPEN_SECONDS: float = Field(default=15.0, description="Seconds the breaker stays open before admitting half-open probes.")
+    API_CIRCUIT_BREAKER_HALF_OPEN_MAX: int = Field(default=1, description="Concurrent probe requests allowed while the breaker is half-open.")
     INTERNAL_HTTP_CONNECT_TIMEOUT: Annotated[float, Field(default=10.0, description="Connect timeout in seconds for internal HTTP calls.")]
     INTERNAL_HTTP_READ_TIMEOUT: Annotated[float, Field(default=30.0, description="Read timeout in seconds for internal HTTP calls.")]
 
@@ -66,6 +66,16 @@ beat_schedule = {
         "schedule": crontab(day_of_week="sun", hour=10, minute=0),
         "options": {"queue": "maintenance"},
     },
+    "sweep_cache_hashes": {
+        "task": "core.tasks.cache.sweep_cache_hashes",
+        "schedule": timedelta(seconds=settings.CACHE_SWEEP_INTERVAL),
+        "options": {"queue": "maintenance"},
+    },
+    "flush_metrics_events": {
+        "task": "core.tasks.metrics.flush_metrics_events",
+        "schedule": timedelta(seconds=settings.METRICS_FLUSH_INTERVAL),
+        "options": {"queue": "maintenance"},
+    },
     "send_subscription_renewal_reminders": {
         "task": "core.tasks.bot_calls.send_subscription_renewal_reminders",
         "schedule": crontab(hour=9, minute=30),
@@ -89,6 +89,11 @@ urlpatterns = [
         cast(WebappView, metrics_views.record_metrics_event),
         name="internal-metrics-event",
     ),
+    path(
+        "internal/metrics/buffer/",
+        cast(WebappView, metrics_views.metrics_buffer_stats),
+        name="internal-metrics-buffer",
+    ),
     path(
         "internal/diets/",
         cast(WebappView, webapp_views.diet_plan_save_internal),
@@ -0,0 +1,148 @@
+"""Partial Ask AI answers published per request through a Redis stream.
+
+The AI coach appends the model output to ``ai_coach:answer_stream:<request_id>`` while it is generated, in segments
+of a few dozen characters rather than one entry per token. The Ask AI task appends the final answer (or the failure)
+once the request completes, before the bot webhook is called. The bot tails the stream and edits its reply as text
+arrives; whichever of the stream consumer and the webhook claims the request first delivers the answer.
+"""
+
+import asyncio
+import json
+from time import monotonic
+from typing import Any, Final
+
+from loguru import logger
+
+from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client
+
+STREAM_KIND_START: Final[str] = "start"
+STREAM_KIND_DELTA: Final[str] = "delta"
+STREAM_KIND_FINAL: Final[str] = "final"
+STREAM_KIND_ERROR: Final[str] = "error"
+
+OWNER_STREAM: Final[str] = "stream"
+OWNER_WEBHOOK: Final[str] = "webhook"
+
+
+class AnswerStream:
+    """Redis stream of answer segments for one Ask AI request."""
+
+    PREFIX = "ai_coach:answer_stream:"
+    TTL_S = 900
+    MAXLEN = 2000
+
+    @classmethod
+    def _key(cls, request_id: str, kind: str = "segments") -> str:
+        return f"{cls.PREFIX}{request_id}:{kind}"
+
+    @classmethod
+    async def append(cls, request_id: str, *entries: dict[str, str]) -> bool:
+        if not request_id or not entries:
+            return False
+        key = cls._key(request_id)
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            for entry in entries:
+                pipe.xadd(key, entry, maxlen=cls.MAXLEN, approximate=True)
+            pipe.expire(key, cls.TTL_S)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"answer_stream.append_failed request_id={request_id} detail={exc}")
+            return False
+        return True
+
+    @classmethod
+    async def finish(cls, request_id: str, payload: dict[str, Any]) -> bool:
+        """Append the final notify payload; it supersedes every segment published before it."""
+        return await cls.append(request_id, {"kind": STREAM_KIND_FINAL, "payload": json.dumps(payload)})
+
+    @classmethod
+    async def fail(cls, request_id: str, reason: str) -> bool:
+        return await cls.append(request_id, {"kind": STREAM_KIND_ERROR, "reason": reason})
+
+    @classmethod
+    async def read(cls, request_id: str, last_id: str, *, block_ms: int) -> list[tuple[str, dict[str, str]]]:
+        """Entries after ``last_id``, waiting up to ``block_ms`` for the first one."""
+        try:
+            response = await get_redis_client().xread({cls._key(request_id): last_id}, count=100, block=block_ms)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"answer_stream.read_failed request_id={request_id} detail={exc}")
+            await asyncio.sleep(block_ms / 1000)
+            return []
+        entries: list[tuple[str, dict[str, str]]] = []
+        for _, stream_entries in response or []:
+            entries.extend((str(entry_id), dict(fields)) for entry_id, fields in stream_entries)
+        return entries
+
+    @classmethod
+    async def claim(cls, request_id: str, owner: str) -> str | None:
+        """Claim delivery of ``request_id`` for ``owner`` and return the owner that holds it."""
+        key = cls._key(request_id, "owner")
+        try:
+            client = get_redis_client()
+            if await client.set(key, owner, nx=True, ex=cls.TTL_S):
+                return owner
+            current = await client.get(key)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"answer_stream.claim_failed request_id={request_id} owner={owner} detail={exc}")
+            return None
+        return str(current) if current else None
+
+    @classmethod
+    async def release(cls, request_id: str, owner: str) -> None:
+        """Hand delivery back when ``owner`` gave up after claiming it."""
+        key = cls._key(request_id, "owner")
+        try:
+            client = get_redis_client()
+            if await client.get(key) == owner:
+                await client.delete(key)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"answer_stream.release_failed request_id={request_id} owner={owner} detail={exc}")
+
+
+class AnswerStreamPublisher:
+    """Coalesce model token deltas into stream segments.
+
+    The first delta is published right away so the client sees text as early as possible; later deltas are buffered
+    until ``segment_chars`` characters, a line break or ``flush_s`` seconds have accumulated.
+    """
+
+    def __init__(self, request_id: str, *, segment_chars: int | None = None, flush_s: float = 0.25) -> None:
+        self.request_id = request_id
+        self.segment_chars = max(int(segment_chars or settings.AI_COACH_STREAM_SEGMENT_CHARS), 1)
+        self.flush_s = flush_s
+        self.segments = 0
+        self.published_chars = 0
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._last_flush = monotonic()
+
+    async def push(self, delta: str) -> None:
+        if not delta:
+            return
+        self._pending.append(delta)
+        self._pending_chars += len(delta)
+        if (
+            self.segments == 0
+            or self._pending_chars >= self.segment_chars
+            or "\n" in delta
+            or monotonic() - self._last_flush >= self.flush_s
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        self._last_flush = monotonic()
+        entries: list[dict[str, str]] = []
+        if self.segments == 0:
+            # A retried request streams again from the start; consumers drop what they accumulated so far.
+            entries.append({"kind": STREAM_KIND_START})
+        entries.append({"kind": STREAM_KIND_DELTA, "text": text})
+        await AnswerStream.append(self.request_id, *entries)
+        self.segments += 1
+        self.published_chars += len(text)
@@ -0,0 +1,174 @@
+"""Chat session summarization queued off the ask path.
+
+Summarizing a chat session is an LLM call plus a dataset update, so the ask path no longer runs it inline. It only
+records the profile in ``ai_coach:chat_summary:pending`` (a sorted set scored by enqueue time) and, when the profile
+was not pending yet, schedules ``summarize_chat_session`` on the ``ai_coach`` queue after
+``AI_COACH_CHAT_SUMMARY_DELAY_S``. Every answer given while a job is pending collapses into that job. The AI coach
+takes the entry when the job starts, so answers arriving during a run schedule exactly one follow-up job. A job that
+ends without reaching the AI coach discards the entry, and entries older than the delay plus
+``AI_COACH_CHAT_SUMMARY_STALE_S`` (a message lost by the broker) are dropped on the next enqueue.
+"""
+
+import time
+from typing import Any, Awaitable, Callable, cast
+
+from loguru import logger
+
+from config.app_settings import settings
+from core.utils.redis_lock import get_redis_client
+
+
+class ChatSummaryQueue:
+    """Per-profile coalesced summarization jobs plus the counters reported by ``/health/kb``."""
+
+    PREFIX = "ai_coach:chat_summary:"
+    PENDING_KEY = f"{PREFIX}pending"
+    LANGUAGE_KEY = f"{PREFIX}language"
+    STATS_KEY = f"{PREFIX}stats"
+    RATE_WINDOW_MIN = 5
+
+    @classmethod
+    def _minute_key(cls, minute: int) -> str:
+        return f"{cls.PREFIX}done:{minute}"
+
+    @classmethod
+    async def enqueue(cls, profile_id: int, *, language: str | None = None) -> bool:
+        """Schedule a summarization job for ``profile_id`` unless one is already pending.
+
+        Returns ``True`` when a new job was sent to Celery.
+        """
+        if int(settings.AI_COACH_CHAT_SUMMARY_PAIR_LIMIT) <= 0:
+            return False
+        member = str(profile_id)
+        countdown = max(float(settings.AI_COACH_CHAT_SUMMARY_DELAY_S), 0.0)
+        now_ms = int(time.time() * 1000)
+        stale_before_ms = now_ms - int((countdown + max(float(settings.AI_COACH_CHAT_SUMMARY_STALE_S), 0.0)) * 1000)
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            pipe.zremrangebyscore(cls.PENDING_KEY, "-inf", stale_before_ms)
+            pipe.zadd(cls.PENDING_KEY, {member: now_ms}, nx=True)
+            if language:
+                pipe.hset(cls.LANGUAGE_KEY, member, language)
+            _, added, *_ = await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"chat_summary.enqueue_failed profile_id={profile_id} detail={exc}")
+            return False
+        if not added:
+            logger.debug(f"chat_summary.coalesced profile_id={profile_id}")
+            return False
+        try:
+            from core.tasks.ai_coach.maintenance import summarize_chat_session
+
+            getattr(summarize_chat_session, "apply_async")(kwargs={"profile_id": profile_id}, countdown=countdown)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"chat_summary.schedule_failed profile_id={profile_id} detail={exc}")
+            await cls._drop(member)
+            return False
+        logger.info(f"chat_summary.enqueued profile_id={profile_id} delay_s={countdown}")
+        return True
+
+    @classmethod
+    async def discard(cls, profile_id: int) -> None:
+        """Release the pending entry of a job that ended without reaching the AI coach."""
+        await cls._drop(str(profile_id))
+
+    @classmethod
+    async def _drop(cls, member: str) -> None:
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            pipe.zrem(cls.PENDING_KEY, member)
+            pipe.hdel(cls.LANGUAGE_KEY, member)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"chat_summary.drop_failed profile_id={member} detail={exc}")
+
+    @classmethod
+    async def take(cls, profile_id: int) -> tuple[float | None, str | None]:
+        """Remove the pending entry of ``profile_id``; returns its enqueue time (epoch seconds) and language."""
+        member = str(profile_id)
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            pipe.zscore(cls.PENDING_KEY, member)
+            pipe.hget(cls.LANGUAGE_KEY, member)
+            pipe.zrem(cls.PENDING_KEY, member)
+            pipe.hdel(cls.LANGUAGE_KEY, member)
+            enqueued_ms, language, *_ = await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"chat_summary.take_failed profile_id={profile_id} detail={exc}")
+            return None, None
+        enqueued_at = float(enqueued_ms) / 1000 if enqueued_ms is not None else None
+        return enqueued_at, str(language) if language else None
+
+    @classmethod
+    async def record(cls, profile_id: int, *, status: str, latency_ms: int | None, duration_ms: int) -> None:
+        """Count a finished job; ``latency_ms`` runs from the first enqueue to completion."""
+        now = time.time()
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.hincrby(cls.STATS_KEY, "jobs", 1)
+            pipe.hincrby(cls.STATS_KEY, f"status:{status}", 1)
+            pipe.hset(cls.STATS_KEY, mapping={"last_duration_ms": duration_ms, "last_finished_at": int(now)})
+            if latency_ms is not None:
+                pipe.hincrby(cls.STATS_KEY, "latency_ms_total", latency_ms)
+                pipe.hincrby(cls.STATS_KEY, "latency_samples", 1)
+                pipe.hset(cls.STATS_KEY, "last_latency_ms", latency_ms)
+            if status == "ok":
+                minute_key = cls._minute_key(int(now // 60))
+                pipe.incr(minute_key)
+                pipe.expire(minute_key, (cls.RATE_WINDOW_MIN + 1) * 60)
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"chat_summary.record_failed profile_id={profile_id} detail={exc}")
+
+    @classmethod
+    async def snapshot(cls) -> dict[str, Any]:
+        """Backlog size, job latency and summaries per minute over the last ``RATE_WINDOW_MIN`` full minutes."""
+        current = int(time.time() // 60)
+        minutes = [current - offset for offset in range(1, cls.RATE_WINDOW_MIN + 1)]
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.zcard(cls.PENDING_KEY)
+            pipe.zrange(cls.PENDING_KEY, 0, 0, withscores=True)
+            pipe.hgetall(cls.STATS_KEY)
+            for minute in minutes:
+                pipe.get(cls._minute_key(minute))
+            backlog, oldest, stats, *done = await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"chat_summary.snapshot_failed detail={exc}")
+            return {"available": False}
+        stats = cast(dict[str, str], stats or {})
+        samples = int(stats.get("latency_samples") or 0)
+        oldest_age_s = round(time.time() - float(oldest[0][1]) / 1000, 1) if oldest else None
+        return {
+            "available": True,
+            "backlog": int(backlog),
+            "oldest_pending_s": oldest_age_s,
+            "jobs": int(stats.get("jobs") or 0),
+            "summaries": int(stats.get("status:ok") or 0),
+            "summaries_per_minute": round(sum(int(value or 0) for value in done) / cls.RATE_WINDOW_MIN, 2),
+            "avg_latency_ms": int(int(stats.get("latency_ms_total") or 0) / samples) if samples else None,
+            "last_latency_ms": int(stats["last_latency_ms"]) if "last_latency_ms" in stats else None,
+            "last_duration_ms": int(stats["last_duration_ms"]) if "last_duration_ms" in stats else None,
+        }
+
+
+async def run_chat_summary_job(
+    profile_id: int, summarize: Callable[[str | None], Awaitable[dict[str, Any]]]
+) -> dict[str, Any]:
+    """Run one dequeued job: ``summarize(language)`` performs the summarization and returns its status dict."""
+    enqueued_at, language = await ChatSummaryQueue.take(profile_id)
+    started = time.time()
+    status = "error"
+    try:
+        result = await summarize(language)
+        status = str(result.get("status") or "unknown")
+        return result
+    finally:
+        finished = time.time()
+        latency_ms = int((finished - enqueued_at) * 1000) if enqueued_at is not None else None
+        duration_ms = int((finished - started) * 1000)
+        await ChatSummaryQueue.record(profile_id, status=status, latency_ms=latency_ms, duration_ms=duration_ms)
+        logger.info(
+            f"chat_summary.job_done profile_id={profile_id} status={status} "
+            f"latency_ms={latency_ms} duration_ms={duration_ms}"
+        )
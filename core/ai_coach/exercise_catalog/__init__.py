@@ -1,4 +1,5 @@
 from .constants import EQUIPMENT_TYPES, EXERCISE_CATEGORIES, MUSCLE_GROUPS
+from .index import ExerciseCatalogIndex, load_exercise_index
 from .loader import load_exercise_catalog
 from .models import ExerciseCatalogEntry
 from .search import filter_exercise_entries, search_exercises, suggest_replacement_exercises
@@ -8,8 +9,10 @@ __all__ = [
     "EQUIPMENT_TYPES",
     "MUSCLE_GROUPS",
     "ExerciseCatalogEntry",
+    "ExerciseCatalogIndex",
     "filter_exercise_entries",
     "load_exercise_catalog",
+    "load_exercise_index",
     "search_exercises",
     "suggest_replacement_exercises",
 ]
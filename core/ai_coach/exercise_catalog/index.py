@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Mapping
+
+from .loader import load_exercise_catalog
+from .models import ExerciseCatalogEntry
+
+NGRAM_SIZE = 3
+
+
+def _postings(pairs: Iterable[tuple[str, int]]) -> dict[str, frozenset[int]]:
+    buckets: dict[str, set[int]] = {}
+    for key, entry_id in pairs:
+        buckets.setdefault(key, set()).add(entry_id)
+    return {key: frozenset(ids) for key, ids in buckets.items()}
+
+
+def _ngrams(text: str, size: int = NGRAM_SIZE) -> set[str]:
+    return {text[start : start + size] for start in range(len(text) - size + 1)}
+
+
+def _normalized(values: Iterable[str] | None) -> set[str]:
+    return {str(item).strip().lower() for item in (values or []) if str(item or "").strip()}
+
+
+@dataclass(frozen=True)
+class ExerciseCatalogIndex:
+    """Inverted indexes over catalog entries; entry ids are positions in ``entries``.
+
+    Facet filters are answered by intersecting posting sets. Every substring of up to ``NGRAM_SIZE`` characters of the
+    lowercased canonical names and aliases is indexed: shorter queries are answered by their own posting, longer ones
+    intersect the postings of their n-grams and confirm the substring match on the few surviving candidates.
+    """
+
+    entries: tuple[ExerciseCatalogEntry, ...]
+    names: tuple[tuple[str, ...], ...]
+    by_category: Mapping[str, frozenset[int]]
+    by_primary: Mapping[str, frozenset[int]]
+    by_secondary: Mapping[str, frozenset[int]]
+    by_equipment: Mapping[str, frozenset[int]]
+    by_ngram: Mapping[str, frozenset[int]]
+    by_canonical: Mapping[str, frozenset[int]]
+    gif_keys: frozenset[str]
+
+    @property
+    def all_ids(self) -> range:
+        return range(len(self.entries))
+
+    @classmethod
+    def build(cls, entries: Iterable[ExerciseCatalogEntry]) -> "ExerciseCatalogIndex":
+        items = tuple(entries)
+        names = tuple(
+            tuple(dict.fromkeys(name.lower() for name in (entry.canonical, *entry.aliases))) for entry in items
+        )
+        return cls(
+            entries=items,
+            names=names,
+            by_category=_postings((entry.category, entry_id) for entry_id, entry in enumerate(items)),
+            by_primary=_postings(
+                (item.lower(), entry_id) for entry_id, entry in enumerate(items) for item in entry.primary_muscles
+            ),
+            by_secondary=_postings(
+                (item.lower(), entry_id) for entry_id, entry in enumerate(items) for item in entry.secondary_muscles
+            ),
+            by_equipment=_postings(
+                (item.lower(), entry_id) for entry_id, entry in enumerate(items) for item in entry.equipment
+            ),
+            by_ngram=_postings(
+                (gram, entry_id)
+                for entry_id, entry_names in enumerate(names)
+                for name in entry_names
+                for size in range(1, NGRAM_SIZE + 1)
+                for gram in _ngrams(name, size)
+            ),
+            by_canonical=_postings((entry.canonical, entry_id) for entry_id, entry in enumerate(items)),
+            gif_keys=frozenset(entry.gif_key for entry in items),
+        )
+
+    @staticmethod
+    def _any_of(postings: Mapping[str, frozenset[int]], keys: set[str]) -> frozenset[int]:
+        return frozenset().union(*(postings.get(key, frozenset()) for key in keys))
+
+    def _name_matches(self, query: str, candidates: frozenset[int] | None) -> frozenset[int]:
+        if len(query) <= NGRAM_SIZE:
+            posting = self.by_ngram.get(query, frozenset())
+            return posting if candidates is None else candidates & posting
+        ids = candidates
+        for gram in sorted(_ngrams(query), key=lambda gram: len(self.by_ngram.get(gram, ()))):
+            posting = self.by_ngram.get(gram, frozenset())
+            ids = posting if ids is None else ids & posting
+            if not ids:
+                return frozenset()
+        return frozenset(entry_id for entry_id in ids or () if any(query in name for name in self.names[entry_id]))
+
+    def select(
+        self,
+        *,
+        category: str | None = None,
+        primary_muscles: Iterable[str] | None = None,
+        secondary_muscles: Iterable[str] | None = None,
+        equipment: Iterable[str] | None = None,
+        name_query: str | None = None,
+        exclude_canonical: str | None = None,
+        limit: int | None = None,
+    ) -> list[int]:
+        """Ids of the entries matching every given filter, in catalog order."""
+        filters: list[frozenset[int]] = []
+        normalized_category = str(category or "").strip().lower()
+        if normalized_category:
+            filters.append(self.by_category.get(normalized_category, frozenset()))
+        for postings, values in (
+            (self.by_primary, primary_muscles),
+            (self.by_secondary, secondary_muscles),
+            (self.by_equipment, equipment),
+        ):
+            keys = _normalized(values)
+            if keys:
+                filters.append(self._any_of(postings, keys))
+        ids: frozenset[int] | None = None
+        for posting in sorted(filters, key=len):
+            ids = posting if ids is None else ids & posting
+            if not ids:
+                return []
+        query = str(name_query or "").strip().lower()
+        if query:
+            ids = self._name_matches(query, ids)
+        if exclude_canonical is not None:
+            excluded = self.by_canonical.get(exclude_canonical, frozenset())
+            ids = (frozenset(self.all_ids) if ids is None else ids) - excluded
+        if ids is None:
+            ordered: Iterable[int] = self.all_ids
+        elif limit is not None and len(ids) > limit * 4:
+            # Most entries match: walking the catalog order until ``limit`` hits beats sorting every id.
+            ordered = (entry_id for entry_id in self.all_ids if entry_id in ids)
+        else:
+            ordered = sorted(ids)
+        return list(islice(ordered, limit))
+
+    def search(
+        self,
+        *,
+        category: str | None = None,
+        primary_muscles: Iterable[str] | None = None,
+        secondary_muscles: Iterable[str] | None = None,
+        equipment: Iterable[str] | None = None,
+        name_query: str | None = None,
+        limit: int | None = None,
+    ) -> list[ExerciseCatalogEntry]:
+        ids = self.select(
+            category=category,
+            primary_muscles=primary_muscles,
+            secondary_muscles=secondary_muscles,
+            equipment=equipment,
+            name_query=name_query,
+            limit=max(1, int(limit)) if limit is not None else None,
+        )
+        return [self.entries[entry_id] for entry_id in ids]
+
+
+@lru_cache(maxsize=1)
+def load_exercise_index() -> ExerciseCatalogIndex:
+    return ExerciseCatalogIndex.build(load_exercise_catalog())
+
+
+__all__ = ["ExerciseCatalogIndex", "load_exercise_index"]
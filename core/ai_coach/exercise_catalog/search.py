@@ -1,6 +1,6 @@
 from typing import Iterable
 
-from .loader import load_exercise_catalog
+from .index import load_exercise_index
 from .models import ExerciseCatalogEntry
 
 
@@ -14,6 +14,16 @@ def filter_exercise_entries(
     name_query: str | None = None,
     limit: int | None = None,
 ) -> list[ExerciseCatalogEntry]:
+    index = load_exercise_index()
+    if entries is index.entries:
+        return index.search(
+            category=category,
+            primary_muscles=primary_muscles,
+            secondary_muscles=secondary_muscles,
+            equipment=equipment,
+            name_query=name_query,
+            limit=limit,
+        )
     normalized_category = str(category or "").strip().lower() or None
     primary = {str(item).strip().lower() for item in (primary_muscles or []) if str(item or "").strip()}
     secondary = {str(item).strip().lower() for item in (secondary_muscles or []) if str(item or "").strip()}
@@ -54,9 +64,7 @@ def search_exercises(
     name_query: str | None = None,
     limit: int | None = None,
 ) -> list[ExerciseCatalogEntry]:
-    entries = load_exercise_catalog()
-    return filter_exercise_entries(
-        entries,
+    return load_exercise_index().search(
         category=category,
         primary_muscles=primary_muscles,
         secondary_muscles=secondary_muscles,
@@ -71,29 +79,27 @@ def suggest_replacement_exercises(
     name_query: str | None,
     limit: int = 20,
 ) -> list[ExerciseCatalogEntry]:
-    entries = load_exercise_catalog()
+    index = load_exercise_index()
     query = str(name_query or "").strip()
     if not query:
-        return list(entries)
-    base_candidates = filter_exercise_entries(entries, name_query=query, limit=1)
-    base = base_candidates[0] if base_candidates else None
-    if base is None:
-        return filter_exercise_entries(entries, name_query=query, limit=None)
+        return list(index.entries)
+    base_candidates = index.select(name_query=query)
+    if not base_candidates:
+        return []
+    base = index.entries[base_candidates[0]]
 
     normalized_category = base.category
     if normalized_category in {"conditioning", "health"}:
-        return [
-            entry for entry in entries if entry.category == normalized_category and entry.canonical != base.canonical
-        ]
-
-    base_primary = {item.lower() for item in base.primary_muscles}
-    return [
-        entry
-        for entry in entries
-        if entry.category == normalized_category
-        and entry.canonical != base.canonical
-        and base_primary.intersection({item.lower() for item in entry.primary_muscles})
-    ]
+        ids = index.select(category=normalized_category, exclude_canonical=base.canonical)
+    elif not base.primary_muscles:
+        return []
+    else:
+        ids = index.select(
+            category=normalized_category,
+            primary_muscles=base.primary_muscles,
+            exclude_canonical=base.canonical,
+        )
+    return [index.entries[entry_id] for entry_id in ids]
 
 
 __all__ = ["filter_exercise_entries", "search_exercises", "suggest_replacement_exercises"]
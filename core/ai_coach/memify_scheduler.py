@@ -6,6 +6,7 @@ from loguru import logger
 
 from config.app_settings import settings
 from core.ai_coach import memify_run_at_key, memify_schedule_ttl, memify_scheduled_key
+from core.utils.async_runtime import run_async
 from core.utils.redis_lock import get_redis_client
 
 
@@ -83,19 +84,9 @@ def schedule_profile_memify_sync(
 ) -> bool:
     """Sync wrapper for scheduling memify from synchronous contexts."""
     try:
-        return asyncio.run(schedule_profile_memify(profile_id, reason=reason, delay_s=delay_s))
+        return run_async(schedule_profile_memify(profile_id, reason=reason, delay_s=delay_s))
     except RuntimeError:
         # Already in an event loop (unlikely in sync contexts); best-effort schedule via task.
         loop = asyncio.get_event_loop()
         loop.create_task(schedule_profile_memify(profile_id, reason=reason, delay_s=delay_s))
         return True
-
-
-async def try_lock_chat_summary(profile_id: int, ttl_seconds: int) -> bool:
-    key = f"ai_coach:chat_summary:profile:{profile_id}"
-    try:
-        client = get_redis_client()
-        return bool(await client.set(key, "1", nx=True, ex=ttl_seconds))
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("chat_summary_lock_failed profile_id={} detail={}", profile_id, exc)
-        return False
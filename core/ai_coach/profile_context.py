@@ -0,0 +1,390 @@
+"""Materialized prompt context per profile.
+
+The ask path used to rebuild the profile block of the prompt on every request: a profile fetch over the API plus
+the program and subscription history. The block is now kept as one versioned JSON document per profile in Redis,
+rebuilt by ``refresh_profile_context`` whenever the profile, its programs or its subscriptions are written, and read
+with a single GET. Every invalidation bumps a generation counter; a rebuild only stores its document when the
+generation it started from is still current, so a slow rebuild never overwrites a newer write.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Final, Iterable, Protocol, Sequence, cast
+
+from loguru import logger
+
+from config.app_settings import settings
+from core.schemas import DayExercises, Exercise, Profile, Program, Subscription
+from core.utils.redis_lock import get_redis_client
+
+PROFILE_CONTEXT_VERSION: Final[int] = 1
+
+WORKOUT_EXPERIENCE_DESCRIPTIONS: dict[str, str] = {
+    "beginner": "a newcomer with little to no structured training or only very sporadic activity, not yet training consistently",  # noqa: E501
+    "amateur": "someone with a few months of experience, training irregularly and comfortable with basic movements",
+    "advanced": "a regular trainee for at least a year, familiar with technique and structured progression patterns",
+    "pro": "long-term, consistent athlete with years of disciplined practice, close to competitive conditioning",
+}
+
+# Profile fields rendered into the context or read by the ask path; writes touching only other fields
+# (credits, gift flags) leave the document valid.
+CONTEXT_FIELDS: Final = frozenset(
+    {
+        "name",
+        "language",
+        "workout_goals",
+        "weight",
+        "height",
+        "workout_experience",
+        "health_notes",
+        "diet_allergies",
+        "diet_products",
+        "gender",
+        "born_in",
+        "workout_location",
+    }
+)
+
+# Subscription fields rendered into the context; billing updates such as ``enabled`` leave it valid.
+SUBSCRIPTION_CONTEXT_FIELDS: Final = frozenset({"exercises", "period", "payment_date"})
+
+_STORE_LUA = """
+if (redis.call("get", KEYS[2]) or "0") ~= ARGV[1] then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+return 1
+"""
+
+
+class _RefreshTask(Protocol):
+    def apply_async(
+        self,
+        *,
+        kwargs: dict[str, object] | None = None,
+        countdown: float | None = None,
+    ) -> Any: ...
+
+
+def affects_profile_context(fields: Iterable[str], *, watched: frozenset[str] = CONTEXT_FIELDS) -> bool:
+    return not watched.isdisjoint(fields)
+
+
+def format_exercise_entry(exercise: Exercise) -> str:
+    details: list[str] = []
+    sets = getattr(exercise, "sets", None)
+    reps = getattr(exercise, "reps", None)
+    if sets and reps:
+        details.append(f"{sets}x{reps}")
+    elif sets:
+        details.append(f"{sets} sets")
+    elif reps:
+        details.append(f"{reps} reps")
+    weight = getattr(exercise, "weight", None)
+    if weight:
+        details.append(f"weight {weight}")
+    if details:
+        return f"{exercise.name} ({', '.join(details)})"
+    return exercise.name
+
+
+def format_plan_days(days: list[DayExercises], *, max_exercises: int = 8) -> list[str]:
+    lines: list[str] = []
+    for day in days:
+        exercises = day.exercises or []
+        if not exercises:
+            lines.append(f"{day.day}: no exercises")
+            continue
+        entries = [format_exercise_entry(ex) for ex in exercises[:max_exercises]]
+        if len(exercises) > max_exercises:
+            entries.append("…")
+        lines.append(f"{day.day}: {', '.join(entries)}")
+    return lines
+
+
+def format_program_label(program: Program, *, ordinal: int | None = None) -> str:
+    created_at = getattr(program, "created_at", None)
+    label = f"Program {ordinal}" if ordinal is not None else "Program"
+    if created_at is not None:
+        return f"{label} (created_at: {created_at})"
+    return label
+
+
+def format_subscription_label(subscription: Subscription, *, ordinal: int | None = None) -> str:
+    label = f"Subscription {ordinal}" if ordinal is not None else "Subscription"
+    payment_date = getattr(subscription, "payment_date", None)
+    period = getattr(subscription, "period", None)
+    parts = [f"period: {period}" if period else None, f"payment_date: {payment_date}" if payment_date else None]
+    summary = ", ".join(part for part in parts if part)
+    if summary:
+        return f"{label} ({summary})"
+    return label
+
+
+def profile_lines(profile: Profile) -> list[str]:
+    lines: list[str] = []
+    workout_goals = getattr(profile, "workout_goals", None)
+    if workout_goals:
+        lines.append(f"Workout goals: {workout_goals}")
+    weight = getattr(profile, "weight", None)
+    if weight:
+        lines.append(f"Weight (kg): {weight}")
+    height = getattr(profile, "height", None)
+    if height:
+        lines.append(f"Height (cm): {height}")
+    workout_experience = getattr(profile, "workout_experience", None)
+    if workout_experience:
+        experience_value = str(workout_experience).lower()
+        experience_description = WORKOUT_EXPERIENCE_DESCRIPTIONS.get(experience_value)
+        if experience_description:
+            lines.append(f"Workout experience: {experience_value} ({experience_description})")
+        else:
+            lines.append(f"Workout experience: {experience_value}")
+    health_notes = getattr(profile, "health_notes", None)
+    if health_notes:
+        lines.append(f"Health notes: {health_notes}")
+    diet_allergies = getattr(profile, "diet_allergies", None)
+    if diet_allergies is not None:
+        allergies = str(diet_allergies).strip()
+        if allergies:
+            lines.append(f"Diet allergies: {allergies}")
+        else:
+            lines.append("Diet allergies: none")
+    diet_products = getattr(profile, "diet_products", None)
+    if diet_products:
+        lines.append(f"Diet products: {', '.join(diet_products)}")
+    gender = getattr(profile, "gender", None)
+    if gender:
+        lines.append(f"Gender: {gender.value}")
+    born_in = getattr(profile, "born_in", None)
+    if born_in:
+        lines.append(f"Birth year: {born_in}")
+    return lines
+
+
+def _subscription_sort_key(subscription: Subscription) -> tuple[float, int]:
+    payment_date = getattr(subscription, "payment_date", None)
+    timestamp = 0.0
+    if payment_date:
+        try:
+            timestamp = datetime.fromisoformat(str(payment_date)).timestamp()
+        except ValueError:
+            timestamp = 0.0
+    return (timestamp, int(getattr(subscription, "id", 0) or 0))
+
+
+def plan_lines(programs: Sequence[Program], subscriptions: Sequence[Subscription]) -> list[str]:
+    """Render the three most recent programs and subscriptions."""
+    lines: list[str] = []
+    sorted_programs = sorted(
+        programs,
+        key=lambda program: float(getattr(program, "created_at", 0.0) or 0.0),
+        reverse=True,
+    )
+    programs_added = False
+    for index, program in enumerate(sorted_programs[:3], start=1):
+        try:
+            program_days = [
+                day if isinstance(day, DayExercises) else DayExercises.model_validate(day)
+                for day in program.exercises_by_day
+            ]
+        except Exception:  # noqa: BLE001
+            program_days = []
+        if program_days:
+            if not programs_added:
+                lines.append("Recent programs:")
+                programs_added = True
+            lines.append(format_program_label(program, ordinal=index))
+            lines.extend(format_plan_days(program_days))
+    sorted_subscriptions = sorted(subscriptions, key=_subscription_sort_key, reverse=True)
+    subscriptions_added = False
+    for index, subscription in enumerate(sorted_subscriptions[:3], start=1):
+        try:
+            sub_days = [
+                day if isinstance(day, DayExercises) else DayExercises.model_validate(day)
+                for day in subscription.exercises
+            ]
+        except Exception:  # noqa: BLE001
+            sub_days = []
+        if sub_days:
+            if not subscriptions_added:
+                lines.append("Recent subscriptions:")
+                subscriptions_added = True
+            lines.append(format_subscription_label(subscription, ordinal=index))
+            lines.extend(format_plan_days(sub_days))
+    return lines
+
+
+@dataclass(slots=True)
+class ProfileContext:
+    """Materialized context of one profile; ``profile`` is the snapshot the context was rendered from."""
+
+    profile: Profile
+    summary: str | None
+    plans: str | None
+    generation: int
+    built_at: float
+    version: int = PROFILE_CONTEXT_VERSION
+
+    def render(self, *, include_plans: bool) -> str | None:
+        parts = [part for part in (self.summary, self.plans if include_plans else None) if part]
+        return "\n".join(parts) if parts else None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": self.version,
+                "generation": self.generation,
+                "built_at": self.built_at,
+                "profile": self.profile.model_dump(mode="json"),
+                "summary": self.summary,
+                "plans": self.plans,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ProfileContext | None":
+        data = json.loads(raw)
+        if data.get("version") != PROFILE_CONTEXT_VERSION:
+            return None
+        return cls(
+            profile=Profile.model_validate(data["profile"]),
+            summary=data.get("summary"),
+            plans=data.get("plans"),
+            generation=int(data.get("generation") or 0),
+            built_at=float(data.get("built_at") or 0.0),
+        )
+
+
+class ProfileContextStore:
+    """Redis storage, invalidation and rebuild of ``ProfileContext`` documents."""
+
+    PREFIX = "ai_coach:profile_context:"
+    REFRESH_DEDUPE_S = 60
+
+    @classmethod
+    def _key(cls, profile_id: int, kind: str = "document") -> str:
+        return f"{cls.PREFIX}{profile_id}:{kind}"
+
+    @classmethod
+    async def load(cls, profile_id: int) -> ProfileContext | None:
+        try:
+            raw = await get_redis_client().get(cls._key(profile_id))
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"profile_context.load_failed profile_id={profile_id} detail={exc}")
+            return None
+        if not raw:
+            return None
+        try:
+            return ProfileContext.from_json(raw)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"profile_context.corrupt profile_id={profile_id} detail={exc}")
+            return None
+
+    @classmethod
+    async def generation(cls, profile_id: int) -> int:
+        raw = await get_redis_client().get(cls._key(profile_id, "generation"))
+        return int(raw or 0)
+
+    @classmethod
+    async def store(cls, context: ProfileContext) -> bool:
+        """Store ``context`` unless the profile was invalidated after its rebuild started."""
+        try:
+            stored = await cast(
+                Awaitable[int],
+                get_redis_client().eval(
+                    _STORE_LUA,
+                    2,
+                    cls._key(context.profile.id),
+                    cls._key(context.profile.id, "generation"),
+                    str(context.generation),
+                    context.to_json(),
+                    str(max(int(settings.AI_COACH_PROFILE_CONTEXT_TTL), 1)),
+                ),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"profile_context.store_failed profile_id={context.profile.id} detail={exc}")
+            return False
+        return bool(stored)
+
+    @classmethod
+    async def invalidate(cls, profile_ids: Iterable[int], *, reason: str) -> None:
+        """Drop the documents of ``profile_ids`` and schedule their rebuild."""
+        ids = sorted(set(profile_ids))
+        if not ids or not settings.AI_COACH_PROFILE_CONTEXT_ENABLED:
+            return
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            for profile_id in ids:
+                pipe.incr(cls._key(profile_id, "generation"))
+                pipe.delete(cls._key(profile_id))
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"profile_context.invalidate_failed profile_ids={ids} detail={exc}")
+            return
+        for profile_id in ids:
+            await cls.schedule_refresh(profile_id, reason=reason)
+
+    @classmethod
+    async def schedule_refresh(cls, profile_id: int, *, reason: str) -> bool:
+        """Enqueue one rebuild per profile; requests coalesce until the rebuild starts or the dedupe key expires."""
+        refresh_key = cls._key(profile_id, "refresh")
+        try:
+            client = get_redis_client()
+            if not await client.set(refresh_key, reason, nx=True, ex=cls.REFRESH_DEDUPE_S):
+                return False
+        except Exception as exc:  # noqa: BLE001
+            logger.debug(f"profile_context.schedule_dedupe_failed profile_id={profile_id} detail={exc}")
+            return False
+        try:
+            from core.tasks.ai_coach.maintenance import refresh_profile_context
+
+            cast(_RefreshTask, refresh_profile_context).apply_async(kwargs={"profile_id": profile_id, "reason": reason})
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"profile_context.schedule_failed profile_id={profile_id} detail={exc}")
+            return False
+        return True
+
+    @classmethod
+    async def refresh(cls, profile_id: int, *, invalidate: bool = False) -> ProfileContext | None:
+        """Rebuild the document of ``profile_id`` from the API; ``invalidate`` first drops the current one."""
+        from core.services import APIService
+
+        client = get_redis_client()
+        await client.delete(cls._key(profile_id, "refresh"))
+        if invalidate:
+            pipe = client.pipeline(transaction=True)
+            pipe.incr(cls._key(profile_id, "generation"))
+            pipe.delete(cls._key(profile_id))
+            await pipe.execute()
+        generation = await cls.generation(profile_id)
+        profile = await APIService.profile.get_profile(profile_id)
+        if profile is None:
+            return None
+        programs = await APIService.workout.get_all_programs(profile_id)
+        subscriptions = await APIService.workout.get_all_subscriptions(profile_id)
+        context = ProfileContext(
+            profile=profile,
+            summary="\n".join(profile_lines(profile)) or None,
+            plans="\n".join(plan_lines(programs, subscriptions)) or None,
+            generation=generation,
+            built_at=time.time(),
+        )
+        if not await cls.store(context):
+            logger.info(f"profile_context.superseded profile_id={profile_id} generation={generation}")
+            return None
+        return context
+
+
+def enqueue_profile_context_refresh(profile_id: int | None, *, reason: str) -> None:
+    """Invalidate and rebuild a profile context from synchronous code such as Django views."""
+    if profile_id is None or not settings.AI_COACH_PROFILE_CONTEXT_ENABLED:
+        return
+    try:
+        from core.tasks.ai_coach.maintenance import refresh_profile_context
+
+        getattr(refresh_profile_context, "delay")(profile_id, reason=reason, invalidate=True)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"Failed to enqueue profile context refresh profile_id={profile_id}: {exc}")
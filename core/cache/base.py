@@ -1,28 +1,45 @@
+import asyncio
 import json
+import time
+from collections import Counter
 from decimal import Decimal
 from json import JSONDecodeError
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Iterable, Mapping, Sequence
 
 from loguru import logger
 from redis.asyncio import Redis, from_url
+from redis.asyncio.client import Pipeline
 from typing import Awaitable, Callable, cast
 from redis.exceptions import RedisError
 
 from config.app_settings import settings
+from core.cache.keys import APP_CACHE_DB, app_cache_key
+from core.utils.redis_lock import RedisLock
+
+_InflightKey = tuple[int, str, str, bool]
+_ENVELOPE_FIELDS = frozenset({"value", "fetched_at", "soft_ttl", "hard_ttl"})
+FRESH, STALE, EXPIRED = "fresh", "stale", "expired"
 
 
 class BaseCacheManager:
     """Base Redis cache helper with retry and JSON-safe helpers."""
 
-    _redis: ClassVar[Redis | None] = None
+    _clients: ClassVar[dict[int, tuple[asyncio.AbstractEventLoop, Redis]]] = {}
     _socket_timeout: ClassVar[float] = 5.0
     _socket_connect_timeout: ClassVar[float] = 3.0
+    _batch_size: ClassVar[int] = 500
+    _lease_poll_interval: ClassVar[float] = 0.05
+    _inflight: ClassVar[dict[_InflightKey, asyncio.Future[Any]]] = {}
+    _stats: ClassVar[dict[str, Counter[str]]] = {}
+    _background: ClassVar[set[asyncio.Task[Any]]] = set()
+    _soft_ttl: ClassVar[int | None] = None
+    _hard_ttl: ClassVar[int | None] = None
 
     @classmethod
     def _create_client(cls) -> Redis:
         return from_url(
             url=settings.REDIS_URL,
-            db=1,
+            db=APP_CACHE_DB,
             encoding="utf-8",
             decode_responses=True,
             socket_timeout=cls._socket_timeout,
@@ -31,20 +48,29 @@ class BaseCacheManager:
 
     @classmethod
     def _client(cls) -> Redis:
-        if cls._redis is None:
-            cls._redis = cls._create_client()
-        return cls._redis
+        # One client per event loop: each Celery worker thread keeps its own loop (``core.utils.async_runtime``).
+        # Clients of closed loops are dropped on the next miss, before a new loop can reuse their id.
+        loop = asyncio.get_running_loop()
+        entry = cls._clients.get(id(loop))
+        if entry is not None and entry[0] is loop:
+            return entry[1]
+        for loop_id, (owner, _) in list(cls._clients.items()):
+            if owner.is_closed():
+                cls._clients.pop(loop_id, None)
+        client = cls._create_client()
+        cls._clients[id(loop)] = (loop, client)
+        return client
 
     @classmethod
     async def _reset_client(cls) -> None:
-        if cls._redis is None:
+        loop = asyncio.get_running_loop()
+        entry = cls._clients.pop(id(loop), None)
+        if entry is None or entry[0] is not loop:
             return
         try:
-            await cls._redis.close()
+            await entry[1].close()
         except Exception as exc:  # noqa: BLE001
             logger.warning(f"Redis client close failed: {exc}")
-        finally:
-            cls._redis = None
 
     @classmethod
     async def _with_client(
@@ -64,9 +90,78 @@ class BaseCacheManager:
                     return on_error(exc)
         return None
 
+    @classmethod
+    async def _with_pipeline(
+        cls,
+        build: Callable[[Pipeline], None],
+        *,
+        on_error: Callable[[Exception], Any] | None = None,
+    ) -> list[Any] | None:
+        """Queue commands via ``build`` and flush them in a single round trip."""
+
+        async def _op(client: Redis) -> list[Any]:
+            pipe = client.pipeline(transaction=False)
+            build(pipe)
+            return await pipe.execute()
+
+        return await cls._with_client(_op, on_error=on_error)
+
+    @classmethod
+    def _chunks(cls, items: Sequence[Any]) -> Iterable[Sequence[Any]]:
+        for start in range(0, len(items), cls._batch_size):
+            yield items[start : start + cls._batch_size]
+
+    @classmethod
+    def _wrap(cls, value: str) -> str:
+        """Store ``value`` in a TTL envelope when the manager defines field TTLs."""
+        if cls._hard_ttl is None:
+            return value
+        payload: Any = value
+        if value[:1] in ("{", "["):
+            try:
+                payload = json.loads(value)
+            except JSONDecodeError:
+                payload = value
+        return json.dumps(
+            {
+                "value": payload,
+                "fetched_at": time.time(),
+                "soft_ttl": cls._soft_ttl if cls._soft_ttl is not None else cls._hard_ttl,
+                "hard_ttl": cls._hard_ttl,
+            }
+        )
+
+    @staticmethod
+    def _unwrap(raw: str | None) -> tuple[str | None, dict[str, Any] | None]:
+        """Split a stored field into its value and envelope metadata (``None`` for plain values)."""
+        if not raw or not raw.startswith('{"value"'):
+            return raw, None
+        try:
+            envelope = json.loads(raw)
+        except JSONDecodeError:
+            return raw, None
+        if not isinstance(envelope, dict) or set(envelope) != _ENVELOPE_FIELDS:
+            return raw, None
+        value = envelope["value"]
+        return (value if isinstance(value, str) else json.dumps(value)), envelope
+
+    @staticmethod
+    def _freshness(envelope: dict[str, Any] | None, now: float | None = None) -> str:
+        if envelope is None:
+            return FRESH
+        try:
+            age = (now if now is not None else time.time()) - float(envelope["fetched_at"])
+            if age >= float(envelope["hard_ttl"]):
+                return EXPIRED
+            if age >= float(envelope["soft_ttl"]):
+                return STALE
+        except (TypeError, ValueError):
+            return EXPIRED
+        return FRESH
+
     @classmethod
     def _add_prefix(cls, key: str) -> str:
-        return f"app:{key}"
+        return app_cache_key(key)
 
     @staticmethod
     def _json_safe(data: dict[str, Any]) -> dict[str, Any]:
@@ -97,19 +192,26 @@ class BaseCacheManager:
             return False
 
     @classmethod
-    async def get(cls, key: str, field: str) -> str | None:
+    async def _get_entry(cls, key: str, field: str) -> tuple[str | None, str]:
         def _op(client: Redis) -> Awaitable[str | None]:
             return cast(Awaitable[str | None], client.hget(cls._add_prefix(key), field))
 
-        return await cls._with_client(
+        raw = await cls._with_client(
             _op,
             on_error=lambda e: logger.error(f"Redis GET error [{key}:{field}]: {e}") or None,
         )
+        value, envelope = cls._unwrap(raw)
+        return value, cls._freshness(envelope)
+
+    @classmethod
+    async def get(cls, key: str, field: str) -> str | None:
+        value, state = await cls._get_entry(key, field)
+        return None if state == EXPIRED else value
 
     @classmethod
     async def set(cls, key: str, field: str, value: str) -> None:
         def _op(client: Redis) -> Awaitable[int]:
-            return cast(Awaitable[int], client.hset(cls._add_prefix(key), field, value))
+            return cast(Awaitable[int], client.hset(cls._add_prefix(key), field, cls._wrap(value)))
 
         await cls._with_client(_op, on_error=lambda e: logger.error(f"Redis SET error [{key}:{field}]: {e}"))
 
@@ -125,7 +227,97 @@ class BaseCacheManager:
         def _op(client: Redis) -> Awaitable[dict[str, str]]:
             return cast(Awaitable[dict[str, str]], client.hgetall(cls._add_prefix(key)))
 
-        return await cls._with_client(_op, on_error=lambda e: logger.error(f"Redis HGETALL error [{key}]: {e}") or {})
+        raw = await cls._with_client(_op, on_error=lambda e: logger.error(f"Redis HGETALL error [{key}]: {e}") or {})
+        now = time.time()
+        result: dict[str, str] = {}
+        for field, stored in (raw or {}).items():
+            value, envelope = cls._unwrap(stored)
+            if value is not None and cls._freshness(envelope, now) != EXPIRED:
+                result[field] = value
+        return result
+
+    @classmethod
+    async def mget(cls, key: str, fields: Iterable[str]) -> dict[str, str | None]:
+        unique = list(dict.fromkeys(fields))
+        if not unique:
+            return {}
+        prefixed = cls._add_prefix(key)
+
+        def _build(pipe: Pipeline) -> None:
+            for chunk in cls._chunks(unique):
+                pipe.hmget(prefixed, list(chunk))
+
+        replies = await cls._with_pipeline(
+            _build,
+            on_error=lambda e: logger.error(f"Redis HMGET error [{key}] fields={len(unique)}: {e}") or None,
+        )
+        values: list[str | None] = [value for reply in replies or [] for value in reply or []]
+        if len(values) != len(unique):
+            return {field: None for field in unique}
+        now = time.time()
+        result: dict[str, str | None] = {}
+        for field, stored in zip(unique, values):
+            value, envelope = cls._unwrap(stored)
+            result[field] = None if cls._freshness(envelope, now) == EXPIRED else value
+        return result
+
+    @classmethod
+    async def mset(cls, key: str, mapping: Mapping[str, str]) -> None:
+        if not mapping:
+            return
+        prefixed = cls._add_prefix(key)
+        items = [(field, cls._wrap(value)) for field, value in mapping.items()]
+
+        def _build(pipe: Pipeline) -> None:
+            for chunk in cls._chunks(items):
+                pipe.hset(prefixed, mapping=dict(chunk))
+
+        await cls._with_pipeline(
+            _build,
+            on_error=lambda e: logger.error(f"Redis HSET error [{key}] fields={len(items)}: {e}"),
+        )
+
+    @classmethod
+    async def mdelete(cls, key: str, fields: Iterable[str]) -> None:
+        unique = list(dict.fromkeys(fields))
+        if not unique:
+            return
+        prefixed = cls._add_prefix(key)
+
+        def _build(pipe: Pipeline) -> None:
+            for chunk in cls._chunks(unique):
+                pipe.hdel(prefixed, *chunk)
+
+        await cls._with_pipeline(
+            _build,
+            on_error=lambda e: logger.error(f"Redis HDEL error [{key}] fields={len(unique)}: {e}"),
+        )
+
+    @classmethod
+    async def mget_json(cls, key: str, fields: Iterable[str]) -> dict[str, Any | None]:
+        raw = await cls.mget(key, fields)
+        result: dict[str, Any | None] = {}
+        for field, value in raw.items():
+            if not value:
+                result[field] = None
+                continue
+            try:
+                result[field] = json.loads(value)
+            except (JSONDecodeError, TypeError) as e:
+                logger.error(f"Invalid JSON [{key}:{field}]: {e}")
+                result[field] = None
+        return result
+
+    @classmethod
+    async def mset_json(cls, key: str, mapping: Mapping[str, Any]) -> None:
+        serialized: dict[str, str] = {}
+        for field, data in mapping.items():
+            try:
+                safe = cls._json_safe(data) if isinstance(data, dict) else data
+                serialized[field] = json.dumps(safe)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Cannot serialize [{key}:{field}]: {e}")
+        await cls.mset(key, serialized)
 
     @classmethod
     async def get_json(cls, key: str, field: str) -> dict[str, Any] | None:
@@ -182,21 +374,163 @@ class BaseCacheManager:
             return data.model_dump()
         return data
 
+    @classmethod
+    def _record(cls, event: str) -> None:
+        cls._stats.setdefault(cls.__name__, Counter())[event] += 1
+
+    @classmethod
+    def cache_stats(cls) -> dict[str, dict[str, int]]:
+        """Return hit/miss/coalesced counters per cache manager."""
+        return {name: dict(counter) for name, counter in cls._stats.items()}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls._stats.clear()
+
     @classmethod
     async def get_or_fetch(cls, cache_key: str, field: str, *, use_fallback: bool = True) -> Any:
-        """Retrieve an item from cache or fallback to the backing service."""
+        """Retrieve an item from cache or fallback to the backing service.
 
-        raw = await cls.get(cache_key, field)
-        if raw:
+        Fields past their soft TTL are returned immediately while a background
+        refresh repopulates them; fields past their hard TTL count as misses.
+        Concurrent misses for the same key within an event loop share a single
+        fetch; with ``CACHE_FETCH_LEASE_ENABLED`` workers also coordinate through
+        a short Redis lease so only one process repopulates the key.
+        """
+
+        raw, state = await cls._get_entry(cache_key, field)
+        if raw and state != EXPIRED:
             try:
-                return cls._validate_data(raw, cache_key, field)
+                value = cls._validate_data(raw, cache_key, field)
             except Exception:
                 await cls.delete(cache_key, field)
+            else:
+                if state == STALE:
+                    cls._record("stale")
+                    cls._schedule_refresh(cache_key, field, use_fallback=use_fallback)
+                else:
+                    cls._record("hit")
+                return value
+
+        cls._record("miss")
+        return await cls._single_flight(cache_key, field, use_fallback=use_fallback)
+
+    @classmethod
+    def _flight_key(cls, cache_key: str, field: str, use_fallback: bool) -> _InflightKey:
+        return (id(asyncio.get_running_loop()), cls._add_prefix(cache_key), field, use_fallback)
 
-        data = await cls._fetch_from_service(cache_key, field, use_fallback=use_fallback)
+    @classmethod
+    async def _single_flight(cls, cache_key: str, field: str, *, use_fallback: bool) -> Any:
+        flight_key = cls._flight_key(cache_key, field, use_fallback)
+        pending = cls._inflight.get(flight_key)
+        if pending is not None:
+            cls._record("coalesced")
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                return await cls._refill(cache_key, field, use_fallback=use_fallback)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        cls._inflight[flight_key] = future
         try:
-            prepared = cls._prepare_for_cache(data, cache_key, field)
-            await cls.set(cache_key, field, json.dumps(prepared))
-        except Exception as e:
-            logger.error(f"Failed to cache {cache_key}:{field}: {e}")
-        return data
+            data = await cls._refill(cache_key, field, use_fallback=use_fallback)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; mark as retrieved for the owner
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            cls._inflight.pop(flight_key, None)
+
+    @classmethod
+    def _schedule_refresh(cls, cache_key: str, field: str, *, use_fallback: bool) -> None:
+        if cls._flight_key(cache_key, field, use_fallback) in cls._inflight:
+            return
+
+        async def _refresh() -> None:
+            try:
+                await cls._single_flight(cache_key, field, use_fallback=use_fallback)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Background cache refresh failed [{cache_key}:{field}]: {exc}")
+
+        task = asyncio.get_running_loop().create_task(_refresh())
+        cls._background.add(task)
+        task.add_done_callback(cls._background.discard)
+
+    @classmethod
+    async def _refill(cls, cache_key: str, field: str, *, use_fallback: bool) -> Any:
+        lease: RedisLock | None = None
+        if settings.CACHE_FETCH_LEASE_ENABLED:
+            lease = RedisLock(cls._add_prefix(f"lease:{cache_key}:{field}"), settings.CACHE_FETCH_LEASE_TTL_MS)
+            try:
+                acquired = await lease.acquire()
+            except RedisError as exc:
+                logger.warning(f"Cache lease unavailable [{cache_key}:{field}]: {exc}")
+                acquired, lease = True, None
+            if not acquired:
+                cls._record("lease_wait")
+                filled = await cls._wait_for_peer(cache_key, field)
+                if filled is not None:
+                    cls._record("coalesced")
+                    return filled
+        try:
+            data = await cls._fetch_from_service(cache_key, field, use_fallback=use_fallback)
+            try:
+                prepared = cls._prepare_for_cache(data, cache_key, field)
+                await cls.set(cache_key, field, json.dumps(prepared))
+            except Exception as e:
+                logger.error(f"Failed to cache {cache_key}:{field}: {e}")
+            return data
+        finally:
+            if lease is not None:
+                try:
+                    await lease.release()
+                except RedisError as exc:
+                    logger.warning(f"Cache lease release failed [{cache_key}:{field}]: {exc}")
+
+    @classmethod
+    async def _wait_for_peer(cls, cache_key: str, field: str) -> Any | None:
+        """Poll the cache while another process holds the refill lease."""
+        deadline = asyncio.get_running_loop().time() + settings.CACHE_FETCH_LEASE_WAIT_S
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(cls._lease_poll_interval)
+            raw = await cls.get(cache_key, field)
+            if not raw:
+                continue
+            try:
+                return cls._validate_data(raw, cache_key, field)
+            except Exception:
+                return None
+        return None
+
+    @classmethod
+    async def sweep_expired(cls, *, match: str = "*", scan_count: int = 500) -> dict[str, dict[str, int]]:
+        """HSCAN cache hashes and evict fields past their hard TTL.
+
+        Returns ``{hash_key: {"size": remaining_fields, "evicted": removed_fields}}``.
+        Uses SCAN/HSCAN so Redis is never blocked by a full keyspace walk.
+        """
+
+        async def _op(client: Redis) -> dict[str, dict[str, int]]:
+            report: dict[str, dict[str, int]] = {}
+            now = time.time()
+            async for key in client.scan_iter(match=cls._add_prefix(match), count=scan_count, _type="HASH"):
+                expired: list[str] = []
+                async for field, stored in client.hscan_iter(key, count=scan_count):
+                    _, envelope = cls._unwrap(stored)
+                    if envelope is not None and cls._freshness(envelope, now) == EXPIRED:
+                        expired.append(field)
+                for chunk in cls._chunks(expired):
+                    await cast(Awaitable[int], client.hdel(key, *chunk))
+                size = await cast(Awaitable[int], client.hlen(key))
+                report[key] = {"size": int(size), "evicted": len(expired)}
+            return report
+
+        return await cls._with_client(_op, on_error=lambda e: logger.error(f"Redis sweep error: {e}") or {})
@@ -0,0 +1,14 @@
+"""Redis layout of the ``app:`` cache, shared by the async cache managers and the Django API.
+
+Kept free of async imports so the API can address the same records with its sync client.
+"""
+
+APP_CACHE_DB = 1
+APP_CACHE_PREFIX = "app:"
+
+PROFILE_DATA_KEY = "profiles"
+PROFILE_TG_INDEX_KEY = "profiles:tg_index"
+
+
+def app_cache_key(key: str) -> str:
+    return f"{APP_CACHE_PREFIX}{key}"
@@ -1,8 +1,9 @@
-from typing import Any
+from typing import Any, Iterable
 from loguru import logger
 import json
 
 from .base import BaseCacheManager
+from config.app_settings import settings
 from core.enums import PaymentStatus
 from core.containers import get_container
 from core.exceptions import PaymentNotFoundError
@@ -12,6 +13,8 @@ class PaymentCacheManager(BaseCacheManager):
     """Cache payment status entries with API fallback."""
 
     _PREFIX = "workout_plans:payments"
+    _soft_ttl = settings.CACHE_FIELD_SOFT_TTL
+    _hard_ttl = settings.CACHE_FIELD_HARD_TTL
 
     @classmethod
     async def _fetch_from_service(cls, cache_key: str, field: str, *, use_fallback: bool) -> PaymentStatus:
@@ -61,6 +64,12 @@ class PaymentCacheManager(BaseCacheManager):
         except Exception as e:
             logger.error(f"Failed to reset payment status for profile_id={profile_id}: {e}")
 
+    @classmethod
+    async def reset_statuses(cls, profile_ids: Iterable[int], service_type: str) -> None:
+        fields = [str(profile_id) for profile_id in profile_ids]
+        await cls.mdelete(cls._key(service_type), fields)
+        logger.debug(f"Payment status reset for {len(fields)} profiles, type={service_type}")
+
     @classmethod
     async def get_status(cls, profile_id: int, service_type: str, *, use_fallback: bool = True) -> PaymentStatus:
         return await cls.get_or_fetch(cls._key(service_type), str(profile_id), use_fallback=use_fallback)
@@ -1,18 +1,32 @@
-from typing import Any
+import json
+from typing import Any, Mapping
 
 from loguru import logger
 from pydantic import ValidationError
+from redis.asyncio.client import Pipeline
 
-from .base import BaseCacheManager
+from .base import EXPIRED, STALE, BaseCacheManager
+from . import keys
+from config.app_settings import settings
+from core.ai_coach.profile_context import CONTEXT_FIELDS, ProfileContextStore, affects_profile_context
 from core.exceptions import ProfileNotFoundError
 from core.schemas import Profile
 from core.services import APIService
 
 
 class ProfileCacheManager(BaseCacheManager):
-    """Cache profile records with API fallback and migration support."""
+    """Cache profile records with API fallback and migration support.
 
-    PROFILE_DATA_KEY = "profiles"
+    Records live in ``app:profiles`` keyed by profile id; ``app:profiles:tg_index``
+    maps Telegram ids to profile ids so ``get_profile`` can be served from Redis.
+    Records past the soft TTL are re-read from the API on ``get_profile`` so
+    changes made behind the cache (credit adjustments) cannot outlive it.
+    """
+
+    PROFILE_DATA_KEY = keys.PROFILE_DATA_KEY
+    TG_INDEX_KEY = keys.PROFILE_TG_INDEX_KEY
+    _soft_ttl = settings.CACHE_FIELD_SOFT_TTL
+    _hard_ttl = settings.CACHE_FIELD_HARD_TTL
 
     @classmethod
     async def _cache_profile_data(cls, profile_id: int, profile_data: dict[str, Any]) -> None:
@@ -27,8 +41,61 @@ class ProfileCacheManager(BaseCacheManager):
         except (TypeError, ValueError):
             logger.error(f"Cannot cache profile {profile_id}: invalid tg_id={tg_id}")
             return
+        await cls.set(cls.TG_INDEX_KEY, str(int(tg_id)), str(profile_id))
         await cls.set_json(cls.PROFILE_DATA_KEY, str(profile_id), data)
 
+    @classmethod
+    async def _store_profiles(cls, records: Mapping[str, dict[str, Any]]) -> None:
+        """Write profile records and their tg_id index entries in one pipeline."""
+        profiles_key = cls._add_prefix(cls.PROFILE_DATA_KEY)
+        index_key = cls._add_prefix(cls.TG_INDEX_KEY)
+        payload: Mapping[str | bytes, str] = {
+            field: cls._wrap(json.dumps(cls._json_safe(data))) for field, data in records.items()
+        }
+        index: Mapping[str | bytes, str] = {
+            str(int(data["tg_id"])): cls._wrap(field) for field, data in records.items()
+        }
+
+        def _build(pipe: Pipeline) -> None:
+            pipe.hset(profiles_key, mapping=payload)
+            pipe.hset(index_key, mapping=index)
+
+        await cls._with_pipeline(
+            _build,
+            on_error=lambda e: logger.error(f"Redis profile store error profile_ids={list(records)}: {e}"),
+        )
+
+    @classmethod
+    async def _indexed_profile_id(cls, tg_id: int) -> int | None:
+        raw = await cls.get(cls.TG_INDEX_KEY, str(tg_id))
+        if not raw:
+            return None
+        try:
+            return int(raw)
+        except (TypeError, ValueError):
+            await cls.delete(cls.TG_INDEX_KEY, str(tg_id))
+            return None
+
+    @classmethod
+    async def _get_indexed_profile(cls, tg_id: int, *, revalidate: bool = False) -> Profile | None:
+        profile_id = await cls._indexed_profile_id(tg_id)
+        if profile_id is None:
+            cls._record("index_miss")
+            return None
+        profile, state = await cls._read_record(profile_id)
+        if profile is None or profile.tg_id != int(tg_id):
+            cls._record("index_miss")
+            await cls.delete(cls.TG_INDEX_KEY, str(tg_id))
+            return None
+        if state == STALE and revalidate:
+            cls._record("stale")
+            try:
+                return await cls._fetch_profile_by_tg(tg_id)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(f"Profile revalidation failed tg_id={tg_id}, serving cached record: {exc}")
+        cls._record("index_hit")
+        return profile
+
     @classmethod
     async def _fetch_profile_by_tg(cls, tg_id: int) -> Profile:
         profile = await APIService.profile.get_profile_by_tg_id(int(tg_id))
@@ -62,6 +129,9 @@ class ProfileCacheManager(BaseCacheManager):
 
     @classmethod
     async def get_profile(cls, tg_id: int, *, use_fallback: bool = True) -> Profile:
+        indexed = await cls._get_indexed_profile(tg_id, revalidate=use_fallback)
+        if indexed:
+            return indexed
         migrated = await cls._migrate_legacy_profile(tg_id)
         if migrated:
             return migrated
@@ -79,21 +149,26 @@ class ProfileCacheManager(BaseCacheManager):
 
     @classmethod
     async def update_profile(cls, tg_id: int, updates: dict) -> None:
-        try:
-            profile = await cls._fetch_profile_by_tg(tg_id)
-        except ProfileNotFoundError:
-            logger.warning(f"Cannot update profile cache - profile not found for tg_id={tg_id}")
-            return
-        await cls.update_record(profile.id, updates)
+        profile_id = await cls._indexed_profile_id(tg_id)
+        if profile_id is None:
+            try:
+                profile_id = (await cls._fetch_profile_by_tg(tg_id)).id
+            except ProfileNotFoundError:
+                logger.warning(f"Cannot update profile cache - profile not found for tg_id={tg_id}")
+                return
+        await cls.update_record(profile_id, updates)
 
     @classmethod
     async def delete_profile(cls, tg_id: int) -> bool:
         try:
-            profile = await APIService.profile.get_profile_by_tg_id(int(tg_id))
-            if profile is None:
-                logger.warning(f"Profile not found when deleting cache for tg_id={tg_id}")
-                return False
-            await cls.delete(cls.PROFILE_DATA_KEY, str(profile.id))
+            profile_id = await cls._indexed_profile_id(tg_id)
+            if profile_id is None:
+                profile = await APIService.profile.get_profile_by_tg_id(int(tg_id))
+                if profile is None:
+                    logger.warning(f"Profile not found when deleting cache for tg_id={tg_id}")
+                    return False
+                profile_id = profile.id
+            await cls._drop_profile(profile_id, tg_id)
             logger.info(f"Profile cache cleared for tg_id={tg_id}")
             return True
         except Exception as exc:  # noqa: BLE001
@@ -102,9 +177,26 @@ class ProfileCacheManager(BaseCacheManager):
 
     @classmethod
     async def delete_record(cls, profile_id: int) -> None:
-        await cls.delete(cls.PROFILE_DATA_KEY, str(profile_id))
+        cached = await cls.get_json(cls.PROFILE_DATA_KEY, str(profile_id)) or {}
+        await cls._drop_profile(profile_id, cached.get("tg_id"))
         logger.info(f"Profile cache cleared for profile_id={profile_id}")
 
+    @classmethod
+    async def _drop_profile(cls, profile_id: int, tg_id: int | None) -> None:
+        profiles_key = cls._add_prefix(cls.PROFILE_DATA_KEY)
+        index_key = cls._add_prefix(cls.TG_INDEX_KEY)
+
+        def _build(pipe: Pipeline) -> None:
+            pipe.hdel(profiles_key, str(profile_id))
+            if tg_id is not None:
+                pipe.hdel(index_key, str(tg_id))
+
+        await cls._with_pipeline(
+            _build,
+            on_error=lambda e: logger.error(f"Redis profile delete error profile_id={profile_id}: {e}"),
+        )
+        await ProfileContextStore.invalidate([profile_id], reason="profile_cache_deleted")
+
     @classmethod
     async def update_record(cls, profile_id: int, updates: dict[str, Any]) -> None:
         try:
@@ -118,49 +210,98 @@ class ProfileCacheManager(BaseCacheManager):
                 payload.update(updates)
                 await cls._cache_profile_data(profile.id, payload)
                 logger.debug(f"Profile record refreshed profile_id={profile_id} with {updates}")
+                if affects_profile_context(updates):
+                    await ProfileContextStore.invalidate([profile_id], reason="profile_cache_updated")
                 return
             existing.update(updates)
             await cls._cache_profile_data(profile_id, existing)
             logger.debug(f"Profile record updated profile_id={profile_id} with {updates}")
+            if affects_profile_context(updates):
+                await ProfileContextStore.invalidate([profile_id], reason="profile_cache_updated")
         except Exception as exc:
             logger.error(f"Failed to update profile record profile_id={profile_id}: {exc}")
 
     @classmethod
     async def save_record(cls, profile_id: int, profile_data: dict[str, Any]) -> None:
+        await cls.save_records({profile_id: profile_data})
+
+    @classmethod
+    async def save_records(cls, records: Mapping[int, dict[str, Any]]) -> None:
+        """Cache several profile records with one HMGET and one pipelined HSET."""
         try:
-            data = dict(profile_data)
-            data["id"] = profile_id
-            tg_id = data.get("tg_id")
-            if tg_id is None:
-                logger.error(f"Cannot cache profile {profile_id}: missing tg_id")
+            prepared: dict[str, dict[str, Any]] = {}
+            for profile_id, profile_data in records.items():
+                data = dict(profile_data)
+                data["id"] = profile_id
+                tg_id = data.get("tg_id")
+                if tg_id is None:
+                    logger.error(f"Cannot cache profile {profile_id}: missing tg_id")
+                    continue
+                try:
+                    int(tg_id)
+                except (TypeError, ValueError):
+                    logger.error(f"Cannot cache profile {profile_id}: invalid tg_id={tg_id}")
+                    continue
+                prepared[str(profile_id)] = data
+            if not prepared:
                 return
-            try:
-                int(tg_id)
-            except (TypeError, ValueError):
-                logger.error(f"Cannot cache profile {profile_id}: invalid tg_id={tg_id}")
+            existing = await cls.mget_json(cls.PROFILE_DATA_KEY, prepared.keys())
+            changed = {field: data for field, data in prepared.items() if existing.get(field) != data}
+            if not changed:
                 return
-            existing = await cls.get_json(cls.PROFILE_DATA_KEY, str(profile_id))
-            if existing == data:
-                return
-            await cls._cache_profile_data(profile_id, data)
-            logger.debug(f"Profile record saved profile_id={profile_id}")
+            await cls._store_profiles(changed)
+            logger.debug(f"Profile records saved profile_ids={','.join(changed)}")
+            stale = [
+                int(field)
+                for field, data in changed.items()
+                if isinstance(previous := existing.get(field), dict)
+                and any(previous.get(name) != data.get(name) for name in CONTEXT_FIELDS)
+            ]
+            await ProfileContextStore.invalidate(stale, reason="profile_cache_saved")
         except Exception as exc:
-            logger.error(f"Failed to save profile record profile_id={profile_id}: {exc}")
+            logger.error(f"Failed to save profile records profile_ids={list(records)}: {exc}")
+
+    @classmethod
+    async def _read_record(cls, profile_id: int) -> tuple[Profile | None, str]:
+        raw, state = await cls._get_entry(cls.PROFILE_DATA_KEY, str(profile_id))
+        if not raw or state == EXPIRED:
+            return None, state
+        try:
+            return Profile.model_validate_json(raw), state
+        except (ValidationError, TypeError, ValueError) as exc:
+            logger.debug(f"Corrupt profile record for profile_id={profile_id}: {exc}")
+            await cls.delete(cls.PROFILE_DATA_KEY, str(profile_id))
+            return None, state
 
     @classmethod
     async def get_record(cls, profile_id: int, *, use_fallback: bool = True) -> Profile:
-        raw = await cls.get_json(cls.PROFILE_DATA_KEY, str(profile_id))
-        if raw:
-            try:
-                profile = Profile.model_validate(raw)
-                return profile
-            except (ValidationError, TypeError, ValueError) as exc:
-                logger.debug(f"Corrupt profile record for profile_id={profile_id}: {exc}")
-                await cls.delete(cls.PROFILE_DATA_KEY, str(profile_id))
+        profile, _ = await cls._read_record(profile_id)
+        if profile is not None:
+            return profile
         if not use_fallback:
             raise ProfileNotFoundError(profile_id)
         return await cls._fetch_profile_by_id(profile_id)
 
+    @classmethod
+    async def refresh_record(cls, profile_id: int) -> Profile | None:
+        """Re-read a profile changed behind the cache and re-cache it; drops the record when it cannot be read.
+
+        Best-effort: cache failures are logged and never propagate to the caller.
+        """
+        try:
+            profile = await APIService.profile.get_profile(profile_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Profile refresh failed profile_id={profile_id}: {exc}")
+            profile = None
+        try:
+            if profile is None:
+                await cls.delete(cls.PROFILE_DATA_KEY, str(profile_id))
+            else:
+                await cls._cache_profile_data(profile.id, profile.model_dump(mode="json"))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Profile cache refresh failed profile_id={profile_id}: {exc}")
+        return profile
+
     @classmethod
     async def get_all_records(cls) -> dict[str, str]:
         return await cls.get_all(cls.PROFILE_DATA_KEY)
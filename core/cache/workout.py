@@ -1,10 +1,12 @@
 import json
 import inspect
-from typing import Any, cast
+from typing import Any, Mapping, cast
 from loguru import logger
 
 from core.schemas import Subscription, Program
 from .base import BaseCacheManager
+from config.app_settings import settings
+from core.ai_coach.profile_context import SUBSCRIPTION_CONTEXT_FIELDS, ProfileContextStore, affects_profile_context
 from core.utils.validators import validate_or_raise
 from core.containers import get_container
 from core.exceptions import SubscriptionNotFoundError, ProgramNotFoundError, UserServiceError
@@ -13,6 +15,9 @@ from core.exceptions import SubscriptionNotFoundError, ProgramNotFoundError, Use
 class WorkoutCacheManager(BaseCacheManager):
     """Cache workout programs and subscriptions with API fallback."""
 
+    _soft_ttl = settings.CACHE_FIELD_SOFT_TTL
+    _hard_ttl = settings.CACHE_FIELD_HARD_TTL
+
     @classmethod
     async def _fetch_from_service(cls, cache_key: str, field: str, *, use_fallback: bool) -> Subscription | Program:
         profile_id = int(field)
@@ -48,6 +53,7 @@ class WorkoutCacheManager(BaseCacheManager):
             await cls.set("workout_plans:subscriptions", str(profile_id), json.dumps(subscription_data))
             await Cache.payment.reset_status(profile_id, "subscription")
             logger.debug(f"Subscription saved for profile_id={profile_id}")
+            await ProfileContextStore.invalidate([profile_id], reason="subscription_saved")
         except Exception as e:
             logger.error(f"Failed to save subscription for profile_id={profile_id}: {e}")
 
@@ -58,9 +64,40 @@ class WorkoutCacheManager(BaseCacheManager):
             current.update(updates)
             await cls.set_json("workout_plans:subscriptions", str(profile_id), current)
             logger.debug(f"Subscription updated for profile_id={profile_id} with {updates}")
+            if affects_profile_context(updates, watched=SUBSCRIPTION_CONTEXT_FIELDS):
+                await ProfileContextStore.invalidate([profile_id], reason="subscription_updated")
         except Exception as e:
             logger.error(f"Failed to update subscription for profile_id={profile_id}: {e}")
 
+    @classmethod
+    async def update_subscriptions(cls, updates: Mapping[int, dict[str, Any]]) -> None:
+        """Apply partial updates to many cached subscriptions in two round trips."""
+        await cls._update_many("workout_plans:subscriptions", updates)
+        stale = [
+            profile_id
+            for profile_id, changes in updates.items()
+            if affects_profile_context(changes, watched=SUBSCRIPTION_CONTEXT_FIELDS)
+        ]
+        await ProfileContextStore.invalidate(stale, reason="subscriptions_updated")
+
+    @classmethod
+    async def _update_many(cls, key: str, updates: Mapping[int, dict[str, Any]]) -> None:
+        if not updates:
+            return
+        try:
+            fields = {str(profile_id): changes for profile_id, changes in updates.items()}
+            current = await cls.mget_json(key, fields.keys())
+            merged: dict[str, dict[str, Any]] = {}
+            for field, changes in fields.items():
+                record = current.get(field)
+                payload = dict(record) if isinstance(record, dict) else {}
+                payload.update(changes)
+                merged[field] = payload
+            await cls.mset_json(key, merged)
+            logger.debug(f"Batch updated {len(merged)} entries in {key}")
+        except Exception as e:
+            logger.error(f"Failed to batch update {key} profile_ids={list(updates)}: {e}")
+
     @classmethod
     async def get_latest_subscription(cls, profile_id: int, *, use_fallback: bool = True) -> Subscription:
         return await cls.get_or_fetch(
@@ -74,6 +111,7 @@ class WorkoutCacheManager(BaseCacheManager):
         try:
             await cls.set("workout_plans:programs", str(profile_id), json.dumps(program_data))
             logger.debug(f"Program saved for profile_id={profile_id}")
+            await ProfileContextStore.invalidate([profile_id], reason="program_saved")
         except Exception as e:
             logger.error(f"Failed to save program for profile_id={profile_id}: {e}")
 
@@ -84,6 +122,7 @@ class WorkoutCacheManager(BaseCacheManager):
             current.update(updates)
             await cls.set_json("workout_plans:programs", str(profile_id), current)
             logger.debug(f"Program updated for profile_id={profile_id} with {updates}")
+            await ProfileContextStore.invalidate([profile_id], reason="program_updated")
         except Exception as e:
             logger.error(f"Failed to update program for profile_id={profile_id}: {e}")
 
@@ -142,6 +142,7 @@ CELERY_INCLUDE: tuple[str, ...] = (
     "core.tasks.backups",
     "core.tasks.billing",
     "core.tasks.bot_calls",
+    "core.tasks.cache",
     "core.tasks.ai_coach",
     "core.tasks.ai_coach.ask_ai",
     "core.tasks.ai_coach.workout_plans",
@@ -10,6 +10,7 @@ from celery import Task, signals
 from loguru import logger
 
 from core.celery_app import AI_COACH_TASK_ROUTES, CRITICAL_TASK_ROUTES
+from core.utils.async_runtime import close_worker_loops, reset_worker_loops
 
 EXPECTED_TASK_NAMES: tuple[str, ...] = tuple(sorted({*AI_COACH_TASK_ROUTES.keys(), *CRITICAL_TASK_ROUTES.keys()}))
 _TASK_START_TIMES: MutableMapping[str, float] = {}
@@ -24,6 +25,8 @@ def setup_celery_signals() -> None:
     signals.task_prerun.connect(_on_task_prerun, weak=False)
     signals.task_postrun.connect(_on_task_postrun, weak=False)
     signals.after_setup_task_logger.connect(_on_after_setup_task_logger, weak=False)
+    signals.worker_process_init.connect(_on_worker_process_init, weak=False)
+    signals.worker_shutdown.connect(_on_worker_shutdown, weak=False)
     _SIGNALS_ATTACHED = True
 
 
@@ -31,6 +34,14 @@ def _on_after_setup_task_logger(logger: logging.Logger, **_: Any) -> None:
     logger.setLevel(logging.INFO)
 
 
+def _on_worker_process_init(**_: Any) -> None:
+    reset_worker_loops()
+
+
+def _on_worker_shutdown(**_: Any) -> None:
+    close_worker_loops()
+
+
 def _on_worker_ready(sender: Any, **_: Any) -> None:
     from celery.apps.worker import WorkController  # local import for typing only
 
@@ -23,6 +23,7 @@ def build_http_client(**_: Any) -> httpx.AsyncClient:
         limits=httpx.Limits(
             max_connections=settings.API_MAX_CONNECTIONS,
             max_keepalive_connections=settings.API_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.API_KEEPALIVE_EXPIRY,
         ),
     )
 
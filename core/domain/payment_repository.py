@@ -1,12 +1,14 @@
 from typing import Any, Protocol
 
-from core.schemas import Payment, Subscription
+from core.schemas import Payment, SubscriptionRef
 
 
 class PaymentRepository(Protocol):
     async def update_payment(self, payment_id: int, data: dict[str, Any]) -> bool: ...
 
-    async def get_expired_subscriptions(self, expired_before: str) -> list[Subscription]: ...
+    async def get_expired_subscriptions(
+        self, expired_before: str, *, after_id: int = 0, limit: int = 500
+    ) -> list[SubscriptionRef]: ...
 
     async def update_payment_status(self, order_id: str, status_: str, error: str = "") -> Payment | None: ...
 
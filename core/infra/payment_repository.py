@@ -1,12 +1,12 @@
 from typing import Any
-from urllib.parse import urljoin
+from urllib.parse import urlencode, urljoin
 
 import httpx
 from loguru import logger
 from pydantic import ValidationError
 
 from core.enums import PaymentStatus
-from core.schemas import Payment, Subscription
+from core.schemas import Payment, SubscriptionRef
 from core.services.internal.api_client import (
     APIClient,
     APIClientHTTPError,
@@ -17,7 +17,7 @@ from core.services.internal.api_client import (
 
 class HTTPPaymentRepository(APIClient):
     API_BASE_PATH = "api/v1/payments/"
-    SUBSCRIPTIONS_PATH = "api/v1/subscriptions/"
+    EXPIRED_SUBSCRIPTIONS_PATH = "api/v1/subscriptions/expired/"
 
     def __init__(self, client: httpx.AsyncClient, settings: APISettings) -> None:
         super().__init__(client, settings)
@@ -49,17 +49,20 @@ class HTTPPaymentRepository(APIClient):
         )
         return status_code in {200, 204}
 
-    async def get_expired_subscriptions(self, expired_before: str) -> list[Subscription]:
+    async def get_expired_subscriptions(
+        self, expired_before: str, *, after_id: int = 0, limit: int = 500
+    ) -> list[SubscriptionRef]:
+        """One keyset page of enabled subscriptions paid up to ``expired_before``, ordered by id after ``after_id``."""
+        query = urlencode({"expired_before": expired_before, "after": after_id, "limit": limit})
         status_code, response = await self._handle_payment_api_request(
             method="get",
-            endpoint=self.SUBSCRIPTIONS_PATH,
-            data={"enabled": "True", "payment_date__lte": expired_before},
+            endpoint=f"{self.EXPIRED_SUBSCRIPTIONS_PATH}?{query}",
         )
         if status_code != 200:
             logger.error(f"Failed to get expired subscriptions: HTTP {status_code}")
             return []
         results = response.get("results", [])
-        return [Subscription.model_validate(item) for item in results]
+        return [SubscriptionRef.model_validate(item) for item in results]
 
     async def update_payment_status(self, order_id: str, status_: str, error: str = "") -> Payment | None:
         payment, payment_id = await self._get_payment_by_order_id(order_id)
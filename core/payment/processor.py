@@ -75,7 +75,7 @@ class PaymentProcessor:
             logger.error(message)
             raise ValueError(message)
         await self.profile_service.adjust_credits(profile.id, credits)
-        await self.cache.profile.update_record(profile.id, {"credits": profile.credits + credits})
+        await self.cache.profile.refresh_record(profile.id)
         return credits
 
     async def handle_webhook_event(self, order_id: str, status_: str, error: str = "") -> None:
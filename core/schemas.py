@@ -165,6 +165,11 @@ class Subscription(BaseModel):
             return str(value)
 
 
+class SubscriptionRef(BaseModel):
+    id: int
+    profile: int
+
+
 class Payment(BaseModel):
     id: int
     profile: int
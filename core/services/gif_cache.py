@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
+
+from loguru import logger
+
+_CHUNK_SIZE = 256 * 1024
+
+
+class _Blob(Protocol):
+    generation: int | None
+    content_type: str | None
+    updated: Any
+
+    def download_to_filename(self, filename: str) -> None: ...
+
+
+class GIFBucket(Protocol):
+    def get_blob(self, blob_name: str) -> _Blob | None: ...
+
+
+@dataclass(frozen=True)
+class CachedGIF:
+    key: str
+    path: Path
+    size: int
+    etag: str
+    last_modified: int
+    content_type: str
+    generation: int | None
+    checked_at: float
+
+
+class ExerciseGIFCache:
+    """Size-bounded on-disk LRU cache of exercise GIF blobs shared by the workers of one host.
+
+    Every blob is stored as ``<sha1(key)>.gif`` next to a JSON sidecar with its strong ETag (SHA-256 of the content),
+    last-modified time and bucket generation; both are written to a temporary file and renamed into place, so
+    concurrent workers never see a partial file. Entries older than ``ttl_s`` are revalidated against the bucket
+    generation and downloaded again only when it changed. When the total size exceeds ``max_bytes`` the least
+    recently served entries are removed.
+    """
+
+    def __init__(self, root: Path | str, *, max_bytes: int, ttl_s: int) -> None:
+        self.root = Path(root).expanduser()
+        self.max_bytes = max(int(max_bytes), 0)
+        self.ttl_s = max(int(ttl_s), 0)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._entries: OrderedDict[str, CachedGIF] = OrderedDict()
+        self._total_bytes = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _data_path(self, key: str) -> Path:
+        return self.root / f"{self._digest(key)}.gif"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{self._digest(key)}.json"
+
+    @staticmethod
+    def _read_meta(meta_path: Path) -> tuple[float, CachedGIF] | None:
+        try:
+            payload = json.loads(meta_path.read_text(encoding="utf-8"))
+            entry = replace(CachedGIF(**payload), path=Path(payload["path"]))
+            return entry.path.stat().st_mtime, entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError) as exc:
+            logger.debug(f"exercise_gif_cache.meta_skipped path={meta_path} detail={exc}")
+            return None
+
+    def _load(self) -> None:
+        found = [item for meta_path in self.root.glob("*.json") if (item := self._read_meta(meta_path)) is not None]
+        for _, entry in sorted(found, key=lambda item: item[0]):
+            self._entries[entry.key] = entry
+            self._total_bytes += entry.size
+        self._evict()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, bucket: GIFBucket, key: str) -> CachedGIF | None:
+        """Return the cached blob ``key``, downloading it on a miss; ``None`` when the bucket has no such blob."""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._lookup(key)
+            if entry is not None and time.time() - entry.checked_at < self.ttl_s:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            blob = bucket.get_blob(key)
+            if blob is None:
+                self._drop(key)
+                return None
+            if entry is not None and blob.generation is not None and blob.generation == entry.generation:
+                entry = replace(entry, checked_at=time.time())
+                self._write_meta(entry)
+                self._remember(entry)
+                return entry
+            entry = self._download(key, blob)
+            self._remember(entry)
+            return entry
+
+    def open(self, bucket: GIFBucket, key: str) -> tuple[CachedGIF, BinaryIO] | None:
+        """Like ``get`` but also opens the file; an entry evicted in between is fetched again once."""
+        for _ in range(2):
+            entry = self.get(bucket, key)
+            if entry is None:
+                return None
+            try:
+                return entry, entry.path.open("rb")
+            except FileNotFoundError:
+                self._drop(key)
+        raise FileNotFoundError(f"exercise GIF {key} was evicted while opening it")
+
+    def _lookup(self, key: str) -> CachedGIF | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            # Another worker on this host may have stored it already.
+            found = self._read_meta(self._meta_path(key))
+            if found is None:
+                return None
+            entry = found[1]
+            self._remember(entry)
+        try:
+            os.utime(entry.path)
+        except FileNotFoundError:
+            # Another worker evicted it.
+            self._drop(key)
+            return None
+        return entry
+
+    def _download(self, key: str, blob: _Blob) -> CachedGIF:
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".part")
+        os.close(fd)
+        try:
+            blob.download_to_filename(tmp_name)
+            digest = hashlib.sha256()
+            size = 0
+            with open(tmp_name, "rb") as handle:
+                while chunk := handle.read(_CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+            path = self._data_path(key)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        updated = getattr(blob, "updated", None)
+        last_modified = int(updated.timestamp()) if hasattr(updated, "timestamp") else int(time.time())
+        entry = CachedGIF(
+            key=key,
+            path=path,
+            size=size,
+            etag=f'"{digest.hexdigest()[:32]}"',
+            last_modified=last_modified,
+            content_type=blob.content_type or "image/gif",
+            generation=blob.generation,
+            checked_at=time.time(),
+        )
+        self._write_meta(entry)
+        logger.debug(f"exercise_gif_cache.stored gif_key={key} size={size}")
+        return entry
+
+    def _write_meta(self, entry: CachedGIF) -> None:
+        payload = {**asdict(entry), "path": str(entry.path)}
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".part")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp_name, self._meta_path(entry.key))
+
+    def _remember(self, entry: CachedGIF) -> None:
+        with self._lock:
+            previous = self._entries.pop(entry.key, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+            self._entries[entry.key] = entry
+            self._total_bytes += entry.size
+            self._evict()
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+        self._unlink(key)
+
+    def _evict(self) -> None:
+        # Callers hold ``self._lock``; the newest entry always stays even when it alone exceeds the budget.
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size
+            self.evictions += 1
+            self._unlink(key)
+
+    def _unlink(self, key: str) -> None:
+        self._meta_path(key).unlink(missing_ok=True)
+        self._data_path(key).unlink(missing_ok=True)
+
+
+__all__ = ["CachedGIF", "ExerciseGIFCache", "GIFBucket"]
@@ -68,6 +68,7 @@ class AiCoachService(APIClient):
         request_id: str | None = None,
         use_agent_header: bool = False,
         attachments: list[dict[str, str]] | None = None,
+        stream: bool = False,
     ) -> QAResponse | None:
         payload = AICoachRequest(
             prompt=prompt,
@@ -76,6 +77,7 @@ class AiCoachService(APIClient):
             mode=CoachMode.ask_ai,
             request_id=request_id,
             attachments=attachments,
+            stream=stream,
         )
         headers = {"X-Agent": "pydanticai"} if use_agent_header else None
         data = await self._post_ask(payload, request_id=request_id, extra_headers=headers)
@@ -255,14 +257,12 @@ class AiCoachService(APIClient):
         delay = 0.5
         for attempt in range(1, attempts + 1):
             try:
-                async with httpx.AsyncClient(base_url=self.base_url, timeout=self.settings.AI_COACH_TIMEOUT) as client:
-                    ping_status, _ = await self._api_request(
-                        "get",
-                        ping_path,
-                        timeout=5,
-                        headers=ping_headers,
-                        client=client,
-                    )
+                ping_status, _ = await self._api_request(
+                    "get",
+                    ping_path,
+                    timeout=5,
+                    headers=ping_headers,
+                )
                 logger.debug(
                     "ai_coach.ping.ok request_id={} status={} attempt={}",
                     request_id,
@@ -296,7 +296,7 @@ class AiCoachService(APIClient):
                 await asyncio.sleep(delay)
                 delay = min(delay * 2.0, 4.5)
 
-        # Main POST with retries and per-call client
+        # Main POST with retries over the pooled client
         attempts = 2
         delay = 0.5
         status: int = 0
@@ -304,16 +304,14 @@ class AiCoachService(APIClient):
         for attempt in range(1, attempts + 1):
             attempt_started = monotonic()
             try:
-                async with httpx.AsyncClient(base_url=self.base_url, timeout=self.settings.AI_COACH_TIMEOUT) as client:
-                    status, data = await self._api_request(
-                        "post",
-                        endpoint,
-                        payload_dict,
-                        body_bytes=body_bytes,
-                        headers=headers or None,
-                        timeout=self.settings.AI_COACH_TIMEOUT,
-                        client=client,
-                    )
+                status, data = await self._api_request(
+                    "post",
+                    endpoint,
+                    payload_dict,
+                    body_bytes=body_bytes,
+                    headers=headers or None,
+                    timeout=self.settings.AI_COACH_TIMEOUT,
+                )
                 attempt_elapsed_ms = int((monotonic() - attempt_started) * 1000)
                 if attempt_elapsed_ms >= 500:
                     logger.info(
@@ -426,15 +424,13 @@ class AiCoachService(APIClient):
             headers = build_internal_hmac_auth_headers(key_id=key_id, secret_key=secret_key, body=body)
             headers["Content-Type"] = "application/json"
         try:
-            async with httpx.AsyncClient(base_url=self.base_url, timeout=self.settings.AI_COACH_TIMEOUT) as client:
-                status, _ = await self._api_request(
-                    "post",
-                    "knowledge/refresh/",
-                    headers=headers,
-                    body_bytes=body,
-                    timeout=self.settings.AI_COACH_TIMEOUT,
-                    client=client,
-                )
+            status, _ = await self._api_request(
+                "post",
+                "knowledge/refresh/",
+                headers=headers,
+                body_bytes=body,
+                timeout=self.settings.AI_COACH_TIMEOUT,
+            )
         except (APIClientHTTPError, APIClientTransportError) as exc:
             logger.error(f"Knowledge refresh request failed: {exc}")
             raise UserServiceError(str(exc)) from exc
@@ -444,13 +440,11 @@ class AiCoachService(APIClient):
 
     async def health(self, timeout: float = 3.0) -> bool:
         try:
-            async with httpx.AsyncClient(base_url=self.base_url, timeout=self.settings.AI_COACH_TIMEOUT) as client:
-                status, _ = await self._api_request(
-                    "get",
-                    "health/",
-                    timeout=int(timeout),
-                    client=client,
-                )
+            status, _ = await self._api_request(
+                "get",
+                "health/",
+                timeout=int(timeout),
+            )
         except (APIClientHTTPError, APIClientTransportError) as exc:
             logger.debug(f"AI coach health check failed: {exc}")
             return False
@@ -7,6 +7,16 @@ import httpx
 from loguru import logger
 
 from core.exceptions import UserServiceError
+from core.services.internal.http_pool import HTTPClientRegistry
+
+_DEGRADED_REASONS = frozenset(
+    {
+        "timeout",
+        "knowledge_base_empty",
+        "knowledge_base_unavailable",
+        "knowledge_base_degraded",
+    }
+)
 
 
 class APIClientHTTPError(UserServiceError):
@@ -34,6 +44,13 @@ class APIClientTransportError(UserServiceError):
         super().__init__(message)
 
 
+class APIClientCircuitOpenError(APIClientTransportError):
+    def __init__(self, host: str, *, method: str, url: str, retry_after: float) -> None:
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {host} on {method.upper()} {url} (retry in {retry_after:.1f}s)")
+
+
 class APISettings(Protocol):
     API_URL: str
     API_KEY: str
@@ -122,8 +139,14 @@ class APIClient:
         allowed = allow_statuses or set()
         attempts = max(1, self.max_retries + 1)
         delay = self.initial_delay
+        if client is None:
+            base_url_candidate = getattr(self, "base_url", None) or getattr(self, "api_url", None)
+            client = HTTPClientRegistry.get_client(str(base_url_candidate or ""), self.settings)
+        breaker = HTTPClientRegistry.get_breaker(self._host_key(client, url), self.settings)
 
         for attempt in range(1, attempts + 1):
+            if breaker is not None and not breaker.allow():
+                raise APIClientCircuitOpenError(breaker.host, method=method, url=url, retry_after=breaker.retry_after())
             try:
                 request_kwargs: dict[str, Any] = {
                     "headers": headers,
@@ -134,24 +157,13 @@ class APIClient:
                 else:
                     request_kwargs["json"] = json_payload
 
-                if client is not None:
-                    response = await client.request(
-                        method,
-                        url,
-                        **request_kwargs,
-                    )
-                else:
-                    limits = httpx.Limits(max_connections=50, max_keepalive_connections=10)
-                    base_url_candidate = getattr(self, "base_url", None) or getattr(self, "api_url", None)
-                    base_url_value = str(base_url_candidate or "")
-                    async with httpx.AsyncClient(
-                        base_url=base_url_value, timeout=timeout_value, limits=limits
-                    ) as _client:
-                        response = await _client.request(
-                            method,
-                            url,
-                            **request_kwargs,
-                        )
+                response = await client.request(
+                    method,
+                    url,
+                    **request_kwargs,
+                )
+                if breaker is not None:
+                    breaker.record(not self._is_upstream_failure(response))
 
                 if response.status_code in allowed:
                     return response.status_code, self._parse_response_json(response)
@@ -163,15 +175,7 @@ class APIClient:
                     body = exc.response.text if exc.response else ""
                     reason = self._extract_reason(body)
                     retryable = status == 429 or (
-                        retry_server_errors
-                        and status >= 500
-                        and reason
-                        not in {
-                            "timeout",
-                            "knowledge_base_empty",
-                            "knowledge_base_unavailable",
-                            "knowledge_base_degraded",
-                        }
+                        retry_server_errors and status >= 500 and reason not in _DEGRADED_REASONS
                     )
                     if retryable:
                         if attempt < attempts:
@@ -200,16 +204,7 @@ class APIClient:
                 body = exc.response.text if exc.response else ""
                 reason = self._extract_reason(body)
                 retryable = status == 429 or (
-                    retry_server_errors
-                    and status is not None
-                    and status >= 500
-                    and reason
-                    not in {
-                        "timeout",
-                        "knowledge_base_empty",
-                        "knowledge_base_unavailable",
-                        "knowledge_base_degraded",
-                    }
+                    retry_server_errors and status is not None and status >= 500 and reason not in _DEGRADED_REASONS
                 )
                 if retryable and attempt < attempts:
                     logger.warning(
@@ -228,6 +223,8 @@ class APIClient:
                 ) from exc
 
             except httpx.RequestError as exc:
+                if breaker is not None:
+                    breaker.record(False)
                 if attempt >= attempts:
                     raise APIClientTransportError(f"{type(exc).__name__} on {method.upper()} {url}: {exc}") from exc
                 logger.warning(
@@ -243,6 +240,21 @@ class APIClient:
 
         raise APIClientTransportError(f"Exhausted retries for {method.upper()} {url}")
 
+    @staticmethod
+    def _host_key(client: httpx.AsyncClient, url: str) -> str:
+        target = httpx.URL(url)
+        if not target.host:
+            target = client.base_url.join(url)
+        return target.netloc.decode() or "-"
+
+    @classmethod
+    def _is_upstream_failure(cls, response: httpx.Response) -> bool:
+        """Whether a response should count against the host's circuit breaker."""
+        status = response.status_code
+        if status == 429:
+            return True
+        return status >= 500 and cls._extract_reason(response.text) not in _DEGRADED_REASONS
+
     @staticmethod
     async def _sleep(delay: float) -> None:
         if delay > 0:
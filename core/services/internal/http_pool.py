@@ -0,0 +1,227 @@
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from typing import Any
+
+import httpx
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-host breaker driven by the error rate over a rolling time window.
+
+    ``closed`` lets everything through and opens once at least ``min_requests``
+    outcomes in the window fail at ``failure_threshold`` or more. ``open`` rejects
+    calls until ``open_for`` seconds pass, then ``half_open`` admits up to
+    ``half_open_max`` probes: a success closes the breaker, a failure reopens it.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        window: float,
+        failure_threshold: float,
+        min_requests: int,
+        open_for: float,
+        half_open_max: int,
+    ) -> None:
+        self.host = host
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.min_requests = max(1, min_requests)
+        self.open_for = open_for
+        self.half_open_max = max(1, half_open_max)
+        self.state = CLOSED
+        self.transitions: Counter[str] = Counter()
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / len(self._outcomes)
+
+    def _transition(self, state: str, now: float) -> None:
+        previous, self.state = self.state, state
+        self.transitions[f"{previous}->{state}"] += 1
+        error_rate = self._error_rate()
+        if state == OPEN:
+            self._opened_at = now
+        else:
+            self._outcomes.clear()
+        self._probes = 0
+        log = logger.warning if state == OPEN else logger.info
+        log(
+            f"circuit_breaker_state host={self.host} from={previous} to={state} "
+            f"error_rate={error_rate:.2f} open_for={self.open_for}"
+        )
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self._opened_at < self.open_for:
+                    return False
+                self._transition(HALF_OPEN, now)
+            if self.state == HALF_OPEN:
+                # probes that never reported back stop counting after ``open_for``
+                if self._probes >= self.half_open_max and now - self._probe_started < self.open_for:
+                    return False
+                if self._probes >= self.half_open_max:
+                    self._probes = 0
+                self._probes += 1
+                self._probe_started = now
+            return True
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                self._transition(CLOSED if success else OPEN, now)
+                return
+            if self.state == OPEN:
+                return
+            self._outcomes.append((now, success))
+            self._trim(now)
+            if len(self._outcomes) >= self.min_requests and self._error_rate() >= self.failure_threshold:
+                self._transition(OPEN, now)
+
+    def retry_after(self) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_for - (time.monotonic() - self._opened_at))
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                "state": self.state,
+                "error_rate": round(self._error_rate(), 3),
+                "samples": len(self._outcomes),
+                "retry_after": round(self.retry_after(), 3),
+                "transitions": dict(self.transitions),
+            }
+
+
+class HTTPClientRegistry:
+    """Process-wide httpx clients shared per (event loop, base URL).
+
+    httpx clients are bound to the loop that opened their connections, so each
+    running loop gets its own pooled client; clients of closed loops are dropped
+    on the next lookup. Breakers are keyed by host and shared across loops.
+    """
+
+    _clients: dict[tuple[int, str], tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+    _breakers: dict[str, CircuitBreaker] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _limits(settings: Any) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=getattr(settings, "API_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=getattr(settings, "API_MAX_KEEPALIVE_CONNECTIONS", 20),
+            keepalive_expiry=getattr(settings, "API_KEEPALIVE_EXPIRY", 30.0),
+        )
+
+    @classmethod
+    def _prune(cls) -> None:
+        for key, (loop, _) in list(cls._clients.items()):
+            if loop.is_closed():
+                cls._clients.pop(key, None)
+
+    @classmethod
+    def get_client(cls, base_url: str, settings: Any) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        key = (id(loop), base_url)
+        with cls._lock:
+            entry = cls._clients.get(key)
+            if entry is not None and entry[0] is loop and not entry[1].is_closed:
+                return entry[1]
+            cls._prune()
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=getattr(settings, "API_TIMEOUT", None) or None,
+                limits=cls._limits(settings),
+            )
+            cls._clients[key] = (loop, client)
+            return client
+
+    @classmethod
+    def get_breaker(cls, host: str, settings: Any) -> CircuitBreaker | None:
+        if not getattr(settings, "API_CIRCUIT_BREAKER_ENABLED", False):
+            return None
+        with cls._lock:
+            breaker = cls._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    window=getattr(settings, "API_CIRCUIT_BREAKER_WINDOW", 30.0),
+                    failure_threshold=getattr(settings, "API_CIRCUIT_BREAKER_FAILURE_RATE", 0.5),
+                    min_requests=getattr(settings, "API_CIRCUIT_BREAKER_MIN_REQUESTS", 10),
+                    open_for=getattr(settings, "API_CIRCUIT_BREAKER_OPEN_SECONDS", 15.0),
+                    half_open_max=getattr(settings, "API_CIRCUIT_BREAKER_HALF_OPEN_MAX", 1),
+                )
+                cls._breakers[host] = breaker
+            return breaker
+
+    @staticmethod
+    def _pool_stats(client: httpx.AsyncClient) -> dict[str, int]:
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        limit = getattr(pool, "_max_connections", None) or 0
+        return {
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "max_connections": limit,
+        }
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        """Return pool utilization per client and breaker state per host."""
+        with cls._lock:
+            cls._prune()
+            clients = list(cls._clients.items())
+            breakers = list(cls._breakers.items())
+        pools: dict[str, dict[str, int]] = {}
+        for (loop_id, base_url), (_, client) in clients:
+            pools[f"{base_url or '-'}@{loop_id}"] = cls._pool_stats(client)
+        return {
+            "pools": pools,
+            "breakers": {host: breaker.snapshot() for host, breaker in breakers},
+        }
+
+    @classmethod
+    async def aclose_all(cls) -> None:
+        """Close clients owned by the running loop."""
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            owned = [key for key, (owner, _) in cls._clients.items() if owner is loop]
+            clients = [cls._clients.pop(key)[1] for key in owned]
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.exception("Failed to close pooled httpx client")
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._clients.clear()
+            cls._breakers.clear()
@@ -2,7 +2,7 @@ from decimal import Decimal
 from typing import Any
 
 from core.domain.payment_repository import PaymentRepository
-from core.schemas import Payment, Subscription
+from core.schemas import Payment, SubscriptionRef
 from core.payment.providers.liqpay import LiqPayGateway
 from core.payment.providers.payment_gateway import PaymentGateway
 
@@ -45,8 +45,10 @@ class PaymentService:
     async def update_payment(self, payment_id: int, data: dict[str, Any]) -> bool:
         return await self._repository.update_payment(payment_id, data)
 
-    async def get_expired_subscriptions(self, expired_before: str) -> list[Subscription]:
-        return await self._repository.get_expired_subscriptions(expired_before)
+    async def get_expired_subscriptions(
+        self, expired_before: str, *, after_id: int = 0, limit: int = 500
+    ) -> list[SubscriptionRef]:
+        return await self._repository.get_expired_subscriptions(expired_before, after_id=after_id, limit=limit)
 
     async def update_payment_status(self, order_id: str, status_: str, error: str = "") -> Payment | None:
         return await self._repository.update_payment_status(order_id, status_, error)
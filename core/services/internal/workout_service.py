@@ -9,7 +9,7 @@ from loguru import logger
 from config.app_settings import settings
 from core.services.internal.api_client import APIClient, APIClientHTTPError, APIClientTransportError
 from core.exceptions import UserServiceError
-from core.schemas import Program, DayExercises, Subscription
+from core.schemas import Program, DayExercises, Subscription, SubscriptionRef
 from core.enums import SubscriptionPeriod
 
 
@@ -164,6 +164,18 @@ class WorkoutService(APIClient):
                 f"Failed to update subscription {subscription_id}. HTTP status: {status_code}, response: {response}"
             )
 
+    async def deactivate_subscriptions(self, subscription_ids: list[int]) -> list[SubscriptionRef]:
+        """Disable the given subscriptions in one call; returns those that were still enabled."""
+        if not subscription_ids:
+            return []
+        url = urljoin(self.api_url, "api/v1/subscriptions/bulk_deactivate/")
+        status_code, response = await self._api_request(
+            "post", url, {"ids": subscription_ids}, headers={"Authorization": f"Api-Key {self.api_key}"}
+        )
+        if status_code != 200 or not isinstance(response, dict):
+            raise UserServiceError(f"Failed to deactivate subscriptions, received status {status_code}: {response}")
+        return [SubscriptionRef.model_validate(item) for item in response.get("deactivated", [])]
+
     async def get_all_subscriptions(self, profile_id: int) -> list[Subscription]:
         url = urljoin(self.api_url, f"api/v1/subscriptions/?profile={profile_id}")
         try:
@@ -14,6 +14,8 @@ from .maintenance import (  # noqa: F401
     memify_profile_datasets,
     prune_knowledge_base,
     refresh_external_knowledge,
+    refresh_profile_context,
+    summarize_chat_session,
     sync_profile_knowledge,
 )
 from .workout_plans import (  # noqa: F401
@@ -85,6 +87,8 @@ __all__ = (
     "cleanup_profile_knowledge",
     "sync_profile_knowledge",
     "memify_profile_datasets",
+    "refresh_profile_context",
+    "summarize_chat_session",
     "replace_exercise_task",
     "enqueue_exercise_replace_task",
     "replace_subscription_exercise_task",
@@ -10,7 +10,9 @@ from loguru import logger
 import orjson
 
 from config.app_settings import settings
+from core.ai_coach.answer_stream import AnswerStream
 from core.ai_coach.state.ask_ai import AiQuestionState
+from core.cache import Cache
 from core.celery_app import app
 from core.internal_http import build_internal_hmac_auth_headers, internal_request_timeout
 from core.schemas import Profile, QAResponse
@@ -60,7 +62,7 @@ async def _refund_credits_impl(payload: dict[str, Any]) -> None:
     profile: Profile | None = None
     try:
         await APIService.profile.adjust_credits(profile_id, cost)
-        profile = await APIService.profile.get_profile(profile_id)
+        profile = await Cache.profile.refresh_record(profile_id)
     except APIClientHTTPError as exc:
         logger.error(f"event=ask_ai_refund_failed request_id={request_id} profile_id={profile_id} error={exc.reason}")
         raise
@@ -224,6 +226,8 @@ async def _notify_ai_answer_error(
     }
     if profile_id is not None:
         payload["profile_id"] = profile_id
+    if request_id and settings.AI_COACH_STREAM_ENABLED:
+        await AnswerStream.fail(request_id, error)
     if dispatch:
         notify_ai_answer_ready_task.apply_async(  # pyrefly: ignore[not-callable]
             args=[payload],
@@ -295,6 +299,7 @@ async def _ask_ai_question_impl(payload: dict[str, Any], task: Task) -> dict[str
             continue
         attachments.append({"mime": mime_val, "data_base64": data_val})
     attempt = getattr(task.request, "retries", 0)
+    stream = bool(settings.AI_COACH_STREAM_ENABLED and request_id and not attachments)
 
     cost = int(payload["cost"])
 
@@ -311,7 +316,7 @@ async def _ask_ai_question_impl(payload: dict[str, Any], task: Task) -> dict[str
         profile: Profile | None = None
         try:
             await APIService.profile.adjust_credits(profile_id, -cost)
-            profile = await APIService.profile.get_profile(profile_id)
+            profile = await Cache.profile.refresh_record(profile_id)
         except APIClientHTTPError as exc:
             logger.error(
                 f"event=ask_ai_charge_failed profile_id={profile_id} request_id={request_id} "
@@ -345,6 +350,7 @@ async def _ask_ai_question_impl(payload: dict[str, Any], task: Task) -> dict[str
             language=language,
             request_id=request_id or None,
             attachments=attachments or None,
+            **({"stream": True} if stream else {}),
         )
     except APIClientHTTPError as exc:
         logger.error(
@@ -421,6 +427,8 @@ async def _ask_ai_question_impl(payload: dict[str, Any], task: Task) -> dict[str
         answer_len,
         str(kb_used).lower(),
     )
+    if stream:
+        await AnswerStream.finish(request_id, notify_payload)
     await emit_metrics_event(
         METRICS_EVENT_ASK_AI_ANSWER,
         source=METRICS_SOURCE_ASK_AI,
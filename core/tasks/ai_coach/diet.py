@@ -12,6 +12,7 @@ import orjson
 
 from config.app_settings import settings
 from core.ai_coach.state.diet import AiDietState
+from core.cache import Cache
 from core.celery_app import app
 from core.internal_http import build_internal_hmac_auth_headers, internal_request_timeout
 from core.schemas import DietPlan, Profile
@@ -110,7 +111,7 @@ async def _refund_credits_impl(payload: dict[str, Any]) -> bool:
         profile: Profile | None = None
         try:
             await APIService.profile.adjust_credits(profile_id, cost)
-            profile = await APIService.profile.get_profile(profile_id)
+            profile = await Cache.profile.refresh_record(profile_id)
         except APIClientHTTPError as exc:
             logger.error(
                 f"event=ai_diet_refund_failed request_id={request_id} profile_id={profile_id} error={exc.reason}"
@@ -343,7 +344,7 @@ async def _generate_diet_plan_impl(payload: dict[str, Any], task: Task) -> dict[
         profile: Profile | None = None
         try:
             await APIService.profile.adjust_credits(profile_id, -cost)
-            profile = await APIService.profile.get_profile(profile_id)
+            profile = await Cache.profile.refresh_record(profile_id)
         except APIClientHTTPError as exc:
             logger.error(
                 f"event=ai_diet_charge_failed profile_id={profile_id} request_id={request_id} "
@@ -9,6 +9,7 @@ import httpx
 from loguru import logger
 
 from config.app_settings import settings
+from core.ai_coach.chat_summary import ChatSummaryQueue
 from core.celery_app import app
 from core.internal_http import build_internal_hmac_auth_headers, resolve_hmac_credentials
 from core.services import APIService
@@ -18,6 +19,7 @@ from core.ai_coach import (
     memify_scheduled_key,
     parse_memify_run_at,
 )
+from core.utils.async_runtime import run_async
 from core.utils.redis_lock import get_redis_client, redis_try_lock
 
 __all__ = [
@@ -28,6 +30,8 @@ __all__ = [
     "cleanup_profile_knowledge",
     "sync_profile_knowledge",
     "memify_profile_datasets",
+    "refresh_profile_context",
+    "summarize_chat_session",
 ]
 
 
@@ -107,7 +111,7 @@ def refresh_external_knowledge(self) -> None:  # pyrefly: ignore[valid-type]
             await APIService.ai_coach.refresh_knowledge()
 
     try:
-        asyncio.run(_impl())
+        run_async(_impl())
     except Exception as exc:  # noqa: BLE001
         logger.error(f"refresh_external_knowledge failed: {exc}")
         raise
@@ -276,7 +280,7 @@ def memify_profile_datasets(self, profile_id: int, reason: str = "paid_flow") ->
             await client.delete(run_at_key, scheduled_key)
 
         try:
-            asyncio.run(_clear_schedule_keys())
+            run_async(_clear_schedule_keys())
         except Exception as exc:  # noqa: BLE001
             logger.warning(f"memify_profile_datasets.clear_failed profile_id={profile_id} detail={exc}")
         logger.info(
@@ -328,7 +332,7 @@ def memify_profile_datasets(self, profile_id: int, reason: str = "paid_flow") ->
         return remaining
 
     try:
-        planned_run_at = asyncio.run(_read_run_at())
+        planned_run_at = run_async(_read_run_at())
     except Exception as exc:  # noqa: BLE001
         planned_run_at = None
         logger.warning(f"memify_profile_datasets.schedule_read_failed profile_id={profile_id} detail={exc}")
@@ -336,7 +340,7 @@ def memify_profile_datasets(self, profile_id: int, reason: str = "paid_flow") ->
     if planned_run_at is not None and planned_run_at > now:
         delay_seconds = planned_run_at - now
         try:
-            asyncio.run(_touch_schedule(delay_seconds, planned_run_at))
+            run_async(_touch_schedule(delay_seconds, planned_run_at))
         except Exception as exc:  # noqa: BLE001
             logger.warning(f"memify_profile_datasets.schedule_touch_failed profile_id={profile_id} detail={exc}")
         self.apply_async(kwargs={"profile_id": profile_id, "reason": reason}, countdown=delay_seconds)
@@ -352,7 +356,7 @@ def memify_profile_datasets(self, profile_id: int, reason: str = "paid_flow") ->
     logger.info(f"memify_profile_datasets.done profile_id={profile_id}")
 
     try:
-        next_delay = asyncio.run(_finalize_schedule())
+        next_delay = run_async(_finalize_schedule())
     except Exception as exc:  # noqa: BLE001
         next_delay = None
         logger.warning(f"memify_profile_datasets.schedule_finalize_failed profile_id={profile_id} detail={exc}")
@@ -360,3 +364,68 @@ def memify_profile_datasets(self, profile_id: int, reason: str = "paid_flow") ->
     if next_delay is not None:
         self.apply_async(kwargs={"profile_id": profile_id, "reason": reason}, countdown=next_delay)
         logger.info(f"memify_profile_datasets.rescheduled profile_id={profile_id} delay_s={next_delay:.1f}")
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=5,
+    retry_jitter=True,
+    max_retries=3,
+    queue="ai_coach",
+    routing_key="ai_coach",
+)
+def refresh_profile_context(
+    self, profile_id: int, reason: str = "profile_updated", invalidate: bool = False
+) -> None:  # pyrefly: ignore[valid-type]
+    """Rebuild the materialized ask prompt context of a profile."""
+    from core.ai_coach.profile_context import ProfileContextStore
+
+    started = time.monotonic()
+    context = run_async(ProfileContextStore.refresh(profile_id, invalidate=invalidate))
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+    if context is None:
+        logger.info(f"refresh_profile_context.skipped profile_id={profile_id} reason={reason} elapsed_ms={elapsed_ms}")
+        return
+    logger.info(
+        f"refresh_profile_context.done profile_id={profile_id} reason={reason} "
+        f"generation={context.generation} elapsed_ms={elapsed_ms}"
+    )
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(httpx.HTTPError,),
+    retry_backoff=30,
+    retry_jitter=True,
+    max_retries=3,
+    queue="ai_coach",
+    routing_key="ai_coach",
+)
+def summarize_chat_session(self, profile_id: int) -> None:  # pyrefly: ignore[valid-type]
+    """Summarize the cached chat session of a profile once enough messages piled up."""
+    creds = resolve_hmac_credentials(settings, prefer_ai_coach=True)
+    if not creds:
+        logger.warning(f"summarize_chat_session.skipped profile_id={profile_id} reason=missing_hmac_credentials")
+        run_async(ChatSummaryQueue.discard(profile_id))
+        return
+    key_id, secret_key = creds
+    body = b"{}"
+    headers = build_internal_hmac_auth_headers(key_id=key_id, secret_key=secret_key, body=body)
+    headers.setdefault("Content-Type", "application/json")
+    url = _ai_coach_path(f"internal/knowledge/profiles/{profile_id}/summarize/")
+    try:
+        resp = httpx.post(url, content=body, headers=headers, timeout=settings.AI_COACH_TIMEOUT)
+        resp.raise_for_status()
+    except httpx.HTTPError as exc:
+        attempt = int(getattr(self.request, "retries", 0))
+        logger.warning(f"summarize_chat_session.retry profile_id={profile_id} attempt={attempt} detail={exc}")
+        if attempt >= int(getattr(self, "max_retries", 0) or 0):
+            run_async(ChatSummaryQueue.discard(profile_id))
+            raise
+        raise self.retry(exc=exc)
+    result = resp.json().get("result") or {}
+    logger.info(
+        f"summarize_chat_session.done profile_id={profile_id} status={result.get('status')} "
+        f"reason={result.get('reason')}"
+    )
@@ -1,6 +1,5 @@
 """Celery task for replacing a single exercise via LLM."""
 
-import asyncio
 import json
 from string import Template
 from pathlib import Path
@@ -11,6 +10,7 @@ from loguru import logger
 from config.app_settings import settings
 from core.celery_app import app
 from core.ai_coach.exercise_catalog import suggest_replacement_exercises
+from core.utils.async_runtime import run_async
 from apps.webapp.exercise_replace import (
     ReplaceExerciseResponse,
     extract_json_payload,
@@ -192,7 +192,7 @@ def _request_replacement(
         f"exercise_replace_llm_request profile_id={profile_id} {plan_label}_id={plan_id} "
         f"exercise_id={exercise_id} model={model_name} prompt_len={len(prompt)}"
     )
-    response = asyncio.run(
+    response = run_async(
         LLMHelper.call_llm(
             client,
             _load_system_prompt(),
@@ -1,6 +1,5 @@
 """AI coach Celery tasks and helpers."""
 
-import asyncio
 from collections.abc import Mapping
 from typing import Any
 
@@ -11,14 +10,17 @@ from loguru import logger
 
 from config.app_settings import settings
 from core.ai_coach.state.plan import AiPlanState
+from core.cache import Cache
 from core.celery_app import app
 from core.enums import SubscriptionPeriod, WorkoutLocation, WorkoutPlanType
 from core.internal_http import build_internal_hmac_auth_headers, internal_request_timeout
 from core.schemas import Program, Subscription
 from core.services import APIService
 from core.services.internal.api_client import APIClientHTTPError, APIClientTransportError
+from core.services.internal.http_pool import HTTPClientRegistry
 from core.metrics.constants import METRICS_EVENT_WORKOUT_PLAN, METRICS_SOURCE_WORKOUT_PLAN
 from core.tasks.ai_coach.metrics import emit_metrics_event
+from core.utils.async_runtime import run_async
 
 __all__ = [
     "handle_ai_plan_failure",
@@ -108,6 +110,7 @@ async def _refund_plan_credits(
             )
             return False
         await APIService.profile.adjust_credits(profile_id, cost)
+        await Cache.profile.refresh_record(profile_id)
         await state.mark_refunded(request_id, ttl_s=settings.AI_PLAN_NOTIFY_FAILURE_TTL)
         logger.info(f"ai_plan_refund_ok profile_id={profile_id} request_id={request_id} cost={cost}")
         return True
@@ -171,9 +174,9 @@ async def _notify_ai_plan_ready(payload: dict[str, Any]) -> None:
             return
     logger.info(f"ai_plan_notify_start action={action} request_id={request_id} url={url}")
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response: httpx.Response = await client.post(url, content=body, headers=headers)
-            response.raise_for_status()
+        client = HTTPClientRegistry.get_client(base_url, settings)
+        response: httpx.Response = await client.post(url, content=body, headers=headers, timeout=timeout)
+        response.raise_for_status()
     except httpx.HTTPStatusError as exc:
         status_code: int | None = exc.response.status_code if exc.response is not None else None
         detail: str = f"status={status_code} error={exc!s}"
@@ -259,7 +262,7 @@ def handle_ai_plan_failure(self, payload: Any, action: str, *exc_info: Any) -> N
     if normalized is None:
         logger.error(f"ai_plan_failure_payload_missing action={action} detail={detail}")
         return
-    asyncio.run(_handle_ai_plan_failure_impl(normalized, action, detail))
+    run_async(_handle_ai_plan_failure_impl(normalized, action, detail))
 
 
 def _parse_workout_location(raw: Any) -> WorkoutLocation | None:
@@ -638,17 +641,17 @@ def notify_ai_plan_ready_task(self, payload: dict[str, Any]) -> None:  # pyrefly
         normalized.get("profile_id"),
     )
     try:
-        asyncio.run(_notify_ai_plan_ready(normalized))
+        run_async(_notify_ai_plan_ready(normalized))
     except (httpx.HTTPStatusError, httpx.TransportError) as exc:
         attempt = int(getattr(self.request, "retries", 0))
         max_retries = int(getattr(self, "max_retries", 0) or 0)
         logger.warning(f"ai_plan_notify_retry action={action} request_id={request_id} attempt={attempt} error={exc}")
         if attempt >= max_retries:
-            asyncio.run(_handle_notify_failure(normalized, exc))
+            run_async(_handle_notify_failure(normalized, exc))
             raise
         raise self.retry(exc=exc)
     except Exception as exc:  # noqa: BLE001
-        asyncio.run(_handle_notify_failure(normalized, exc))
+        run_async(_handle_notify_failure(normalized, exc))
         raise
 
 
@@ -673,7 +676,7 @@ def generate_ai_workout_plan(self, payload: dict[str, Any]) -> dict[str, Any] |
             payload.get("profile_id"),
             payload.get("plan_type"),
         )
-        notify_payload = asyncio.run(_generate_ai_workout_plan_impl(payload, self))
+        notify_payload = run_async(_generate_ai_workout_plan_impl(payload, self))
     except APIClientHTTPError as exc:
         retries = int(getattr(self.request, "retries", 0))
         max_retries = int(getattr(self, "max_retries", 0) or 0)
@@ -707,7 +710,7 @@ def generate_ai_workout_plan(self, payload: dict[str, Any]) -> dict[str, Any] |
 )
 def update_ai_workout_plan(self, payload: dict[str, Any]) -> dict[str, Any] | None:  # pyrefly: ignore[valid-type]
     try:
-        notify_payload = asyncio.run(_update_ai_workout_plan_impl(payload, self))
+        notify_payload = run_async(_update_ai_workout_plan_impl(payload, self))
     except APIClientHTTPError as exc:
         retries = int(getattr(self.request, "retries", 0))
         max_retries = int(getattr(self, "max_retries", 0) or 0)
@@ -1,19 +1,46 @@
 """Billing-related Celery tasks."""
 
-import asyncio
+import time
 from datetime import datetime
 
 from loguru import logger
 
+from config.app_settings import settings
+from core.ai_coach.profile_context import ProfileContextStore
 from core.cache import Cache
 from core.celery_app import app
 from core.services import APIService
+from core.utils.async_runtime import run_async
 
 __all__ = [
     "deactivate_expired_subscriptions",
 ]
 
 
+async def _deactivate_expired(expired_before: str, chunk_size: int) -> tuple[int, int]:
+    """Deactivate expired subscriptions in keyset chunks; returns ``(deactivated, chunks)``."""
+    after_id = 0
+    deactivated = 0
+    chunks = 0
+    while True:
+        page = await APIService.payment.get_expired_subscriptions(expired_before, after_id=after_id, limit=chunk_size)
+        if not page:
+            break
+        chunks += 1
+        after_id = page[-1].id
+        expired = await APIService.workout.deactivate_subscriptions([sub.id for sub in page])
+        profile_ids = sorted({sub.profile for sub in expired})
+        if profile_ids:
+            await Cache.workout.update_subscriptions({profile_id: {"enabled": False} for profile_id in profile_ids})
+            await Cache.payment.reset_statuses(profile_ids, "subscription")
+            await ProfileContextStore.invalidate(profile_ids, reason="subscription_expired")
+        deactivated += len(expired)
+        logger.info(f"deactivate_expired_subscriptions chunk={chunks} deactivated={len(expired)} last_id={after_id}")
+        if len(page) < chunk_size:
+            break
+    return deactivated, chunks
+
+
 @app.task(
     bind=True,
     autoretry_for=(Exception,),
@@ -23,23 +50,15 @@ __all__ = [
 )  # pyrefly: ignore[not-callable]
 def deactivate_expired_subscriptions(self) -> None:
     logger.info("deactivate_expired_subscriptions started")
-
-    async def _impl() -> None:
-        today = datetime.now().date().isoformat()
-        subscriptions = await APIService.payment.get_expired_subscriptions(today)
-
-        for sub in subscriptions:
-            if not sub.id or not sub.profile:
-                logger.warning(f"Invalid subscription: {sub}")
-                continue
-            await APIService.workout.update_subscription(sub.id, {"enabled": False, "profile": sub.profile})
-            await Cache.workout.update_subscription(sub.profile, {"enabled": False})
-            await Cache.payment.reset_status(sub.profile, "subscription")
-            logger.info(f"Subscription {sub.id} deactivated for user {sub.profile}")
-
+    today = datetime.now().date().isoformat()
+    started = time.monotonic()
     try:
-        asyncio.run(_impl())
+        deactivated, chunks = run_async(_deactivate_expired(today, max(1, settings.BILLING_EXPIRY_CHUNK_SIZE)))
     except Exception as exc:  # noqa: BLE001
         logger.error(f"deactivate_expired_subscriptions failed: {exc}")
         raise
-    logger.info("deactivate_expired_subscriptions completed")
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"deactivate_expired_subscriptions completed deactivated={deactivated} chunks={chunks} "
+        f"duration_ms={int(elapsed * 1000)} rows_per_s={deactivated / elapsed if elapsed else 0:.1f}"
+    )
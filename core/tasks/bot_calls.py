@@ -1,9 +1,17 @@
-"""Celery tasks that proxy calls to the bot service."""
+"""Celery tasks that proxy calls to the bot service.
+
+Scheduled notifications are not sent as one request with every recipient. The scheduled task walks the recipients
+by ``profile_id`` in keyset pages of ``BOT_NOTIFY_CHUNK_SIZE`` and fans each page out as a ``send_notification_chunk``
+subtask, which loads its recipients and posts them to the bot as a broadcast of its own. Chunks are keyed by the run
+(the local date) and their index, so a retried scheduler or a redelivered chunk does not notify anyone twice, and a
+failing chunk retries alone. Progress of a run is counted in ``bot_calls:dispatch:<kind>:<run_id>``.
+"""
 
 from __future__ import annotations
 
-from datetime import timedelta
-from typing import TYPE_CHECKING, TypedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Callable, Iterator, TypedDict
 
 import httpx
 import orjson
@@ -16,35 +24,33 @@ if TYPE_CHECKING:
 from config.app_settings import settings
 from core.celery_app import app
 from core.internal_http import build_internal_hmac_auth_headers, internal_request_timeout
+from core.services.internal.http_pool import HTTPClientRegistry
+from core.utils.async_runtime import run_async, worker_async
+from core.utils.idempotency import acquire_once
+from core.utils.redis_lock import get_redis_client
 
 
-class WeeklySurveyRecipient(TypedDict):
-    profile_id: int
-    tg_id: int
-    language: str | None
-    subscription_id: int
-
-
-class WeeklySurveyPayload(TypedDict):
-    recipients: list[WeeklySurveyRecipient]
-
-
-class SubscriptionRenewalRecipient(TypedDict):
+class NotificationRecipient(TypedDict):
     profile_id: int
     tg_id: int
     language: str | None
     subscription_id: int
 
 
-class SubscriptionRenewalPayload(TypedDict):
-    recipients: list[SubscriptionRenewalRecipient]
+class NotificationPayload(TypedDict):
+    broadcast_id: str
+    recipients: list[NotificationRecipient]
 
 
 __all__ = [
     "send_weekly_survey",
     "send_subscription_renewal_reminders",
+    "send_notification_chunk",
 ]
 
+DISPATCH_PREFIX = "bot_calls:dispatch:"
+DISPATCH_TTL_S = 3 * 24 * 3600
+
 
 def _active_subscriptions_queryset() -> "QuerySet[Subscription]":
     from apps.workout_plans.models import Subscription
@@ -60,14 +66,51 @@ def _active_subscriptions_queryset() -> "QuerySet[Subscription]":
     )
 
 
-def _fetch_weekly_survey_recipients() -> list[WeeklySurveyRecipient]:
-    recipients: list[WeeklySurveyRecipient] = []
-    for row in _active_subscriptions_queryset().values(
-        "id",
-        "profile_id",
-        "profile__tg_id",
-        "profile__language",
-    ):
+def _weekly_survey_queryset(run_id: str) -> "QuerySet[Subscription]":
+    return _active_subscriptions_queryset()
+
+
+def _subscription_renewal_queryset(run_id: str) -> "QuerySet[Subscription]":
+    target_date = (date.fromisoformat(run_id) + timedelta(days=1)).isoformat()
+    return _active_subscriptions_queryset().filter(payment_date=target_date)
+
+
+@dataclass(frozen=True)
+class _Notification:
+    endpoint: str
+    queryset: Callable[[str], "QuerySet[Subscription]"]
+
+
+NOTIFICATIONS: dict[str, _Notification] = {
+    "weekly_survey": _Notification("send_weekly_survey", _weekly_survey_queryset),
+    "subscription_renewal": _Notification("send_subscription_renewal", _subscription_renewal_queryset),
+}
+
+
+def _profile_id_pages(kind: str, run_id: str, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """``(after, last)`` profile id bounds of consecutive pages of at most ``chunk_size`` recipients."""
+    queryset = NOTIFICATIONS[kind].queryset(run_id)
+    after = 0
+    while True:
+        ids = list(queryset.filter(profile_id__gt=after).values_list("profile_id", flat=True)[:chunk_size])
+        if not ids:
+            return
+        yield after, ids[-1]
+        if len(ids) < chunk_size:
+            return
+        after = ids[-1]
+
+
+def _fetch_chunk_recipients(kind: str, run_id: str, after: int, last: int) -> list[NotificationRecipient]:
+    recipients: list[NotificationRecipient] = []
+    rows = (
+        NOTIFICATIONS[kind]
+        .queryset(run_id)
+        .filter(profile_id__gt=after, profile_id__lte=last)
+        .values("id", "profile_id", "profile__tg_id", "profile__language")
+        .iterator(chunk_size=settings.BOT_NOTIFY_CHUNK_SIZE)
+    )
+    for row in rows:
         tg_id = row.get("profile__tg_id")
         if tg_id is None:
             continue
@@ -82,31 +125,70 @@ def _fetch_weekly_survey_recipients() -> list[WeeklySurveyRecipient]:
     return recipients
 
 
-def _fetch_subscription_renewal_recipients() -> list[SubscriptionRenewalRecipient]:
-    recipients: list[SubscriptionRenewalRecipient] = []
-    target_date = (timezone.localdate() + timedelta(days=1)).isoformat()
-    for row in (
-        _active_subscriptions_queryset()
-        .filter(payment_date=target_date)
-        .values(
-            "id",
-            "profile_id",
-            "profile__tg_id",
-            "profile__language",
-        )
-    ):
-        tg_id = row.get("profile__tg_id")
-        if tg_id is None:
-            continue
-        recipients.append(
-            {
-                "profile_id": int(row["profile_id"]),
-                "tg_id": int(tg_id),
-                "language": row.get("profile__language"),
-                "subscription_id": int(row["id"]),
-            }
+def _dispatch_key(kind: str, run_id: str) -> str:
+    return f"{DISPATCH_PREFIX}{kind}:{run_id}"
+
+
+@worker_async
+async def _record_planned(kind: str, run_id: str, chunks: int) -> None:
+    key = _dispatch_key(kind, run_id)
+    client = get_redis_client()
+    pipe = client.pipeline(transaction=False)
+    pipe.hset(key, "chunks", str(chunks))
+    pipe.hget(key, "done")
+    pipe.expire(key, DISPATCH_TTL_S)
+    _, done, _ = await pipe.execute()
+    if int(done or 0) >= chunks:
+        logger.info(f"{kind}_dispatch_completed run_id={run_id} chunks={chunks}")
+
+
+@worker_async
+async def _record_chunk_done(kind: str, run_id: str, recipients: int) -> None:
+    key = _dispatch_key(kind, run_id)
+    client = get_redis_client()
+    pipe = client.pipeline(transaction=False)
+    pipe.hincrby(key, "done", 1)
+    pipe.hincrby(key, "recipients", recipients)
+    pipe.hget(key, "chunks")
+    pipe.expire(key, DISPATCH_TTL_S)
+    done, total_recipients, chunks, _ = await pipe.execute()
+    if chunks is not None and int(done) >= int(chunks):
+        logger.info(f"{kind}_dispatch_completed run_id={run_id} chunks={chunks} recipients={total_recipients}")
+
+
+@worker_async
+async def _post_chunk(kind: str, payload: NotificationPayload) -> None:
+    body = orjson.dumps(payload)
+    headers = build_internal_hmac_auth_headers(
+        key_id=settings.INTERNAL_KEY_ID,
+        secret_key=settings.INTERNAL_API_KEY,
+        body=body,
+    )
+    base_url = settings.BOT_INTERNAL_URL.rstrip("/")
+    client = HTTPClientRegistry.get_client(base_url, settings)
+    url = f"{base_url}/internal/tasks/{NOTIFICATIONS[kind].endpoint}/"
+    resp = await client.post(url, content=body, headers=headers, timeout=internal_request_timeout(settings))
+    resp.raise_for_status()
+
+
+def _dispatch(kind: str) -> int:
+    run_id = timezone.localdate().isoformat()
+    chunk_size = max(1, int(settings.BOT_NOTIFY_CHUNK_SIZE))
+    chunks = 0
+    for index, (after, last) in enumerate(_profile_id_pages(kind, run_id, chunk_size)):
+        getattr(send_notification_chunk, "apply_async")(
+            kwargs={"kind": kind, "run_id": run_id, "index": index, "after": after, "last": last},
+            queue="maintenance",
+            routing_key="maintenance",
         )
-    return recipients
+        chunks += 1
+    if chunks:
+        try:
+            _record_planned(kind, run_id, chunks)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"{kind}_dispatch_record_failed run_id={run_id} detail={exc}")
+    logger.info(f"{kind}_dispatched run_id={run_id} chunks={chunks} chunk_size={chunk_size}")
+    return chunks
 
 
 @app.task(
@@ -117,28 +199,8 @@ def _fetch_subscription_renewal_recipients() -> list[SubscriptionRenewalRecipien
     max_retries=3,
 )  # pyrefly: ignore[not-callable]
 def send_weekly_survey(self) -> None:
-    recipients = _fetch_weekly_survey_recipients()
-    if not recipients:
+    if not _dispatch("weekly_survey"):
         logger.info("weekly_survey_skipped reason=no_active_subscriptions")
-        return
-
-    payload: WeeklySurveyPayload = {"recipients": recipients}
-    body = orjson.dumps(payload)
-    headers = build_internal_hmac_auth_headers(
-        key_id=settings.INTERNAL_KEY_ID,
-        secret_key=settings.INTERNAL_API_KEY,
-        body=body,
-    )
-    base_url = settings.BOT_INTERNAL_URL.rstrip("/")
-    url = f"{base_url}/internal/tasks/send_weekly_survey/"
-    timeout = internal_request_timeout(settings)
-
-    try:
-        resp = httpx.post(url, content=body, headers=headers, timeout=timeout)
-        resp.raise_for_status()
-    except httpx.HTTPError as exc:
-        logger.warning(f"Bot call failed for weekly survey: {exc!s}")
-        raise self.retry(exc=exc)
 
 
 @app.task(
@@ -149,25 +211,35 @@ def send_weekly_survey(self) -> None:
     max_retries=3,
 )  # pyrefly: ignore[not-callable]
 def send_subscription_renewal_reminders(self) -> None:
-    recipients = _fetch_subscription_renewal_recipients()
-    if not recipients:
+    if not _dispatch("subscription_renewal"):
         logger.info("subscription_renewal_skipped reason=no_recipients")
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(httpx.HTTPError,),
+    retry_backoff=60,
+    retry_jitter=True,
+    max_retries=5,
+)  # pyrefly: ignore[not-callable]
+def send_notification_chunk(self, kind: str, run_id: str, index: int, after: int, last: int) -> None:
+    """Post one chunk of a scheduled notification to the bot."""
+    # Retries get their own key: the bot resumes a retried broadcast, so only duplicate deliveries are dropped.
+    claim_key = f"bot_calls:{kind}:{run_id}:{index}:{self.request.retries}"
+    if not run_async(acquire_once(claim_key, ttl=DISPATCH_TTL_S)):
+        logger.info(f"{kind}_chunk_skipped reason=duplicate run_id={run_id} chunk={index}")
         return
 
-    payload: SubscriptionRenewalPayload = {"recipients": recipients}
-    body = orjson.dumps(payload)
-    headers = build_internal_hmac_auth_headers(
-        key_id=settings.INTERNAL_KEY_ID,
-        secret_key=settings.INTERNAL_API_KEY,
-        body=body,
-    )
-    base_url = settings.BOT_INTERNAL_URL.rstrip("/")
-    url = f"{base_url}/internal/tasks/send_subscription_renewal/"
-    timeout = internal_request_timeout(settings)
+    recipients = _fetch_chunk_recipients(kind, run_id, after, last)
+    if recipients:
+        payload: NotificationPayload = {"broadcast_id": f"{kind}:{run_id}:{index}", "recipients": recipients}
+        try:
+            _post_chunk(kind, payload)
+        except httpx.HTTPError as exc:
+            logger.warning(f"Bot call failed for {kind} run_id={run_id} chunk={index}: {exc!s}")
+            raise self.retry(exc=exc)
 
     try:
-        resp = httpx.post(url, content=body, headers=headers, timeout=timeout)
-        resp.raise_for_status()
-    except httpx.HTTPError as exc:
-        logger.warning(f"Bot call failed for subscription renewal: {exc!s}")
-        raise self.retry(exc=exc)
+        _record_chunk_done(kind, run_id, len(recipients))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"{kind}_dispatch_record_failed run_id={run_id} chunk={index} detail={exc}")
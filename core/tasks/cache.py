@@ -0,0 +1,27 @@
+"""Cache maintenance Celery tasks."""
+
+import time
+from typing import Any
+
+from loguru import logger
+
+from core.cache.base import BaseCacheManager
+from core.celery_app import app
+from core.utils.async_runtime import run_async
+
+__all__ = [
+    "sweep_cache_hashes",
+]
+
+
+@app.task(bind=True, queue="maintenance", routing_key="maintenance")  # pyrefly: ignore[not-callable]
+def sweep_cache_hashes(self) -> dict[str, Any]:
+    started = time.monotonic()
+    report = run_async(BaseCacheManager.sweep_expired())
+    for key, stats in sorted(report.items()):
+        logger.info(f"cache_sweep_hash key={key} size={stats['size']} evicted={stats['evicted']}")
+    evicted = sum(stats["evicted"] for stats in report.values())
+    remaining = sum(stats["size"] for stats in report.values())
+    duration_ms = int((time.monotonic() - started) * 1000)
+    logger.info(f"cache_sweep_done hashes={len(report)} fields={remaining} evicted={evicted} duration_ms={duration_ms}")
+    return {"hashes": report, "evicted": evicted, "fields": remaining, "duration_ms": duration_ms}
@@ -7,6 +7,7 @@ from django.db.models import Sum
 from django.utils import timezone
 from loguru import logger
 
+from apps.metrics.buffer import flush_events
 from apps.metrics.models import MetricsEvent, MetricsEventType
 from apps.payments.models import Payment
 from config.app_settings import settings
@@ -14,7 +15,7 @@ from core.celery_app import app
 from core.enums import PaymentStatus
 from core.services.gsheets_service import GSheetsService
 
-__all__ = ["collect_weekly_metrics"]
+__all__ = ["collect_weekly_metrics", "flush_metrics_events"]
 
 
 def _coerce_total(value: Decimal | None) -> Decimal:
@@ -38,6 +39,11 @@ def collect_weekly_metrics(self) -> None:
         logger.warning("weekly_metrics_skipped reason=missing_spreadsheet_id")
         return
 
+    try:
+        flush_events(settings.METRICS_FLUSH_BATCH_SIZE)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"weekly_metrics_flush_failed error={exc}")
+
     end = _start_of_week(timezone.localtime())
     start = end - timedelta(days=7)
 
@@ -90,3 +96,14 @@ def collect_weekly_metrics(self) -> None:
         workout_plans,
         total_amount,
     )
+
+
+@app.task(bind=True, queue="maintenance", routing_key="maintenance")  # pyrefly: ignore[not-callable]
+def flush_metrics_events(self) -> dict[str, float | int]:
+    report = flush_events(max(1, settings.METRICS_FLUSH_BATCH_SIZE))
+    if report.flushed:
+        logger.info(
+            f"metrics_buffer_flushed events={report.flushed} batches={report.batches} "
+            f"duration_ms={report.duration_ms:.1f} depth={report.depth}"
+        )
+    return {"flushed": report.flushed, "duration_ms": round(report.duration_ms, 1), "depth": report.depth}
@@ -0,0 +1,154 @@
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+import bot.utils.ai_coach.answer_stream as bot_stream
+from ai_coach.agent.base import AgentDeps
+from ai_coach.agent.coach import CoachAgent
+from core.ai_coach import answer_stream
+from core.ai_coach.answer_stream import OWNER_STREAM, OWNER_WEBHOOK, AnswerStream, AnswerStreamPublisher
+from config.app_settings import settings
+from core.schemas import Profile
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+
+    def xadd(self, key: str, fields: dict[str, str], **kwargs: Any) -> "_Pipeline":
+        entries = self._redis.streams.setdefault(key, [])
+        entries.append((f"{len(entries) + 1}-0", dict(fields)))
+        return self
+
+    def expire(self, key: str, seconds: int) -> "_Pipeline":
+        return self
+
+    async def execute(self) -> list[Any]:
+        return []
+
+
+class _Redis:
+    """Stream reads return one entry per call, like segments arriving one at a time."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self.values: dict[str, str] = {}
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    async def xread(self, streams: dict[str, str], count: int | None = None, block: int | None = None) -> list[Any]:
+        key, last_id = next(iter(streams.items()))
+        newer = [
+            entry for entry in self.streams.get(key, []) if int(entry[0].split("-")[0]) > int(last_id.split("-")[0])
+        ]
+        return [[key, newer[:1]]] if newer else []
+
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+
+
+class _Bot:
+    def __init__(self) -> None:
+        self.id = 111
+        self.sent: list[str] = []
+        self.edits: list[str] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs: Any) -> SimpleNamespace:
+        self.sent.append(text)
+        return SimpleNamespace(message_id=len(self.sent))
+
+    async def edit_message_text(self, text: str, **kwargs: Any) -> None:
+        self.edits.append(text)
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _Redis:
+    client = _Redis()
+    monkeypatch.setattr(answer_stream, "get_redis_client", lambda: client)
+    return client
+
+
+def _entries(redis: _Redis, request_id: str) -> list[dict[str, str]]:
+    return [fields for _, fields in redis.streams[AnswerStream._key(request_id)]]
+
+
+@pytest.mark.asyncio
+async def test_streamed_completion_is_published_in_segments(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    tokens = ["Train", " three", " times", " a", " week", ".\n", *([" Rest"] * 20)]
+
+    async def fake_call_llm_stream(client: Any, messages: Any, *, model: str, max_tokens: int) -> AsyncIterator[str]:
+        assert messages[1] == {"role": "user", "content": "How often?"}
+        for token in tokens:
+            yield token
+
+    helper = CoachAgent.llm_helper
+    monkeypatch.setattr(helper, "call_llm_stream", staticmethod(fake_call_llm_stream))
+    monkeypatch.setattr(helper, "get_completion_client", classmethod(lambda cls: (object(), settings.AGENT_MODEL)))
+    monkeypatch.setattr(settings, "AI_COACH_KB_ENABLED", False)
+
+    publisher = AnswerStreamPublisher("req-1", segment_chars=16)
+    result = await helper._stream_answer_question(
+        "How often?",
+        AgentDeps(profile_id=1, locale="en"),
+        ["client: How often?"],
+        publisher=publisher,
+    )
+
+    assert result is not None
+    assert result.answer == "".join(tokens).strip()
+    assert result.sources == ["general_knowledge"]
+    entries = _entries(redis, "req-1")
+    assert entries[:2] == [{"kind": "start"}, {"kind": "delta", "text": "Train"}]
+    assert "".join(entry.get("text", "") for entry in entries) == "".join(tokens)
+    assert publisher.segments == len(entries) - 1 < len(tokens)
+
+
+@pytest.mark.asyncio
+async def test_stream_consumer_edits_at_bounded_rate_and_owns_delivery(
+    redis: _Redis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "AI_COACH_STREAM_EDIT_INTERVAL_S", 0.1)
+    delivered: list[str] = []
+    menus: list[int] = []
+
+    async def mark_delivered(request_id: str) -> None:
+        delivered.append(request_id)
+
+    async def send_main_menu(bot: Any, chat_id: int, profile: Profile, fsm: FSMContext) -> None:
+        menus.append(chat_id)
+
+    monkeypatch.setattr(bot_stream.AiQuestionState, "create", lambda: SimpleNamespace(mark_delivered=mark_delivered))
+    monkeypatch.setattr(bot_stream, "send_main_menu_to_chat", send_main_menu)
+    monkeypatch.setattr(bot_stream, "ParseMode", SimpleNamespace(HTML="HTML"))
+
+    publisher = AnswerStreamPublisher("req-2", segment_chars=1)
+    for delta in ("Sleep", " eight", " hours"):
+        await publisher.push(delta)
+    await AnswerStream.finish("req-2", {"status": "success", "answer": "Sleep eight hours."})
+
+    profile = Profile(id=5, tg_id=50, language="en")
+    fsm = FSMContext(storage=MemoryStorage(), key=StorageKey(bot_id=111, chat_id=50, user_id=50))
+    await fsm.set_data({"ask_ai_question_message_id": 9, "ask_ai_cost": 1})
+    bot = _Bot()
+
+    assert await bot_stream.deliver_streamed_answer(bot=bot, profile=profile, request_id="req-2", fsm=fsm)
+
+    assert len(bot.sent) == 1 and "Sleep" in bot.sent[0]
+    assert len(bot.edits) == 1 and "Sleep eight hours." in bot.edits[0]
+    assert delivered == ["req-2"] and menus == [50]
+    assert await fsm.get_data() == {"profile": profile.model_dump(mode="json"), "last_request_id": "req-2"}
+    assert await AnswerStream.claim("req-2", OWNER_WEBHOOK) == OWNER_STREAM
@@ -10,6 +10,7 @@ from ai_coach.agent import CoachAgent
 import ai_coach.api as coach_api
 from ai_coach.application import app
 from config.app_settings import settings
+from core.ai_coach.profile_context import ProfileContextStore
 from core.enums import Language
 from core.schemas import DayExercises, Exercise, Profile, Program
 
@@ -39,6 +40,23 @@ def _patch_agent(monkeypatch: pytest.MonkeyPatch, attr: str, value) -> None:
     monkeypatch.setattr(coach_api.CoachAgent, attr, value)
 
 
+@pytest.fixture(autouse=True)
+def context_refreshes(monkeypatch: pytest.MonkeyPatch) -> list[tuple[int, str]]:
+    """No materialized context: every request misses and records the refresh it schedules."""
+    refreshes: list[tuple[int, str]] = []
+
+    async def fake_load(cls, profile_id: int) -> None:
+        return None
+
+    async def fake_schedule_refresh(cls, profile_id: int, *, reason: str) -> bool:
+        refreshes.append((profile_id, reason))
+        return True
+
+    monkeypatch.setattr(ProfileContextStore, "load", classmethod(fake_load))
+    monkeypatch.setattr(ProfileContextStore, "schedule_refresh", classmethod(fake_schedule_refresh))
+    return refreshes
+
+
 def test_request_language_overrides_profile(monkeypatch: pytest.MonkeyPatch) -> None:
     recorded: dict[str, str] = {}
 
@@ -177,3 +195,30 @@ def test_profile_language_enum_without_str(monkeypatch: pytest.MonkeyPatch) -> N
 
     asyncio.run(runner())
     assert recorded.get("locale") == "ua"
+
+
+def test_context_miss_schedules_refresh(
+    monkeypatch: pytest.MonkeyPatch, context_refreshes: list[tuple[int, str]]
+) -> None:
+    fetched: list[int] = []
+
+    async def fake_generate(prompt: str | None, deps: Any, **_: Any) -> Program:
+        return _sample_program()
+
+    async def fake_get_profile(profile_id: int) -> Profile | None:
+        fetched.append(profile_id)
+        return Profile(id=profile_id, tg_id=1, language=Language.eng)
+
+    _patch_agent(monkeypatch, "generate_workout_plan", staticmethod(fake_generate))
+    monkeypatch.setattr("core.services.internal.APIService.profile.get_profile", fake_get_profile)
+    monkeypatch.setattr(settings, "AI_COACH_PROFILE_CONTEXT_ENABLED", True)
+
+    async def runner() -> None:
+        status, _ = await _run_ask(
+            {"profile_id": 5, "prompt": "p-context-miss", "mode": "program", "workout_location": "home"}
+        )
+        assert status == 200
+
+    asyncio.run(runner())
+    assert fetched == [5]
+    assert context_refreshes == [(5, "ask_miss")]
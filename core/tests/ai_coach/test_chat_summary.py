@@ -0,0 +1,192 @@
+from typing import Any
+
+import httpx
+import pytest
+
+from config.app_settings import settings
+from core.ai_coach import chat_summary
+from core.ai_coach.chat_summary import ChatSummaryQueue, run_chat_summary_job
+from core.tasks.ai_coach import maintenance
+from core.utils.async_runtime import run_async
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> "_Pipeline":
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list[Any]:
+        return [getattr(self._redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self._ops]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.strings: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    def _zadd(self, key: str, mapping: dict[str, float], nx: bool = False) -> int:
+        zset = self.zsets.setdefault(key, {})
+        added = [member for member in mapping if not (nx and member in zset)]
+        zset.update({member: mapping[member] for member in added})
+        return len(added)
+
+    def _zremrangebyscore(self, key: str, low: str, high: float) -> int:
+        zset = self.zsets.get(key, {})
+        stale = [member for member, score in zset.items() if score <= high]
+        for member in stale:
+            zset.pop(member)
+        return len(stale)
+
+    def _zscore(self, key: str, member: str) -> float | None:
+        return self.zsets.get(key, {}).get(member)
+
+    def _zrem(self, key: str, member: str) -> int:
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    def _zcard(self, key: str) -> int:
+        return len(self.zsets.get(key, {}))
+
+    def _zrange(self, key: str, start: int, end: int, withscores: bool = False) -> list[Any]:
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return ordered[start : end + 1 if end >= 0 else None]
+
+    def _hset(
+        self, key: str, field: str | None = None, value: Any = None, mapping: dict[str, Any] | None = None
+    ) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        updates = dict(mapping or {})
+        if field is not None:
+            updates[field] = value
+        bucket.update({name: str(item) for name, item in updates.items()})
+        return len(updates)
+
+    def _hget(self, key: str, field: str) -> str | None:
+        return self.hashes.get(key, {}).get(field)
+
+    def _hdel(self, key: str, field: str) -> int:
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    def _hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def _hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    def _incr(self, key: str) -> int:
+        self.strings[key] = str(int(self.strings.get(key, 0)) + 1)
+        return int(self.strings[key])
+
+    def _expire(self, key: str, seconds: int) -> bool:
+        return True
+
+    def _get(self, key: str) -> str | None:
+        return self.strings.get(key)
+
+
+class _Task:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    def apply_async(self, *, kwargs: dict[str, Any], countdown: float) -> None:
+        self.calls.append({**kwargs, "countdown": countdown})
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _Redis:
+    client = _Redis()
+    monkeypatch.setattr(chat_summary, "get_redis_client", lambda: client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_repeated_triggers_coalesce_into_one_job(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    task = _Task()
+    monkeypatch.setattr(maintenance, "summarize_chat_session", task)
+    monkeypatch.setattr(settings, "AI_COACH_CHAT_SUMMARY_DELAY_S", 5.0)
+
+    results = [await ChatSummaryQueue.enqueue(7, language="uk") for _ in range(3)]
+
+    assert results == [True, False, False]
+    assert task.calls == [{"profile_id": 7, "countdown": 5.0}]
+    snapshot = await ChatSummaryQueue.snapshot()
+    assert snapshot["backlog"] == 1 and snapshot["oldest_pending_s"] is not None
+
+    languages: list[str | None] = []
+
+    async def summarize(language: str | None) -> dict[str, Any]:
+        languages.append(language)
+        assert await ChatSummaryQueue.enqueue(7, language="uk")
+        return {"status": "ok", "messages": 10}
+
+    result = await run_chat_summary_job(7, summarize)
+
+    assert result["status"] == "ok" and languages == ["uk"]
+    assert len(task.calls) == 2
+    snapshot = await ChatSummaryQueue.snapshot()
+    assert snapshot["backlog"] == 1
+    assert snapshot["jobs"] == 1 and snapshot["summaries"] == 1
+    assert snapshot["last_latency_ms"] is not None and snapshot["avg_latency_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_schedule_releases_pending_entry(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    class _Broken:
+        def apply_async(self, **kwargs: Any) -> None:
+            raise RuntimeError("broker down")
+
+    monkeypatch.setattr(maintenance, "summarize_chat_session", _Broken())
+
+    assert not await ChatSummaryQueue.enqueue(8, language="en")
+    assert (await ChatSummaryQueue.snapshot())["backlog"] == 0
+
+
+def test_job_ending_before_the_ai_coach_releases_pending_entry(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    job = maintenance.summarize_chat_session
+    task = _Task()
+    monkeypatch.setattr(maintenance, "summarize_chat_session", task)
+    monkeypatch.setattr(maintenance, "resolve_hmac_credentials", lambda *args, **kwargs: None)
+
+    assert run_async(ChatSummaryQueue.enqueue(9, language="en"))
+    job(9)
+    assert (run_async(ChatSummaryQueue.snapshot()))["backlog"] == 0
+
+    def _post(*args: Any, **kwargs: Any) -> None:
+        raise httpx.ConnectError("ai coach down")
+
+    monkeypatch.setattr(maintenance, "resolve_hmac_credentials", lambda *args, **kwargs: ("key", "secret"))
+    monkeypatch.setattr(maintenance.httpx, "post", _post)
+    monkeypatch.setattr(settings, "AI_COACH_URL", "http://ai-coach")
+    assert run_async(ChatSummaryQueue.enqueue(9, language="en"))
+    monkeypatch.setattr(job.request, "retries", job.max_retries)
+    with pytest.raises(httpx.ConnectError):
+        job(9)
+
+    assert (run_async(ChatSummaryQueue.snapshot()))["backlog"] == 0
+    assert len(task.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_pending_entry_does_not_block_new_jobs(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    task = _Task()
+    monkeypatch.setattr(maintenance, "summarize_chat_session", task)
+    monkeypatch.setattr(settings, "AI_COACH_CHAT_SUMMARY_DELAY_S", 5.0)
+    monkeypatch.setattr(settings, "AI_COACH_CHAT_SUMMARY_STALE_S", 60.0)
+
+    assert await ChatSummaryQueue.enqueue(10)
+    redis.zsets[ChatSummaryQueue.PENDING_KEY]["10"] -= 120_000
+
+    assert await ChatSummaryQueue.enqueue(10)
+    assert len(task.calls) == 2
@@ -201,7 +201,7 @@ def test_normalize_tool_call_arguments_fills_sources() -> None:
 
 
 def test_api_passthrough_returns_llm_answer(monkeypatch: pytest.MonkeyPatch) -> None:
-    async def fake_answer(prompt: str, deps: AgentDeps, profile_context: str | None = None) -> QAResponse:
+    async def fake_answer(prompt: str, deps: AgentDeps, profile_context: str | None = None, **_: object) -> QAResponse:
         return QAResponse(answer="OK_FROM_LLM", sources=["kb_global"])
 
     monkeypatch.setattr(CoachAgent, "answer_question", staticmethod(fake_answer))
@@ -222,7 +222,7 @@ def test_api_passthrough_returns_llm_answer(monkeypatch: pytest.MonkeyPatch) ->
 
 
 def test_ask_ai_runtime_error(monkeypatch) -> None:
-    async def boom(prompt: str, deps: AgentDeps) -> QAResponse:
+    async def boom(prompt: str, deps: AgentDeps, **_: object) -> QAResponse:
         raise RuntimeError("boom")
 
     monkeypatch.setattr(CoachAgent, "answer_question", staticmethod(boom))
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest  # pyrefly: ignore[import-error]
+
+from ai_coach.agent.knowledge.utils import dataset_stats
+from ai_coach.agent.knowledge.utils.dataset_stats import DatasetStatsRegistry
+from ai_coach.agent.knowledge.utils.datasets import DatasetService
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.reads = 0
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        self.reads += 1
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key: str, mapping: dict[str, int]) -> int:
+        self.hashes.setdefault(key, {}).update({field: str(value) for field, value in mapping.items()})
+        return len(mapping)
+
+    async def eval(self, script: str, numkeys: int, key: str, field: str, amount: int) -> int | None:
+        bucket = self.hashes.get(key)
+        if bucket is None:
+            return None
+        bucket[field] = str(int(bucket.get(field, "0")) + amount)
+        return int(bucket[field])
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.hashes.pop(key, None) is not None)
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _Redis:
+    client = _Redis()
+    monkeypatch.setattr(dataset_stats, "get_redis_client", lambda: client)
+    monkeypatch.setattr(dataset_stats.settings, "AI_COACH_DATASET_STATS_TTL", 60.0)
+    DatasetStatsRegistry._local.clear()
+    yield client
+    DatasetStatsRegistry._local.clear()
+
+
+def test_registry_memoizes_and_bumps_existing_snapshots(redis: _Redis) -> None:
+    async def runner() -> None:
+        await DatasetStatsRegistry.bump("kb_new")
+        assert await DatasetStatsRegistry.get("kb_new") is None
+
+        await DatasetStatsRegistry.store("kb", {"text_rows": 2, "chunk_rows": 4, "graph_nodes": 9})
+        reads = redis.reads
+        assert await DatasetStatsRegistry.get("kb") == {
+            "text_rows": 2,
+            "chunk_rows": 4,
+            "graph_nodes": 9,
+            "graph_edges": 0,
+        }
+        assert redis.reads == reads
+
+        await DatasetStatsRegistry.bump("kb")
+        counts = await DatasetStatsRegistry.get("kb")
+        assert counts is not None and counts["text_rows"] == 3
+
+        await DatasetStatsRegistry.invalidate("kb")
+        assert await DatasetStatsRegistry.get("kb") is None
+
+    asyncio.run(runner())
+
+
+def test_cached_counts_use_scoped_graph_count_on_miss(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[bool] = []
+
+    async def fake_get_counts(self, dataset: str, user: object = None, *, scoped_graph: bool = False) -> dict[str, int]:
+        calls.append(scoped_graph)
+        return {"text_rows": 1, "chunk_rows": 1, "graph_nodes": 3, "graph_edges": 2}
+
+    monkeypatch.setattr(DatasetService, "get_counts", fake_get_counts)
+    service = DatasetService()
+
+    async def runner() -> None:
+        first = await service.get_cached_counts("kb_stats_test")
+        second = await service.get_cached_counts("kb_stats_test")
+        assert first == second
+
+    asyncio.run(runner())
+    assert calls == [True]
+
+
+def test_scoped_graph_counts_start_from_dataset_documents(monkeypatch: pytest.MonkeyPatch) -> None:
+    queries: list[tuple[str, dict[str, object] | None]] = []
+
+    class _Record:
+        def __init__(self, value: int) -> None:
+            self._value = value
+
+        def value(self) -> int:
+            return self._value
+
+    class _Session:
+        def run(self, query: str, params: dict[str, object] | None = None) -> "_Session":
+            queries.append((query, params))
+            self._count = 5 if len(queries) % 2 else 4
+            return self
+
+        def single(self) -> _Record:
+            return _Record(self._count)
+
+    class _Driver:
+        def session(self, **_: object) -> _Session:
+            return _Session()
+
+    async def fake_document_ids(self, dataset: str, user: object) -> list[str]:
+        return ["doc-1", "doc-2"]
+
+    monkeypatch.setattr(DatasetService, "_dataset_document_ids", fake_document_ids)
+    service = DatasetService()
+    service.set_graph_engine(SimpleNamespace(driver=_Driver()))
+
+    nodes, edges = asyncio.run(service.get_graph_counts("kb_scoped", scoped=True))
+
+    assert (nodes, edges) == (5, 4)
+    assert [params for _, params in queries] == [{"document_ids": ["doc-1", "doc-2"]}] * 2
+    assert all("`__Node__`" in query and "dataset_id" not in query for query, _ in queries)
@@ -138,7 +138,7 @@ def test_ask_ai_dispatch_and_keys(monkeypatch: pytest.MonkeyPatch) -> None:
     async def runner() -> None:
         captured: dict[str, tuple] = {}
 
-        async def fake_answer(prompt: str, deps: object, profile_context: str | None = None) -> str:
+        async def fake_answer(prompt: str, deps: object, profile_context: str | None = None, **_: object) -> str:
             captured["args"] = (prompt, deps, profile_context)
             return "ask_ai-result"
 
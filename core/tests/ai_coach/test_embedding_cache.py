@@ -0,0 +1,122 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from ai_coach.agent.knowledge.cognee_config import CogneeConfig
+from ai_coach.agent.knowledge.utils import embedding_cache as embedding_cache_module
+from ai_coach.agent.knowledge.utils.embedding_cache import EmbeddingCache, SqliteEmbeddingStore
+
+
+class _Embedder:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+
+    def set(self, key: str, value: str, ex: int | None = None) -> "_Pipeline":
+        self._redis.values[key] = value
+        return self
+
+    async def execute(self) -> list[bool]:
+        return []
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+def test_misses_are_deduplicated_and_persisted(tmp_path: Path) -> None:
+    async def runner() -> None:
+        embedder = _Embedder()
+        cache = EmbeddingCache(SqliteEmbeddingStore(tmp_path / "embeddings.sqlite"))
+
+        first = await cache.embed(["squat", "bench", "squat"], model="m", dimensions=2, compute=embedder)
+        assert first == [[5.0, 0.5], [5.0, 0.5], [5.0, 0.5]]
+        assert embedder.batches == [["squat", "bench"]]
+
+        second = await cache.embed(["bench", "deadlift"], model="m", dimensions=2, compute=embedder)
+        assert second == [[5.0, 0.5], [8.0, 0.5]]
+        assert embedder.batches[-1] == ["deadlift"]
+
+        await cache.embed(["squat"], model="other", dimensions=2, compute=embedder)
+        assert embedder.batches[-1] == ["squat"]
+
+        reopened = EmbeddingCache(SqliteEmbeddingStore(tmp_path / "embeddings.sqlite"))
+        assert await reopened.embed(["bench", "squat"], model="m", dimensions=2, compute=embedder) == [
+            [5.0, 0.5],
+            [5.0, 0.5],
+        ]
+        assert len(embedder.batches) == 3
+        stats = reopened.stats()
+        assert stats["hit_rate"] == 1.0
+        assert stats["calls_saved"] == 1
+
+    asyncio.run(runner())
+
+
+def test_redis_tier_backfills_the_local_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    redis = _Redis()
+    monkeypatch.setattr(embedding_cache_module, "get_redis_client", lambda: redis)
+
+    async def runner() -> None:
+        embedder = _Embedder()
+        host_a = EmbeddingCache(SqliteEmbeddingStore(tmp_path / "a.sqlite"), redis_ttl=60)
+        host_b = EmbeddingCache(SqliteEmbeddingStore(tmp_path / "b.sqlite"), redis_ttl=60)
+
+        await host_a.embed(["plank"], model="m", dimensions=2, compute=embedder)
+        assert await host_b.embed(["plank"], model="m", dimensions=2, compute=embedder) == [[5.0, 0.5]]
+        assert len(embedder.batches) == 1
+        assert host_b.counters()["redis_hits"] == 1
+
+        redis.values.clear()
+        await host_b.embed(["plank"], model="m", dimensions=2, compute=embedder)
+        assert host_b.counters()["local_hits"] == 1
+        assert len(embedder.batches) == 1
+
+    asyncio.run(runner())
+
+
+def test_patched_engine_embeds_only_uncached_texts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(embedding_cache_module.settings, "AI_COACH_EMBEDDING_CACHE_ENABLED", True)
+    monkeypatch.setattr(embedding_cache_module.settings, "AI_COACH_EMBEDDING_CACHE_PATH", str(tmp_path / "e.sqlite"))
+    monkeypatch.setattr(embedding_cache_module.settings, "AI_COACH_EMBEDDING_CACHE_REDIS_TTL", 0)
+    EmbeddingCache.reset()
+    calls: list[list[str]] = []
+
+    class _Engine:
+        model = "openai/text-embedding-3-large"
+        dimensions = 2
+
+        async def embed_text(self, text: list[str]) -> list[list[float]]:
+            calls.append(list(text))
+            return [[1.0, 2.0] for _ in text]
+
+    CogneeConfig._patch_embedding_cache(_Engine)
+    CogneeConfig._patch_embedding_cache(_Engine)
+
+    async def runner() -> Any:
+        engine = _Engine()
+        await engine.embed_text(["lunge", "row"])
+        return await engine.embed_text(["row", "lunge", "curl"])
+
+    try:
+        assert asyncio.run(runner()) == [[1.0, 2.0], [1.0, 2.0], [1.0, 2.0]]
+    finally:
+        EmbeddingCache.reset()
+    assert calls == [["lunge", "row"], ["curl"]]
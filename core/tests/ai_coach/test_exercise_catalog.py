@@ -1,4 +1,8 @@
-from core.ai_coach.exercise_catalog import ExerciseCatalogEntry, filter_exercise_entries
+from typing import Any
+
+import pytest
+
+from core.ai_coach.exercise_catalog import ExerciseCatalogEntry, filter_exercise_entries, load_exercise_index
 
 
 def test_filter_exercise_entries_by_category_muscles_and_name() -> None:
@@ -94,3 +98,20 @@ def test_filter_exercise_entries_returns_all_when_limit_is_none() -> None:
     results = filter_exercise_entries(entries, equipment=["barbell"], limit=None)
 
     assert [item.gif_key for item in results] == ["press-1.gif", "press-2.gif", "press-3.gif"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"category": "strength", "limit": 5},
+        {"category": "strength", "primary_muscles": ["Chest"], "equipment": ["barbell", "dumbbell"]},
+        {"secondary_muscles": ["core"], "name_query": "plank"},
+        {"name_query": "ab"},
+        {"name_query": " Bench Press ", "limit": 1},
+        {"name_query": "no such exercise"},
+    ],
+)
+def test_catalog_index_matches_linear_scan(query: dict[str, Any]) -> None:
+    index = load_exercise_index()
+
+    assert index.search(**query) == filter_exercise_entries(list(index.entries), **query)
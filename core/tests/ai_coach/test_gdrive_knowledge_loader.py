@@ -1,7 +1,9 @@
+import asyncio
 import importlib
 from dataclasses import dataclass
 from types import SimpleNamespace
 from typing import Any
+from unittest.mock import AsyncMock
 
 import ai_coach.agent.knowledge.gdrive_knowledge_loader as loader_module
 
@@ -57,3 +59,101 @@ def test_gdrive_loader_scans_subfolders_and_preserves_paths(monkeypatch) -> None
     items = loader._scan_drive_tree("root")
     paths = sorted(item.get("kb_path") for item in items)
     assert paths == ["intro.md", "programs/basics.txt", "programs/elderly/contraindications.pdf"]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.strings: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.strings.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> bool:
+        self.strings[key] = value
+        return True
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction: bool = True) -> "_Pipeline":
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis: _Redis) -> None:
+        self._redis = redis
+
+    def hset(self, key: str, mapping: dict[str, str]) -> "_Pipeline":
+        self._redis.hashes.setdefault(key, {}).update(mapping)
+        return self
+
+    def hdel(self, key: str, *fields: str) -> "_Pipeline":
+        for field in fields:
+            self._redis.hashes.get(key, {}).pop(field, None)
+        return self
+
+    async def execute(self) -> list[Any]:
+        return []
+
+
+class _KnowledgeBase:
+    GLOBAL_DATASET = "kb_global"
+
+    def __init__(self) -> None:
+        self._user = SimpleNamespace(id="user")
+        self.batches: list[list[str]] = []
+        self.results: list[dict[str, Any]] = []
+        self.dataset_service = SimpleNamespace(
+            alias_for_dataset=lambda dataset: dataset,
+            _normalize_text=lambda text: text.strip(),
+            log_once=lambda *args, **kwargs: None,
+            get_counts=AsyncMock(return_value={}),
+        )
+        self.projection_service = SimpleNamespace(project_dataset_now=AsyncMock())
+        self._wait_for_projection = AsyncMock()
+
+    async def update_dataset_batch(self, items, dataset, user=None, **kwargs):  # type: ignore[no-untyped-def]
+        self.batches.append([str(metadata["file_id"]) for _, metadata in items])
+        return dataset, [True] * len(items)
+
+    def record_loader_result(self, alias: str, **kwargs: Any) -> None:
+        self.results.append(kwargs)
+
+
+def test_gdrive_sync_ingests_changed_files_in_batches(monkeypatch) -> None:
+    importlib.reload(loader_module)
+    redis = _Redis()
+    monkeypatch.setattr(loader_module, "get_redis_client", lambda: redis)
+    monkeypatch.setattr(loader_module.settings, "GDRIVE_SYNC_BATCH_SIZE", 2)
+    monkeypatch.setattr(loader_module.settings, "GDRIVE_PARSE_PROCESSES", 0)
+    kb = _KnowledgeBase()
+    loader = loader_module.GDriveDocumentLoader(kb)
+    loader.folder_id = "root"
+    tree = {
+        "root": [
+            {"id": f"file-{index}", "name": f"note-{index}.txt", "size": "5", "modifiedTime": "t1", "md5Checksum": "a"}
+            for index in range(3)
+        ]
+    }
+    downloads: list[str] = []
+
+    def _fetch(file_id: str) -> bytes:
+        downloads.append(file_id)
+        return f"squat {file_id}".encode()
+
+    monkeypatch.setattr(loader, "_get_drive_files_service", lambda: _FakeDriveFilesService(tree))
+    monkeypatch.setattr(loader, "_fetch_media", _fetch)
+
+    asyncio.run(loader._sync("root", force_ingest=False))
+    assert kb.batches == [["file-0", "file-1"], ["file-2"]]
+    assert sorted(downloads) == ["file-0", "file-1", "file-2"]
+
+    tree["root"][1] = {**tree["root"][1], "modifiedTime": "t2", "md5Checksum": "b"}
+    tree["root"].pop()
+    redis.strings.clear()
+    asyncio.run(loader._sync("root", force_ingest=False))
+    assert kb.batches[-1] == ["file-1"]
+    assert len(downloads) == 4
+    assert kb.results[-1] == {"processed": 1, "skipped": 1, "errors": 0, "projection_requested": True}
+    assert set(redis.hashes["ai_coach:gdrive:folder:root:files"]) == {"file-0", "file-1"}
@@ -0,0 +1,216 @@
+import json
+import os
+import sys
+from fnmatch import fnmatch
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import pytest
+
+from ai_coach.agent.knowledge.utils.datasets import DatasetService
+from ai_coach.agent.knowledge.utils.hash_store import HashStore
+from ai_coach.agent.knowledge.utils.storage import StorageService
+from ai_coach.agent.knowledge.utils.text_cache import TextLRUCache
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> "_Pipeline":
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list[Any]:
+        self._redis.round_trips += 1
+        return [getattr(self._redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self._ops]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.sets: dict[str, set[str]] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.round_trips = 0
+
+    def _sadd(self, key: str, *members: str) -> int:
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def _expire(self, key: str, seconds: int) -> bool:
+        return True
+
+    def _hset(self, key: str, mapping: dict[str, str]) -> int:
+        self.hashes.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def _srem(self, key: str, *members: str) -> int:
+        self.sets.get(key, set()).difference_update(members)
+        return len(members)
+
+    def _hdel(self, key: str, *fields: str) -> int:
+        bucket = self.hashes.get(key, {})
+        return sum(1 for field in fields if bucket.pop(field, None) is not None)
+
+    async def scan_iter(self, match: str, count: int | None = None) -> AsyncIterator[str]:
+        self.round_trips += 1
+        for key in list(self.sets):
+            if fnmatch(key, match):
+                yield key
+
+    async def keys(self, pattern: str) -> list[str]:
+        raise AssertionError("KEYS must not be used")
+
+    async def smismember(self, key: str, members: list[str]) -> list[int]:
+        self.round_trips += 1
+        bucket = self.sets.get(key, set())
+        return [int(member in bucket) for member in members]
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+class _DatasetService:
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+def _digest(text: str) -> str:
+    return sha256(text.encode("utf-8")).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_hash_store_batch_roundtrips(monkeypatch: pytest.MonkeyPatch) -> None:
+    redis = _Redis()
+    monkeypatch.setattr(HashStore, "redis", redis)
+
+    await HashStore.add_many("kb_global", {"a" * 64: {"kind": "document"}, "b" * 64: None})
+    assert redis.round_trips == 1
+    assert redis.sets["cognee_hashes:kb_global"] == {"a" * 64, "b" * 64}
+    stored = json.loads(redis.hashes["cognee_hash_meta:kb_global"]["a" * 64])
+    assert stored == {"kind": "document", "digest_sha": "a" * 64}
+    assert "b" * 64 not in redis.hashes["cognee_hash_meta:kb_global"]
+
+    known = await HashStore.contains_many("kb_global", ["a" * 64, "c" * 64, "a" * 64])
+    assert known == {"a" * 64: True, "c" * 64: False}
+    assert redis.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_hash_store_remove_many_and_scan(monkeypatch: pytest.MonkeyPatch) -> None:
+    redis = _Redis()
+    monkeypatch.setattr(HashStore, "redis", redis)
+    await HashStore.add_many("kb_profile_1", {"a" * 64: {"kind": "document"}, "b" * 64: {"kind": "document"}})
+    await HashStore.add_many("kb_global", {"c" * 64: None})
+
+    await HashStore.remove_many("kb_profile_1", ["a" * 64, "a" * 64])
+    assert redis.sets["cognee_hashes:kb_profile_1"] == {"b" * 64}
+    assert list(redis.hashes["cognee_hash_meta:kb_profile_1"]) == ["b" * 64]
+    assert await HashStore.list_all_datasets() == {"kb_profile_1", "kb_global"}
+
+
+@pytest.mark.asyncio
+async def test_hash_store_resolves_client_per_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    requested: list[int] = []
+    redis = _Redis()
+
+    def fake_client_for_db(db: int) -> _Redis:
+        requested.append(db)
+        return redis
+
+    monkeypatch.setattr(HashStore, "redis", None)
+    monkeypatch.setattr("ai_coach.agent.knowledge.utils.hash_store.get_redis_client_for_db", fake_client_for_db)
+    assert await HashStore.contains_many("kb_global", ["a" * 64]) == {"a" * 64: False}
+    assert requested == [HashStore.DB]
+
+
+def test_ensure_storage_files_fsyncs_directory_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = StorageService(_DatasetService())
+    monkeypatch.setattr(service, "storage_root", lambda: tmp_path)
+    existing = "already stored"
+    (tmp_path / f"text_{_digest(existing)}.txt").write_text(existing, encoding="utf-8")
+    synced: list[int] = []
+    monkeypatch.setattr("ai_coach.agent.knowledge.utils.storage.os.fsync", lambda fd: synced.append(fd))
+
+    items = [(_digest(text), text) for text in ("first note", existing, "second note")]
+    items.append(("short", "invalid digest"))
+    results = service.ensure_storage_files(items, dataset="kb_global")
+
+    assert [created for _, created in results] == [True, False, True, False]
+    assert results[3][0] is None
+    assert (tmp_path / f"text_{_digest('first note')}.txt").read_text(encoding="utf-8") == "first note"
+    assert not list(tmp_path.glob("*.tmp"))
+    assert len(synced) == 1
+
+
+@pytest.mark.asyncio
+async def test_storage_cache_evicts_to_disk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    texts = [f"document {index} " + "x" * 200 for index in range(4)]
+    cache = TextLRUCache(max_bytes=2 * sys.getsizeof(texts[0]))
+    monkeypatch.setattr(StorageService, "_STORAGE_CACHE", cache)
+    service = StorageService(_DatasetService())
+    monkeypatch.setattr(service, "storage_root", lambda: tmp_path)
+    service.ensure_storage_files([(_digest(text), text) for text in texts])
+
+    for text in texts:
+        assert await service.read_storage_text(digest_sha=_digest(text)) == text
+    assert len(cache) == 2
+    assert _digest(texts[0]) not in cache
+
+    assert await service.read_storage_text(digest_sha=_digest(texts[0])) == texts[0]
+    assert await service.read_storage_text(digest_sha=_digest(texts[0])) == texts[0]
+    stats = service.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 5
+    assert stats["evictions"] == 3
+    assert stats["bytes"] <= stats["max_bytes"]
+
+    cache.put("huge", "y" * (stats["max_bytes"] + 1))
+    assert "huge" not in cache
+
+
+@pytest.mark.asyncio
+async def test_rebuild_from_disk_rereads_only_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    redis = _Redis()
+    monkeypatch.setattr(HashStore, "redis", redis)
+    dataset_service = _DatasetService()
+    dataset_service._infer_metadata_from_text = DatasetService._infer_metadata_from_text  # type: ignore[attr-defined]
+    service = StorageService(dataset_service)
+    monkeypatch.setattr(service, "storage_root", lambda: tmp_path)
+    texts = ["squat 5x5", "client: how do I deadlift?", "bench 3x8"]
+    service.ensure_storage_files([(_digest(text), text) for text in texts[:2]], dataset="kb_global")
+    (tmp_path / f"text_{_digest(texts[2])}.txt").write_text(texts[2], encoding="utf-8")
+    (tmp_path / f"text_{'0' * 64}.txt").write_text("tampered", encoding="utf-8")
+
+    reads: list[str] = []
+    real_read = StorageService._read_for_rebuild
+
+    def counting_read(self: StorageService, alias: str, files: Any) -> Any:
+        reads.extend(digest for digest, *_ in files)
+        return real_read(self, alias, files)
+
+    monkeypatch.setattr(StorageService, "_read_for_rebuild", counting_read)
+
+    created, linked = await service.rebuild_from_disk("kb_global")
+    assert (created, linked) == (3, 3)
+    assert sorted(reads) == sorted([_digest(texts[2]), "0" * 64])
+    meta = json.loads(redis.hashes["cognee_hash_meta:kb_global"][_digest(texts[1])])
+    assert meta["kind"] == "message"
+
+    reads.clear()
+    created, linked = await service.rebuild_from_disk("kb_global")
+    assert (created, linked) == (0, 3)
+    assert reads == ["0" * 64]
+
+    changed = tmp_path / f"text_{_digest(texts[0])}.txt"
+    changed.write_text(texts[0], encoding="utf-8")
+    os.utime(changed, ns=(1, 1))
+    reads.clear()
+    await service.rebuild_from_disk("kb_global")
+    assert sorted(reads) == sorted([_digest(texts[0]), "0" * 64])
+    entries, _ = service.manifest().load()
+    assert set(entries) == {_digest(text) for text in texts}
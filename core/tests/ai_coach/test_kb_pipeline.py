@@ -6,6 +6,7 @@ import pytest
 from ai_coach.agent.knowledge.knowledge_base import KnowledgeBase, ProjectionStatus
 from ai_coach.agent.knowledge.utils.chat_queue import ChatProjectionScheduler
 from ai_coach.agent.knowledge.utils.projection import ProjectionService
+from ai_coach.agent.knowledge.utils.projection_coordinator import ProjectionCoordinator
 
 
 @pytest.mark.asyncio
@@ -28,7 +29,7 @@ async def test_add_text_skips_empty_content(monkeypatch):
     dummy_dataset = DummyDatasetService()
     kb.dataset_service = dummy_dataset
     kb.update_dataset = AsyncMock()
-    queue_mock = MagicMock()
+    queue_mock = AsyncMock()
     kb.chat_queue_service = SimpleNamespace(
         queue_chat_dataset=queue_mock,
         ensure_chat_projection_task=MagicMock(),
@@ -87,16 +88,17 @@ async def test_chat_projection_scheduler_uses_kb_user(monkeypatch):
         def _log_task_exception(task: object) -> None:
             return None
 
-    ChatProjectionScheduler._CHAT_PENDING.clear()
     ChatProjectionScheduler._CHAT_PROJECT_TASKS.clear()
-    ChatProjectionScheduler._CHAT_LAST_PROJECT_TS.clear()
+    monkeypatch.setattr(ProjectionCoordinator, "chat_cooldown", AsyncMock(return_value=0.0))
+    monkeypatch.setattr(ProjectionCoordinator, "take_chat_pending", AsyncMock(return_value=1))
+    monkeypatch.setattr(ProjectionCoordinator, "start_chat_cooldown", AsyncMock())
+    monkeypatch.setattr(ProjectionCoordinator, "chat_pending", AsyncMock(return_value=0))
 
     kb = DummyKB()
     dataset_service = DummyDatasetService()
     scheduler = ChatProjectionScheduler(dataset_service, kb)
     alias = "kb_chat_99"
-    scheduler._CHAT_PENDING[alias] = 1
 
-    await scheduler._run_chat_projection(alias, 0.0)
+    await scheduler._run_chat_projection(alias)
 
     kb._process_dataset.assert_awaited_once_with(alias, kb._user)
@@ -0,0 +1,105 @@
+from hashlib import md5, sha256
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import ai_coach.agent.knowledge.utils.storage as storage_module
+from ai_coach.agent.knowledge import migrate_storage
+from ai_coach.agent.knowledge.utils.packfile import PackfileStore
+from ai_coach.agent.knowledge.utils.storage import StorageService
+
+
+class _DatasetService:
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    def alias_for_dataset(self, dataset: str) -> str:
+        return dataset
+
+
+def _digest(text: str) -> str:
+    return sha256(text.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def _reset_stores() -> Any:
+    yield
+    PackfileStore.reset()
+
+
+def test_packfile_roundtrip_delete_and_compact(tmp_path: Path) -> None:
+    store = PackfileStore(tmp_path, segment_bytes=64)
+    texts = [f"note {index} " + "z" * 40 for index in range(4)]
+    created = store.put_many([(_digest(text), text) for text in texts] + [(_digest(texts[0]), texts[0])])
+    assert created == [True, True, True, True, False]
+    assert len(list(store.root.glob("segment_*.pack"))) == 4
+    assert store.get(_digest(texts[2])) == texts[2]
+    assert store.sha_for_md5(md5(texts[1].encode()).hexdigest()) == _digest(texts[1])
+
+    assert store.delete_many([_digest(texts[0]), _digest(texts[1]), "missing"]) == 2
+    assert store.get(_digest(texts[0])) is None
+    assert store.garbage_ratio() == pytest.approx(0.5)
+
+    reclaimed = store.compact(0.5)
+    assert reclaimed == 2 * len(texts[0])
+    assert store.garbage_ratio() == 0.0
+    assert len(list(store.root.glob("segment_*.pack"))) == 2
+
+    reloaded = PackfileStore(tmp_path, segment_bytes=64)
+    assert set(reloaded.records()) == {_digest(texts[2]), _digest(texts[3])}
+    assert reloaded.get(_digest(texts[3])) == texts[3]
+    store.close()
+    reloaded.close()
+
+
+@pytest.mark.asyncio
+async def test_storage_service_packfile_backend(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(storage_module.settings, "AI_COACH_STORAGE_BACKEND", "packfile")
+    monkeypatch.setattr(storage_module.settings, "AI_COACH_PACKFILE_COMPACT_RATIO", 0.0)
+    monkeypatch.setattr(StorageService, "_STORAGE_CACHE", type(StorageService._STORAGE_CACHE)(0))
+    added: dict[str, dict[str, Any]] = {}
+
+    async def fake_contains_many(dataset: str, digests: list[str]) -> dict[str, bool]:
+        return {digest: digest in added for digest in digests}
+
+    async def fake_add_many(dataset: str, entries: dict[str, dict[str, Any]]) -> None:
+        added.update(entries)
+
+    async def fake_contains(dataset: str, digest: str) -> bool:
+        return False
+
+    monkeypatch.setattr("ai_coach.agent.knowledge.utils.storage.HashStore.contains_many", fake_contains_many)
+    monkeypatch.setattr("ai_coach.agent.knowledge.utils.storage.HashStore.add_many", fake_add_many)
+    monkeypatch.setattr("ai_coach.agent.knowledge.utils.storage.HashStore.contains", fake_contains)
+    service = StorageService(_DatasetService())
+    monkeypatch.setattr(service, "storage_root", lambda: tmp_path)
+
+    text = "client: how many sets?"
+    path, created = service.ensure_storage_file(digest_sha=_digest(text), text=text, dataset="kb_chat_1")
+    assert created is True and path is not None
+    assert not list(tmp_path.glob("text_*.txt"))
+    assert service.has_storage_text(_digest(text))
+    assert await service.read_storage_text(digest_sha=_digest(text)) == text
+
+    assert await service.rebuild_from_disk("kb_chat_1") == (1, 1)
+    assert added[_digest(text)]["kind"] == "message"
+
+    assert await service.drop_dataset_storage("kb_chat_1", [_digest(text)]) == 1
+    assert not service.has_storage_text(_digest(text))
+
+
+def test_migration_roundtrip_preserves_md5_mirrors(tmp_path: Path) -> None:
+    service = migrate_storage._RootedStorage(tmp_path)
+    texts = ["squat 5x5", "bench 3x8"]
+    service.ensure_storage_files([(_digest(text), text) for text in texts])
+    mirror = tmp_path / f"text_{md5(texts[0].encode()).hexdigest()}.txt"
+    assert mirror.is_symlink()
+
+    assert migrate_storage.to_packfile(tmp_path, prune=True) == (2, 0)
+    assert not (tmp_path / f"text_{_digest(texts[0])}.txt").exists()
+    assert not mirror.is_symlink()
+    assert mirror.read_text(encoding="utf-8") == texts[0]
+
+    assert migrate_storage.to_files(tmp_path) == (2, 0)
+    assert (tmp_path / f"text_{_digest(texts[1])}.txt").read_text(encoding="utf-8") == texts[1]
@@ -6,6 +6,7 @@ import pytest
 import httpx
 
 from config import app_settings as app_settings_module
+from core.services.internal.http_pool import HTTPClientRegistry
 
 
 class _SettingsStub(SimpleNamespace):
@@ -72,8 +73,7 @@ class DummyResponse:
 
 
 class DummyClient:
-    def __init__(self, recorder: dict[str, Any], *, timeout: Any) -> None:
-        recorder["timeout"] = timeout
+    def __init__(self, recorder: dict[str, Any]) -> None:
         self._recorder = recorder
         self._response_factory: Callable[[], DummyResponse] = lambda: DummyResponse(200)
 
@@ -94,6 +94,7 @@ class DummyClient:
         self._recorder["json"] = json
         self._recorder["headers"] = headers or {}
         self._recorder["content"] = kwargs.get("content")
+        self._recorder["timeout"] = kwargs.get("timeout")
         return self._response_factory()
 
 
@@ -132,7 +133,7 @@ async def test_notify_ai_plan_ready_uses_internal_header(
     state_factory = SimpleNamespace(create=lambda: DummyState())
     monkeypatch.setattr(ai_coach_tasks, "AiPlanState", state_factory)
     monkeypatch.setattr(ai_coach_tasks.plans, "AiPlanState", state_factory, raising=False)
-    monkeypatch.setattr(ai_coach_tasks.httpx, "AsyncClient", lambda **kwargs: DummyClient(recorder, **kwargs))
+    monkeypatch.setattr(HTTPClientRegistry, "get_client", lambda base_url, settings: DummyClient(recorder))
 
     payload = {
         "profile_id": 1,
@@ -171,7 +172,7 @@ async def test_notify_ai_plan_ready_fallback_authorization(
     state_factory = SimpleNamespace(create=lambda: DummyState())
     monkeypatch.setattr(ai_coach_tasks, "AiPlanState", state_factory)
     monkeypatch.setattr(ai_coach_tasks.plans, "AiPlanState", state_factory, raising=False)
-    monkeypatch.setattr(ai_coach_tasks.httpx, "AsyncClient", lambda **kwargs: DummyClient(recorder, **kwargs))
+    monkeypatch.setattr(HTTPClientRegistry, "get_client", lambda base_url, settings: DummyClient(recorder))
 
     payload = {
         "profile_id": 2,
@@ -224,7 +225,7 @@ async def test_notify_ai_plan_ready_skips_duplicate_delivery(
             recorder["calls"] += 1
             return await _noop_post(url, json, headers, **kwargs)
 
-    monkeypatch.setattr(ai_coach_tasks.httpx, "AsyncClient", lambda **kwargs: CountingClient(recorder, **kwargs))
+    monkeypatch.setattr(HTTPClientRegistry, "get_client", lambda base_url, settings: CountingClient(recorder))
 
     payload = {
         "profile_id": 3,
@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import core.services
+from core.ai_coach import profile_context
+from core.ai_coach.profile_context import ProfileContextStore
+from core.schemas import Profile, Program
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...]]] = []
+
+    def incr(self, key: str) -> "_Pipeline":
+        self._ops.append(("incr", (key,)))
+        return self
+
+    def delete(self, key: str) -> "_Pipeline":
+        self._ops.append(("delete", (key,)))
+        return self
+
+    async def execute(self) -> list[Any]:
+        return [getattr(self._redis, f"_{name}")(*args) for name, args in self._ops]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def _incr(self, key: str) -> int:
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    def _delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return self._delete(*keys)
+
+    async def eval(self, script: str, numkeys: int, *args: str) -> int:
+        assert script == profile_context._STORE_LUA
+        document_key, generation_key, generation, payload, _ttl = args
+        if self.values.get(generation_key, "0") != generation:
+            return 0
+        self.values[document_key] = payload
+        return 1
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+class _Task:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, object]] = []
+
+    def apply_async(self, *, kwargs: dict[str, object] | None = None, countdown: float | None = None) -> None:
+        self.calls.append(kwargs or {})
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _Redis:
+    client = _Redis()
+    monkeypatch.setattr(profile_context, "get_redis_client", lambda: client)
+    return client
+
+
+def _api(profile: Profile, programs: list[Program], on_profile: Any = None) -> SimpleNamespace:
+    async def get_profile(profile_id: int) -> Profile:
+        if on_profile is not None:
+            await on_profile()
+        return profile
+
+    async def get_all_programs(profile_id: int) -> list[Program]:
+        return programs
+
+    async def get_all_subscriptions(profile_id: int) -> list[Any]:
+        return []
+
+    return SimpleNamespace(
+        profile=SimpleNamespace(get_profile=get_profile),
+        workout=SimpleNamespace(get_all_programs=get_all_programs, get_all_subscriptions=get_all_subscriptions),
+    )
+
+
+def test_refresh_materializes_context_read_with_one_get(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    profile = Profile(id=7, tg_id=70, language="eng", workout_goals="strength", weight=80)
+    program = Program(
+        id=1,
+        profile=7,
+        exercises_by_day=[{"day": "Day 1", "exercises": [{"name": "Squat", "sets": "5", "reps": "5"}]}],
+        created_at=1.0,
+    )
+    monkeypatch.setattr(core.services, "APIService", _api(profile, [program]))
+
+    async def runner() -> None:
+        await ProfileContextStore.refresh(7)
+        context = await ProfileContextStore.load(7)
+        assert context is not None
+        assert context.profile.tg_id == 70
+        assert context.render(include_plans=False) == "Workout goals: strength\nWeight (kg): 80"
+        rendered = context.render(include_plans=True)
+        assert rendered is not None
+        assert rendered.endswith("Recent programs:\nProgram 1 (created_at: 1.0)\nDay 1: Squat (5x5)")
+
+    asyncio.run(runner())
+
+
+def test_rebuild_started_before_a_write_is_discarded(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    task = _Task()
+    monkeypatch.setattr("core.tasks.ai_coach.maintenance.refresh_profile_context", task)
+    profile = Profile(id=7, tg_id=70, language="eng", workout_goals="strength")
+
+    async def _write_during_rebuild() -> None:
+        await ProfileContextStore.invalidate([7], reason="profile_updated")
+
+    monkeypatch.setattr(core.services, "APIService", _api(profile, [], on_profile=_write_during_rebuild))
+
+    async def runner() -> None:
+        assert await ProfileContextStore.refresh(7) is None
+        assert await ProfileContextStore.load(7) is None
+        assert task.calls == [{"profile_id": 7, "reason": "profile_updated"}]
+
+        await ProfileContextStore.invalidate([7], reason="program_saved")
+        assert len(task.calls) == 1
+
+    asyncio.run(runner())
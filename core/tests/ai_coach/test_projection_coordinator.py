@@ -0,0 +1,270 @@
+import asyncio
+from time import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ai_coach.agent.knowledge.utils import dataset_stats, projection_coordinator
+from ai_coach.agent.knowledge.utils.projection import ProjectionService
+from ai_coach.agent.knowledge.utils.projection_coordinator import ProjectionCoordinator
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> "_Pipeline":
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list[Any]:
+        return [getattr(self._redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self._ops]
+
+
+class _Redis:
+    """Commands and scripts used by ``ProjectionCoordinator``; Lua scripts are mirrored in Python."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, tuple[str, float | None]] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.sets: dict[str, set[str]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        impl = getattr(type(self), f"_{name}", None)
+        if impl is None:
+            raise AttributeError(name)
+
+        async def _command(*args: Any, **kwargs: Any) -> Any:
+            return impl(self, *args, **kwargs)
+
+        return _command
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    def _get(self, key: str) -> str | None:
+        entry = self.strings.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time() * 1000:
+            self.strings.pop(key)
+            return None
+        return entry[0]
+
+    def _set(self, key: str, value: str, nx: bool = False, px: int | None = None) -> bool | None:
+        if nx and self._get(key) is not None:
+            return None
+        self.strings[key] = (str(value), time() * 1000 + px if px else None)
+        return True
+
+    def _pttl(self, key: str) -> int:
+        if self._get(key) is None:
+            return -2
+        expires = self.strings[key][1]
+        return -1 if expires is None else int(expires - time() * 1000)
+
+    def _delete(self, *keys: str) -> int:
+        return sum(
+            int(self.strings.pop(key, None) is not None) + int(self.hashes.pop(key, None) is not None) for key in keys
+        )
+
+    def _hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def _hget(self, key: str, field: str) -> str | None:
+        return self.hashes.get(key, {}).get(field)
+
+    def _hdel(self, key: str, *fields: str) -> int:
+        bucket = self.hashes.get(key, {})
+        return sum(1 for field in fields if bucket.pop(field, None) is not None)
+
+    def _hset(self, key: str, mapping: dict[str, Any]) -> int:
+        self.hashes.setdefault(key, {}).update({field: str(value) for field, value in mapping.items()})
+        return len(mapping)
+
+    def _hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    def _sadd(self, key: str, *members: str) -> int:
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def _smembers(self, key: str) -> set[str]:
+        return set(self.sets.get(key, set()))
+
+    def _zadd(self, key: str, mapping: dict[str, float], nx: bool = False) -> int:
+        bucket = self.zsets.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            if nx and member in bucket:
+                continue
+            added += int(member not in bucket)
+            bucket[member] = float(score)
+        return added
+
+    def _zscore(self, key: str, member: str) -> float | None:
+        return self.zsets.get(key, {}).get(member)
+
+    def _zrem(self, key: str, *members: str) -> int:
+        bucket = self.zsets.get(key, {})
+        return sum(1 for member in members if bucket.pop(member, None) is not None)
+
+    def _zrange(self, key: str, start: int, end: int, withscores: bool = False) -> list[Any]:
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+
+    def _zcount(self, key: str, low: float, high: str) -> int:
+        return sum(1 for score in self.zsets.get(key, {}).values() if score >= low)
+
+    def _eval(self, script: str, numkeys: int, *args: Any) -> Any:
+        keys, argv = args[:numkeys], [str(arg) for arg in args[numkeys:]]
+        if script == projection_coordinator._CLAIM_LUA:
+            queue, requests, lease = keys
+            alias, owner, lease_ms, now_ms, force = argv
+            due = self._zscore(queue, alias)
+            if force != "1" and (due is None or due > float(now_ms)):
+                return None
+            if not self._set(lease, owner, nx=True, px=int(lease_ms)):
+                return None
+            self._zrem(queue, alias)
+            count = int(self._hget(requests, alias) or 0)
+            self._hdel(requests, alias)
+            return count
+        if script == projection_coordinator._RELEASE_LUA:
+            self._zrem(keys[1], argv[0])
+            if self._get(keys[0]) == argv[0]:
+                return self._delete(keys[0])
+            return 0
+        if script == projection_coordinator._RENEW_LUA:
+            return int(self._get(keys[0]) == argv[0])
+        if script == projection_coordinator._TOKEN_LUA:
+            owner, now_ms, expiry_ms, limit = argv
+            bucket = self.zsets.setdefault(keys[0], {})
+            for member in [member for member, score in bucket.items() if score <= float(now_ms)]:
+                bucket.pop(member)
+            if owner in bucket or len(bucket) < int(limit):
+                bucket[owner] = float(expiry_ms)
+                return 1
+            return 0
+        raise AssertionError("unexpected script")
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _Redis:
+    client = _Redis()
+    monkeypatch.setattr(projection_coordinator, "get_redis_client", lambda: client)
+    monkeypatch.setattr(dataset_stats, "get_redis_client", lambda: client)
+    return client
+
+
+def test_pending_requests_collapse_and_one_worker_claims(redis: _Redis) -> None:
+    async def runner() -> None:
+        for _ in range(3):
+            await ProjectionCoordinator.mark_pending("kb_global", 0.0)
+        await ProjectionCoordinator.mark_pending("kb_chat_1", 60.0)
+
+        assert await ProjectionCoordinator.claim("kb_global", "worker-a") == 3
+        assert await ProjectionCoordinator.claim("kb_global", "worker-b", force=True) is None
+        assert await ProjectionCoordinator.lease_holder("kb_global") == "worker-a"
+        assert await ProjectionCoordinator.claim("kb_chat_1", "worker-b") is None
+
+        snapshot = await ProjectionCoordinator.snapshot()
+        assert snapshot["queue_depth"] == 1
+        assert snapshot["datasets"]["kb_global"]["lease_holder"] == "worker-a"
+        assert snapshot["datasets"]["kb_chat_1"]["pending_requests"] == 1
+
+        await ProjectionCoordinator.release("kb_global", "worker-b")
+        assert await ProjectionCoordinator.lease_holder("kb_global") == "worker-a"
+        await ProjectionCoordinator.record_run("kb_global", "worker-a", duration_s=1.5, requests=3, status="done")
+        await ProjectionCoordinator.release("kb_global", "worker-a")
+        stats = (await ProjectionCoordinator.snapshot())["datasets"]["kb_global"]
+        assert stats["lease_holder"] is None
+        assert stats["last_duration_ms"] == 1500
+        assert stats["runs"] == 1
+
+    asyncio.run(runner())
+
+
+def test_concurrency_tokens_are_capped(redis: _Redis, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(projection_coordinator.settings, "COGNEE_PROJECTION_MAX_CONCURRENCY", 1)
+
+    async def runner() -> None:
+        assert await ProjectionCoordinator.acquire_token("worker-a")
+        assert not await ProjectionCoordinator.acquire_token("worker-b")
+        await ProjectionCoordinator.release_token("worker-a")
+        assert await ProjectionCoordinator.acquire_token("worker-b")
+
+    asyncio.run(runner())
+
+
+class _DatasetService:
+    def alias_for_dataset(self, dataset: str) -> str:
+        return dataset
+
+    def to_user_ctx(self, user: Any) -> Any:
+        return user
+
+    async def get_dataset_id(self, alias: str, user_ctx: Any) -> None:
+        return None
+
+    async def get_dataset_uuid(self, alias: str, user_ctx: Any) -> None:
+        return None
+
+    async def get_counts(self, alias: str, user: Any, *, scoped_graph: bool = False) -> dict[str, int]:
+        return {"text_rows": 1}
+
+    def log_once(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+def test_concurrent_requests_run_one_projection_then_one_follow_up(
+    redis: _Redis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import cognee
+
+    from ai_coach.agent.knowledge.utils import projection
+
+    monkeypatch.setattr(projection.settings, "COGNEE_PROJECTION_BATCH_WINDOW_S", 0.0)
+    monkeypatch.setattr(projection.settings, "COGNEE_PROJECTION_DEBOUNCE_S", 0.0)
+    monkeypatch.setattr(ProjectionService, "_CLAIM_POLL_S", 0.01)
+    running = 0
+    overlaps: list[int] = []
+
+    async def _cognify(**kwargs: Any) -> None:
+        nonlocal running
+        running += 1
+        overlaps.append(running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    cognify = AsyncMock(side_effect=_cognify)
+    monkeypatch.setattr(cognee, "cognify", cognify, raising=False)
+    bumped: list[tuple[str, ...]] = []
+
+    async def _bump(*datasets: str) -> None:
+        bumped.append(datasets)
+
+    monkeypatch.setattr(projection.SearchResultCache, "bump", _bump)
+
+    async def runner() -> None:
+        workers = [ProjectionService(_DatasetService(), SimpleNamespace()) for _ in range(3)]  # pyrefly: ignore
+        user = SimpleNamespace(id="user")
+        await asyncio.gather(*(worker.project_dataset_now("kb_global", user) for worker in workers))
+        while ProjectionService._SCHEDULED_TASKS:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(runner())
+
+    assert cognify.await_count == 2
+    assert max(overlaps) == 1
+    assert bumped == [("kb_global",), ("kb_global",)]
+    assert not redis.zsets.get(ProjectionCoordinator.QUEUE_KEY)
+    assert redis.hashes[ProjectionCoordinator._key("stats", "kb_global")]["runs"] == "2"
@@ -16,6 +16,9 @@ class _DatasetServiceStub:
     async def get_counts(self, alias: str, user: object) -> dict[str, int]:
         return {"text_rows": 1, "chunk_rows": 0, "graph_nodes": 0, "graph_edges": 0}
 
+    async def get_cached_counts(self, alias: str, user: object) -> dict[str, int]:
+        return await self.get_counts(alias, user)
+
     async def get_row_count(self, alias: str, user: object) -> int:
         return 0
 
@@ -50,3 +53,95 @@ def test_search_service_has_rows_but_unavailable() -> None:
         assert exc_info.value.reason == "knowledge_base_unavailable"
 
     asyncio.run(runner())
+
+
+def test_run_queries_merges_in_variant_order_and_stops_at_k(monkeypatch: pytest.MonkeyPatch) -> None:
+    from ai_coach.agent.knowledge.schemas import KnowledgeSnippet
+    from ai_coach.agent.knowledge.utils import search as search_module
+
+    monkeypatch.setattr(search_module.settings, "AI_COACH_SEARCH_VARIANT_CONCURRENCY", 2)
+    delays = {"q1": 0.05, "q2": 0.01, "q3": 0.01, "slow": 1.0}
+    active = 0
+    peak = 0
+    cancelled: list[str] = []
+
+    async def fake_single(self, query, datasets, user, k, profile_id, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            await asyncio.sleep(delays[query])
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        finally:
+            active -= 1
+        return [KnowledgeSnippet(text=f"{query} a"), KnowledgeSnippet(text=f"{query} b")]
+
+    monkeypatch.setattr(SearchService, "_search_single_query", fake_single)
+    service = SearchService(_DatasetServiceStub(), _ProjectionServiceStub())
+
+    async def runner() -> list[KnowledgeSnippet]:
+        return await service._run_queries(  # pyrefly: ignore[private-use]
+            ["q1", "q2", "q3", "slow"], ["dataset"], {"id": 1}, 4, 1, "rid", ""
+        )
+
+    snippets = asyncio.run(runner())
+    # q3 finishes before q1, but the primary query's results still come first
+    assert [snippet.text for snippet in snippets] == ["q1 a", "q1 b", "q2 a", "q2 b"]
+    assert peak == 2
+    assert cancelled == ["slow"]
+
+
+def test_search_result_cache_invalidated_by_version_bump(monkeypatch: pytest.MonkeyPatch) -> None:
+    from ai_coach.agent.knowledge.schemas import KnowledgeSnippet
+    from ai_coach.agent.knowledge.utils import search_cache
+    from ai_coach.agent.knowledge.utils.search_cache import SearchResultCache
+
+    class _Pipeline:
+        def __init__(self, client: "_Redis") -> None:
+            self.client = client
+            self.ops: list[tuple[str, str]] = []
+
+        def hincrby(self, key: str, field: str, amount: int) -> None:
+            self.ops.append((key, field))
+
+        async def execute(self) -> None:
+            for key, field in self.ops:
+                bucket = self.client.hashes.setdefault(key, {})
+                bucket[field] = str(int(bucket.get(field, "0")) + 1)
+
+    class _Redis:
+        def __init__(self) -> None:
+            self.hashes: dict[str, dict[str, str]] = {}
+            self.strings: dict[str, str] = {}
+
+        async def hmget(self, key: str, fields: list[str]) -> list[str | None]:
+            return [self.hashes.get(key, {}).get(field) for field in fields]
+
+        async def get(self, key: str) -> str | None:
+            return self.strings.get(key)
+
+        async def set(self, key: str, value: str, ex: int | None = None) -> None:
+            self.strings[key] = value
+
+        def pipeline(self, transaction: bool = True) -> _Pipeline:
+            return _Pipeline(self)
+
+    redis = _Redis()
+    monkeypatch.setattr(search_cache, "get_redis_client", lambda: redis)
+    monkeypatch.setattr(search_cache.settings, "AI_COACH_SEARCH_CACHE_TTL", 60)
+
+    async def runner() -> None:
+        key = await SearchResultCache.key_for("  How   to SQUAT ", ["kb_b", "kb_a"], 3)
+        assert key == await SearchResultCache.key_for("how to squat", ["kb_a", "kb_b"], 3)
+        assert key is not None
+        await SearchResultCache.set(key, [KnowledgeSnippet(text="squat deep", dataset="kb_a")])
+        assert await SearchResultCache.get(key) == [KnowledgeSnippet(text="squat deep", dataset="kb_a")]
+
+        await SearchResultCache.bump("kb_b")
+        bumped = await SearchResultCache.key_for("how to squat", ["kb_a", "kb_b"], 3)
+        assert bumped != key
+        assert await SearchResultCache.get(bumped) is None  # pyrefly: ignore[bad-argument-type]
+
+    asyncio.run(runner())
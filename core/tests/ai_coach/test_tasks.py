@@ -42,7 +42,7 @@ def test_ai_plan_tasks_notify_on_success(task_obj: Any, target_name: str, monkey
             return exc.value
         return None
 
-    monkeypatch.setattr("core.tasks.ai_coach.asyncio.run", fake_run)
+    monkeypatch.setattr("core.tasks.ai_coach.workout_plans.run_async", fake_run)
     payload = {"profile_id": 1}
     result = task_obj.run(payload)
 
@@ -85,7 +85,7 @@ def test_ai_plan_tasks_skip_notify_on_empty_payload(
         coro.close()
         return None
 
-    monkeypatch.setattr("core.tasks.ai_coach.asyncio.run", fake_run)
+    monkeypatch.setattr("core.tasks.ai_coach.workout_plans.run_async", fake_run)
     payload = {"profile_id": 1}
     result = task_obj.run(payload)
 
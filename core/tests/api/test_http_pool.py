@@ -0,0 +1,125 @@
+import asyncio
+import types
+
+import httpx
+import pytest
+
+from core.services.internal.api_client import APIClient, APIClientCircuitOpenError, APIClientHTTPError
+from core.services.internal.http_pool import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, HTTPClientRegistry
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    HTTPClientRegistry.reset()
+    yield
+    HTTPClientRegistry.reset()
+
+
+def _settings(**overrides) -> types.SimpleNamespace:
+    values = dict(
+        API_URL="http://api",
+        API_KEY="",
+        API_MAX_RETRIES=0,
+        API_RETRY_INITIAL_DELAY=0,
+        API_RETRY_BACKOFF_FACTOR=1,
+        API_RETRY_MAX_DELAY=0,
+        API_TIMEOUT=5,
+        API_CIRCUIT_BREAKER_ENABLED=True,
+        API_CIRCUIT_BREAKER_WINDOW=60.0,
+        API_CIRCUIT_BREAKER_FAILURE_RATE=0.5,
+        API_CIRCUIT_BREAKER_MIN_REQUESTS=2,
+        API_CIRCUIT_BREAKER_OPEN_SECONDS=60.0,
+        API_CIRCUIT_BREAKER_HALF_OPEN_MAX=1,
+    )
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+def _breaker(**overrides) -> CircuitBreaker:
+    options = dict(window=60.0, failure_threshold=0.5, min_requests=4, open_for=0.0, half_open_max=1)
+    options.update(overrides)
+    return CircuitBreaker("api:80", **options)
+
+
+def test_breaker_opens_on_error_rate() -> None:
+    breaker = _breaker(open_for=60.0)
+    breaker.record(True)
+    breaker.record(False)
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    assert breaker.snapshot()["transitions"] == {"closed->open": 1}
+
+
+def test_breaker_half_open_probe_closes_or_reopens() -> None:
+    breaker = _breaker(min_requests=1, open_for=60.0)
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+    breaker._opened_at -= 60.0
+    assert breaker.allow() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is False
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+    breaker._opened_at -= 60.0
+    assert breaker.allow() is True
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["samples"] == 0
+
+
+def test_registry_reuses_client_per_loop() -> None:
+    settings = _settings()
+
+    async def lookup() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
+        client = HTTPClientRegistry.get_client("http://api", settings)
+        assert len(HTTPClientRegistry.stats()["pools"]) == 1
+        return client, HTTPClientRegistry.get_client("http://api", settings)
+
+    first, again = asyncio.run(lookup())
+    assert first is again
+    second, _ = asyncio.run(lookup())
+    assert second is not first
+
+
+def test_api_request_fails_fast_when_circuit_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    async def fake_request(self, method, url, **kwargs):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, request=httpx.Request(method, url), text="down")
+
+    monkeypatch.setattr(httpx.AsyncClient, "request", fake_request)
+    api = APIClient(None, _settings())
+
+    async def run() -> None:
+        for _ in range(2):
+            with pytest.raises(APIClientHTTPError):
+                await api._api_request("get", "http://api/x", retry_server_errors=False)
+        with pytest.raises(APIClientCircuitOpenError):
+            await api._api_request("get", "http://api/x")
+
+    asyncio.run(run())
+    assert calls == 2
+    assert HTTPClientRegistry.stats()["breakers"]["api"]["state"] == OPEN
+
+
+def test_client_errors_do_not_trip_breaker(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_request(self, method, url, **kwargs):
+        return httpx.Response(404, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(httpx.AsyncClient, "request", fake_request)
+    api = APIClient(None, _settings())
+
+    async def run() -> None:
+        for _ in range(3):
+            status, _ = await api._api_request("get", "http://api/x", allow_statuses={404})
+            assert status == 404
+
+    asyncio.run(run())
+    assert HTTPClientRegistry.stats()["breakers"]["api"]["state"] == CLOSED
@@ -6,38 +6,49 @@ from core.tasks import billing
 
 
 def test_deactivate_expired_subscriptions_disables_and_resets(monkeypatch: pytest.MonkeyPatch) -> None:
-    sub = SimpleNamespace(id=1, profile=10)
+    expired = [SimpleNamespace(id=sub_id, profile=sub_id * 10) for sub_id in (1, 2, 3)]
+    pages: list[tuple[int, int]] = []
+    api_calls: list[list[int]] = []
+    cache_calls: list[dict[int, dict]] = []
+    reset_calls: list[tuple[list[int], str]] = []
+    invalidated: list[list[int]] = []
 
-    async def get_expired_subscriptions(_today: str):
-        return [sub]
+    async def get_expired_subscriptions(_today: str, *, after_id: int, limit: int):
+        pages.append((after_id, limit))
+        return [sub for sub in expired if sub.id > after_id][:limit]
 
-    api_calls: list[tuple[int, dict]] = []
-    cache_calls: list[tuple[int, dict]] = []
-    reset_calls: list[tuple[int, str]] = []
+    async def deactivate_subscriptions(subscription_ids: list[int]):
+        api_calls.append(list(subscription_ids))
+        # subscription 2 was disabled concurrently and is not returned by the bulk update
+        return [sub for sub in expired if sub.id in subscription_ids and sub.id != 2]
 
-    async def workout_update(sub_id: int, payload: dict) -> None:
-        api_calls.append((sub_id, dict(payload)))
+    async def cache_workout_update(updates: dict[int, dict]) -> None:
+        cache_calls.append(dict(updates))
 
-    async def cache_workout_update(profile_id: int, payload: dict) -> None:
-        cache_calls.append((profile_id, dict(payload)))
+    async def cache_payment_reset(profile_ids: list[int], status: str) -> None:
+        reset_calls.append((list(profile_ids), status))
 
-    async def cache_payment_reset(profile_id: int, status: str) -> None:
-        reset_calls.append((profile_id, status))
+    async def invalidate(profile_ids: list[int], *, reason: str) -> None:
+        invalidated.append(list(profile_ids))
 
     api_stub = SimpleNamespace(
         payment=SimpleNamespace(get_expired_subscriptions=get_expired_subscriptions),
-        workout=SimpleNamespace(update_subscription=workout_update),
+        workout=SimpleNamespace(deactivate_subscriptions=deactivate_subscriptions),
     )
     cache_stub = SimpleNamespace(
-        workout=SimpleNamespace(update_subscription=cache_workout_update),
-        payment=SimpleNamespace(reset_status=cache_payment_reset),
+        workout=SimpleNamespace(update_subscriptions=cache_workout_update),
+        payment=SimpleNamespace(reset_statuses=cache_payment_reset),
     )
 
     monkeypatch.setattr(billing, "APIService", api_stub)
     monkeypatch.setattr(billing, "Cache", cache_stub)
+    monkeypatch.setattr(billing.ProfileContextStore, "invalidate", invalidate)
+    monkeypatch.setattr(billing.settings, "BILLING_EXPIRY_CHUNK_SIZE", 2)
 
     billing.deactivate_expired_subscriptions()
 
-    assert api_calls == [(1, {"enabled": False, "profile": 10})]
-    assert cache_calls == [(10, {"enabled": False})]
-    assert reset_calls == [(10, "subscription")]
+    assert pages == [(0, 2), (2, 2)]
+    assert api_calls == [[1, 2], [3]]
+    assert cache_calls == [{10: {"enabled": False}}, {30: {"enabled": False}}]
+    assert reset_calls == [([10], "subscription"), ([30], "subscription")]
+    assert invalidated == [[10], [30]]
@@ -0,0 +1,177 @@
+import asyncio
+from time import monotonic
+from typing import Any
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+
+from bot.handlers.internal import tasks
+from bot.handlers.internal.schemas import SubscriptionRenewalRecipient
+from bot.utils import broadcast
+from bot.utils.broadcast import Broadcast, BroadcastMessage, BroadcastProgress, TokenBucket
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> "_Pipeline":
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list[Any]:
+        return [getattr(self._redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self._ops]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.strings: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.sets: dict[str, set[str]] = {}
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    def __getattr__(self, name: str) -> Any:
+        impl = getattr(self, f"_{name}")
+
+        async def _command(*args: Any, **kwargs: Any) -> Any:
+            return impl(*args, **kwargs)
+
+        return _command
+
+    def _set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.strings:
+            return False
+        self.strings[key] = value
+        return True
+
+    def _get(self, key: str) -> str | None:
+        return self.strings.get(key)
+
+    def _delete(self, *keys: str) -> int:
+        return sum(int(self.strings.pop(key, None) is not None) for key in keys)
+
+    def _expire(self, key: str, seconds: int) -> bool:
+        return True
+
+    def _hset(
+        self, key: str, field: str | None = None, value: Any = None, mapping: dict[str, Any] | None = None
+    ) -> int:
+        updates = dict(mapping or {})
+        if field is not None:
+            updates[field] = value
+        self.hashes.setdefault(key, {}).update({name: str(item) for name, item in updates.items()})
+        return len(updates)
+
+    def _hsetnx(self, key: str, field: str, value: str) -> int:
+        return int(self.hashes.setdefault(key, {}).setdefault(field, value) == value)
+
+    def _hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def _hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    def _sadd(self, key: str, *members: str) -> int:
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def _srem(self, key: str, *members: str) -> int:
+        self.sets.get(key, set()).difference_update(members)
+        return len(members)
+
+    def _smembers(self, key: str) -> set[str]:
+        return set(self.sets.get(key, set()))
+
+
+class _Bot:
+    def __init__(self, *, flood_chat: int | None = None, blocked_chat: int | None = None) -> None:
+        self.flood_chat = flood_chat
+        self.blocked_chat = blocked_chat
+        self.sent: list[int] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs: Any) -> None:
+        if chat_id == self.flood_chat:
+            self.flood_chat = None
+            raise TelegramRetryAfter(method=None, message="Too Many Requests", retry_after=0)
+        if chat_id == self.blocked_chat:
+            raise TelegramForbiddenError(method=None, message="bot was blocked by the user")
+        self.sent.append(chat_id)
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _Redis:
+    fake = _Redis()
+    monkeypatch.setattr(broadcast, "get_redis_client", lambda: fake)
+    return fake
+
+
+def _recipients(*chat_ids: int) -> list[SubscriptionRenewalRecipient]:
+    return [
+        SubscriptionRenewalRecipient(profile_id=chat_id, tg_id=chat_id, subscription_id=chat_id) for chat_id in chat_ids
+    ]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_retries_after_flood_control_and_resumes(redis: _Redis) -> None:
+    bot = _Bot(flood_chat=2, blocked_chat=3)
+
+    def build(recipient: SubscriptionRenewalRecipient) -> BroadcastMessage | None:
+        return None if recipient.tg_id == 4 else BroadcastMessage(text="renew")
+
+    first = Broadcast(
+        bot, broadcast_id="b1", kind="test", recipients=_recipients(1, 2, 3, 4), build=build, per_chat_interval_s=0
+    )
+    report = await first.run()
+
+    assert report is not None
+    assert sorted(bot.sent) == [1, 2]
+    assert (report.sent, report.failed, report.skipped, report.throttled) == (2, 1, 1, 1)
+    assert redis.hashes["bot:broadcast:b1:stats"]["status"] == "done"
+
+    again = Broadcast(bot, broadcast_id="b1", kind="test", recipients=_recipients(1, 2, 3, 4, 5), build=build)
+    report = await again.run()
+
+    assert report is not None
+    assert bot.sent[-1] == 5 and len(bot.sent) == 3
+    assert (report.sent, report.resumed) == (1, 4)
+    assert redis.hashes["bot:broadcast:b1:stats"]["sent"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_renewal_endpoint_accepts_once(redis: _Redis) -> None:
+    bot = _Bot()
+    payload = {"recipients": [item.model_dump() for item in _recipients(10, 11)]}
+
+    class _Request:
+        app = {"bot": bot}
+
+        async def json(self) -> dict[str, Any]:
+            return payload
+
+    handler = tasks.internal_send_subscription_renewal.__wrapped__
+    response = await handler(_Request())
+    assert response.status == 202
+    await asyncio.gather(*broadcast._BROADCAST_TASKS)
+    assert sorted(bot.sent) == [10, 11]
+    assert await BroadcastProgress.pending() == []
+
+    repeated = await handler(_Request())
+    assert repeated.status == 200
+    assert sorted(bot.sent) == [10, 11]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_acquisitions() -> None:
+    bucket = TokenBucket(rate=100, capacity=1)
+    started = monotonic()
+    for _ in range(11):
+        await bucket.acquire()
+    assert monotonic() - started >= 0.09
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from core.cache.base import BaseCacheManager
+from core.cache.profile import ProfileCacheManager
+from core.cache.workout import WorkoutCacheManager
+
+
+class _FakePipeline:
+    def __init__(self, client: "_FakeHashClient") -> None:
+        self._client = client
+        self._ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def hmget(self, key: str, fields: list[str]) -> "_FakePipeline":
+        self._ops.append(("hmget", (key, fields), {}))
+        return self
+
+    def hset(self, key: str, mapping: dict[str, str]) -> "_FakePipeline":
+        self._ops.append(("hset", (key,), {"mapping": mapping}))
+        return self
+
+    def hdel(self, key: str, *fields: str) -> "_FakePipeline":
+        self._ops.append(("hdel", (key, *fields), {}))
+        return self
+
+    async def execute(self) -> list[Any]:
+        self._client.round_trips += 1
+        results: list[Any] = []
+        for name, args, kwargs in self._ops:
+            bucket = self._client.data.setdefault(args[0], {})
+            if name == "hmget":
+                results.append([bucket.get(field) for field in args[1]])
+            elif name == "hset":
+                bucket.update(kwargs["mapping"])
+                results.append(len(kwargs["mapping"]))
+            else:
+                results.append(sum(1 for field in args[1:] if bucket.pop(field, None) is not None))
+        return results
+
+
+class _FakeHashClient:
+    def __init__(self) -> None:
+        self.data: dict[str, dict[str, str]] = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+@pytest.fixture
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> _FakeHashClient:
+    client = _FakeHashClient()
+    monkeypatch.setattr(BaseCacheManager, "_client", classmethod(lambda cls: client))
+    monkeypatch.setattr(BaseCacheManager, "_batch_size", 2)
+    return client
+
+
+def test_mset_and_mget_json_round_trip(fake_client: _FakeHashClient) -> None:
+    async def runner() -> None:
+        await BaseCacheManager.mset_json("bench", {str(i): {"value": i} for i in range(5)})
+        result = await BaseCacheManager.mget_json("bench", ["0", "3", "missing", "4"])
+        assert result == {"0": {"value": 0}, "3": {"value": 3}, "missing": None, "4": {"value": 4}}
+        assert fake_client.round_trips == 2
+
+        await BaseCacheManager.mdelete("bench", ["0", "1", "2"])
+        assert sorted(fake_client.data["app:bench"]) == ["3", "4"]
+
+    asyncio.run(runner())
+
+
+def test_save_records_skips_unchanged(fake_client: _FakeHashClient) -> None:
+    async def runner() -> None:
+        payload = {"tg_id": 1, "language": "eng", "status": "created"}
+        await ProfileCacheManager.save_records({1: payload, 2: {"language": "eng"}})
+        assert list(fake_client.data["app:profiles"]) == ["1"]
+        trips = fake_client.round_trips
+        await ProfileCacheManager.save_record(1, payload)
+        assert fake_client.round_trips == trips + 1
+
+        cached = await ProfileCacheManager.mget_json("profiles", ["1"])
+        assert cached["1"]["tg_id"] == 1
+
+    asyncio.run(runner())
+
+
+def test_update_subscriptions_merges_existing(fake_client: _FakeHashClient) -> None:
+    async def runner() -> None:
+        await WorkoutCacheManager.mset_json("workout_plans:subscriptions", {"7": {"enabled": True, "price": 5}})
+        await WorkoutCacheManager.update_subscriptions({7: {"enabled": False}, 8: {"enabled": False}})
+        result = await WorkoutCacheManager.mget_json("workout_plans:subscriptions", ["7", "8"])
+        assert result == {"7": {"enabled": False, "price": 5}, "8": {"enabled": False}}
+
+    asyncio.run(runner())
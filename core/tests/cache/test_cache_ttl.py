@@ -0,0 +1,117 @@
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator
+
+import pytest
+
+from core.cache.base import BaseCacheManager
+
+
+class _FakeHashClient:
+    def __init__(self) -> None:
+        self.data: dict[str, dict[str, str]] = {}
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return self.data.get(key, {}).get(field)
+
+    async def hset(self, key: str, field: str, value: str) -> int:
+        self.data.setdefault(key, {})[field] = value
+        return 1
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        bucket = self.data.get(key, {})
+        return sum(1 for field in fields if bucket.pop(field, None) is not None)
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.data.get(key, {}))
+
+    async def hlen(self, key: str) -> int:
+        return len(self.data.get(key, {}))
+
+    async def scan_iter(self, match: str, count: int, _type: str) -> AsyncIterator[str]:
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+    async def hscan_iter(self, key: str, count: int) -> AsyncIterator[tuple[str, str]]:
+        for item in list(self.data.get(key, {}).items()):
+            yield item
+
+
+class _TTLManager(BaseCacheManager):
+    _soft_ttl = 60
+    _hard_ttl = 600
+    fetches = 0
+
+    @classmethod
+    async def _fetch_from_service(cls, cache_key: str, field: str, *, use_fallback: bool) -> Any:
+        cls.fetches += 1
+        return {"field": field, "fresh": True}
+
+    @classmethod
+    def _validate_data(cls, raw: str, cache_key: str, field: str) -> Any:
+        return json.loads(raw)
+
+
+@pytest.fixture
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> _FakeHashClient:
+    client = _FakeHashClient()
+    monkeypatch.setattr(BaseCacheManager, "_client", classmethod(lambda cls: client))
+    _TTLManager.fetches = 0
+    BaseCacheManager.reset_stats()
+    return client
+
+
+def _age(client: _FakeHashClient, key: str, field: str, seconds: float) -> None:
+    envelope = json.loads(client.data[key][field])
+    envelope["fetched_at"] = time.time() - seconds
+    client.data[key][field] = json.dumps(envelope)
+
+
+def test_set_wraps_value_and_get_unwraps(fake_client: _FakeHashClient) -> None:
+    async def runner() -> None:
+        await _TTLManager.set_json("items", "1", {"a": 1})
+        stored = json.loads(fake_client.data["app:items"]["1"])
+        assert stored["value"] == {"a": 1}
+        assert (stored["soft_ttl"], stored["hard_ttl"]) == (60, 600)
+        assert await _TTLManager.get_json("items", "1") == {"a": 1}
+        assert await _TTLManager.get_all("items") == {"1": json.dumps({"a": 1})}
+
+        fake_client.data["app:items"]["legacy"] = json.dumps({"b": 2})
+        assert await _TTLManager.get_json("items", "legacy") == {"b": 2}
+
+    asyncio.run(runner())
+
+
+def test_stale_value_served_while_refreshing(fake_client: _FakeHashClient) -> None:
+    async def runner() -> None:
+        await _TTLManager.set_json("items", "1", {"field": "1", "fresh": False})
+        _age(fake_client, "app:items", "1", 120)
+
+        value = await _TTLManager.get_or_fetch("items", "1")
+        assert value == {"field": "1", "fresh": False}
+        await asyncio.gather(*list(BaseCacheManager._background))
+
+        assert _TTLManager.fetches == 1
+        assert await _TTLManager.get_json("items", "1") == {"field": "1", "fresh": True}
+        assert BaseCacheManager.cache_stats()["_TTLManager"]["stale"] == 1
+
+    asyncio.run(runner())
+
+
+def test_expired_field_is_a_miss_and_swept(fake_client: _FakeHashClient) -> None:
+    async def runner() -> None:
+        await _TTLManager.set_json("items", "1", {"field": "1"})
+        await _TTLManager.set_json("items", "2", {"field": "2"})
+        _age(fake_client, "app:items", "1", 900)
+
+        assert await _TTLManager.get("items", "1") is None
+        report = await BaseCacheManager.sweep_expired()
+        assert report == {"app:items": {"size": 1, "evicted": 1}}
+
+        await _TTLManager.get_or_fetch("items", "1")
+        assert _TTLManager.fetches == 1
+
+    asyncio.run(runner())
@@ -0,0 +1,69 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from core.cache.base import BaseCacheManager
+
+
+class _CountingManager(BaseCacheManager):
+    fetches = 0
+    store: dict[str, str] = {}
+
+    @classmethod
+    async def _get_entry(cls, key: str, field: str) -> tuple[str | None, str]:
+        return cls.store.get(f"{key}:{field}"), "fresh"
+
+    @classmethod
+    async def set(cls, key: str, field: str, value: str) -> None:
+        cls.store[f"{key}:{field}"] = value
+
+    @classmethod
+    async def _fetch_from_service(cls, cache_key: str, field: str, *, use_fallback: bool) -> Any:
+        cls.fetches += 1
+        await asyncio.sleep(0.01)
+        if field == "boom":
+            raise LookupError(field)
+        return {"field": field}
+
+    @classmethod
+    def _validate_data(cls, raw: str, cache_key: str, field: str) -> Any:
+        return json.loads(raw)
+
+
+@pytest.fixture(autouse=True)
+def _reset() -> None:
+    _CountingManager.fetches = 0
+    _CountingManager.store = {}
+    BaseCacheManager.reset_stats()
+
+
+def test_concurrent_misses_share_one_fetch() -> None:
+    async def runner() -> list[Any]:
+        return await asyncio.gather(*(_CountingManager.get_or_fetch("items", "1") for _ in range(10)))
+
+    results = asyncio.run(runner())
+
+    assert results == [{"field": "1"}] * 10
+    assert _CountingManager.fetches == 1
+    stats = BaseCacheManager.cache_stats()["_CountingManager"]
+    assert stats["miss"] == 10
+    assert stats["coalesced"] == 9
+
+    asyncio.run(_CountingManager.get_or_fetch("items", "1"))
+    assert BaseCacheManager.cache_stats()["_CountingManager"]["hit"] == 1
+
+
+def test_fetch_errors_propagate_to_waiters() -> None:
+    async def runner() -> list[Any]:
+        return await asyncio.gather(
+            *(_CountingManager.get_or_fetch("items", "boom") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(runner())
+
+    assert all(isinstance(item, LookupError) for item in results)
+    assert _CountingManager.fetches == 1
+    assert BaseCacheManager._inflight == {}
@@ -0,0 +1,107 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from core.cache.base import BaseCacheManager
+from core.cache.profile import ProfileCacheManager
+from core.enums import Language, ProfileStatus
+from core.schemas import Profile
+
+
+class _FakeHashClient:
+    def __init__(self) -> None:
+        self.data: dict[str, dict[str, str]] = {}
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return self.data.get(key, {}).get(field)
+
+    async def hset(self, key: str, field: str, value: str) -> int:
+        self.data.setdefault(key, {})[field] = value
+        return 1
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        bucket = self.data.get(key, {})
+        return sum(1 for field in fields if bucket.pop(field, None) is not None)
+
+    def pipeline(self, transaction: bool = True) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client: _FakeHashClient) -> None:
+        self._client = client
+        self._ops: list[tuple[str, tuple[Any, ...]]] = []
+
+    def hdel(self, key: str, *fields: str) -> "_FakePipeline":
+        self._ops.append((key, fields))
+        return self
+
+    async def execute(self) -> list[int]:
+        return [await self._client.hdel(key, *fields) for key, fields in self._ops]
+
+
+class _ProfileAPI:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def get_profile_by_tg_id(self, tg_id: int) -> Profile:
+        self.calls += 1
+        return Profile(id=tg_id + 100, tg_id=tg_id, language=Language.eng, status=ProfileStatus.completed)
+
+
+@pytest.fixture
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> _FakeHashClient:
+    client = _FakeHashClient()
+    monkeypatch.setattr(BaseCacheManager, "_client", classmethod(lambda cls: client))
+    return client
+
+
+def test_get_profile_served_from_index(fake_client: _FakeHashClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    api = _ProfileAPI()
+    monkeypatch.setattr("core.cache.profile.APIService.profile.get_profile_by_tg_id", api.get_profile_by_tg_id)
+
+    async def runner() -> None:
+        first = await ProfileCacheManager.get_profile(7)
+        second = await ProfileCacheManager.get_profile(7)
+        assert first.id == second.id == 107
+        assert api.calls == 1
+
+        await ProfileCacheManager.delete_record(107)
+        assert "7" not in fake_client.data["app:profiles:tg_index"]
+        await ProfileCacheManager.get_profile(7)
+        assert api.calls == 2
+
+    asyncio.run(runner())
+
+
+def test_stale_index_entry_falls_back_to_api(fake_client: _FakeHashClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    api = _ProfileAPI()
+    monkeypatch.setattr("core.cache.profile.APIService.profile.get_profile_by_tg_id", api.get_profile_by_tg_id)
+
+    async def runner() -> None:
+        await ProfileCacheManager.set(ProfileCacheManager.TG_INDEX_KEY, "9", "555")
+        profile = await ProfileCacheManager.get_profile(9)
+        assert profile.id == 109
+        assert api.calls == 1
+        assert await ProfileCacheManager.get(ProfileCacheManager.TG_INDEX_KEY, "9") == "109"
+
+    asyncio.run(runner())
+
+
+def test_stale_record_is_revalidated(fake_client: _FakeHashClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    api = _ProfileAPI()
+    monkeypatch.setattr("core.cache.profile.APIService.profile.get_profile_by_tg_id", api.get_profile_by_tg_id)
+    monkeypatch.setattr(ProfileCacheManager, "_soft_ttl", 0)
+    monkeypatch.setattr(ProfileCacheManager, "_hard_ttl", 3600)
+
+    async def runner() -> None:
+        await ProfileCacheManager.get_profile(11)
+        assert api.calls == 1
+        await ProfileCacheManager.get_profile(11)
+        assert api.calls == 2
+        cached = await ProfileCacheManager.get_profile(11, use_fallback=False)
+        assert cached.id == 111
+        assert api.calls == 2
+
+    asyncio.run(runner())
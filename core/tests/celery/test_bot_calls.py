@@ -0,0 +1,130 @@
+from datetime import date
+from typing import Any
+
+import orjson
+import pytest
+
+from core.tasks import bot_calls
+from core.utils import idempotency
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any) -> "_Pipeline":
+            self._ops.append((name, args))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list[Any]:
+        return [getattr(self._redis, f"_{name}")(*args) for name, args in self._ops]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.strings: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.strings:
+            return False
+        self.strings[key] = value
+        return True
+
+    def _hset(self, key: str, field: str, value: str) -> int:
+        self.hashes.setdefault(key, {})[field] = value
+        return 1
+
+    def _hget(self, key: str, field: str) -> str | None:
+        return self.hashes.get(key, {}).get(field)
+
+    def _hincrby(self, key: str, field: str, amount: int) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def _expire(self, key: str, seconds: int) -> bool:
+        return True
+
+
+class _Subscriptions:
+    def __init__(self, profile_ids: list[int]) -> None:
+        self.profile_ids = profile_ids
+
+    def filter(self, profile_id__gt: int) -> "_Subscriptions":
+        return _Subscriptions([item for item in self.profile_ids if item > profile_id__gt])
+
+    def values_list(self, field: str, flat: bool) -> "_Subscriptions":
+        return self
+
+    def __getitem__(self, window: slice) -> list[int]:
+        return self.profile_ids[window]
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _Redis:
+    fake = _Redis()
+
+    async def _get_redis() -> _Redis:
+        return fake
+
+    monkeypatch.setattr(bot_calls, "get_redis_client", lambda: fake)
+    monkeypatch.setattr(idempotency, "_get_redis", _get_redis)
+    return fake
+
+
+def test_profile_id_pages_use_keyset_bounds(monkeypatch: pytest.MonkeyPatch) -> None:
+    subscriptions = _Subscriptions([3, 4, 8, 15, 16, 23, 42])
+    monkeypatch.setitem(
+        bot_calls.NOTIFICATIONS,
+        "weekly_survey",
+        bot_calls._Notification("send_weekly_survey", lambda run_id: subscriptions),
+    )
+
+    assert list(bot_calls._profile_id_pages("weekly_survey", "2025-01-05", 3)) == [(0, 8), (8, 23), (23, 42)]
+    assert list(bot_calls._profile_id_pages("weekly_survey", "2025-01-05", 7)) == [(0, 42)]
+
+
+def test_weekly_survey_fans_out_idempotent_chunks(monkeypatch: pytest.MonkeyPatch, redis: _Redis) -> None:
+    posted: list[dict[str, Any]] = []
+
+    class _Response:
+        def raise_for_status(self) -> None:
+            return None
+
+    class _Client:
+        async def post(self, url: str, content: bytes, **kwargs: Any) -> _Response:
+            posted.append({"url": url, **orjson.loads(content)})
+            return _Response()
+
+    def _recipients(kind: str, run_id: str, after: int, last: int) -> list[dict[str, Any]]:
+        return [
+            {"profile_id": profile_id, "tg_id": profile_id, "language": None, "subscription_id": profile_id}
+            for profile_id in range(after + 1, last + 1)
+        ]
+
+    monkeypatch.setattr(bot_calls, "_profile_id_pages", lambda kind, run_id, size: iter([(0, 2), (2, 3)]))
+    monkeypatch.setattr(bot_calls, "_fetch_chunk_recipients", _recipients)
+    monkeypatch.setattr(bot_calls.HTTPClientRegistry, "get_client", lambda base_url, settings: _Client())
+    monkeypatch.setattr(bot_calls.timezone, "localdate", lambda: date(2025, 1, 5))
+
+    bot_calls.send_weekly_survey()
+
+    assert [item["broadcast_id"] for item in posted] == ["weekly_survey:2025-01-05:0", "weekly_survey:2025-01-05:1"]
+    assert [len(item["recipients"]) for item in posted] == [2, 1]
+    assert all(item["url"].endswith("/internal/tasks/send_weekly_survey/") for item in posted)
+    assert redis.hashes["bot_calls:dispatch:weekly_survey:2025-01-05"] == {
+        "done": "2",
+        "recipients": "3",
+        "chunks": "2",
+    }
+
+    bot_calls.send_notification_chunk(kind="weekly_survey", run_id="2025-01-05", index=0, after=0, last=2)
+    assert len(posted) == 2
@@ -145,6 +145,9 @@ class _DatasetService:
     async def get_counts(self, *args, **kwargs) -> dict[str, int]:
         return {}
 
+    async def get_cached_counts(self, *args, **kwargs) -> dict[str, int]:
+        return await self.get_counts(*args, **kwargs)
+
     def dump_identifier_map(self) -> dict[str, str]:
         return {}
 
@@ -369,7 +372,10 @@ class _KB:
         self.dataset_service = _DatasetService()
         self.projection_service = _ProjectionService()
         self.projection_service.attach_knowledge_base(self)
-        self.storage_service = types.SimpleNamespace(attach_knowledge_base=lambda *a, **k: None)
+        self.storage_service = types.SimpleNamespace(
+            attach_knowledge_base=lambda *a, **k: None,
+            cache_stats=lambda: {},
+        )
         self.chat_queue_service = types.SimpleNamespace()
         self.search_service = _SearchServiceStub(self)
         self._seen: set[tuple[int]] = set()
@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from apps.metrics import buffer
+from config.app_settings import settings
+from core.metrics.constants import METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> "_Pipeline":
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self) -> list[Any]:
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._ops]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.stream: list[tuple[str, dict[str, str]]] = []
+        self.hashes: dict[str, dict[str, str]] = {}
+        self._seq = 0
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    def xadd(self, key: str, fields: dict[str, str]) -> str:
+        self._seq += 1
+        entry_id = f"{1_700_000_000_000 + self._seq}-0"
+        self.stream.append((entry_id, dict(fields)))
+        return entry_id
+
+    def xrange(self, key: str, start: str, end: str, count: int) -> list[tuple[str, dict[str, str]]]:
+        return list(self.stream[:count])
+
+    def xdel(self, key: str, *entry_ids: str) -> int:
+        before = len(self.stream)
+        self.stream = [entry for entry in self.stream if entry[0] not in entry_ids]
+        return before - len(self.stream)
+
+    def xlen(self, key: str) -> int:
+        return len(self.stream)
+
+    def hset(self, key: str, mapping: dict[str, Any]) -> int:
+        self.hashes.setdefault(key, {}).update({field: str(value) for field, value in mapping.items()})
+        return len(mapping)
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+
+def test_buffered_events_flush_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    redis = _Redis()
+    inserted: list[list[tuple[str, str, str]]] = []
+
+    def bulk_create(events: list[Any], ignore_conflicts: bool = False) -> list[Any]:
+        assert ignore_conflicts
+        inserted.append([(event.event_type, event.source, event.source_id) for event in events])
+        return events
+
+    monkeypatch.setattr(buffer, "_get_client", lambda: redis)
+    monkeypatch.setattr(buffer.MetricsEvent.objects, "bulk_create", bulk_create)
+    monkeypatch.setattr(settings, "METRICS_BUFFER_ENABLED", True)
+
+    for source_id in ("1", "2", "2"):
+        assert buffer.buffer_event(METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, source_id)
+    redis.xadd(buffer.STREAM_KEY, {"event_type": "bogus", "source": METRICS_SOURCE_PROFILE, "source_id": "3"})
+
+    report = buffer.flush_events(2)
+
+    assert (report.flushed, report.batches, report.depth) == (4, 2, 0)
+    assert inserted == [
+        [(METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, "1"), (METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, "2")],
+        [(METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, "2")],
+    ]
+    stats = buffer.buffer_stats()
+    assert stats["depth"] == 0
+    assert stats["last_flush_size"] == 4 and stats["flushed_total"] == 4
+
+
+def test_flushed_events_keep_their_append_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    redis = _Redis()
+    inserted: list[Any] = []
+    monkeypatch.setattr(buffer, "_get_client", lambda: redis)
+    monkeypatch.setattr(buffer.MetricsEvent.objects, "bulk_create", lambda events, **_: inserted.extend(events))
+    monkeypatch.setattr(settings, "METRICS_BUFFER_ENABLED", True)
+
+    assert buffer.buffer_event(METRICS_EVENT_NEW_USER, METRICS_SOURCE_PROFILE, "1")
+    buffer.flush_events(10)
+
+    assert [event.created_at for event in inserted] == [datetime.fromtimestamp(1_700_000_000.001)]
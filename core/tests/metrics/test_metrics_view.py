@@ -18,6 +18,7 @@ def _sign(secret: str, *, ts: int, body: bytes) -> str:
 def test_record_metrics_event_valid(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(settings, "INTERNAL_KEY_ID", "kid")
     monkeypatch.setattr(settings, "INTERNAL_API_KEY", "secret")
+    monkeypatch.setattr(settings, "METRICS_BUFFER_ENABLED", False)
     monkeypatch.setattr("apps.metrics.views.time.time", lambda: 1000)
     captured: dict[str, str] = {}
 
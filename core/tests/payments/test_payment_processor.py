@@ -163,7 +163,7 @@ def test_process_payment_no_strategy() -> None:
     run(runner)
 
 
-def test_process_credit_topup_updates_profile_and_cache() -> None:
+def test_process_credit_topup_updates_profile_and_refreshes_cache() -> None:
     async def runner() -> None:
         profile_id = 11
         profile = SimpleNamespace(id=profile_id, credits=5, tg_id=1, language="en")
@@ -174,12 +174,12 @@ def test_process_credit_topup_updates_profile_and_cache() -> None:
         async def adjust_credits(profile_id: int, delta: int) -> None:
             profile_calls.append((profile_id, delta))
 
-        cache_updates: list[tuple[int, dict[str, Any]]] = []
+        refreshed: list[int] = []
 
-        async def update_record(profile_id: int, data: dict[str, Any]) -> None:
-            cache_updates.append((profile_id, data))
+        async def refresh_record(profile_id: int) -> None:
+            refreshed.append(profile_id)
 
-        cache = SimpleNamespace(profile=SimpleNamespace(update_record=update_record))
+        cache = SimpleNamespace(profile=SimpleNamespace(refresh_record=refresh_record))
 
         async def update_payment(*_: Any) -> bool:
             return True
@@ -199,6 +199,6 @@ def test_process_credit_topup_updates_profile_and_cache() -> None:
         package_map = {package.price: package.credits for package in ServiceCatalog.credit_packages()}
         expected_credits = package_map[normalized]
         assert profile_calls == [(profile_id, expected_credits)]
-        assert cache_updates == [(profile_id, {"credits": profile.credits + expected_credits})]
+        assert refreshed == [profile_id]
 
     run(runner)
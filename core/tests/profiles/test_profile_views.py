@@ -5,7 +5,7 @@ from types import SimpleNamespace
 import django
 import pytest
 from apps.profiles.choices import ProfileStatus
-from apps.profiles.views import ProfileAPIList, ProfileAPIDestroy
+from apps.profiles.views import ProfileAPIList, ProfileAPIDestroy, ProfileAPIUpdate
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
 django.setup()
@@ -139,3 +139,60 @@ def test_profile_destroy_soft_deletes_and_enqueues(monkeypatch: pytest.MonkeyPat
     assert profile.workout_goals is None
     assert profile.workout_location is None
     assert cleanup_calls == [(7, "profile_deleted")]
+
+
+def test_profile_update_with_credits_invalidates_app_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    profile = _ProfileStub()
+    invalidated: list[tuple[int, int | None]] = []
+
+    class _UpdateSerializerStub(_SerializerStub):
+        def __init__(self, instance: _ProfileStub, *, data: dict, partial: bool) -> None:
+            super().__init__(data=data)
+            self._instance = instance
+
+        def save(self) -> _ProfileStub:
+            return self._instance
+
+    monkeypatch.setattr("apps.profiles.views.ProfileRepository.get_model_by_id", lambda _: profile)
+    monkeypatch.setattr("apps.profiles.views.ProfileRepository.invalidate_cache", lambda **_: None)
+    monkeypatch.setattr(
+        "apps.profiles.views.ProfileRepository.invalidate_app_cache",
+        lambda profile_id, tg_id: invalidated.append((profile_id, tg_id)),
+    )
+    monkeypatch.setattr(ProfileAPIUpdate, "serializer_class", _UpdateSerializerStub)
+    monkeypatch.setitem(
+        sys.modules,
+        "core.tasks.ai_coach.maintenance",
+        SimpleNamespace(sync_profile_knowledge=SimpleNamespace(delay=lambda *_, **__: None)),
+    )
+
+    view = ProfileAPIUpdate()
+    view.put(SimpleNamespace(data={"language": "uk"}), profile.id)  # type: ignore[arg-type]
+    assert invalidated == []
+
+    response = view.put(SimpleNamespace(data={"credits": 5}), profile.id)  # type: ignore[arg-type]
+    assert response.status_code == 200
+    assert invalidated == [(profile.id, profile.tg_id)]
+
+
+def test_invalidate_app_cache_drops_the_bot_profile_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+    from apps.profiles import repos
+    from core.cache.profile import ProfileCacheManager
+
+    deleted: list[tuple[str, str]] = []
+
+    class _Pipeline:
+        def hdel(self, key: str, field: str) -> None:
+            deleted.append((key, field))
+
+        def execute(self) -> None:
+            return None
+
+    monkeypatch.setattr(repos, "_get_app_cache_client", lambda: SimpleNamespace(pipeline=lambda **_: _Pipeline()))
+
+    repos.ProfileRepository.invalidate_app_cache(10, 555)
+
+    assert deleted == [
+        (ProfileCacheManager._add_prefix(ProfileCacheManager.PROFILE_DATA_KEY), "10"),
+        (ProfileCacheManager._add_prefix(ProfileCacheManager.TG_INDEX_KEY), "555"),
+    ]
@@ -287,6 +287,35 @@ class TelegramBadRequest: ...
 aiogram.exceptions.TelegramBadRequest = TelegramBadRequest
 
 
+class TelegramAPIError(Exception):
+    def __init__(self, method: Any = None, message: str = "") -> None:
+        super().__init__(message)
+        self.method = method
+        self.message = message
+
+
+class TelegramNetworkError(TelegramAPIError): ...
+
+
+class TelegramServerError(TelegramAPIError): ...
+
+
+class TelegramForbiddenError(TelegramAPIError): ...
+
+
+class TelegramRetryAfter(TelegramAPIError):
+    def __init__(self, method: Any = None, message: str = "", retry_after: int = 0) -> None:
+        super().__init__(method, message)
+        self.retry_after = retry_after
+
+
+aiogram.exceptions.TelegramAPIError = TelegramAPIError
+aiogram.exceptions.TelegramNetworkError = TelegramNetworkError
+aiogram.exceptions.TelegramServerError = TelegramServerError
+aiogram.exceptions.TelegramForbiddenError = TelegramForbiddenError
+aiogram.exceptions.TelegramRetryAfter = TelegramRetryAfter
+
+
 class ParseMode: ...
 
 
@@ -692,6 +721,8 @@ signals = types.SimpleNamespace(
     task_success=_Sig(),
     worker_ready=_Sig(),
     after_setup_task_logger=_Sig(),
+    worker_process_init=_Sig(),
+    worker_shutdown=_Sig(),
 )
 
 
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.cache.base import BaseCacheManager
+from core.utils import async_runtime, idempotency
+
+
+async def _current_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+def test_worker_threads_keep_their_own_loop() -> None:
+    current = async_runtime.worker_async(_current_loop)
+    first = current()
+    assert current() is first and not first.is_closed()
+
+    other: list[asyncio.AbstractEventLoop] = []
+    thread = threading.Thread(target=lambda: other.append(async_runtime.run_async(_current_loop())))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+    async_runtime.close_worker_loops()
+    assert first.is_closed() and other[0].is_closed()
+    assert async_runtime.run_async(_current_loop()) is not first
+    async_runtime.close_worker_loops()
+
+
+def test_cache_manager_keeps_one_client_per_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _Client:
+        closed = False
+
+        async def close(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(BaseCacheManager, "_clients", {})
+    monkeypatch.setattr(BaseCacheManager, "_create_client", classmethod(lambda cls: _Client()))
+
+    async def _get_client() -> object:
+        return BaseCacheManager._client()  # pyrefly: ignore[private-use]
+
+    first = async_runtime.run_async(_get_client())
+    assert async_runtime.run_async(_get_client()) is first
+
+    other: list[object] = []
+    thread = threading.Thread(target=lambda: other.append(async_runtime.run_async(_get_client())))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+    async_runtime.close_worker_loops()
+    assert first.closed and other[0].closed  # pyrefly: ignore[missing-attribute]
+    assert not BaseCacheManager._clients
+
+
+def test_clients_of_closed_loops_are_not_reused(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _Client:
+        async def close(self) -> None:
+            return None
+
+    dead_loop = asyncio.new_event_loop()
+    dead_loop.close()
+    stale = _Client()
+    monkeypatch.setattr(BaseCacheManager, "_create_client", classmethod(lambda cls: _Client()))
+    monkeypatch.setattr(idempotency, "from_url", lambda *args, **kwargs: _Client())
+    monkeypatch.setattr(idempotency.settings, "REDIS_URL", "redis://cache")
+
+    async def _clients_after_id_reuse() -> tuple[object, object | None]:
+        # Simulate a collected loop whose id the running loop now reuses.
+        loop_id = id(asyncio.get_running_loop())
+        monkeypatch.setattr(BaseCacheManager, "_clients", {loop_id: (dead_loop, stale), 1: (dead_loop, stale)})
+        monkeypatch.setattr(idempotency, "_clients", {loop_id: (dead_loop, stale)})
+        return BaseCacheManager._client(), await idempotency._get_redis()  # pyrefly: ignore[private-use]
+
+    cache_client, idempotency_client = asyncio.run(_clients_after_id_reuse())
+
+    assert cache_client is not stale and idempotency_client is not stale
+    assert 1 not in BaseCacheManager._clients
@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+from importlib import import_module
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from django.http.response import HttpResponse
+from django.test import RequestFactory
+
+from core.services.gif_cache import ExerciseGIFCache
+
+views = import_module("apps.webapp.views")
+
+GIF_KEY = "crunch-floor.gif"
+
+
+class _Blob:
+    def __init__(self, source: Path, generation: int) -> None:
+        self.source = source
+        self.generation = generation
+        self.content_type = "image/gif"
+        self.updated = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def download_to_filename(self, filename: str) -> None:
+        Path(filename).write_bytes(self.source.read_bytes())
+
+
+class _Bucket:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.generation = 1
+        self.downloads = 0
+
+    def get_blob(self, blob_name: str) -> _Blob | None:
+        path = self.root / blob_name
+        if not path.exists():
+            return None
+        self.downloads += 1
+        return _Blob(path, self.generation)
+
+
+@pytest.fixture
+def bucket(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> _Bucket:
+    source = tmp_path / "bucket"
+    source.mkdir()
+    (source / GIF_KEY).write_bytes(bytes(range(256)) * 4)
+    fake = _Bucket(source)
+    gif_cache = ExerciseGIFCache(tmp_path / "cache", max_bytes=10_000, ttl_s=3600)
+    monkeypatch.setattr(views, "HttpResponse", HttpResponse)
+    monkeypatch.setattr(views, "_get_gif_storage", lambda: SimpleNamespace(bucket=fake))
+    monkeypatch.setattr(views, "_get_gif_cache", lambda: gif_cache)
+    return fake
+
+
+def _get(**headers: str) -> HttpResponse:
+    request = RequestFactory().get(f"/api/gif/{GIF_KEY}/", headers=headers)
+    return views.exercise_gif(request, GIF_KEY)
+
+
+def test_exercise_gif_streams_from_cache_and_revalidates(bucket: _Bucket) -> None:
+    first = _get()
+    assert first.status_code == 200
+    assert b"".join(first.streaming_content) == bytes(range(256)) * 4
+    etag = first["ETag"]
+    assert etag.startswith('"') and first["Accept-Ranges"] == "bytes"
+
+    assert _get().status_code == 200
+    assert bucket.downloads == 1
+
+    not_modified = _get(If_None_Match=etag)
+    assert not_modified.status_code == 304
+    assert not_modified["ETag"] == etag
+
+
+def test_exercise_gif_serves_byte_ranges(bucket: _Bucket) -> None:
+    partial = _get(Range="bytes=10-19")
+    assert partial.status_code == 206
+    assert partial["Content-Range"] == "bytes 10-19/1024"
+    assert b"".join(partial.streaming_content) == bytes(range(10, 20))
+
+    suffix = _get(Range="bytes=-4")
+    assert b"".join(suffix.streaming_content) == bytes(range(252, 256))
+
+    unsatisfiable = _get(Range="bytes=5000-")
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable["Content-Range"] == "bytes */1024"
+
+
+def test_gif_cache_evicts_least_recently_served(tmp_path: Path) -> None:
+    source = tmp_path / "bucket"
+    source.mkdir()
+    for name in ("a.gif", "b.gif", "c.gif"):
+        (source / name).write_bytes(b"x" * 400)
+    bucket = _Bucket(source)
+    gif_cache = ExerciseGIFCache(tmp_path / "cache", max_bytes=1000, ttl_s=3600)
+
+    gif_cache.get(bucket, "a.gif")
+    gif_cache.get(bucket, "b.gif")
+    gif_cache.get(bucket, "a.gif")
+    gif_cache.get(bucket, "c.gif")
+
+    assert gif_cache.stats()["evictions"] == 1
+    reopened = ExerciseGIFCache(tmp_path / "cache", max_bytes=1000, ttl_s=3600)
+    assert sorted(entry.key for entry in reopened._entries.values()) == ["a.gif", "c.gif"]
@@ -38,6 +38,31 @@ def test_program_update_invalidates_cache(monkeypatch: pytest.MonkeyPatch) -> No
     assert response.status_code == 200
 
 
-def test_subscription_update_does_not_touch_cache() -> None:
+def test_subscription_update_enqueues_profile_context_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[int | None, str]] = []
+    monkeypatch.setattr(
+        "apps.workout_plans.views.enqueue_profile_context_refresh",
+        lambda profile_id, *, reason: calls.append((profile_id, reason)),
+    )
     serializer = SimpleNamespace(save=lambda: SimpleNamespace(profile_id=7))
     SubscriptionViewSet().perform_update(serializer)  # type: ignore[arg-type]
+
+    assert calls == [(7, "subscription_updated")]
+
+
+def test_subscription_bulk_deactivate_validates_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[int]] = []
+
+    def deactivate_many(subscription_ids: list[int]) -> list[dict[str, int]]:
+        calls.append(subscription_ids)
+        return [{"id": subscription_ids[0], "profile": 7}]
+
+    monkeypatch.setattr("apps.workout_plans.views.SubscriptionRepository.deactivate_many", deactivate_many)
+    view = SubscriptionViewSet()
+
+    assert view.bulk_deactivate(SimpleNamespace(data={"ids": "1,2"})).status_code == 400  # type: ignore[arg-type]
+    response = view.bulk_deactivate(SimpleNamespace(data={"ids": ["3", 4]}))  # type: ignore[arg-type]
+
+    assert response.status_code == 200
+    assert response.data == {"deactivated": [{"id": 3, "profile": 7}]}
+    assert calls == [[3, 4]]
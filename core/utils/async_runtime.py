@@ -0,0 +1,95 @@
+"""Long-lived event loops for async code inside Celery tasks.
+
+Workers run the threads pool, and ``asyncio.run`` in a task opens and tears down a loop, and with it every httpx
+pool and Redis connection that code created, on each invocation. ``run_async`` runs coroutines on one loop per worker
+thread instead, created on first use and kept for the life of the thread, so per-loop clients (``get_redis_client``,
+``BaseCacheManager``, ``HTTPClientRegistry``) are reused by every task that thread executes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from functools import wraps
+from typing import Any, Callable, Coroutine, ParamSpec, TypeVar
+
+from loguru import logger
+
+from core.cache.base import BaseCacheManager
+from core.services.internal.http_pool import HTTPClientRegistry
+from core.utils.idempotency import close_redis as close_idempotency
+from core.utils.redis_lock import _RedisFactory
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+__all__ = [
+    "worker_loop",
+    "run_async",
+    "worker_async",
+    "reset_worker_loops",
+    "close_worker_loops",
+]
+
+_local = threading.local()
+_loops: list[asyncio.AbstractEventLoop] = []
+_lock = threading.Lock()
+
+
+def worker_loop() -> asyncio.AbstractEventLoop:
+    """Event loop of the calling thread, created on first use."""
+    loop: asyncio.AbstractEventLoop | None = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _local.loop = loop
+        with _lock:
+            _loops.append(loop)
+        logger.debug(f"worker_loop_created thread={threading.current_thread().name}")
+    return loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Drop-in replacement for ``asyncio.run`` in task bodies that keeps the thread's loop open."""
+    return worker_loop().run_until_complete(coro)
+
+
+def worker_async(func: Callable[P, Coroutine[Any, Any, T]]) -> Callable[P, T]:
+    """Turn a coroutine function into a blocking one that runs on the worker thread's loop."""
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        return run_async(func(*args, **kwargs))
+
+    return wrapper
+
+
+def reset_worker_loops() -> None:
+    """Forget loops inherited from a parent process (``worker_process_init``); children create their own."""
+    global _local
+    with _lock:
+        _loops.clear()
+    _local = threading.local()
+
+
+async def _close_loop_clients() -> None:
+    await HTTPClientRegistry.aclose_all()
+    await _RedisFactory.aclose_loop()
+    await close_idempotency()
+    await BaseCacheManager.close_pool()
+
+
+def close_worker_loops() -> None:
+    """Close the clients of every worker loop and the loops themselves (``worker_shutdown``)."""
+    with _lock:
+        loops, _loops[:] = list(_loops), []
+    for loop in loops:
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(_close_loop_clients())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"worker_loop_close_failed detail={exc}")
+        finally:
+            loop.close()
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional
 
 from loguru import logger
@@ -6,30 +7,37 @@ from redis.exceptions import RedisError
 
 from config.app_settings import settings
 
-_redis: Optional[Redis] = None
+_clients: dict[int, tuple[asyncio.AbstractEventLoop, Redis]] = {}
 
 
 async def _get_redis() -> Optional[Redis]:
-    global _redis
-    if _redis is None:
-        url = settings.REDIS_URL
-        if not url:
-            logger.warning("REDIS_URL not set, idempotency disabled")
-            return None
-        _redis = from_url(url, encoding="utf-8", decode_responses=True)
-    return _redis
+    # One client per event loop: each Celery worker thread keeps its own loop (``core.utils.async_runtime``).
+    # Clients of closed loops are dropped on the next miss, before a new loop can reuse their id.
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(id(loop))
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    for loop_id, (owner, _) in list(_clients.items()):
+        if owner.is_closed():
+            _clients.pop(loop_id, None)
+    url = settings.REDIS_URL
+    if not url:
+        logger.warning("REDIS_URL not set, idempotency disabled")
+        return None
+    redis = from_url(url, encoding="utf-8", decode_responses=True)
+    _clients[id(loop)] = (loop, redis)
+    return redis
 
 
 async def close_redis() -> None:
-    global _redis
-    if _redis is None:
+    loop = asyncio.get_running_loop()
+    entry = _clients.pop(id(loop), None)
+    if entry is None or entry[0] is not loop:
         return
     try:
-        await _redis.close()
+        await entry[1].close()
     except Exception as exc:  # noqa: BLE001
         logger.error(f"Redis close failed: {exc}")
-    finally:
-        _redis = None
 
 
 async def acquire_once(key: str, ttl: int = 300) -> bool:
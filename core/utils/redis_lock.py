@@ -42,6 +42,18 @@ class _RedisFactory:
             finally:
                 cls._clients.pop(k, None)
 
+    @classmethod
+    async def aclose_loop(cls) -> None:
+        """Close the clients owned by the running loop."""
+        loop_id = id(asyncio.get_running_loop())
+        for k, c in list(cls._clients.items()):
+            if k[0] != loop_id:
+                continue
+            try:
+                await c.aclose()  # pyrefly: ignore[missing-attribute]
+            finally:
+                cls._clients.pop(k, None)
+
 
 _RELEASE_LUA = """
 if redis.call("get", KEYS[1]) == ARGV[1] then